@@ -17,6 +17,7 @@ License: GPL-3.0 (based on DeepFaceLive)
 
 from pathlib import Path
 from typing import List, Optional
+from xlib import appargs as lib_appargs
 from xlib import os as lib_os
 from xlib import qt as qtx
 
@@ -86,13 +87,13 @@ class QLiveSwap(qtx.QXWidget):
             backend.BackendSignal()
         )
 
-        multi_sources_bc_out = backend.BackendConnection(multi_producer=True)
+        multi_sources_bc_out = backend.BackendConnection(multi_producer=True, preview_size=256)
         face_detector_bc_out = backend.BackendConnection()
         face_marker_bc_out = backend.BackendConnection()
-        face_aligner_bc_out = backend.BackendConnection()
+        face_aligner_bc_out = backend.BackendConnection(preview_size=256)
         face_swapper_bc_out = backend.BackendConnection()
         frame_adjuster_bc_out = backend.BackendConnection()
-        face_merger_bc_out = backend.BackendConnection()
+        face_merger_bc_out = backend.BackendConnection(preview_size=256)
 
         file_source = self.file_source = backend.FileSource(
             weak_heap=backend_weak_heap,
@@ -350,9 +351,14 @@ class QLiveSwap(qtx.QXWidget):
 
     def initialize(self) -> None:
         # Initialize all backends
+        idle_timeout = float(lib_appargs.get_arg_str('BACKEND_IDLE_TIMEOUT', '0'))
         for backend_host in self.all_backends:
             try:
-                if hasattr(backend_host, 'initialize'):
+                if isinstance(backend_host, backend.BackendHost):
+                    # Process is started when the data comes to the stage
+                    backend_host.set_idle_timeout(idle_timeout)
+                    backend_host.start_on_demand()
+                elif hasattr(backend_host, 'initialize'):
                     backend_host.initialize()
                 elif hasattr(backend_host, 'start'):
                     backend_host.start()
@@ -0,0 +1,231 @@
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Union
+
+from xlib import ffmpeg as lib_ffmpeg
+from xlib.image import ImageProcessor
+
+from . import backend
+from .backend.FileSource import InputType
+
+
+class PlayaTewsIdentityMaskerBatchRenderer:
+    """
+    Headless offline render of a video file or image sequence through the live pipeline
+
+        FileSource -> FaceDetector -> FaceMarker -> FaceAligner -> FaceSwapDFM -> FrameAdjuster -> FaceMerger -> encoder
+
+    The same backend workers as in the UI are used, with the settings saved in userdata/settings/states.dat.
+    The settings file is copied, so the render does not modify UI settings.
+
+    FileSource plays in non-realtime mode: every stage writes the next frame
+    only when the previous one is read, so every frame is processed once and in order.
+    Frames re-emitted by the stages, when their controls are restored, are not written.
+
+    arguments
+
+        userdata_path       Path    workspace directory of the app
+
+        input_path          Path    video file or image sequence directory
+
+        output_path         Path    output video file
+
+        target_width(0)     int     0 - source resolution
+
+        crf(18), preset('medium')   encoder settings
+
+        on_progress(None)   callable(frame_num, frame_count, fps)
+
+        trace_path(None)    Path    save Chrome trace JSON of the render
+    """
+
+    def __init__(self, userdata_path : Path,
+                       input_path : Path,
+                       output_path : Path,
+                       target_width : int = 0,
+                       crf : int = 18,
+                       preset : str = 'medium',
+                       on_progress : Callable[[int, int, float], None] = None,
+                       trace_path : Path = None):
+        self._userdata_path = Path(userdata_path)
+        self._input_path = Path(input_path)
+        self._output_path = Path(output_path)
+        self._target_width = target_width
+        self._crf = crf
+        self._preset = preset
+        self._on_progress = on_progress
+        self._trace_path = Path(trace_path) if trace_path is not None else None
+        self._file_source_error = None
+
+        if not self._input_path.exists():
+            raise Exception(f'{self._input_path} does not exist.')
+
+    def run(self, start_timeout : float = 120.0, frame_timeout : float = 120.0) -> Dict[str, float]:
+        """
+        render all frames
+
+            start_timeout   sec to wait for backends to start and load models
+
+            frame_timeout   sec to wait for a single frame from the pipeline
+
+        returns dict of statistics, 'latency' is BackendTracer.get_stats() of the pipeline
+        """
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            states_path = self._userdata_path / 'settings' / 'states.dat'
+            tmp_states_path = Path(tmp_dir) / 'states.dat'
+            if states_path.exists():
+                shutil.copy(states_path, tmp_states_path)
+
+            backend_db = backend.BackendDB(tmp_states_path)
+            backend_weak_heap = backend.BackendWeakHeap(size_mb=2048)
+            reemit_frame_signal = backend.BackendSignal()
+
+            file_source_bc_out = backend.BackendConnection()
+            face_detector_bc_out = backend.BackendConnection()
+            face_marker_bc_out = backend.BackendConnection()
+            face_aligner_bc_out = backend.BackendConnection()
+            face_swapper_bc_out = backend.BackendConnection()
+            frame_adjuster_bc_out = backend.BackendConnection()
+            face_merger_bc_out = backend.BackendConnection()
+
+            dfm_models_path = self._userdata_path / 'dfm_models'
+            dfm_models_path.mkdir(parents=True, exist_ok=True)
+
+            file_source = backend.FileSource(weak_heap=backend_weak_heap, reemit_frame_signal=reemit_frame_signal, bc_out=file_source_bc_out, backend_db=backend_db)
+            all_backends : List[backend.BackendHost] = [
+                file_source,
+                backend.FaceDetector(weak_heap=backend_weak_heap, reemit_frame_signal=reemit_frame_signal, bc_in=file_source_bc_out, bc_out=face_detector_bc_out, backend_db=backend_db),
+                backend.FaceMarker(weak_heap=backend_weak_heap, reemit_frame_signal=reemit_frame_signal, bc_in=face_detector_bc_out, bc_out=face_marker_bc_out, backend_db=backend_db),
+                backend.FaceAligner(weak_heap=backend_weak_heap, reemit_frame_signal=reemit_frame_signal, bc_in=face_marker_bc_out, bc_out=face_aligner_bc_out, backend_db=backend_db),
+                backend.FaceSwapDFM(weak_heap=backend_weak_heap, reemit_frame_signal=reemit_frame_signal, bc_in=face_aligner_bc_out, bc_out=face_swapper_bc_out, dfm_models_path=dfm_models_path, backend_db=backend_db),
+                backend.FrameAdjuster(weak_heap=backend_weak_heap, reemit_frame_signal=reemit_frame_signal, bc_in=face_swapper_bc_out, bc_out=frame_adjuster_bc_out, backend_db=backend_db),
+                backend.FaceMerger(weak_heap=backend_weak_heap, reemit_frame_signal=reemit_frame_signal, bc_in=frame_adjuster_bc_out, bc_out=face_merger_bc_out, backend_db=backend_db),
+            ]
+
+            # input of the UI session is not used
+            file_source.reset_state()
+            file_source.get_control_sheet().error.call_on_error(self._on_file_source_error)
+
+            try:
+                for bh in all_backends:
+                    bh.start()
+
+                self._wait(all_backends, lambda: all(bh.is_started() and not bh.is_busy() for bh in all_backends),
+                           start_timeout, 'backends are not started')
+
+                self._setup_file_source(all_backends, file_source)
+
+                return self._render(all_backends, file_source, face_merger_bc_out, backend_weak_heap, frame_timeout)
+            finally:
+                for bh in all_backends:
+                    bh.stop()
+                self._wait(all_backends, lambda: all(bh.is_stopped() for bh in all_backends), 10.0, None)
+                for bh in all_backends:
+                    if not bh.is_stopped():
+                        bh.stop(force=True)
+                backend_db.finish_pending_jobs()
+
+    def _on_file_source_error(self, text):
+        self._file_source_error = text
+
+    def _wait(self, all_backends, cond_func, timeout, error : Union[str, None]):
+        time_start = time.time()
+        while not cond_func():
+            for bh in all_backends:
+                bh.process_messages()
+            if time.time() - time_start > timeout:
+                if error is not None:
+                    raise Exception(f'Timeout: {error}')
+                return
+            time.sleep(0.005)
+
+    def _setup_file_source(self, all_backends, file_source : backend.FileSource):
+        cs = file_source.get_control_sheet()
+        input_type = InputType.IMAGE_SEQUENCE if self._input_path.is_dir() else InputType.VIDEO_FILE
+
+        self._wait(all_backends, lambda: cs.input_type.in_choices(input_type), 10.0, 'FileSource is not ready')
+        cs.input_type.select(input_type)
+        self._wait(all_backends, lambda: cs.input_paths.is_enabled() and cs.input_type.get_selected_choice() == input_type, 10.0, 'FileSource input type is not selected')
+        cs.input_paths.set_paths(self._input_path)
+
+        def is_opened():
+            if self._file_source_error is not None:
+                raise Exception(self._file_source_error)
+            return cs.is_realtime.is_enabled()
+        self._wait(all_backends, is_opened, 30.0, f'unable to open {self._input_path}')
+
+        cs.is_realtime.set_flag(False)
+        cs.is_autorewind.set_flag(False)
+        cs.target_width.set_number(self._target_width)
+        cs.frame_index.set_number(0)
+        self._wait(all_backends, lambda: not cs.is_realtime.get_flag() and not cs.is_autorewind.get_flag(), 10.0, 'FileSource is not configured')
+        cs.play.signal()
+
+    def _render(self, all_backends, file_source : backend.FileSource, bc_in : backend.BackendConnection, weak_heap, frame_timeout) -> Dict[str, float]:
+        writer = None
+        frame_count = None
+        prev_frame_num = -1
+        frame_time = time_start = time.time()
+        last_report_time = 0.0
+        out_of_order = 0
+        skipped = 0
+
+        tracer = backend.BackendTracer()
+        if self._trace_path is not None:
+            tracer.start_recording()
+
+        while frame_count is None or prev_frame_num < frame_count-1:
+            for bh in all_backends:
+                bh.process_messages()
+
+            bcd = bc_in.read(timeout=0.005)
+            if bcd is None:
+                if self._file_source_error is not None:
+                    raise Exception(self._file_source_error)
+                if time.time() - frame_time > frame_timeout:
+                    raise Exception(f'Timeout: no frames from the pipeline for {frame_timeout} sec')
+                continue
+
+            tracer.add(bcd)
+            frame_time = time.time()
+            frame_num = bcd.get_frame_num()
+            frame_count = bcd.get_frame_count()
+            if bcd.get_is_frame_reemitted() or frame_num <= prev_frame_num:
+                # the frame is already written, writing it again breaks frame count and audio sync
+                skipped += 1
+                continue
+            if frame_num != prev_frame_num+1:
+                out_of_order += 1
+            prev_frame_num = frame_num
+            bcd.assign_weak_heap(weak_heap)
+
+            image = bcd.get_image(bcd.get_merged_image_name())
+            if image is None:
+                # no faces in the frame
+                image = bcd.get_image(bcd.get_frame_image_name())
+            image = ImageProcessor(image).ch(3).to_uint8().get_image('HWC')
+
+            if writer is None:
+                writer = lib_ffmpeg.FFMPEGVideoWriter(self._output_path, fps=bcd.get_frame_fps(), crf=self._crf, preset=self._preset,
+                                                      audio_filepath=self._input_path if self._input_path.is_file() else None)
+            writer.write(image)
+
+            if self._on_progress is not None and (frame_time - last_report_time >= 1.0 or frame_num == frame_count-1):
+                last_report_time = frame_time
+                self._on_progress(frame_num, frame_count, writer.get_frame_count() / max(frame_time - time_start, 1e-6) )
+
+        if writer is None or not writer.close():
+            raise Exception('ffmpeg encoder error')
+
+        if self._trace_path is not None:
+            tracer.save_chrome_trace(self._trace_path)
+
+        time_elapsed = time.time() - time_start
+        return {'frame_count' : writer.get_frame_count(),
+                'out_of_order' : out_of_order,
+                'skipped' : skipped,
+                'time_elapsed' : time_elapsed,
+                'fps' : writer.get_frame_count() / max(time_elapsed, 1e-6),
+                'latency' : tracer.get_stats(), }
@@ -0,0 +1,386 @@
+import json
+import platform
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Union
+
+import cv2
+import numpy as np
+
+from . import backend
+from .backend.FileSource import InputType
+from .backend.StreamOutput import SourceType
+
+
+class PlayaTewsIdentityMaskerBenchmark:
+    """
+    Headless benchmark of the real pipeline on CPU
+
+        FileSource -> FaceDetector -> FaceMarker -> FaceAligner -> FaceSwapDFM -> FaceMerger -> StreamOutput
+
+    Backends start with default settings in a temporary workspace, so results do not depend on UI settings.
+    FileSource plays in non-realtime mode, so throughput is limited by the slowest stage.
+    Per-stage and end-to-end latencies are collected from frame traces, see backend.BackendTracer.
+
+    arguments
+
+        input_path(None)    Path    video file or image sequence directory.
+                                    None - synthetic clip of frame_count frames of width x height is generated.
+
+        frame_count(120)    int     number of frames of synthetic clip
+
+        width(1280), height(720)    size of synthetic clip
+
+        dfm_model_path(None)    Path    .dfm model for FaceSwapDFM.
+                                        None - tiny test model is generated if torch is available.
+
+        require_faces(True)     bool    raise if no face is detected, or no face is swapped while a model is used.
+                                        Otherwise swap and merge stages do no work, and the result does not measure them.
+                                        Faces drawn in the synthetic clip may be not detected, use input_path with a real face.
+                                        False - the problems are only listed in 'warnings' of the result.
+    """
+
+    def __init__(self, input_path : Path = None,
+                       frame_count : int = 120,
+                       width : int = 1280,
+                       height : int = 720,
+                       dfm_model_path : Path = None,
+                       require_faces : bool = True):
+        self._input_path = Path(input_path) if input_path is not None else None
+        self._frame_count = frame_count
+        self._width = width
+        self._height = height
+        self._dfm_model_path = Path(dfm_model_path) if dfm_model_path is not None else None
+        self._require_faces = require_faces
+        self._file_source_error = None
+
+    def run(self, start_timeout : float = 300.0, frame_timeout : float = 120.0) -> Dict:
+        """
+        run benchmark
+
+        returns dict of results, see save_benchmark_results
+        """
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp_path = Path(tmp_dir)
+
+            input_path = self._input_path
+            if input_path is None:
+                input_path = tmp_path / 'clip'
+                create_synthetic_clip(input_path, self._frame_count, self._width, self._height)
+
+            dfm_models_path = tmp_path / 'dfm_models'
+            dfm_models_path.mkdir()
+            dfm_model_path = self._dfm_model_path
+            if dfm_model_path is None:
+                dfm_model_path = dfm_models_path / 'BenchmarkTestModel.dfm'
+                if not create_test_dfm_model(dfm_model_path):
+                    dfm_model_path = None
+
+            backend_db = backend.BackendDB(tmp_path / 'states.dat')
+            backend_weak_heap = backend.BackendWeakHeap(size_mb=2048)
+            reemit_frame_signal = backend.BackendSignal()
+
+            file_source_bc_out = backend.BackendConnection()
+            face_detector_bc_out = backend.BackendConnection()
+            face_marker_bc_out = backend.BackendConnection()
+            face_aligner_bc_out = backend.BackendConnection()
+            face_swapper_bc_out = backend.BackendConnection()
+            face_merger_bc_out = backend.BackendConnection()
+
+            file_source = backend.FileSource(weak_heap=backend_weak_heap, reemit_frame_signal=reemit_frame_signal, bc_out=file_source_bc_out, backend_db=backend_db)
+            face_detector = backend.FaceDetector(weak_heap=backend_weak_heap, reemit_frame_signal=reemit_frame_signal, bc_in=file_source_bc_out, bc_out=face_detector_bc_out, backend_db=backend_db)
+            face_marker = backend.FaceMarker(weak_heap=backend_weak_heap, reemit_frame_signal=reemit_frame_signal, bc_in=face_detector_bc_out, bc_out=face_marker_bc_out, backend_db=backend_db)
+            face_aligner = backend.FaceAligner(weak_heap=backend_weak_heap, reemit_frame_signal=reemit_frame_signal, bc_in=face_marker_bc_out, bc_out=face_aligner_bc_out, backend_db=backend_db)
+            face_swapper = backend.FaceSwapDFM(weak_heap=backend_weak_heap, reemit_frame_signal=reemit_frame_signal, bc_in=face_aligner_bc_out, bc_out=face_swapper_bc_out, dfm_models_path=dfm_models_path, backend_db=backend_db)
+            face_merger = backend.FaceMerger(weak_heap=backend_weak_heap, reemit_frame_signal=reemit_frame_signal, bc_in=face_swapper_bc_out, bc_out=face_merger_bc_out, backend_db=backend_db)
+            stream_output = backend.StreamOutput(weak_heap=backend_weak_heap, reemit_frame_signal=reemit_frame_signal, bc_in=face_merger_bc_out, backend_db=backend_db)
+
+            all_backends : List[backend.BackendHost] = [file_source, face_detector, face_marker, face_aligner, face_swapper, face_merger, stream_output]
+
+            file_source.get_control_sheet().error.call_on_error(self._on_file_source_error)
+
+            try:
+                for bh in all_backends:
+                    bh.start()
+
+                self._wait(all_backends, lambda: all(bh.is_started() and not bh.is_busy() for bh in all_backends),
+                           start_timeout, 'backends are not started')
+
+                for bh in [face_detector, face_marker, face_swapper, face_merger]:
+                    self._select_choice(all_backends, bh, bh.get_control_sheet().device, _is_cpu_device, start_timeout, f'CPU device of {bh.__class__.__name__}')
+
+                if dfm_model_path is not None:
+                    self._select_choice(all_backends, face_swapper, face_swapper.get_control_sheet().model,
+                                        lambda model: model is not None and Path(model.get_model_path()) == dfm_model_path,
+                                        start_timeout, f'model {dfm_model_path}')
+
+                self._select_choice(all_backends, stream_output, stream_output.get_control_sheet().source_type,
+                                    lambda source_type: source_type == SourceType.MERGED_FRAME_OR_SOURCE_FRAME,
+                                    start_timeout, 'StreamOutput source type')
+
+                self._setup_file_source(all_backends, file_source, input_path)
+
+                results = self._measure(all_backends, face_merger_bc_out, backend_weak_heap, frame_timeout)
+                results['sink_fps'] = stream_output.get_control_sheet().avg_fps.get_number()
+            finally:
+                for bh in all_backends:
+                    bh.stop()
+                self._wait(all_backends, lambda: all(bh.is_stopped() for bh in all_backends), 10.0, None)
+                for bh in all_backends:
+                    if not bh.is_stopped():
+                        bh.stop(force=True)
+                backend_db.finish_pending_jobs()
+
+        errors = []
+        if results['faces_per_frame'] == 0:
+            errors.append('no faces are detected, swap and merge stages are not measured')
+        elif dfm_model_path is not None and results['swapped_faces_per_frame'] == 0:
+            errors.append('no faces are swapped, swap and merge stages are not measured')
+        if self._require_faces and len(errors) != 0:
+            raise Exception(f'Benchmark is not valid: {"; ".join(errors)}')
+
+        results['warnings'] = errors
+        if dfm_model_path is None:
+            results['warnings'].append('no DFM model, faces are not swapped')
+
+        results['config'] = {'input_path' : str(self._input_path) if self._input_path is not None else None,
+                             'frame_count' : self._frame_count,
+                             'width' : self._width,
+                             'height' : self._height,
+                             'dfm_model' : dfm_model_path.name if dfm_model_path is not None else None, }
+        results['git_commit'] = _get_git_commit()
+        results['platform'] = platform.platform()
+        results['timestamp'] = time.time()
+        return results
+
+    def _on_file_source_error(self, text):
+        self._file_source_error = text
+
+    def _wait(self, all_backends, cond_func, timeout, error : Union[str, None]):
+        time_start = time.time()
+        while not cond_func():
+            for bh in all_backends:
+                bh.process_messages()
+            if time.time() - time_start > timeout:
+                if error is not None:
+                    raise Exception(f'Timeout: {error}')
+                return
+            time.sleep(0.005)
+
+    def _select_choice(self, all_backends, bh : backend.BackendHost, switch, match_func, timeout, what : str):
+        """select the first choice of DynamicSingleSwitch matching match_func and wait the backend is restarted with it"""
+        def get_choice():
+            for choice in (switch.get_choices() or []):
+                if match_func(choice):
+                    return choice
+            return None
+
+        self._wait(all_backends, lambda: get_choice() is not None, timeout, f'{what} is not available')
+        choice = get_choice()
+        switch.select(choice)
+        self._wait(all_backends, lambda: switch.get_selected_choice() == choice and bh.is_started() and not bh.is_busy(),
+                   timeout, f'{what} is not selected')
+
+    def _setup_file_source(self, all_backends, file_source : backend.FileSource, input_path : Path):
+        cs = file_source.get_control_sheet()
+        input_type = InputType.IMAGE_SEQUENCE if input_path.is_dir() else InputType.VIDEO_FILE
+
+        self._wait(all_backends, lambda: cs.input_type.in_choices(input_type), 10.0, 'FileSource is not ready')
+        cs.input_type.select(input_type)
+        self._wait(all_backends, lambda: cs.input_paths.is_enabled() and cs.input_type.get_selected_choice() == input_type, 10.0, 'FileSource input type is not selected')
+        cs.input_paths.set_paths(input_path)
+
+        def is_opened():
+            if self._file_source_error is not None:
+                raise Exception(self._file_source_error)
+            return cs.is_realtime.is_enabled()
+        self._wait(all_backends, is_opened, 30.0, f'unable to open {input_path}')
+
+        cs.is_realtime.set_flag(False)
+        cs.is_autorewind.set_flag(False)
+        cs.frame_index.set_number(0)
+        self._wait(all_backends, lambda: not cs.is_realtime.get_flag() and not cs.is_autorewind.get_flag(), 10.0, 'FileSource is not configured')
+        cs.play.signal()
+
+    def _measure(self, all_backends, bc : backend.BackendConnection, weak_heap, frame_timeout) -> Dict:
+        """
+        observe output of FaceMerger without consuming it, StreamOutput is the consumer
+        """
+        tracer = backend.BackendTracer()
+        bcd_id = None
+        frame_count = None
+        last_frame_num = -1
+        traced_frames = 0
+        faces_count = 0
+        swapped_faces_count = 0
+        frame_time = time.time()
+        time_start = None
+
+        while frame_count is None or last_frame_num < frame_count-1:
+            for bh in all_backends:
+                bh.process_messages()
+
+            new_bcd_id = bc.get_write_id()
+            bcd = bc.get_by_id(new_bcd_id) if new_bcd_id != bcd_id else None
+            if bcd is None:
+                if self._file_source_error is not None:
+                    raise Exception(self._file_source_error)
+                if time.time() - frame_time > frame_timeout:
+                    raise Exception(f'Timeout: no frames from the pipeline for {frame_timeout} sec')
+                time.sleep(0.001)
+                continue
+
+            bcd_id = new_bcd_id
+            frame_time = time.time()
+            if time_start is None:
+                # first frame includes warmup of the models
+                time_start = frame_time
+                first_frame_num = bcd.get_frame_num()
+            else:
+                tracer.add(bcd)
+                traced_frames += 1
+                fsi_list = bcd.get_face_swap_info_list()
+                faces_count += len(fsi_list)
+                swapped_faces_count += sum(1 for fsi in fsi_list if fsi.face_swap_image_name is not None)
+
+            frame_count = bcd.get_frame_count()
+            last_frame_num = bcd.get_frame_num()
+
+        time_elapsed = time.time() - time_start
+        processed_frames = last_frame_num - first_frame_num
+        latency = tracer.get_stats()
+
+        stages = {}
+        for stage_name, stage_stats in latency['stages'].items():
+            compute_mean = stage_stats['compute']['mean']
+            stages[stage_name] = dict(stage_stats, fps=1.0 / compute_mean if compute_mean != 0 else 0.0)
+
+        return {'frames' : processed_frames,
+                'traced_frames' : traced_frames,
+                'time_elapsed' : time_elapsed,
+                'fps' : processed_frames / max(time_elapsed, 1e-6),
+                'faces_per_frame' : faces_count / max(traced_frames, 1),
+                'swapped_faces_per_frame' : swapped_faces_count / max(traced_frames, 1),
+                'stages' : stages,
+                'end_to_end' : latency['end_to_end'], }
+
+
+def create_synthetic_clip(dir_path : Path, frame_count : int, width : int, height : int):
+    """
+    write image sequence of a moving face-like drawing on a gradient background
+    """
+    dir_path = Path(dir_path)
+    dir_path.mkdir(parents=True, exist_ok=True)
+
+    background = np.empty( (height, width, 3), np.uint8)
+    background[...] = np.linspace(40, 200, width, dtype=np.float32)[None,:,None].astype(np.uint8)
+
+    face_size = min(width, height) // 3
+    for i in range(frame_count):
+        img = background.copy()
+        phase = 2*np.pi * i / max(frame_count, 1)
+        cx = int(width/2 + width/6 * np.sin(phase))
+        cy = int(height/2 + height/12 * np.cos(phase))
+
+        cv2.ellipse(img, (cx, cy), (face_size//2, int(face_size*0.65)), 0, 0, 360, (140, 170, 210), -1)
+        for ex in [cx - face_size//5, cx + face_size//5]:
+            cv2.ellipse(img, (ex, cy - face_size//8), (face_size//12, face_size//24), 0, 0, 360, (255, 255, 255), -1)
+            cv2.circle(img, (ex, cy - face_size//8), face_size//40, (40, 30, 20), -1)
+        cv2.ellipse(img, (cx, cy + face_size//4), (face_size//6, face_size//20), 0, 0, 360, (90, 80, 170), -1)
+
+        cv2.imwrite(str(dir_path / f'{i:06d}.jpg'), img, [int(cv2.IMWRITE_JPEG_QUALITY), 95])
+
+
+def create_test_dfm_model(model_path : Path, resolution : int = 64) -> bool:
+    """
+    export tiny DFM model with one conv layer per output.
+    The model has the same inputs and outputs as trained models, so FaceSwapDFM runs the full path.
+
+    returns False if torch is not available
+    """
+    try:
+        import torch
+        import torch.nn as nn
+    except ImportError:
+        return False
+
+    class TestDFMNet(nn.Module):
+        def __init__(self):
+            super().__init__()
+            self.celeb_conv = nn.Conv2d(3, 3, 3, padding=1)
+            self.mask_conv = nn.Conv2d(3, 2, 3, padding=1)
+
+        def forward(self, in_face):
+            x = in_face.permute(0, 3, 1, 2)
+            celeb = torch.sigmoid(self.celeb_conv(x)).permute(0, 2, 3, 1)
+            masks = torch.sigmoid(self.mask_conv(x)).permute(0, 2, 3, 1)
+            return masks[...,0:1], celeb, masks[...,1:2]
+
+    torch.onnx.export(TestDFMNet(),
+                      torch.zeros( (1, resolution, resolution, 3), dtype=torch.float32),
+                      str(model_path),
+                      opset_version=12,
+                      input_names=['in_face:0'],
+                      output_names=['out_face_mask:0', 'out_celeb_face:0', 'out_celeb_face_mask:0'],
+                      dynamic_axes={'in_face:0' : {0:'batch_size'}}, )
+    return True
+
+
+def save_benchmark_results(results : Dict, filepath : Path):
+    """save results of PlayaTewsIdentityMaskerBenchmark.run() as JSON"""
+    Path(filepath).write_text( json.dumps(results, indent=4) )
+
+
+def load_benchmark_results(filepath : Path) -> Dict:
+    return json.loads( Path(filepath).read_text() )
+
+
+def compare_benchmark_results(baseline : Dict, current : Dict, tolerance : float = 0.1) -> List[str]:
+    """
+    compare results with baseline
+
+        tolerance(0.1)  allowed relative slowdown
+
+    returns list of descriptions of regressions, empty if there are no regressions
+    """
+    regressions = []
+
+    def check_fps(name, baseline_fps, current_fps):
+        if baseline_fps is not None and current_fps is not None and baseline_fps > 0 and \
+           current_fps < baseline_fps * (1.0 - tolerance):
+            regressions.append(f'{name}: {current_fps:.2f} FPS, baseline {baseline_fps:.2f} FPS ({(current_fps/baseline_fps-1.0)*100:.1f}%)')
+
+    def check_latency(name, baseline_latency, current_latency):
+        if baseline_latency is not None and current_latency is not None and baseline_latency > 0 and \
+           current_latency > baseline_latency * (1.0 + tolerance):
+            regressions.append(f'{name}: {current_latency*1000:.1f} ms, baseline {baseline_latency*1000:.1f} ms (+{(current_latency/baseline_latency-1.0)*100:.1f}%)')
+
+    check_fps('pipeline', baseline.get('fps', None), current.get('fps', None))
+    check_latency('end to end p95', baseline.get('end_to_end', {}).get('p95', None), current.get('end_to_end', {}).get('p95', None))
+
+    current_stages = current.get('stages', {})
+    for stage_name, baseline_stage in baseline.get('stages', {}).items():
+        current_stage = current_stages.get(stage_name, None)
+        if current_stage is not None:
+            check_fps(stage_name, baseline_stage.get('fps', None), current_stage.get('fps', None))
+            check_latency(f'{stage_name} compute p95', baseline_stage.get('compute', {}).get('p95', None), current_stage.get('compute', {}).get('p95', None))
+    return regressions
+
+
+def _is_cpu_device(device) -> bool:
+    if device is None:
+        return False
+    if isinstance(device, str):
+        return device == 'CPU'
+    is_cpu = getattr(device, 'is_cpu', None)
+    return is_cpu is not None and is_cpu()
+
+
+def _get_git_commit() -> Union[str, None]:
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=Path(__file__).parent,
+                              capture_output=True, text=True, timeout=10).stdout.strip() or None
+    except Exception:
+        return None
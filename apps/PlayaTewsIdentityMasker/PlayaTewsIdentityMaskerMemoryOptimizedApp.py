@@ -48,13 +48,13 @@ class QLiveSwapMemoryOptimized(qtx.QXWidget):
         backend_weak_heap   = self.backend_weak_heap   = backend.BackendWeakHeap(size_mb=4096)  # Increased to 4GB
         reemit_frame_signal = self.reemit_frame_signal = backend.BackendSignal()
 
-        multi_sources_bc_out  = backend.BackendConnection(multi_producer=True)
+        multi_sources_bc_out  = backend.BackendConnection(multi_producer=True, preview_size=256)
         face_detector_bc_out  = backend.BackendConnection()
         face_marker_bc_out    = backend.BackendConnection()
-        face_aligner_bc_out   = backend.BackendConnection()
+        face_aligner_bc_out   = backend.BackendConnection(preview_size=256)
         face_swapper_bc_out   = backend.BackendConnection()
         frame_adjuster_bc_out = backend.BackendConnection()
-        face_merger_bc_out    = backend.BackendConnection()
+        face_merger_bc_out    = backend.BackendConnection(preview_size=256)
 
         file_source    = self.file_source    = backend.FileSource   (weak_heap=backend_weak_heap, reemit_frame_signal=reemit_frame_signal, bc_out=multi_sources_bc_out, backend_db=backend_db)
         camera_source  = self.camera_source  = backend.CameraSource (weak_heap=backend_weak_heap, bc_out=multi_sources_bc_out, backend_db=backend_db)
@@ -6,7 +6,9 @@ from PyQt5.QtWidgets import QSplitter
 from localization import L, Localization
 from resources.fonts import QXFontDB
 from resources.gfx import QXImageDB
+from xlib import appargs as lib_appargs
 from xlib import os as lib_os
+from xlib import python as lib_python
 from xlib import qt as qtx
 from xlib.qt.widgets.QXLabel import QXLabel
 
@@ -48,13 +50,21 @@ class QLiveSwapOBS(qtx.QXWidget):
         backend_weak_heap   = self.backend_weak_heap   = backend.BackendWeakHeap(size_mb=2048)
         reemit_frame_signal = self.reemit_frame_signal = backend.BackendSignal()
 
-        multi_sources_bc_out  = backend.BackendConnection(multi_producer=True)
+        multi_sources_bc_out  = backend.BackendConnection(multi_producer=True, preview_size=256)
         face_detector_bc_out  = backend.BackendConnection()
         face_marker_bc_out    = backend.BackendConnection()
-        face_aligner_bc_out   = backend.BackendConnection()
+        face_aligner_bc_out   = backend.BackendConnection(preview_size=256)
         face_swapper_bc_out   = backend.BackendConnection()
         frame_adjuster_bc_out = backend.BackendConnection()
-        face_merger_bc_out    = backend.BackendConnection()
+        face_merger_bc_out    = backend.BackendConnection(preview_size=256)
+        self._face_merger_bc_out = face_merger_bc_out
+
+        # Per-stage latency trace of the merged frames, saved on finalize
+        self._trace_path = lib_appargs.get_arg_str('TRACE_PATH', None)
+        self._tracer = None
+        if self._trace_path:
+            self._tracer = backend.BackendTracer()
+            self._tracer.start_recording()
 
         file_source    = self.file_source    = backend.FileSource   (weak_heap=backend_weak_heap, reemit_frame_signal=reemit_frame_signal, bc_out=multi_sources_bc_out, backend_db=backend_db)
         camera_source  = self.camera_source  = backend.CameraSource (weak_heap=backend_weak_heap, bc_out=multi_sources_bc_out, backend_db=backend_db)
@@ -159,6 +169,8 @@ class QLiveSwapOBS(qtx.QXWidget):
         self.backend_db.process_messages()
         for backend in self.all_backends:
             backend.process_messages()
+        if self._tracer is not None:
+            self._tracer.add_written(self._face_merger_bc_out)
 
     def _on_timer_5ms(self):
         self._process_messages()
@@ -167,11 +179,14 @@ class QLiveSwapOBS(qtx.QXWidget):
         self.backend_db.clear()
 
     def initialize(self):
+        idle_timeout = float(lib_appargs.get_arg_str('BACKEND_IDLE_TIMEOUT', '0'))
         for bcknd in self.all_backends:
             default_state = True
             if isinstance(bcknd, (backend.CameraSource, backend.FaceAnimator, backend.FaceSwapInsight) ):
                 default_state = False
-            bcknd.restore_on_off_state(default_state=default_state)
+            # Processes are started when the data comes to the stage
+            bcknd.set_idle_timeout(idle_timeout)
+            bcknd.restore_on_off_state(default_state=default_state, on_demand=True)
 
     def finalize(self):
         # Gracefully stop the backend
@@ -187,6 +202,10 @@ class QLiveSwapOBS(qtx.QXWidget):
 
         self.backend_db.finish_pending_jobs()
 
+        if self._tracer is not None:
+            self._tracer.save_chrome_trace(self._trace_path)
+            print(f'Latency trace is saved to {self._trace_path}')
+
         self.q_ds_frame_viewer.clear()
         self.q_ds_fa_viewer.clear()
 
@@ -384,6 +403,9 @@ class PlayaTewsIdentityMaskerOBSStyleApp(qtx.QXMainApplication):
         # Initialize the main content
         self.initialize()
 
+        # Load modules deferred by the stages while the user looks at the window
+        lib_python.preload_modules(['numexpr', 'onnxruntime'])
+
     def on_reinitialize(self):
         if self._wnd.q_live_swap is not None:
             self._wnd.q_live_swap.finalize()
@@ -392,19 +414,6 @@ class PlayaTewsIdentityMaskerOBSStyleApp(qtx.QXMainApplication):
         self._wnd.q_live_swap = QLiveSwapOBS(self._userdata_path, self._settings_dirpath)
         self._wnd.content_l.addWidget(self._wnd.q_live_swap)
         self._wnd.q_live_swap.initialize()
-        
-        # Ensure all backend components are properly initialized
-        print("Initializing backend components...")
-        from . import backend as backend_module
-        for backend in self._wnd.q_live_swap.all_backends:
-            print(f"Initializing {backend.__class__.__name__}")
-            # Use restore_on_off_state instead of direct start
-            default_state = True
-            if isinstance(backend, (backend_module.CameraSource, 
-                                   backend_module.FaceAnimator, 
-                                   backend_module.FaceSwapInsight)):
-                default_state = False
-            backend.restore_on_off_state(default_state=default_state)
 
     def initialize(self):
         self.on_reinitialize()
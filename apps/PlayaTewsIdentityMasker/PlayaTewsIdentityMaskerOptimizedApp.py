@@ -12,6 +12,7 @@ from PyQt5.QtWidgets import QSplitter
 from localization import L, Localization
 from resources.fonts import QXFontDB
 from resources.gfx import QXImageDB
+from xlib import appargs as lib_appargs
 from xlib import os as lib_os
 from xlib import qt as qtx
 from xlib.qt.widgets.QXLabel import QXLabel
@@ -56,13 +57,13 @@ class QLiveSwapOptimized(qtx.QXWidget):
         backend_weak_heap   = self.backend_weak_heap   = backend.BackendWeakHeap(size_mb=2048)
         reemit_frame_signal = self.reemit_frame_signal = backend.BackendSignal()
 
-        multi_sources_bc_out  = backend.BackendConnection(multi_producer=True)
+        multi_sources_bc_out  = backend.BackendConnection(multi_producer=True, preview_size=256)
         face_detector_bc_out  = backend.BackendConnection()
         face_marker_bc_out    = backend.BackendConnection()
-        face_aligner_bc_out   = backend.BackendConnection()
+        face_aligner_bc_out   = backend.BackendConnection(preview_size=256)
         face_swapper_bc_out   = backend.BackendConnection()
         frame_adjuster_bc_out = backend.BackendConnection()
-        face_merger_bc_out    = backend.BackendConnection()
+        face_merger_bc_out    = backend.BackendConnection(preview_size=256)
 
         file_source    = self.file_source    = backend.FileSource   (weak_heap=backend_weak_heap, reemit_frame_signal=reemit_frame_signal, bc_out=multi_sources_bc_out, backend_db=backend_db)
         camera_source  = self.camera_source  = backend.CameraSource (weak_heap=backend_weak_heap, bc_out=multi_sources_bc_out, backend_db=backend_db)
@@ -226,11 +227,14 @@ class QLiveSwapOptimized(qtx.QXWidget):
             self.showFullScreen()
 
     def initialize(self):
+        idle_timeout = float(lib_appargs.get_arg_str('BACKEND_IDLE_TIMEOUT', '0'))
         for bcknd in self.all_backends:
             default_state = True
             if isinstance(bcknd, (backend.CameraSource, backend.FaceAnimator, backend.FaceSwapInsight) ):
                 default_state = False
-            bcknd.restore_on_off_state(default_state=default_state)
+            # Processes are started when the data comes to the stage
+            bcknd.set_idle_timeout(idle_timeout)
+            bcknd.restore_on_off_state(default_state=default_state, on_demand=True)
 
     def finalize(self):
         # Gracefully stop the backend
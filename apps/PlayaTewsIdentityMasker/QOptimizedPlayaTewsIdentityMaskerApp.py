@@ -12,6 +12,7 @@ from typing import List, Optional, Dict, Any
 from localization import L, Localization
 from resources.fonts import QXFontDB
 from resources.gfx import QXImageDB
+from xlib import appargs as lib_appargs
 from xlib import os as lib_os
 from xlib import qt as qtx
 from xlib.qt.widgets.QXLabel import QXLabel
@@ -87,13 +88,13 @@ class QOptimizedLiveSwap(qtx.QXWidget):
         self.reemit_frame_signal = backend.BackendSignal()
         
         # Backend connections
-        self.multi_sources_bc_out = backend.BackendConnection(multi_producer=True)
+        self.multi_sources_bc_out = backend.BackendConnection(multi_producer=True, preview_size=256)
         self.face_detector_bc_out = backend.BackendConnection()
         self.face_marker_bc_out = backend.BackendConnection()
-        self.face_aligner_bc_out = backend.BackendConnection()
+        self.face_aligner_bc_out = backend.BackendConnection(preview_size=256)
         self.face_swapper_bc_out = backend.BackendConnection()
         self.frame_adjuster_bc_out = backend.BackendConnection()
-        self.face_merger_bc_out = backend.BackendConnection()
+        self.face_merger_bc_out = backend.BackendConnection(preview_size=256)
         
         # Initialize backend components with optimized settings
         self.file_source = backend.FileSource(
@@ -352,11 +353,14 @@ class QOptimizedLiveSwap(qtx.QXWidget):
         """Initialize with optimized startup"""
         self.logger.info("Starting optimized initialization...")
         
+        idle_timeout = float(lib_appargs.get_arg_str('BACKEND_IDLE_TIMEOUT', '0'))
         for bcknd in self.all_backends:
             default_state = True
             if isinstance(bcknd, (backend.CameraSource, backend.FaceAnimator, backend.FaceSwapInsight)):
                 default_state = False
-            bcknd.restore_on_off_state(default_state=default_state)
+            # Processes are started when the data comes to the stage
+            bcknd.set_idle_timeout(idle_timeout)
+            bcknd.restore_on_off_state(default_state=default_state, on_demand=True)
         
         self.logger.info("Optimized initialization completed")
         
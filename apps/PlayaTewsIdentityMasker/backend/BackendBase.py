@@ -1,10 +1,13 @@
 import multiprocessing
 import pickle
+import time
+import weakref
 from typing import List, Union, Tuple
 
 import numpy as np
 from xlib import mp as lib_mp
 from xlib import time as lib_time
+from xlib.image import ImageProcessor
 from xlib.mp import csw as lib_csw
 from xlib.python.EventListener import EventListener
 
@@ -48,6 +51,7 @@ class BackendConnectionData:
         self._weak_heap = None
         self._weak_heap_refs = {}
         self._weak_heap_image_infos = {}
+        self._preview_image_names = {}
 
         self._uid = uid
         self._is_frame_reemitted = None
@@ -61,6 +65,10 @@ class BackendConnectionData:
 
         self._face_swap_info_list = []
 
+        # list of (stage_name, dequeue_time, compute_end_time, enqueue_time), time.perf_counter() of every stage
+        self._trace = []
+        self._trace_dequeue_time = None
+
     def __getstate__(self, ):
         d = self.__dict__.copy()
         d['_weak_heap'] = None
@@ -112,6 +120,68 @@ class BackendConnectionData:
             return np.ndarray(shape, dtype=dtype, buffer=buffer)
         return None
 
+    def set_preview_image(self, key, image : np.ndarray, preview_size : int):
+        """
+        store downscaled uint8 copy of image fitting preview_size x preview_size,
+        so viewers don't need to read and scale the full image.
+        """
+        ip = ImageProcessor(image)
+        ip.fit_in(TW=preview_size, TH=preview_size)
+        preview_name = f'{key}_preview'
+        self.set_image(preview_name, np.ascontiguousarray(ip.to_uint8().get_image('HWC')))
+        self._preview_image_names[key] = preview_name
+
+    def get_preview_image(self, key) -> Union[np.ndarray, None]:
+        """
+        returns uint8 preview of image stored with set_preview_image or None
+        """
+        return self.get_image(self._preview_image_names.get(key, None))
+
+    def update_preview_images(self, preview_size : int):
+        """
+        store previews of frame, merged, face align and face swap images
+        which have no preview yet
+        """
+        keys = [self._frame_image_name, self._merged_image_name]
+        for fsi in self._face_swap_info_list:
+            keys += [fsi.face_align_image_name, fsi.face_swap_image_name]
+
+        for key in keys:
+            if key is not None and key not in self._preview_image_names:
+                image = self.get_image(key)
+                if image is not None:
+                    self.set_preview_image(key, image, preview_size)
+
+    def get_trace(self) -> List[Tuple[str, float, float, Union[float, None]]]:
+        """
+        returns list of (stage_name, dequeue_time, compute_end_time, enqueue_time)
+        of every stage passed by the data, in time.perf_counter() sec.
+
+        Source stage has dequeue_time of start of the frame.
+        enqueue_time is None if the data is not written yet.
+        """
+        return self._trace
+
+    def trace_dequeue(self, dequeue_time : float = None):
+        """mark the data is read by the stage"""
+        self._trace_dequeue_time = time.perf_counter() if dequeue_time is None else dequeue_time
+
+    def trace_compute(self, stage_name : str, compute_start_time : float, compute_end_time : float = None):
+        """
+        add record of the stage which processed the data
+        """
+        dequeue_time = self._trace_dequeue_time
+        if dequeue_time is None or dequeue_time < compute_start_time:
+            dequeue_time = compute_start_time
+        self._trace_dequeue_time = None
+        self._trace.append( (stage_name, dequeue_time, time.perf_counter() if compute_end_time is None else compute_end_time, None) )
+
+    def trace_enqueue(self, enqueue_time : float = None):
+        """mark the data is written by the last stage"""
+        if len(self._trace) != 0 and self._trace[-1][3] is None:
+            stage_name, dequeue_time, compute_end_time, _ = self._trace[-1]
+            self._trace[-1] = (stage_name, dequeue_time, compute_end_time, time.perf_counter() if enqueue_time is None else enqueue_time)
+
     def get_uid(self) -> int: return self._uid
 
     def get_is_frame_reemitted(self) -> Union[bool, None]: return self._is_frame_reemitted
@@ -139,16 +209,30 @@ class BackendConnectionData:
 
 
 class BackendConnection:
-    def __init__(self, multi_producer=False):
+    """
+        multi_producer(False)
+
+        preview_size(0)     if not 0, writer stores previews of images of BackendConnectionData
+                            fitting preview_size x preview_size, which are used by viewers
+    """
+    def __init__(self, multi_producer=False, preview_size=0):
         self._rd = lib_mp.MPSPSCMRRingData(table_size=8192, heap_size_mb=8, multi_producer=multi_producer)
+        self._preview_size = preview_size
+
+    def get_preview_size(self) -> int: return self._preview_size
 
     def write(self, bcd : BackendConnectionData):
+        if self._preview_size != 0 and bcd._weak_heap is not None:
+            bcd.update_preview_images(self._preview_size)
+        bcd.trace_enqueue()
         self._rd.write( pickle.dumps(bcd) )
 
     def read(self, timeout : float = 0) -> Union[BackendConnectionData, None]:
         b = self._rd.read(timeout=timeout)
         if b is not None:
-            return pickle.loads(b)
+            bcd = pickle.loads(b)
+            bcd.trace_dequeue()
+            return bcd
         return None
 
     def get_write_id(self) -> int:
@@ -172,6 +256,13 @@ class BackendConnection:
         """
         return self._rd.get_read_id() >= (self._rd.get_write_id() - buffer_size)
 
+    def skip_unread(self, keep : int = 0):
+        """
+        mark unread data as read except last keep ones,
+        call only while the receiver is not running
+        """
+        self._rd.skip_unread(keep)
+
 
 class BackendSignal:
     def __init__(self):
@@ -196,12 +287,25 @@ class BackendWorkerState(lib_csw.WorkerState):
     ...
 
 class BackendHost(lib_csw.Host):
+    """
+        bc_in(None)     BackendConnection the worker reads from.
+                        Writes to it are the demand to start the worker, see start_on_demand()
+
+    Several stages can read the same connection, for example face swappers reading the face aligner output.
+    While one of them is running, writes to the connection do not wake up the others, the running one consumes them,
+    and starting another one does not move the read position of the running one.
+    """
+    _hosts = weakref.WeakSet()
+
     def __init__(self, backend_db : BackendDB = None,
+                       bc_in : BackendConnection = None,
                        sheet_cls = None,
                        worker_cls = None,
                        worker_state_cls : BackendWorkerState = None,
                        worker_start_args = None,
                        worker_start_kwargs = None):
+        self._bc_in = bc_in
+        self._bc_in_write_id = bc_in.get_write_id() if bc_in is not None else 0
 
         super().__init__(db=backend_db,
                          sheet_cls = sheet_cls,
@@ -213,21 +317,54 @@ class BackendHost(lib_csw.Host):
         self._profile_timing_evl = EventListener()
         self.call_on_msg('_profile_timing', self._on_profile_timing_msg)
 
+        if bc_in is not None:
+            BackendHost._hosts.add(self)
+
     def _on_profile_timing_msg(self, timing : float):
         self._profile_timing_evl.call(timing)
 
     def call_on_profile_timing(self, func_or_list):
         self._profile_timing_evl.add(func_or_list)
 
+    def _has_demand(self) -> bool:
+        if self._bc_in is None:
+            # Source, works while enabled
+            return True
+        write_id = self._bc_in.get_write_id()
+        if write_id != self._bc_in_write_id:
+            self._bc_in_write_id = write_id
+            # Frames of the shared connection are consumed by the running stage
+            return not (self.is_stopped() and self._is_bc_in_read_by_other())
+        return False
+
+    def _is_bc_in_read_by_other(self) -> bool:
+        """returns True if other not stopped host reads the same connection"""
+        return any(host is not self and host._bc_in is self._bc_in and not host.is_stopped()
+                   for host in list(BackendHost._hosts))
+
+    def start(self):
+        if self.is_stopped() and self._bc_in is not None and not self._is_bc_in_read_by_other():
+            # Do not process the frames written while the worker was stopped, except the last one
+            self._bc_in.skip_unread(keep=1)
+        return super().start()
+
 class BackendWorker(lib_csw.Worker):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._profile_timing_measurer = lib_time.AverageMeasurer(samples=120)
+        self._profile_timing_start = None
 
     def start_profile_timing(self):
         self._profile_timing_measurer.start()
+        self._profile_timing_start = time.perf_counter()
 
-    def stop_profile_timing(self):
+    def stop_profile_timing(self, bcd : BackendConnectionData = None):
+        """
+            bcd(None)   add trace record of this stage to processed BackendConnectionData
+        """
+        if bcd is not None and self._profile_timing_start is not None:
+            bcd.trace_compute(self.__class__.__name__, self._profile_timing_start)
+        self._profile_timing_start = None
         self.send_msg('_profile_timing', self._profile_timing_measurer.stop() )
 
@@ -0,0 +1,154 @@
+import json
+import time
+from collections import deque
+from pathlib import Path
+from typing import Dict, List
+
+from xlib.time import LatencyHistogram
+
+from .BackendBase import BackendConnection, BackendConnectionData
+
+
+class BackendTracer:
+    """
+    Aggregates per-stage traces of BackendConnectionData read by the final consumer of the pipeline.
+
+    For every stage three latency histograms are collected
+
+        queue       waiting in the input connection, from enqueue by previous stage to dequeue
+
+        compute     from dequeue to end of processing
+
+        output      waiting for the next stage to read the previous data (backpressure)
+
+    and end_to_end histogram from start of the frame in the source to add().
+
+    Traces of a recording window can be saved as Chrome trace JSON (chrome://tracing, Perfetto).
+
+        max_recorded_frames(10000)  older frames of the recording window are discarded
+    """
+
+    def __init__(self, max_recorded_frames : int = 10000):
+        self._recording = False
+        self._recorded = deque(maxlen=max_recorded_frames)
+        self._side_read_id = None
+        self.reset()
+
+    def reset(self):
+        """reset histograms"""
+        self._stage_names : List[str] = []
+        self._histograms : Dict[str, Dict[str, LatencyHistogram]] = {}
+        self._end_to_end = LatencyHistogram()
+
+    def start_recording(self):
+        """start recording window of frame traces for save_chrome_trace"""
+        self._recorded.clear()
+        self._recording = True
+
+    def stop_recording(self):
+        self._recording = False
+
+    def is_recording(self) -> bool: return self._recording
+
+    def add(self, bcd : BackendConnectionData, consume_time : float = None):
+        """
+        add trace of data read by the consumer
+
+            consume_time(None)  time.perf_counter() of the consumption, None - now
+        """
+        trace = bcd.get_trace()
+        if len(trace) == 0:
+            return
+        if consume_time is None:
+            consume_time = time.perf_counter()
+
+        prev_enqueue_time = None
+        for stage_name, dequeue_time, compute_end_time, enqueue_time in trace:
+            histograms = self._histograms.get(stage_name, None)
+            if histograms is None:
+                histograms = self._histograms[stage_name] = {'queue' : LatencyHistogram(), 'compute' : LatencyHistogram(), 'output' : LatencyHistogram()}
+                self._stage_names.append(stage_name)
+
+            if prev_enqueue_time is not None:
+                histograms['queue'].record(dequeue_time - prev_enqueue_time)
+            histograms['compute'].record(compute_end_time - dequeue_time)
+            if enqueue_time is not None:
+                histograms['output'].record(enqueue_time - compute_end_time)
+            prev_enqueue_time = enqueue_time
+
+        self._end_to_end.record(consume_time - trace[0][1])
+
+        if self._recording:
+            self._recorded.append( (bcd.get_uid(), bcd.get_frame_num(), list(trace), consume_time) )
+
+    def add_written(self, bc : BackendConnection, max_count : int = 64):
+        """
+        add traces of data written to bc since the last call.
+
+        Data is read as a side reader, like viewers do, thus the consumer of bc is not affected.
+        Consumption time is the time of the call, so call it often.
+
+            max_count(64)   if more data is written since the last call, only last max_count are added
+        """
+        write_id = bc.get_write_id()
+        read_id = self._side_read_id
+        if read_id is None or read_id > write_id:
+            # first call or new connection, start from the next data
+            read_id = write_id
+        read_id = max(read_id, write_id - max_count)
+
+        for id in range(read_id+1, write_id+1):
+            bcd = bc.get_by_id(id)
+            if bcd is not None:
+                self.add(bcd)
+        self._side_read_id = write_id
+
+    def get_stats(self) -> Dict[str, Dict]:
+        """
+        returns dict
+
+            {'stages' : { stage_name : {'queue' : summary, 'compute' : summary, 'output' : summary} },
+             'end_to_end' : summary }
+
+        where summary is LatencyHistogram.get_summary(), in pipeline order of stages
+        """
+        return {'stages' : { stage_name : { key : hist.get_summary() for key, hist in self._histograms[stage_name].items() }
+                             for stage_name in self._stage_names },
+                'end_to_end' : self._end_to_end.get_summary() }
+
+    def get_chrome_trace(self) -> Dict:
+        """
+        returns Chrome trace event format dict of the recording window.
+        Compute and input queue of every stage are threads, spans of frames are complete events.
+        """
+        events = []
+        tids = {}
+        time_origin = min( (trace[0][1] for _, _, trace, _ in self._recorded), default=0.0)
+
+        def us(t):
+            return (t - time_origin) * 1e6
+
+        def get_tid(thread_name):
+            tid = tids.get(thread_name, None)
+            if tid is None:
+                tid = tids[thread_name] = len(tids)
+                events.append( {'name' : 'thread_name', 'ph' : 'M', 'pid' : 0, 'tid' : tid, 'args' : {'name' : thread_name}} )
+            return tid
+
+        for uid, frame_num, trace, consume_time in self._recorded:
+            args = {'uid' : uid, 'frame_num' : frame_num}
+            prev_enqueue_time = None
+            for stage_name, dequeue_time, compute_end_time, enqueue_time in trace:
+                # queue of the stage overlaps with compute of previous frame, so it has own thread
+                if prev_enqueue_time is not None:
+                    events.append( {'name' : f'frame {frame_num}', 'cat' : 'queue', 'ph' : 'X', 'pid' : 0, 'tid' : get_tid(f'{stage_name} queue'),
+                                    'ts' : us(prev_enqueue_time), 'dur' : max(0.0, us(dequeue_time)-us(prev_enqueue_time)), 'args' : args} )
+                events.append( {'name' : f'frame {frame_num}', 'cat' : 'compute', 'ph' : 'X', 'pid' : 0, 'tid' : get_tid(stage_name),
+                                'ts' : us(dequeue_time), 'dur' : max(0.0, us(compute_end_time)-us(dequeue_time)), 'args' : args} )
+                prev_enqueue_time = enqueue_time
+
+        return {'traceEvents' : events, 'displayTimeUnit' : 'ms'}
+
+    def save_chrome_trace(self, filepath):
+        """save recording window as Chrome trace JSON"""
+        Path(filepath).write_text( json.dumps(self.get_chrome_trace()) )
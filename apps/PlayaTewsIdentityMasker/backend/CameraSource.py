@@ -275,7 +275,7 @@ class CameraSourceWorker(BackendWorker):
                     bcd.set_frame_num(bcd_uid)
                     bcd.set_frame_timestamp(timestamp)
                     bcd.set_image(frame_name, img)
-                    self.stop_profile_timing()
+                    self.stop_profile_timing(bcd)
                     self.pending_bcd = bcd
 
         if self.pending_bcd is not None:
@@ -14,7 +14,7 @@ from xlib import os as lib_os
 from xlib import time as lib_time
 from xlib.image import ImageProcessor
 from xlib.mp import csw as lib_csw
-from xlib.streamer import FFMPEGStreamer
+from xlib.streamer import FFMPEGFanoutStreamer
 
 from .BackendBase import (BackendConnection, BackendDB, BackendHost,
                           BackendSignal, BackendWeakHeap, BackendWorker,
@@ -105,6 +105,7 @@ class EnhancedStreamOutput(BackendHost):
                        backend_db : BackendDB = None):
 
         super().__init__(backend_db=backend_db,
+                         bc_in=bc_in,
                          sheet_cls=Sheet,
                          worker_cls=EnhancedStreamOutputWorker,
                          worker_state_cls=WorkerState,
@@ -134,8 +135,10 @@ class EnhancedStreamOutputWorker(BackendWorker):
         self._wnd_showing = False
 
         # Enhanced streaming components
-        self._streamers = {}  # Multiple streamers for different platforms
-        self._recorder = None
+        # Frames are encoded once and sent to every platform and the recording
+        self._fanout = FFMPEGFanoutStreamer()
+        self._streamers = {}  # platform -> output name of the fanout streamer
+        self._recorder = None # output name of the recording
         self._scenes = {}
         self._current_scene = None
         self._sources = {}
@@ -272,6 +275,7 @@ class EnhancedStreamOutputWorker(BackendWorker):
         """Stop all streaming and recording"""
         self.stop_all_streaming()
         self.stop_recording()
+        self._fanout.stop()
         
         # Release all sources
         for source in self._sources.values():
@@ -304,19 +308,18 @@ class EnhancedStreamOutputWorker(BackendWorker):
                 return False
             rtmp_url = platform_config['rtmp_base'] + stream_key
             
-        # Create streamer for this platform
-        streamer = FFMPEGStreamer()
-        if streamer.start(rtmp_url):
-            self._streamers[platform] = streamer
-            platform_config['enabled'] = True
-            return True
-        return False
+        # Add output of the shared encoder for this platform
+        output_name = platform_config['name']
+        self._start_encoder_session(platform_config)
+        self._fanout.add_output(output_name, rtmp_url)
+        self._streamers[platform] = output_name
+        platform_config['enabled'] = True
+        return True
 
     def stop_streaming(self, platform: StreamingPlatform):
         """Stop streaming to a specific platform"""
         if platform in self._streamers:
-            self._streamers[platform].stop()
-            del self._streamers[platform]
+            self._fanout.remove_output(self._streamers.pop(platform))
             self.streaming_platforms[platform]['enabled'] = False
 
     def stop_all_streaming(self):
@@ -352,20 +355,40 @@ class EnhancedStreamOutputWorker(BackendWorker):
         extension = format_extensions.get(self.recording_settings['format'], '.mp4')
         filepath = recording_path / f"{filename}{extension}"
         
-        # Start recording
-        self._recorder = FFMPEGStreamer()
-        if self._recorder.start(str(filepath)):
-            self.recording_settings['enabled'] = True
-            return True
-        return False
+        # Start recording as output of the shared encoder
+        self._recorder = 'Recording'
+        self._start_encoder_session(self.recording_settings)
+        self._fanout.add_output(self._recorder, filepath)
+        self.recording_settings['enabled'] = True
+        return True
 
     def stop_recording(self):
         """Stop recording"""
         if self._recorder:
-            self._recorder.stop()
+            self._fanout.remove_output(self._recorder)
             self._recorder = None
             self.recording_settings['enabled'] = False
 
+    def _start_encoder_session(self, config):
+        """
+        Encoder is shared by all outputs, its settings are taken from the first output
+        and kept while any output is active, so adding or removing outputs does not restart it
+        """
+        if not self._fanout.has_outputs():
+            self._fanout.set_encoder_params(fps=config['fps'], bitrate=config['bitrate'])
+
+    def update_encoder_params(self):
+        """
+        Restart the shared encoder with the highest fps and bitrate of active outputs.
+        Streams continue from the next keyframe, the recording continues in a new segment file.
+        """
+        configs = [ self.streaming_platforms[platform] for platform in self._streamers ]
+        if self._recorder:
+            configs.append(self.recording_settings)
+        if len(configs) != 0:
+            self._fanout.set_encoder_params(fps=max(config['fps'] for config in configs),
+                                            bitrate=max(config['bitrate'] for config in configs))
+
     def add_scene(self, name: str):
         """Add a new scene"""
         if name not in self._scenes:
@@ -591,14 +614,9 @@ class EnhancedStreamOutputWorker(BackendWorker):
                             cv2.imshow(self._wnd_name, delayed_frame)
                             cv2.waitKey(1)
                         
-                        # Stream to all active platforms
-                        for platform, streamer in self._streamers.items():
-                            if streamer.is_running():
-                                streamer.write_frame(delayed_frame)
-                        
-                        # Record if enabled
-                        if self._recorder and self._recorder.is_running():
-                            self._recorder.write_frame(delayed_frame)
+                        # Encode once for all active platforms and the recording
+                        if self._fanout.has_outputs():
+                            self._fanout.write_frame(ImageProcessor(delayed_frame).ch(3).to_uint8().get_image('HWC'))
                         
                         # Save sequence if path is set
                         if state.sequence_path is not None:
@@ -25,6 +25,7 @@ AlignModeNames = ['@FaceAligner.AlignMode.FROM_RECT',
 class FaceAligner(BackendHost):
     def __init__(self, weak_heap :  BackendWeakHeap, reemit_frame_signal : BackendSignal, bc_in : BackendConnection, bc_out : BackendConnection, backend_db : BackendDB = None):
         super().__init__(backend_db=backend_db,
+                         bc_in=bc_in,
                          sheet_cls=Sheet,
                          worker_cls=FaceAlignerWorker,
                          worker_state_cls=WorkerState,
@@ -192,7 +193,7 @@ class FaceAlignerWorker(BackendWorker):
                             fsi.face_align_lmrks_mask_name = f'{frame_image_name}_{face_id}_aligned_lmrks_mask'
                             bcd.set_image(fsi.face_align_lmrks_mask_name, face_align_lmrks_mask_img)
 
-                self.stop_profile_timing()
+                self.stop_profile_timing(bcd)
                 self.pending_bcd = bcd
 
         if self.pending_bcd is not None:
@@ -19,6 +19,7 @@ class FaceAnimator(BackendHost):
                   id : int = 0):
         self._id = id
         super().__init__(backend_db=backend_db,
+                         bc_in=bc_in,
                          sheet_cls=Sheet,
                          worker_cls=FaceAnimatorWorker,
                          worker_state_cls=WorkerState,
@@ -162,7 +163,7 @@ class FaceAnimatorWorker(BackendWorker):
                                 bcd.set_image(fsi.face_swap_image_name, anim_image)
                             break
 
-                self.stop_profile_timing()
+                self.stop_profile_timing(bcd)
                 self.pending_bcd = bcd
 
         if self.pending_bcd is not None:
@@ -42,6 +42,7 @@ class FaceDetector(BackendHost):
         self._weak_heap = weak_heap
         self._bc_out = bc_out
         super().__init__(backend_db=backend_db,
+                         bc_in=bc_in,
                          sheet_cls=Sheet,
                          worker_cls=FaceDetectorWorker,
                          worker_state_cls=WorkerState,
@@ -274,7 +275,7 @@ class FaceDetectorWorker(BackendWorker):
                                     fsi.face_urect = face_urect
                                     bcd.add_face_swap_info(fsi)
 
-                    self.stop_profile_timing()
+                    self.stop_profile_timing(bcd)
                     self.pending_bcd = bcd
 
 
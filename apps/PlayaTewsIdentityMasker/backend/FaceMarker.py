@@ -24,6 +24,7 @@ class FaceMarker(BackendHost):
     def __init__(self, weak_heap : BackendWeakHeap, reemit_frame_signal : BackendSignal, bc_in : BackendConnection, bc_out : BackendConnection, backend_db : BackendDB = None):
 
         super().__init__(backend_db=backend_db,
+                         bc_in=bc_in,
                          sheet_cls=Sheet,
                          worker_cls=FaceMarkerWorker,
                          worker_state_cls=WorkerState,
@@ -211,7 +212,7 @@ class FaceMarkerWorker(BackendWorker):
                                 face_ulmrks = face_ulmrks.transform(face_uni_mat, invert=True)
                                 fsi.face_ulmrks = face_ulmrks
 
-                    self.stop_profile_timing()
+                    self.stop_profile_timing(bcd)
                 self.pending_bcd = bcd
 
         if self.pending_bcd is not None:
@@ -1,24 +1,26 @@
 import time
 
 import cv2
-import numexpr as ne
 import numpy as np
 from xlib import avecl as lib_cl
 from xlib import os as lib_os
 from xlib.image import ImageProcessor
 from xlib.image import color_transfer as lib_ct
 from xlib.mp import csw as lib_csw
-from xlib.python import all_is_not_None
+from xlib.python import all_is_not_None, lazy_import
 
 from .BackendBase import (BackendConnection, BackendDB, BackendHost,
                           BackendSignal, BackendWeakHeap, BackendWorker,
                           BackendWorkerState)
 
+ne = lazy_import('numexpr')
+
 
 class FaceMerger(BackendHost):
 
     def __init__(self, weak_heap : BackendWeakHeap, reemit_frame_signal : BackendSignal, bc_in : BackendConnection, bc_out  : BackendConnection, backend_db : BackendDB = None):
         super().__init__(backend_db=backend_db,
+                         bc_in=bc_in,
                          sheet_cls=Sheet,
                          worker_cls=FaceMergerWorker,
                          worker_state_cls=WorkerState,
@@ -363,7 +365,7 @@ class FaceMergerWorker(BackendWorker):
                         bcd.set_merged_image_name(merged_image_name)
                         bcd.set_image(merged_image_name, merged_frame)
 
-                self.stop_profile_timing()
+                self.stop_profile_timing(bcd)
                 self.pending_bcd = bcd
 
         if self.pending_bcd is not None:
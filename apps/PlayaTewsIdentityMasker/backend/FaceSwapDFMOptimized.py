@@ -20,6 +20,7 @@ class FaceSwapDFMOptimized(BackendHost):
                   id : int = 0):
         self._id = id
         super().__init__(backend_db=backend_db,
+                         bc_in=bc_in,
                          sheet_cls=Sheet,
                          worker_cls=FaceSwapDFMOptimizedWorker,
                          worker_state_cls=WorkerState,
@@ -495,7 +496,7 @@ class FaceSwapDFMOptimizedWorker(BackendWorker):
                         self.update_fps_counter()
                         self.last_processed_frame_time = time.time()
 
-                self.stop_profile_timing()
+                self.stop_profile_timing(bcd)
                 self.pending_bcd = bcd
 
         if self.pending_bcd is not None:
@@ -20,6 +20,7 @@ class FaceSwapInsight(BackendHost):
                   id : int = 0):
         self._id = id
         super().__init__(backend_db=backend_db,
+                         bc_in=bc_in,
                          sheet_cls=Sheet,
                          worker_cls=FaceSwapInsightWorker,
                          worker_state_cls=WorkerState,
@@ -225,7 +226,7 @@ class FaceSwapInsightWorker(BackendWorker):
 
                             break
 
-                self.stop_profile_timing()
+                self.stop_profile_timing(bcd)
                 self.pending_bcd = bcd
 
         if self.pending_bcd is not None:
@@ -292,7 +292,7 @@ class FileSourceWorker(BackendWorker):
                     image = ImageProcessor(p_frame.image).to_uint8().get_image('HWC')
                     bcd.set_image(p_frame.name, image)
 
-                    self.stop_profile_timing()
+                    self.stop_profile_timing(bcd)
                     self.pending_bcd = bcd
 
         if self.pending_bcd is not None:
@@ -300,7 +300,10 @@ class FileSourceWorker(BackendWorker):
                 self.bc_out.write(self.pending_bcd)
                 self.pending_bcd = None
 
-        time.sleep(0.001)
+        # Non-realtime playback produces the next frame as soon as the previous one is sent
+        if self.fp is None or not self.fp.is_playing() or \
+           self.get_state().fp_state.is_realtime or self.pending_bcd is not None:
+            time.sleep(0.001)
 
     def on_stop(self):
         self.set_fp(None)
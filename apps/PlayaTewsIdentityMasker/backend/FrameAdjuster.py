@@ -14,6 +14,7 @@ class FrameAdjuster(BackendHost):
 
     def __init__(self, weak_heap : BackendWeakHeap, reemit_frame_signal : BackendSignal, bc_in : BackendConnection, bc_out  : BackendConnection, backend_db : BackendDB = None):
         super().__init__(backend_db=backend_db,
+                         bc_in=bc_in,
                          sheet_cls=Sheet,
                          worker_cls=FrameAdjusterWorker,
                          worker_state_cls=WorkerState,
@@ -83,7 +84,7 @@ class FrameAdjusterWorker(BackendWorker):
                     frame_image = frame_image_ip.get_image('HWC')
                     bcd.set_image(frame_image_name, frame_image)
 
-                self.stop_profile_timing()
+                self.stop_profile_timing(bcd)
                 self.pending_bcd = bcd
 
         if self.pending_bcd is not None:
@@ -24,6 +24,7 @@ class MemoryOptimizedFaceSwap(BackendHost):
                   id : int = 0):
         self._id = id
         super().__init__(backend_db=backend_db,
+                         bc_in=bc_in,
                          sheet_cls=Sheet,
                          worker_cls=MemoryOptimizedFaceSwapWorker,
                          worker_state_cls=WorkerState,
@@ -695,7 +696,7 @@ class MemoryOptimizedFaceSwapWorker(BackendWorker):
                             bcd.set_image(fsi.face_swap_image_name, celeb_face)
                             bcd.set_image(fsi.face_swap_mask_name, celeb_face_mask_img)
 
-                self.stop_profile_timing()
+                self.stop_profile_timing(bcd)
                 self.pending_bcd = bcd
 
         if self.pending_bcd is not None:
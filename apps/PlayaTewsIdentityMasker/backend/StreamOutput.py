@@ -30,6 +30,7 @@ class StreamOutput(BackendHost):
                        backend_db : BackendDB = None):
 
         super().__init__(backend_db=backend_db,
+                         bc_in=bc_in,
                          sheet_cls=Sheet,
                          worker_cls=StreamOutputWorker,
                          worker_state_cls=WorkerState,
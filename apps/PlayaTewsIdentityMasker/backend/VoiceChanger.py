@@ -1,7 +1,6 @@
 import numpy as np
 import pyaudio
 import threading
-import queue
 import time
 from enum import IntEnum
 from typing import Optional, Dict, Any
@@ -13,6 +12,7 @@ import webrtcvad
 import collections
 import logging
 
+from xlib import audio as lib_audio
 from xlib.mp import csw as lib_csw
 from .BackendBase import (BackendConnection, BackendDB, BackendHost,
                           BackendSignal, BackendWeakHeap, BackendWorker,
@@ -67,9 +67,11 @@ class VoiceChangerWorker(BackendWorker):
         self.weak_heap = weak_heap
         self.logger = logging.getLogger(__name__)
         
-        # Audio settings with better compatibility
+        # Audio settings
         self.sample_rate = 44100
-        self.chunk_size = 2048  # Increased for better stability
+        self.buffer_size = 256      # Frames per device callback
+        self.chunk_size = 1024      # Frames per effect chain block
+        self.latency_target = 0.05  # Seconds of processed audio queued for playback
         self.channels = 1
         self.format = pyaudio.paFloat32
         
@@ -83,16 +85,26 @@ class VoiceChangerWorker(BackendWorker):
         self.input_stream = None
         self.output_stream = None
         
-        # Audio buffers
-        self.input_queue = queue.Queue(maxsize=50)  # Reduced for lower latency
-        self.output_queue = queue.Queue(maxsize=50)
-        
-        # Processing threads
-        self.input_thread = None
-        self.output_thread = None
+        # Ring buffers: capture callback -> effect chain -> playback callback
+        self.playback_latency_frames = max(int(self.sample_rate*self.latency_target), self.chunk_size + self.buffer_size)
+        self.capture_ring = lib_audio.AudioRingBuffer(self.chunk_size*8)
+        self.playback_ring = lib_audio.AudioRingBuffer(self.playback_latency_frames + self.chunk_size*4)
+        self._capture_event = threading.Event()
+        self._chunk_buf = np.zeros( (self.chunk_size,), np.float32)
+        self._playback_buf = np.zeros( (self.buffer_size*4,), np.float32)
+        self._playback_primed = False
+
+        # Realtime counters
+        self.overrun_count = 0     # Capture blocks lost or playback audio dropped to keep latency
+        self.underrun_count = 0    # Playback callbacks without enough processed audio
+
+        # Effect chain thread
         self.processing_thread = None
         self.running = False
         
+        # Streaming pitch/formant shifters keep overlap-add state between chunks, per effect
+        self._shifters = {}
+
         # Voice Activity Detection
         try:
             self.vad = webrtcvad.Vad(2)  # Aggressiveness level 2
@@ -233,36 +245,21 @@ class VoiceChangerWorker(BackendWorker):
 
     def on_stop(self):
         """Stop all audio processing"""
-        self.running = False
-        
-        if self.input_thread and self.input_thread.is_alive():
-            self.input_thread.join(timeout=1.0)
-        
-        if self.output_thread and self.output_thread.is_alive():
-            self.output_thread.join(timeout=1.0)
-        
-        if self.processing_thread and self.processing_thread.is_alive():
-            self.processing_thread.join(timeout=1.0)
-        
-        if self.input_stream:
-            try:
-                self.input_stream.stop_stream()
-                self.input_stream.close()
-            except Exception as e:
-                self.logger.warning(f"Error stopping input stream: {e}")
-        
-        if self.output_stream:
-            try:
-                self.output_stream.stop_stream()
-                self.output_stream.close()
-            except Exception as e:
-                self.logger.warning(f"Error stopping output stream: {e}")
-        
+        self.stop_audio_processing()
+
         if self.audio:
             try:
                 self.audio.terminate()
             except Exception as e:
                 self.logger.warning(f"Error terminating PyAudio: {e}")
+            self.audio = None
+
+    def get_audio_stats(self) -> Dict[str, Any]:
+        """returns realtime counters and current buffered latency"""
+        return {'overrun_count' : self.overrun_count,
+                'underrun_count' : self.underrun_count,
+                'capture_latency' : self.capture_ring.get_read_available() / self.sample_rate,
+                'playback_latency' : self.playback_ring.get_read_available() / self.sample_rate, }
 
     def start_audio_processing(self):
         """Start audio processing with error handling"""
@@ -284,98 +281,133 @@ class VoiceChangerWorker(BackendWorker):
             if input_device is None or output_device is None:
                 self.logger.error("No input or output device selected")
                 return
-            
-            # Start input stream
+
+            self.capture_ring.skip(self.capture_ring.get_read_available())
+            self.playback_ring.skip(self.playback_ring.get_read_available())
+            self._playback_primed = False
+            self._shifters.clear()
+            self.overrun_count = 0
+            self.underrun_count = 0
+            self.running = True
+
+            # Effect chain runs in own thread, woken by capture callback
+            self.processing_thread = threading.Thread(target=self._processing_worker, daemon=True)
+            self.processing_thread.start()
+
+            # Device streams in callback mode, callbacks only copy to/from ring buffers
             self.input_stream = self.audio.open(
                 format=self.format,
                 channels=self.channels,
                 rate=self.sample_rate,
                 input=True,
                 input_device_index=input_device,
-                frames_per_buffer=self.chunk_size,
-                stream_callback=None
+                frames_per_buffer=self.buffer_size,
+                stream_callback=self._input_callback
             )
             
-            # Start output stream
             self.output_stream = self.audio.open(
                 format=self.format,
                 channels=self.channels,
                 rate=self.sample_rate,
                 output=True,
                 output_device_index=output_device,
-                frames_per_buffer=self.chunk_size,
-                stream_callback=None
+                frames_per_buffer=self.buffer_size,
+                stream_callback=self._output_callback
             )
             
-            self.running = True
-            
-            # Start processing threads
-            self.input_thread = threading.Thread(target=self._input_worker, daemon=True)
-            self.output_thread = threading.Thread(target=self._output_worker, daemon=True)
-            self.processing_thread = threading.Thread(target=self._processing_worker, daemon=True)
-            
-            self.input_thread.start()
-            self.output_thread.start()
-            self.processing_thread.start()
-            
-            self.logger.info("Audio processing started successfully")
+            self.logger.info(f"Audio processing started, playback latency target {self.playback_latency_frames / self.sample_rate*1000:.0f}ms")
             
         except Exception as e:
             self.logger.error(f"Failed to start audio processing: {e}")
-            self.running = False
+            self.stop_audio_processing()
 
     def stop_audio_processing(self):
         """Stop audio processing"""
+        was_running = self.running
         self.running = False
-        self.on_stop()
+        self._capture_event.set()
+
+        for stream in [self.input_stream, self.output_stream]:
+            if stream is not None:
+                try:
+                    stream.stop_stream()
+                    stream.close()
+                except Exception as e:
+                    self.logger.warning(f"Error stopping audio stream: {e}")
+        self.input_stream = None
+        self.output_stream = None
 
-    def _input_worker(self):
-        """Input audio worker thread"""
-        while self.running and self.input_stream:
-            try:
-                data = self.input_stream.read(self.chunk_size, exception_on_overflow=False)
-                audio_data = np.frombuffer(data, dtype=np.float32)
-                
-                if not self.input_queue.full():
-                    self.input_queue.put(audio_data)
-                    
-            except Exception as e:
-                self.logger.warning(f"Input worker error: {e}")
-                time.sleep(0.01)
+        if self.processing_thread is not None and self.processing_thread.is_alive():
+            self.processing_thread.join(timeout=1.0)
+        self.processing_thread = None
+
+        if was_running:
+            self.logger.info(f"Audio processing stopped, overruns: {self.overrun_count}, underruns: {self.underrun_count}")
+
+    def _input_callback(self, in_data, frame_count, time_info, status):
+        """Capture device callback: copy samples to capture ring"""
+        if status & pyaudio.paInputOverflow:
+            self.overrun_count += 1
+
+        audio_data = np.frombuffer(in_data, dtype=np.float32)
+        if self.capture_ring.write(audio_data) != audio_data.shape[0]:
+            # Effect chain does not keep up
+            self.overrun_count += 1
+
+        self._capture_event.set()
+        return (None, pyaudio.paContinue)
+
+    def _output_callback(self, in_data, frame_count, time_info, status):
+        """Playback device callback: copy processed samples from playback ring"""
+        playback_ring = self.playback_ring
+        if frame_count > self._playback_buf.shape[0]:
+            self._playback_buf = np.zeros( (frame_count,), np.float32)
+        out = self._playback_buf[:frame_count]
+
+        available = playback_ring.get_read_available()
+        if not self._playback_primed:
+            # Start playback only when latency target is buffered, so small jitter does not cause underruns
+            if available < self.playback_latency_frames:
+                out.fill(0)
+                return (out.tobytes(), pyaudio.paContinue)
+            self._playback_primed = True
+
+        excess = available - self.playback_latency_frames - self.chunk_size
+        if excess > 0:
+            # Clock drift between devices, drop oldest audio to keep latency bounded
+            playback_ring.skip(excess)
+            self.overrun_count += 1
+
+        n = playback_ring.read(out)
+        if n != frame_count:
+            out[n:] = 0
+            self.underrun_count += 1
+            self._playback_primed = False
+
+        return (out.tobytes(), pyaudio.paContinue)
 
     def _processing_worker(self):
-        """Audio processing worker thread"""
+        """Effect chain thread: processes capture ring by chunk_size blocks"""
+        chunk_buf = self._chunk_buf
+        chunk_size = self.chunk_size
         while self.running:
-            try:
-                if not self.input_queue.empty():
-                    audio_data = self.input_queue.get()
-                    
-                    # Apply effects
-                    processed_audio = self._apply_effects(audio_data)
-                    
-                    if not self.output_queue.full():
-                        self.output_queue.put(processed_audio)
-                else:
-                    time.sleep(0.001)  # Small delay to prevent busy waiting
-                    
-            except Exception as e:
-                self.logger.warning(f"Processing worker error: {e}")
-                time.sleep(0.01)
+            self._capture_event.wait(timeout=0.1)
+            self._capture_event.clear()
 
-    def _output_worker(self):
-        """Output audio worker thread"""
-        while self.running and self.output_stream:
-            try:
-                if not self.output_queue.empty():
-                    audio_data = self.output_queue.get()
-                    output_data = audio_data.astype(np.float32).tobytes()
-                    self.output_stream.write(output_data)
-                else:
-                    time.sleep(0.001)  # Small delay to prevent busy waiting
-                    
-            except Exception as e:
-                self.logger.warning(f"Output worker error: {e}")
-                time.sleep(0.01)
+            while self.running and self.capture_ring.get_read_available() >= chunk_size:
+                try:
+                    self.capture_ring.read(chunk_buf)
+                    processed_audio = self._apply_effects(chunk_buf)
+
+                    if processed_audio.shape[0] != chunk_size:
+                        # Keep stream length constant if an effect changed block length
+                        processed_audio = np.pad(processed_audio[:chunk_size], (0, max(0, chunk_size - processed_audio.shape[0])))
+                    processed_audio = processed_audio.astype(np.float32, copy=False)
+
+                    if self.playback_ring.write(processed_audio) != chunk_size:
+                        self.overrun_count += 1
+                except Exception as e:
+                    self.logger.warning(f"Processing worker error: {e}")
 
     def _apply_effects(self, audio_data: np.ndarray) -> np.ndarray:
         """Apply selected effects to audio data"""
@@ -422,20 +454,25 @@ class VoiceChangerWorker(BackendWorker):
             self.logger.warning(f"Effect application error: {e}")
             return audio_data
 
+    def _get_shifter(self, effect_type : VoiceEffectType, pitch_shift : float = 0.0, formant_shift : float = 1.0, band_gains=None) -> lib_audio.StreamingVoiceShifter:
+        """returns streaming shifter of the effect with updated parameters"""
+        shifter = self._shifters.get(effect_type, None)
+        if shifter is None:
+            shifter = self._shifters[effect_type] = lib_audio.StreamingVoiceShifter(self.sample_rate, frame_size=1024, oversampling=4)
+            shifter.set_band_gains(band_gains)
+        shifter.set_pitch_shift(pitch_shift)
+        shifter.set_formant_shift(formant_shift)
+        return shifter
+
     def _pitch_shift(self, audio_data: np.ndarray) -> np.ndarray:
         """Pitch shift effect"""
         try:
             pitch_shift = self.effect_params['pitch_shift']
             if abs(pitch_shift) < 0.1:
-                return audio_data
-            
-            # Use librosa for pitch shifting
-            y_shifted = librosa.effects.pitch_shift(
-                audio_data, 
-                sr=self.sample_rate, 
-                n_steps=pitch_shift
-            )
-            return y_shifted
+                pitch_shift = 0.0
+
+            # Pass through the shifter even if neutral to keep constant latency
+            return self._get_shifter(VoiceEffectType.PITCH_SHIFT, pitch_shift=pitch_shift).process(audio_data)
         except Exception as e:
             self.logger.warning(f"Pitch shift error: {e}")
             return audio_data
@@ -445,21 +482,9 @@ class VoiceChangerWorker(BackendWorker):
         try:
             formant_shift = self.effect_params['formant_shift']
             if abs(formant_shift - 1.0) < 0.1:
-                return audio_data
-            
-            # Simple formant shifting using spectral envelope manipulation
-            stft = librosa.stft(audio_data, n_fft=2048)
-            magnitude = np.abs(stft)
-            phase = np.angle(stft)
-            
-            # Shift formants by scaling frequency bins
-            freq_bins = np.arange(magnitude.shape[0])
-            shifted_bins = np.clip(freq_bins * formant_shift, 0, magnitude.shape[0] - 1).astype(int)
-            
-            shifted_magnitude = magnitude[shifted_bins]
-            shifted_stft = shifted_magnitude * np.exp(1j * phase)
-            
-            return librosa.istft(shifted_stft)
+                formant_shift = 1.0
+
+            return self._get_shifter(VoiceEffectType.FORMANT_SHIFT, formant_shift=formant_shift).process(audio_data)
         except Exception as e:
             self.logger.warning(f"Formant shift error: {e}")
             return audio_data
@@ -488,22 +513,8 @@ class VoiceChangerWorker(BackendWorker):
     def _helium_effect(self, audio_data: np.ndarray) -> np.ndarray:
         """Helium voice effect (high pitch + formant shift)"""
         try:
-            # High pitch shift
-            y_shifted = librosa.effects.pitch_shift(audio_data, sr=self.sample_rate, n_steps=8)
-            
-            # Formant shift to higher frequencies
-            stft = librosa.stft(y_shifted, n_fft=2048)
-            magnitude = np.abs(stft)
-            phase = np.angle(stft)
-            
-            # Shift formants up
-            freq_bins = np.arange(magnitude.shape[0])
-            shifted_bins = np.clip(freq_bins * 1.8, 0, magnitude.shape[0] - 1).astype(int)
-            
-            shifted_magnitude = magnitude[shifted_bins]
-            shifted_stft = shifted_magnitude * np.exp(1j * phase)
-            
-            return librosa.istft(shifted_stft)
+            # High pitch shift with formants shifted up
+            return self._get_shifter(VoiceEffectType.HELIUM, pitch_shift=8, formant_shift=1.8).process(audio_data)
         except Exception as e:
             self.logger.warning(f"Helium effect error: {e}")
             return audio_data
@@ -511,22 +522,8 @@ class VoiceChangerWorker(BackendWorker):
     def _deep_effect(self, audio_data: np.ndarray) -> np.ndarray:
         """Deep voice effect (low pitch + formant shift)"""
         try:
-            # Low pitch shift
-            y_shifted = librosa.effects.pitch_shift(audio_data, sr=self.sample_rate, n_steps=-6)
-            
-            # Formant shift to lower frequencies
-            stft = librosa.stft(y_shifted, n_fft=2048)
-            magnitude = np.abs(stft)
-            phase = np.angle(stft)
-            
-            # Shift formants down
-            freq_bins = np.arange(magnitude.shape[0])
-            shifted_bins = np.clip(freq_bins * 0.6, 0, magnitude.shape[0] - 1).astype(int)
-            
-            shifted_magnitude = magnitude[shifted_bins]
-            shifted_stft = shifted_magnitude * np.exp(1j * phase)
-            
-            return librosa.istft(shifted_stft)
+            # Low pitch shift with formants shifted down
+            return self._get_shifter(VoiceEffectType.DEEP, pitch_shift=-6, formant_shift=0.6).process(audio_data)
         except Exception as e:
             self.logger.warning(f"Deep effect error: {e}")
             return audio_data
@@ -631,21 +628,8 @@ class VoiceChangerWorker(BackendWorker):
     def _male_voice_effect(self, audio_data: np.ndarray) -> np.ndarray:
         """Realistic male voice transformation"""
         try:
-            # Lower pitch
-            y_shifted = librosa.effects.pitch_shift(audio_data, sr=self.sample_rate, n_steps=-3)
-            
-            # Lower formants
-            stft = librosa.stft(y_shifted, n_fft=2048)
-            magnitude = np.abs(stft)
-            phase = np.angle(stft)
-            
-            freq_bins = np.arange(magnitude.shape[0])
-            shifted_bins = np.clip(freq_bins * 0.7, 0, magnitude.shape[0] - 1).astype(int)
-            
-            shifted_magnitude = magnitude[shifted_bins]
-            shifted_stft = shifted_magnitude * np.exp(1j * phase)
-            
-            result = librosa.istft(shifted_stft)
+            # Lower pitch and formants
+            result = self._get_shifter(VoiceEffectType.MALE_VOICE, pitch_shift=-3, formant_shift=0.7).process(audio_data)
             
             # Add some chest resonance
             b, a = signal.butter(4, [80, 200] / (self.sample_rate / 2), btype='band')
@@ -659,21 +643,8 @@ class VoiceChangerWorker(BackendWorker):
     def _female_voice_effect(self, audio_data: np.ndarray) -> np.ndarray:
         """Realistic female voice transformation"""
         try:
-            # Higher pitch
-            y_shifted = librosa.effects.pitch_shift(audio_data, sr=self.sample_rate, n_steps=4)
-            
-            # Higher formants
-            stft = librosa.stft(y_shifted, n_fft=2048)
-            magnitude = np.abs(stft)
-            phase = np.angle(stft)
-            
-            freq_bins = np.arange(magnitude.shape[0])
-            shifted_bins = np.clip(freq_bins * 1.3, 0, magnitude.shape[0] - 1).astype(int)
-            
-            shifted_magnitude = magnitude[shifted_bins]
-            shifted_stft = shifted_magnitude * np.exp(1j * phase)
-            
-            result = librosa.istft(shifted_stft)
+            # Higher pitch and formants
+            result = self._get_shifter(VoiceEffectType.FEMALE_VOICE, pitch_shift=4, formant_shift=1.3).process(audio_data)
             
             # Add brightness
             b, a = signal.butter(4, 2000 / (self.sample_rate / 2), btype='high')
@@ -687,21 +658,8 @@ class VoiceChangerWorker(BackendWorker):
     def _child_voice_effect(self, audio_data: np.ndarray) -> np.ndarray:
         """Realistic child voice transformation"""
         try:
-            # Higher pitch
-            y_shifted = librosa.effects.pitch_shift(audio_data, sr=self.sample_rate, n_steps=6)
-            
-            # Higher formants and smaller vocal tract
-            stft = librosa.stft(y_shifted, n_fft=2048)
-            magnitude = np.abs(stft)
-            phase = np.angle(stft)
-            
-            freq_bins = np.arange(magnitude.shape[0])
-            shifted_bins = np.clip(freq_bins * 1.5, 0, magnitude.shape[0] - 1).astype(int)
-            
-            shifted_magnitude = magnitude[shifted_bins]
-            shifted_stft = shifted_magnitude * np.exp(1j * phase)
-            
-            result = librosa.istft(shifted_stft)
+            # Higher pitch, higher formants and smaller vocal tract
+            result = self._get_shifter(VoiceEffectType.CHILD_VOICE, pitch_shift=6, formant_shift=1.5).process(audio_data)
             
             # Add nasality
             b, a = signal.butter(4, [2000, 3000] / (self.sample_rate / 2), btype='band')
@@ -715,21 +673,8 @@ class VoiceChangerWorker(BackendWorker):
     def _elderly_voice_effect(self, audio_data: np.ndarray) -> np.ndarray:
         """Realistic elderly voice transformation"""
         try:
-            # Slightly lower pitch
-            y_shifted = librosa.effects.pitch_shift(audio_data, sr=self.sample_rate, n_steps=-1)
-            
-            # Lower formants and reduced clarity
-            stft = librosa.stft(y_shifted, n_fft=2048)
-            magnitude = np.abs(stft)
-            phase = np.angle(stft)
-            
-            freq_bins = np.arange(magnitude.shape[0])
-            shifted_bins = np.clip(freq_bins * 0.8, 0, magnitude.shape[0] - 1).astype(int)
-            
-            shifted_magnitude = magnitude[shifted_bins]
-            shifted_stft = shifted_magnitude * np.exp(1j * phase)
-            
-            result = librosa.istft(shifted_stft)
+            # Slightly lower pitch, lower formants and reduced clarity
+            result = self._get_shifter(VoiceEffectType.ELDERLY_VOICE, pitch_shift=-1, formant_shift=0.8).process(audio_data)
             
             # Reduce high frequencies (aging effect)
             b, a = signal.butter(4, 3000 / (self.sample_rate / 2), btype='low')
@@ -748,23 +693,8 @@ class VoiceChangerWorker(BackendWorker):
     def _british_accent_effect(self, audio_data: np.ndarray) -> np.ndarray:
         """British accent effect (RP accent characteristics)"""
         try:
-            # Slightly higher pitch
-            y_shifted = librosa.effects.pitch_shift(audio_data, sr=self.sample_rate, n_steps=1)
-            
-            # Emphasize certain frequency ranges characteristic of RP
-            stft = librosa.stft(y_shifted, n_fft=2048)
-            magnitude = np.abs(stft)
-            phase = np.angle(stft)
-            
-            # Boost frequencies around 2000-3000 Hz (characteristic of British accent)
-            freq_bins = np.arange(magnitude.shape[0])
-            freq_hz = freq_bins * self.sample_rate / (2 * magnitude.shape[0])
-            
-            british_boost = np.where((freq_hz >= 2000) & (freq_hz <= 3000), 1.3, 1.0)
-            magnitude = magnitude * british_boost[:, np.newaxis]
-            
-            shifted_stft = magnitude * np.exp(1j * phase)
-            result = librosa.istft(shifted_stft)
+            # Slightly higher pitch, boost frequencies around 2000-3000 Hz (characteristic of British accent)
+            result = self._get_shifter(VoiceEffectType.BRITISH_ACCENT, pitch_shift=1, band_gains=[(2000, 3000, 1.3)]).process(audio_data)
             
             # Add slight nasality
             b, a = signal.butter(4, [2500, 3500] / (self.sample_rate / 2), btype='band')
@@ -778,23 +708,8 @@ class VoiceChangerWorker(BackendWorker):
     def _southern_accent_effect(self, audio_data: np.ndarray) -> np.ndarray:
         """Southern accent effect (drawl characteristics)"""
         try:
-            # Slightly lower pitch
-            y_shifted = librosa.effects.pitch_shift(audio_data, sr=self.sample_rate, n_steps=-1)
-            
-            # Emphasize lower frequencies (characteristic of Southern drawl)
-            stft = librosa.stft(y_shifted, n_fft=2048)
-            magnitude = np.abs(stft)
-            phase = np.angle(stft)
-            
-            # Boost frequencies around 500-1500 Hz (characteristic of Southern accent)
-            freq_bins = np.arange(magnitude.shape[0])
-            freq_hz = freq_bins * self.sample_rate / (2 * magnitude.shape[0])
-            
-            southern_boost = np.where((freq_hz >= 500) & (freq_hz <= 1500), 1.4, 1.0)
-            magnitude = magnitude * southern_boost[:, np.newaxis]
-            
-            shifted_stft = magnitude * np.exp(1j * phase)
-            result = librosa.istft(shifted_stft)
+            # Slightly lower pitch, boost frequencies around 500-1500 Hz (characteristic of Southern accent)
+            result = self._get_shifter(VoiceEffectType.SOUTHERN_ACCENT, pitch_shift=-1, band_gains=[(500, 1500, 1.4)]).process(audio_data)
             
             # Add slight drawl effect (slower articulation)
             # This is a simplified version - real drawl would require more complex processing
@@ -817,6 +732,7 @@ class VoiceChangerWorker(BackendWorker):
     def on_cs_effect_type(self, idx, effect_type):
         """Handle effect type change"""
         self.current_effect = effect_type
+        self._shifters.clear()
         self.logger.info(f"Voice effect changed to: {effect_type}")
 
     def on_cs_pitch_shift(self, pitch_shift):
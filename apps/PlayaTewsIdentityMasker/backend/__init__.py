@@ -1,6 +1,7 @@
 from .BackendBase import (BackendConnection, BackendConnectionData, BackendDB,
                           BackendHost, BackendSignal, BackendWeakHeap,
                           BackendWorker)
+from .BackendTracer import BackendTracer
 from .CameraSource import CameraSource
 from .FaceAligner import FaceAligner
 from .FaceAnimator import FaceAnimator
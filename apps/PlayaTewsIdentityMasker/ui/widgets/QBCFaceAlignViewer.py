@@ -43,9 +43,12 @@ class QBCFaceAlignViewer(qtx.QXCollapsibleSection):
                 self._layered_images.clear_images()
 
                 for fsi in bcd.get_face_swap_info_list():
-                    face_image = bcd.get_image (fsi.face_align_image_name)
+                    face_image = bcd.get_preview_image(fsi.face_align_image_name)
+                    if face_image is None:
+                        face_image = bcd.get_image (fsi.face_align_image_name)
+
                     if face_image is not None:
-                        h,w = face_image.shape[:2]
+                        h,w = bcd.get_image_shape_dtype(fsi.face_align_image_name)[0][:2]
                         self._layered_images.add_image(face_image)
 
                         if fsi.face_align_ulmrks is not None:
@@ -46,10 +46,13 @@ class QBCFaceSwapViewer(qtx.QXCollapsibleSection):
                 self._layered_images.clear_images()
 
                 for fsi in bcd.get_face_swap_info_list():
-                    face_swap_image = bcd.get_image(fsi.face_swap_image_name)
+                    face_swap_image = bcd.get_preview_image(fsi.face_swap_image_name)
+                    if face_swap_image is None:
+                        face_swap_image = bcd.get_image(fsi.face_swap_image_name)
+
                     if face_swap_image is not None:
                         self._layered_images.add_image(face_swap_image)
-                        h,w = face_swap_image.shape[0:2]
+                        h,w = bcd.get_image_shape_dtype(fsi.face_swap_image_name)[0][0:2]
                         self._info_label.setText(f'{w}x{h}')
                         return
 
@@ -42,11 +42,13 @@ class QBCFrameViewer(qtx.QXCollapsibleSection):
                 self._layered_images.clear_images()
 
                 frame_image_name = bcd.get_frame_image_name()
-                frame_image = bcd.get_image(frame_image_name)
+                frame_image = bcd.get_preview_image(frame_image_name)
+                if frame_image is None:
+                    frame_image = bcd.get_image(frame_image_name)
 
                 if frame_image is not None:
                     self._layered_images.add_image (frame_image)
-                    h,w = frame_image.shape[:2]
+                    h,w = bcd.get_image_shape_dtype(frame_image_name)[0][:2]
                     self._info_label.setText(f'{frame_image_name} {w}x{h}')
 
 
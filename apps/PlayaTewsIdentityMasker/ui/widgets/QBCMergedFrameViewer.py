@@ -45,14 +45,16 @@ class QBCMergedFrameViewer(qtx.QXCollapsibleSection):
                 self._layered_images.clear_images()
 
                 merged_image_name = bcd.get_merged_image_name()
-                merged_image = bcd.get_image(merged_image_name)
+                merged_image = bcd.get_preview_image(merged_image_name)
+                if merged_image is None:
+                    merged_image = bcd.get_image(merged_image_name)
 
                 if merged_image is not None:
                     if merged_image.dtype != np.uint8:
                         merged_image = lib_image.ImageProcessor(merged_image).to_uint8().get_image('HWC')
 
                     self._layered_images.add_image(merged_image)
-                    h,w = merged_image.shape[0:2]
+                    h,w = bcd.get_image_shape_dtype(merged_image_name)[0][0:2]
                     self._info_label.setText(f'{merged_image_name} {w}x{h}')
 
 
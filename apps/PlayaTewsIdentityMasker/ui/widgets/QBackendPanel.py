@@ -64,7 +64,8 @@ class QBackendPanel(qtx.QXWidget):
         elif started:
             btn_on_off.set_image( QXImageDB.power_outline('lime') )
         elif stopped:
-            btn_on_off.set_image( QXImageDB.power_outline('red') )
+            # Enabled, waits for the data to start
+            btn_on_off.set_image( QXImageDB.power_outline('yellow' if backend.is_pending() else 'red') )
 
         if started and not busy:
             qtx.show_and_enable([self._content_widget, self._fps_label])
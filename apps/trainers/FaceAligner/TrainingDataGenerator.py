@@ -10,7 +10,6 @@ from xlib import face as lib_face
 from xlib import image as lib_img
 from xlib import mp as lib_mp
 from xlib import mt as lib_mt
-from xlib.image import sd as lib_sd
 
 
 class Data:
@@ -83,10 +82,11 @@ class TrainingDataGenerator(lib_mp.MPWorker):
         self._resolution = None
         self._random_warp = None
         
+        self._augmentor = None
         self._n_batch = 0
-        self._img_aligned_list = []
-        self._img_aligned_shifted_list = []
-        self._shift_mat_list = []
+        self._img_aligned_batch = None
+        self._img_aligned_shifted_batch = None
+        self._shift_mat_batch = None
     
     def _on_sub_finalize(self):
         self._fs.close()
@@ -136,20 +136,26 @@ class TrainingDataGenerator(lib_mp.MPWorker):
                 align_scale_range = [0.0,2.5]
                 align_tx_range = [-0.50, 0.50]
                 align_ty_range = [-0.50, 0.50]
-                
-                
-                
-                random_mask_complexity = 3
-                sharpen_chance = 25
-                motion_blur_chance = 25
-                gaussian_blur_chance = 25
-                reresize_chance = 25
-                recompress_chance = 25
 
-                img_aligned_list = []
-                img_aligned_shifted_list = []
-                shift_mat_list = []
-                
+                augmentor = self._augmentor
+                if augmentor is None or augmentor.get_resolution() != resolution:
+                    augmentor = self._augmentor = lib_img.BatchAugmentor(resolution,
+                                                                         mask_pool_size=256,
+                                                                         mask_complexity=3,
+                                                                         sharpen_chance=25,
+                                                                         motion_blur_chance=25,
+                                                                         gaussian_blur_chance=25,
+                                                                         reresize_chance=25,
+                                                                         recompress_chance=25)
+
+                img_aligned_batch = self._img_aligned_batch
+                if img_aligned_batch is None or img_aligned_batch.shape[0:2] != (batch_size, resolution):
+                    # (re)allocate batch tensors, samples are written directly into them
+                    self._n_batch = 0
+                    self._img_aligned_batch = np.empty( (batch_size,resolution,resolution,3), np.float32)
+                    self._img_aligned_shifted_batch = np.empty( (batch_size,resolution,resolution,3), np.float32)
+                    self._shift_mat_batch = np.empty( (batch_size,2,3), np.float32)
+
                 if self._n_batch < batch_size:
                     # Make only 1 sample per tick 
                     while True:
@@ -173,8 +179,11 @@ class TrainingDataGenerator(lib_mp.MPWorker):
                             print(f'Corrupted faceset, no image in UImage {uimg1.get_uuid()}')
                             continue
                         
+                        n = self._n_batch
                         img_aligned, _ = flmrks1.cut(img1, face_coverage, resolution)
-                        img_aligned = img_aligned.astype(np.float32) / 255.0
+                        img_aligned_out = self._img_aligned_batch[n]
+                        img_aligned_out[...] = img_aligned
+                        img_aligned_out /= 255.0
                         
                         _, img_to_face_uni_mat1  = flmrks1.calc_cut( img1.shape[0:2], face_coverage, resolution)
                         
@@ -191,62 +200,30 @@ class TrainingDataGenerator(lib_mp.MPWorker):
                                                   rw_grid_ty=rw_grid_ty_range,
                                                 )
                        
-                        img_aligned_shifted = fw1.transform(img1, resolution, random_warp=self._random_warp).astype(np.float32) / 255.0
-    
-                        ip = lib_img.ImageProcessor(img_aligned_shifted)
-                        rnd = np.random
-                        if rnd.randint(2) == 0:
-                            ip.hsv( rnd.uniform(0,1), rnd.uniform(-0.5,0.5), rnd.uniform(-0.5,0.5), mask=lib_sd.random_circle_faded_multi((resolution,resolution), complexity=random_mask_complexity))
-                        else:
-                            ip.levels( [ [rnd.uniform(0,0.25),rnd.uniform(0.75,1.0),rnd.uniform(0.5,1.5), rnd.uniform(0,0.25),rnd.uniform(0.75,1.0),  ],
-                                         [rnd.uniform(0,0.25),rnd.uniform(0.75,1.0),rnd.uniform(0.5,1.5), rnd.uniform(0,0.25),rnd.uniform(0.75,1.0),],
-                                         [rnd.uniform(0,0.25),rnd.uniform(0.75,1.0),rnd.uniform(0.5,1.5), rnd.uniform(0,0.25),rnd.uniform(0.75,1.0),], ], mask=lib_sd.random_circle_faded_multi((resolution,resolution), complexity=random_mask_complexity))
-                        
-                        if rnd.randint(2) == 0:
-                            if rnd.randint(100) < sharpen_chance:
-                                if rnd.randint(2) == 0:
-                                    ip.box_sharpen(size=rnd.randint(1,11), power=rnd.uniform(0.5,5.0), mask=lib_sd.random_circle_faded_multi((resolution,resolution), complexity=random_mask_complexity) )
-                                else:
-                                    ip.gaussian_sharpen(sigma=1.0, power=rnd.uniform(0.5,5.0), mask=lib_sd.random_circle_faded_multi((resolution,resolution), complexity=random_mask_complexity) )
-                                    
-                        else:            
-                            if rnd.randint(100) < motion_blur_chance:
-                                ip.motion_blur (size=rnd.randint(1,11), angle=rnd.randint(360), mask=lib_sd.random_circle_faded_multi((resolution,resolution), complexity=random_mask_complexity))
-                            if rnd.randint(100) < gaussian_blur_chance:
-                                ip.gaussian_blur (sigma=rnd.uniform(0.5,3.0), mask=lib_sd.random_circle_faded_multi((resolution,resolution), complexity=random_mask_complexity))
+                        img_aligned_shifted_out = self._img_aligned_shifted_batch[n]
+                        img_aligned_shifted_out[...] = fw1.transform(img1, resolution, random_warp=self._random_warp)
+                        img_aligned_shifted_out /= 255.0
 
-                        if np.random.randint(2) == 0:
-                            if rnd.randint(100) < reresize_chance:
-                                ip.reresize( rnd.uniform(0.0,0.75), interpolation=ip.Interpolation.NEAREST, mask=lib_sd.random_circle_faded_multi((resolution,resolution), complexity=random_mask_complexity) )
-                        if np.random.randint(2) == 0:
-                            if rnd.randint(100) < reresize_chance:
-                                ip.reresize( rnd.uniform(0.0,0.75), interpolation=ip.Interpolation.LINEAR, mask=lib_sd.random_circle_faded_multi((resolution,resolution), complexity=random_mask_complexity) )
-                        if rnd.randint(100) < recompress_chance:
-                            ip.jpeg_recompress(quality=rnd.randint(10,75), mask=lib_sd.random_circle_faded_multi((resolution,resolution), complexity=random_mask_complexity) )
-                        
-                        img_aligned_shifted = ip.get_image('HWC')
-                        
-                        self._img_aligned_list.append(img_aligned)
-                        self._img_aligned_shifted_list.append(img_aligned_shifted)
-                        self._shift_mat_list.append( fw1.get_aligned_random_transform_mat() )
+                        self._shift_mat_batch[n] = fw1.get_aligned_random_transform_mat()
                         self._n_batch += 1
                         break
                     
                 if self._n_batch == batch_size:
+                    # Augment whole batch at once
+                    augmentor.augment(self._img_aligned_shifted_batch)
+
                     data = Data()
                     data.batch_size = batch_size
                     data.resolution = resolution
-                    data.img_aligned = np.array(self._img_aligned_list).transpose( (0,3,1,2))
-                    data.img_aligned_shifted = np.array(self._img_aligned_shifted_list).transpose( (0,3,1,2))
-                    data.shift_uni_mats = np.array(self._shift_mat_list)
+                    data.img_aligned = self._img_aligned_batch.transpose( (0,3,1,2))
+                    data.img_aligned_shifted = self._img_aligned_shifted_batch.transpose( (0,3,1,2))
+                    data.shift_uni_mats = self._shift_mat_batch
 
+                    # data is pickled on send, so batch tensors can be reused
                     self._send_msg('data', data)
                     self._sent_buffers_count +=1
-                    
+
                     self._n_batch = 0
-                    self._img_aligned_list = []
-                    self._img_aligned_shifted_list = []
-                    self._shift_mat_list = []
 
 
     def _get_next_UFaceMark_uuid(self) -> bytes:
@@ -27,6 +27,8 @@ from enum import Enum
 import urllib.request
 import tempfile
 import shutil
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 import cv2
@@ -35,6 +37,7 @@ import yt_dlp
 
 # Import existing components
 from xlib import face as lib_face
+from xlib import image as lib_image
 from xlib import cv as lib_cv
 from xlib import path as lib_path
 from xlib.net import ThreadFileDownloader
@@ -66,6 +69,8 @@ class ExtractionConfig:
     quality_threshold: float = 0.3
     device: str = "CPU"
     temporal_smoothing: int = 1
+    dedup_distance: Optional[int] = None  # Max hash distance of near-duplicate faces, None - keep all
+    dedup_hash: str = "dhash"
 
 
 @dataclass
@@ -220,51 +225,104 @@ class FaceExtractor:
     
     def extract_faces_from_frame(self, frame: np.ndarray) -> List[Tuple[np.ndarray, Dict]]:
         """Extract faces from a single frame"""
+        return self.extract_faces_from_frames([frame])[0]
+    
+    def extract_faces_from_frames(self, frames: List[np.ndarray]) -> List[List[Tuple[np.ndarray, Dict]]]:
+        """Extract faces from equally sized frames with a single detector call"""
         try:
-            # Detect faces
-            rects = self.detector.extract(
-                frame,
+            # Detect faces in the whole batch, detector returns rects for every batch item
+            rects_list = self.detector.extract(
+                np.stack(frames) if len(frames) > 1 else frames[0],
                 threshold=self.config.threshold,
                 fixed_window=0,
                 min_face_size=self.config.min_face_size
-            )[0]
-            
-            extracted_faces = []
-            
-            for rect in rects[:self.config.max_faces]:
-                # Extract face region
-                x1, y1, x2, y2 = rect.astype(int)
-                face_img = frame[y1:y2, x1:x2]
-                
-                if face_img.size == 0:
-                    continue
-                
-                # Resize to output size
-                face_img = cv2.resize(face_img, (self.config.output_size, self.config.output_size))
-                
-                # Calculate quality score (simple blur detection)
-                gray = cv2.cvtColor(face_img, cv2.COLOR_BGR2GRAY)
-                laplacian_var = cv2.Laplacian(gray, cv2.CV_64F).var()
-                quality_score = min(1.0, laplacian_var / 100.0)  # Normalize
-                
-                # Filter by quality
-                if quality_score >= self.config.quality_threshold:
-                    face_info = {
-                        'bbox': rect,
-                        'quality_score': quality_score,
-                        'size': face_img.shape
-                    }
-                    extracted_faces.append((face_img, face_info))
+            )
             
-            return extracted_faces
+            return [self._crop_faces(frame, rects) for frame, rects in zip(frames, rects_list)] + \
+                   [ [] for _ in range(len(frames)-len(rects_list)) ]
             
         except Exception as e:
             logging.error(f"Error extracting faces from frame: {str(e)}")
-            return []
+            return [ [] for _ in frames ]
+    
+    def _crop_faces(self, frame: np.ndarray, rects) -> List[Tuple[np.ndarray, Dict]]:
+        """Crop, resize and filter by quality detected faces of a frame"""
+        extracted_faces = []
+        
+        for rect in rects[:self.config.max_faces]:
+            # Extract face region
+            x1, y1, x2, y2 = rect.astype(int)
+            face_img = frame[y1:y2, x1:x2]
+            
+            if face_img.size == 0:
+                continue
+            
+            # Resize to output size
+            face_img = cv2.resize(face_img, (self.config.output_size, self.config.output_size))
+            
+            # Calculate quality score (simple blur detection)
+            gray = cv2.cvtColor(face_img, cv2.COLOR_BGR2GRAY)
+            laplacian_var = cv2.Laplacian(gray, cv2.CV_64F).var()
+            quality_score = min(1.0, laplacian_var / 100.0)  # Normalize
+            
+            # Filter by quality
+            if quality_score >= self.config.quality_threshold:
+                face_info = {
+                    'bbox': rect,
+                    'quality_score': quality_score,
+                    'size': face_img.shape
+                }
+                extracted_faces.append((face_img, face_info))
+        
+        return extracted_faces
+    
+    def _iter_sampled_frames(self, cap, frame_interval: int, seek_interval: int):
+        """
+        Yield (frame_idx, frame) of every frame_interval-th frame.
+        
+        Skipped frames are only grabbed, without conversion and copy of the image.
+        Intervals of seek_interval and more are skipped by seeking.
+        """
+        use_seek = seek_interval > 0 and frame_interval >= seek_interval
+        if use_seek:
+            frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+            use_seek = frame_count > 0
+        
+        frame_idx = 0
+        while True:
+            if use_seek:
+                if frame_idx >= frame_count:
+                    break
+                if frame_idx != 0:
+                    cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
+            
+            ret, frame = cap.read()
+            if not ret:
+                break
+            yield frame_idx, frame
+            
+            if use_seek:
+                frame_idx += frame_interval
+            else:
+                for _ in range(frame_interval-1):
+                    if not cap.grab():
+                        return
+                frame_idx += frame_interval
     
     def extract_faces_from_video(self, video_path: Path, output_dir: Path, 
-                                frame_interval: int = 30) -> List[Path]:
-        """Extract faces from video frames at specified intervals"""
+                                frame_interval: int = 30,
+                                batch_size: int = 8,
+                                writer_count: int = 4,
+                                seek_interval: int = 250,
+                                faceset_path: Optional[Path] = None) -> List[Path]:
+        """
+        Extract faces from video frames at specified intervals
+        
+        Only sampled frames are decoded, they are detected by batches of batch_size,
+        faces are written by a pool of writer_count threads while next frames are detected.
+        If faceset_path is set, faces are also added to the Faceset as UImage and UFaceMark.
+        If config.dedup_distance is set, near-duplicates of already extracted faces are skipped.
+        """
         try:
             output_dir = Path(output_dir)
             output_dir.mkdir(parents=True, exist_ok=True)
@@ -273,42 +331,162 @@ class FaceExtractor:
             if not cap.isOpened():
                 raise Exception(f"Could not open video: {video_path}")
             
+            faceset = None
+            if faceset_path is not None:
+                faceset = lib_face.Faceset(faceset_path, write_access=True)
+            
             extracted_faces = []
-            frame_count = 0
-            extracted_count = 0
+            pending = deque()
+            sampled_count = 0
+            duplicate_count = 0
             
-            while True:
-                ret, frame = cap.read()
-                if not ret:
-                    break
-                
-                # Process every nth frame
-                if frame_count % frame_interval == 0:
-                    faces = self.extract_faces_from_frame(frame)
-                    
+            dedup_index = None
+            if self.config.dedup_distance is not None:
+                dedup_index = lib_image.PerceptualHashIndex(self.config.dedup_distance, self.config.dedup_hash)
+            
+            # h5py file is written only by a single thread
+            writer_pool = ThreadPoolExecutor(max_workers=max(1, writer_count))
+            faceset_pool = ThreadPoolExecutor(max_workers=1) if faceset is not None else None
+            
+            def write_faces(frame_batch):
+                nonlocal duplicate_count
+                for frame_idx, faces in frame_batch:
                     for i, (face_img, face_info) in enumerate(faces):
                         # Save face image
-                        face_filename = f"face_{frame_count:06d}_{i:02d}.jpg"
+                        face_filename = f"face_{frame_idx:06d}_{i:02d}.jpg"
                         face_path = output_dir / face_filename
                         
-                        cv2.imwrite(str(face_path), face_img)
-                        extracted_faces.append(face_path)
-                        extracted_count += 1
+                        if dedup_index is not None and not dedup_index.add_if_unique(face_img, face_path):
+                            duplicate_count += 1
+                            continue
                         
-                        # Log progress
-                        if extracted_count % 100 == 0:
-                            logging.info(f"Extracted {extracted_count} faces...")
+                        pending.append( (face_path, writer_pool.submit(cv2.imwrite, str(face_path), face_img)) )
+                        if faceset_pool is not None:
+                            pending.append( (None, faceset_pool.submit(_add_face_to_faceset, faceset, face_path.stem, face_img, face_info)) )
                 
-                frame_count += 1
-            
-            cap.release()
-            logging.info(f"Extracted {len(extracted_faces)} faces from {frame_count} frames")
+                # Bound memory of faces waiting for the writers
+                while len(pending) > writer_count*batch_size*2:
+                    collect_written(pending.popleft())
+            
+            def collect_written(path_future):
+                face_path, future = path_future
+                future.result()
+                if face_path is not None:
+                    extracted_faces.append(face_path)
+                    # Log progress
+                    if len(extracted_faces) % 100 == 0:
+                        logging.info(f"Extracted {len(extracted_faces)} faces...")
+            
+            try:
+                batch = []
+                for frame_idx, frame in self._iter_sampled_frames(cap, frame_interval, seek_interval):
+                    sampled_count += 1
+                    batch.append( (frame_idx, frame) )
+                    if len(batch) == batch_size:
+                        write_faces(zip([idx for idx, _ in batch], self.extract_faces_from_frames([frame for _, frame in batch])))
+                        batch = []
+                if len(batch) != 0:
+                    write_faces(zip([idx for idx, _ in batch], self.extract_faces_from_frames([frame for _, frame in batch])))
+                
+                while len(pending) != 0:
+                    collect_written(pending.popleft())
+            finally:
+                writer_pool.shutdown(wait=True)
+                if faceset_pool is not None:
+                    faceset_pool.shutdown(wait=True)
+                    faceset.close()
+                cap.release()
+            
+            logging.info(f"Extracted {len(extracted_faces)} faces from {sampled_count} sampled frames")
+            if dedup_index is not None:
+                logging.info(f"Skipped {duplicate_count} near-duplicate faces")
             return extracted_faces
             
         except Exception as e:
             raise Exception(f"Failed to extract faces from video: {str(e)}")
 
 
+class FaceDeduplicator:
+    """Removes near-duplicate faces from existing face directories and facesets"""
+    
+    def __init__(self, max_distance: int = 6, hash_type: str = "dhash"):
+        self.max_distance = max_distance
+        self.hash_type = hash_type
+    
+    def dedup_directory(self, faces_dir: Path, remove: bool = False,
+                        duplicates_dir: Optional[Path] = None) -> List[Path]:
+        """
+        Find near-duplicate face images in a directory, the first image in name order is kept.
+        
+        Duplicates are deleted if remove is set, or moved to duplicates_dir if it is set.
+        Returns list of duplicate paths.
+        """
+        faces_dir = Path(faces_dir)
+        index = lib_image.PerceptualHashIndex(self.max_distance, self.hash_type)
+        
+        duplicates = []
+        for face_path in lib_path.get_files_paths(faces_dir, extensions=['.jpg', '.jpeg', '.png']):
+            face_img = lib_cv.imread(face_path, raise_on_error=False)
+            if face_img is None:
+                logging.warning(f"Unable to read {face_path}")
+                continue
+            if not index.add_if_unique(face_img, face_path):
+                duplicates.append(face_path)
+        
+        if duplicates_dir is not None:
+            duplicates_dir = Path(duplicates_dir)
+            duplicates_dir.mkdir(parents=True, exist_ok=True)
+            for face_path in duplicates:
+                shutil.move(str(face_path), str(duplicates_dir / face_path.name))
+        elif remove:
+            for face_path in duplicates:
+                face_path.unlink()
+        
+        logging.info(f"Found {len(duplicates)} near-duplicates of {index.get_count() + len(duplicates)} faces in {faces_dir}")
+        return duplicates
+    
+    def dedup_faceset(self, faceset_path: Path, remove: bool = True) -> int:
+        """
+        Find near-duplicate UImage in a Faceset, the first stored image is kept.
+        
+        Duplicates and their UFaceMark are deleted from the Faceset if remove is set.
+        Returns number of duplicates.
+        """
+        faceset = lib_face.Faceset(faceset_path, write_access=remove)
+        try:
+            index = lib_image.PerceptualHashIndex(self.max_distance, self.hash_type)
+            
+            duplicate_uuids = []
+            for uimage in faceset.iter_UImage():
+                if not index.add_if_unique(uimage.get_image(), uimage.get_uuid()):
+                    duplicate_uuids.append(uimage.get_uuid())
+            
+            if remove:
+                for uuid in duplicate_uuids:
+                    for ufacemark_uuid in faceset.get_UFaceMark_uuids_by_UImage_uuid(uuid):
+                        faceset.delete_UFaceMark_by_uuid(ufacemark_uuid)
+                    faceset.delete_UImage_by_uuid(uuid)
+            
+            logging.info(f"Found {len(duplicate_uuids)} near-duplicates of {index.get_count() + len(duplicate_uuids)} faces in {faceset_path}")
+            return len(duplicate_uuids)
+        finally:
+            faceset.close()
+
+
+def _add_face_to_faceset(faceset, name: str, face_img: np.ndarray, face_info: Dict):
+    """Add face image and its mark covering the whole image to the faceset"""
+    uimage = lib_face.UImage()
+    uimage.set_name(name)
+    uimage.assign_image(face_img)
+    
+    ufacemark = lib_face.UFaceMark()
+    ufacemark.set_UImage_uuid(uimage.get_uuid())
+    ufacemark.set_FRect(lib_face.FRect.from_ltrb([0.0, 0.0, 1.0, 1.0]))
+    
+    faceset.add_UImage(uimage)
+    faceset.add_UFaceMark(ufacemark)
+
+
 class DeepFaceLabDataPreparer:
     """Prepares extracted faces for DeepFaceLab training"""
     
@@ -567,13 +745,16 @@ def main():
                        help="Device to use (CPU, CUDA, etc.)")
     parser.add_argument("--frame-interval", type=int, default=30,
                        help="Process every Nth frame")
+    parser.add_argument("--dedup-distance", type=int, default=None,
+                       help="Skip faces within this perceptual hash distance of an extracted face")
     
     args = parser.parse_args()
     
     # Create configuration
     config = ExtractionConfig(
         detector_type=DetectorType(args.detector),
-        device=args.device
+        device=args.device,
+        dedup_distance=args.dedup_distance
     )
     
     # Initialize extractor
@@ -50,6 +50,7 @@ from deepfacelab_optimization_manager import (
 # Import existing components
 try:
     from xlib import face as lib_face
+    from xlib import image as lib_image
     from xlib import cv as lib_cv
     from xlib import path as lib_path
     from xlib.net import ThreadFileDownloader
@@ -99,6 +100,7 @@ class EnhancedExtractionConfig:
     output_size: int = 256
     quality_threshold: float = 0.3
     device: str = "CPU"
+    dedup_distance: Optional[int] = None  # Max hash distance of near-duplicate faces, None - keep all
     
     # Optimization settings
     extraction_mode: ExtractionMode = ExtractionMode.BALANCED
@@ -503,6 +505,10 @@ class EnhancedFaceExtractor:
             frame_count = 0
             extracted_files = []
             
+            dedup_index = None
+            if self.config.dedup_distance is not None and DEEPFACELAB_AVAILABLE:
+                dedup_index = lib_image.PerceptualHashIndex(self.config.dedup_distance)
+            
             while True:
                 ret, frame = cap.read()
                 if not ret:
@@ -516,6 +522,9 @@ class EnhancedFaceExtractor:
                     # Save extracted faces
                     for i, (face_img, metadata) in enumerate(faces):
                         if metadata['quality_score'] >= self.config.quality_threshold:
+                            if dedup_index is not None and not dedup_index.add_if_unique(face_img):
+                                continue
+                            
                             filename = f"face_{frame_count:06d}_{i:02d}.jpg"
                             filepath = output_dir / filename
                             
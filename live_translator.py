@@ -7,12 +7,11 @@ A real-time speech-to-speech translation application with web interface.
 import asyncio
 import json
 import logging
-import queue
 import threading
 import time
 import wave
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, List, Optional, Tuple
 import base64
 import io
 
@@ -21,7 +20,6 @@ import pyaudio
 import numpy as np
 import librosa
 import webrtcvad
-import soundfile as sf
 
 # Speech recognition
 import whisper
@@ -54,6 +52,11 @@ import uuid
 import os
 from dataclasses import dataclass, field
 
+from xlib.audio import AudioRingBuffer
+from xlib.time import LatencyHistogram
+
+from live_translator_pipeline import PipelineStage, ResultCache, SpeechSegmenter, StreamingTranscriber
+
 
 # Configure logging
 logging.basicConfig(
@@ -92,6 +95,18 @@ class TranslationConfig:
     # Processing
     max_audio_length: float = 30.0  # seconds
     silence_timeout: float = 2.0    # seconds
+    pipeline_queue_size: int = 4    # items waiting between pipeline stages
+    
+    # Streaming transcription
+    streaming_transcription: bool = False
+    stream_step: float = 0.5        # seconds of new audio between transcription passes
+    stream_window: float = 8.0      # seconds of audio kept for a transcription pass
+    
+    # Result caches
+    translation_cache_size: int = 2048          # entries
+    tts_cache_size: int = 512                   # entries
+    tts_cache_max_bytes: int = 64 * 1024**2
+    cache_dir: Optional[str] = None             # persist caches between sessions if set
     
     # Web interface
     web_port: int = 7860
@@ -99,16 +114,25 @@ class TranslationConfig:
 
 
 class AudioCapture:
-    """Real-time audio capture with VAD."""
+    """Real-time audio capture with VAD.
+
+    The stream callback only copies samples into a preallocated ring buffer,
+    voice segments are cut from it by SpeechSegmenter in the consumer.
+    """
     
     def __init__(self, config: TranslationConfig):
         self.config = config
-        self.audio_queue = queue.Queue()
         self.is_recording = False
-        self.vad = webrtcvad.Vad(config.vad_mode)
-        self.audio_buffer = []
-        self.silence_chunks = 0
-        self.max_silence_chunks = int(config.silence_timeout * config.sample_rate / config.chunk_size)
+        
+        # Capture ring buffer holds a few seconds of int16 samples for the consumer
+        self.ring_buffer = AudioRingBuffer(int(config.sample_rate * 4) + config.chunk_size, dtype=np.int16)
+        self.overrun_samples = 0
+        self.segmenter = SpeechSegmenter(self.ring_buffer, webrtcvad.Vad(config.vad_mode),
+                                         sample_rate=config.sample_rate,
+                                         chunk_size=config.chunk_size,
+                                         frame_duration_ms=config.frame_duration_ms,
+                                         silence_timeout=config.silence_timeout,
+                                         max_audio_length=config.max_audio_length)
         
         # Initialize PyAudio
         self.pyaudio = pyaudio.PyAudio()
@@ -138,44 +162,25 @@ class AudioCapture:
         if self.stream:
             self.stream.stop_stream()
             self.stream.close()
+            self.stream = None
         logger.info("Audio recording stopped")
     
     def _audio_callback(self, in_data, frame_count, time_info, status):
         """Audio stream callback."""
         if self.is_recording:
-            # Convert audio data to numpy array
             audio_data = np.frombuffer(in_data, dtype=np.int16)
-            
-            # Check for voice activity
-            is_speech = self.vad.is_speech(in_data, self.config.sample_rate)
-            
-            if is_speech:
-                self.audio_buffer.extend(audio_data)
-                self.silence_chunks = 0
-            else:
-                self.silence_chunks += 1
-                if len(self.audio_buffer) > 0:
-                    self.audio_buffer.extend(audio_data)
-            
-            # If we have enough silence or buffer is full, process the audio
-            if (self.silence_chunks >= self.max_silence_chunks and len(self.audio_buffer) > 0) or \
-               (len(self.audio_buffer) >= self.config.max_audio_length * self.config.sample_rate):
-                
-                if len(self.audio_buffer) > 0:
-                    # Convert to audio format and add to queue
-                    audio_array = np.array(self.audio_buffer, dtype=np.int16)
-                    self.audio_queue.put(audio_array)
-                    self.audio_buffer = []
-                    self.silence_chunks = 0
+            written = self.ring_buffer.write(audio_data)
+            self.overrun_samples += len(audio_data) - written
         
         return (in_data, pyaudio.paContinue)
     
     def get_audio_segment(self) -> Optional[np.ndarray]:
-        """Get the next audio segment from the queue."""
-        try:
-            return self.audio_queue.get_nowait()
-        except queue.Empty:
-            return None
+        """Get the next voice segment as float32 array in [-1, 1], or None."""
+        return self.segmenter.get_audio_segment()
+    
+    def get_speech_increment(self) -> Tuple[Optional[np.ndarray], bool]:
+        """Get speech appended to the current segment since the last call, and whether the segment is complete."""
+        return self.segmenter.get_speech_increment()
     
     def __del__(self):
         """Cleanup resources."""
@@ -187,6 +192,9 @@ class AudioCapture:
 class SpeechRecognizer:
     """Speech recognition using multiple engines."""
     
+    # Whisper models expect 16 kHz mono float32
+    WHISPER_SAMPLE_RATE = 16000
+    
     def __init__(self, config: TranslationConfig):
         self.config = config
         
@@ -198,18 +206,27 @@ class SpeechRecognizer:
         
         # Initialize speech recognition
         self.sr_recognizer = sr.Recognizer()
+    
+    def _prepare_audio(self, audio_data: np.ndarray) -> np.ndarray:
+        """Convert audio to 16 kHz float32 array in [-1, 1] without touching the filesystem."""
+        if audio_data.dtype == np.int16:
+            audio_data = audio_data.astype(np.float32) / 32768.0
+        elif audio_data.dtype != np.float32:
+            audio_data = audio_data.astype(np.float32)
+        
+        if self.config.sample_rate != self.WHISPER_SAMPLE_RATE:
+            audio_data = librosa.resample(audio_data, orig_sr=self.config.sample_rate, target_sr=self.WHISPER_SAMPLE_RATE)
+        return np.ascontiguousarray(audio_data, dtype=np.float32)
         
     async def transcribe_audio(self, audio_data: np.ndarray, language: str = None) -> Tuple[str, str]:
         """Transcribe audio to text."""
         try:
-            # Save audio to temporary file
-            temp_file = f"/tmp/temp_audio_{uuid.uuid4().hex}.wav"
-            sf.write(temp_file, audio_data, self.config.sample_rate)
+            audio = self._prepare_audio(audio_data)
             
             # Use Faster Whisper for transcription
             if self.config.use_faster_whisper:
                 segments, info = self.whisper_model.transcribe(
-                    temp_file,
+                    audio,
                     language=language,
                     beam_size=5,
                     word_timestamps=True
@@ -224,19 +241,49 @@ class SpeechRecognizer:
                 transcription = transcription.strip()
             else:
                 # Use regular Whisper
-                result = self.whisper_model.transcribe(temp_file, language=language)
+                result = self.whisper_model.transcribe(audio, language=language)
                 transcription = result["text"].strip()
                 detected_language = result["language"]
             
-            # Clean up temp file
-            os.unlink(temp_file)
-            
             logger.info(f"Transcribed ({detected_language}): {transcription}")
             return transcription, detected_language
             
         except Exception as e:
             logger.error(f"Transcription failed: {e}")
             return "", "unknown"
+    
+    async def transcribe_words(self, audio_data: np.ndarray, language: str = None, prompt: str = None) -> Tuple[List[Tuple[float, float, str]], str]:
+        """Transcribe audio to a list of (start sec, end sec, word)."""
+        try:
+            audio = self._prepare_audio(audio_data)
+            
+            if self.config.use_faster_whisper:
+                segments, info = self.whisper_model.transcribe(
+                    audio,
+                    language=language,
+                    beam_size=5,
+                    word_timestamps=True,
+                    initial_prompt=prompt,
+                    condition_on_previous_text=False
+                )
+                words = [(word.start, word.end, word.word) for segment in segments for word in (segment.words or [])]
+                detected_language = info.language
+            else:
+                result = self.whisper_model.transcribe(
+                    audio,
+                    language=language,
+                    word_timestamps=True,
+                    initial_prompt=prompt,
+                    condition_on_previous_text=False
+                )
+                words = [(word["start"], word["end"], word["word"]) for segment in result["segments"] for word in segment.get("words", [])]
+                detected_language = result["language"]
+            
+            return words, detected_language
+            
+        except Exception as e:
+            logger.error(f"Transcription failed: {e}")
+            return [], "unknown"
 
 
 class TranslationService:
@@ -249,6 +296,8 @@ class TranslationService:
         self.google_translator = GoogleTranslator()
         self.deep_google_translator = DeepGoogleTranslator(source='auto', target='en')
         
+        self.cache = ResultCache("translation", config.translation_cache_size)
+        
         # Initialize offline models for common language pairs
         self.offline_models = {}
         self._load_offline_models()
@@ -274,8 +323,19 @@ class TranslationService:
             except Exception as e:
                 logger.warning(f"Failed to load offline model {src}-{tgt}: {e}")
     
+    @staticmethod
+    def _normalize_text(text: str) -> str:
+        return " ".join(text.split()).casefold()
+    
     async def translate_text(self, text: str, source_lang: str, target_lang: str) -> Dict[str, str]:
-        """Translate text using multiple services."""
+        """Translate text using multiple services, repeated phrases come from the cache."""
+        cache_key = (self._normalize_text(text), source_lang, target_lang, tuple(self.config.translation_services))
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            best_translation, translations = cached
+            logger.info(f"Translated ({source_lang} -> {target_lang}, cached): {text} -> {best_translation}")
+            return {"best": best_translation, "all": dict(translations)}
+        
         translations = {}
         
         # Google Translate
@@ -318,6 +378,10 @@ class TranslationService:
         else:
             best_translation = text  # Fallback to original text
         
+        # Failed translations are retried next time
+        if translations:
+            self.cache.put(cache_key, (best_translation, dict(translations)))
+        
         logger.info(f"Translated ({source_lang} -> {target_lang}): {text} -> {best_translation}")
         return {"best": best_translation, "all": translations}
 
@@ -335,9 +399,22 @@ class TextToSpeech:
         except Exception as e:
             logger.warning(f"Failed to initialize pyttsx3: {e}")
             self.pyttsx3_engine = None
+        
+        self.cache = ResultCache("tts", config.tts_cache_size, max_bytes=config.tts_cache_max_bytes)
     
     async def speak_text(self, text: str, language: str = "en", voice: str = None) -> bytes:
-        """Convert text to speech audio."""
+        """Convert text to speech audio, repeated phrases come from the cache."""
+        cache_key = (text.strip(), language, voice, self.config.default_tts_engine, self.config.voice_speed)
+        audio_data = self.cache.get(cache_key)
+        if audio_data is not None:
+            return audio_data
+        
+        audio_data = await self._synthesize(text, language, voice)
+        if audio_data:
+            self.cache.put(cache_key, audio_data)
+        return audio_data
+    
+    async def _synthesize(self, text: str, language: str, voice: str = None) -> bytes:
         try:
             if self.config.default_tts_engine == "edge":
                 return await self._edge_tts(text, language, voice)
@@ -408,7 +485,15 @@ class TextToSpeech:
 
 
 class LiveTranslator:
-    """Main live translation system."""
+    """Main live translation system.
+
+    Segments flow through concurrent stages
+
+        capture -> ASR -> translation -> TTS -> history
+
+    so recognition of the next segment overlaps translation and synthesis of
+    the previous one, and the delay is bounded by the slowest stage.
+    """
     
     def __init__(self, config: TranslationConfig = None):
         self.config = config or TranslationConfig()
@@ -424,6 +509,26 @@ class LiveTranslator:
         self.session_id = str(uuid.uuid4())
         self.translation_history = []
         
+        # Streaming transcription state, owned by the ASR stage
+        self.streaming_transcriber = StreamingTranscriber(self.speech_recognizer,
+                                                          sample_rate=self.config.sample_rate,
+                                                          stream_window=self.config.stream_window,
+                                                          max_audio_length=self.config.max_audio_length)
+        self.partial_transcript = {"committed": "", "partial": ""}
+        
+        # Pipeline
+        recognize_stage = self._streaming_recognize_stage if self.config.streaming_transcription else self._recognize_stage
+        self.stages = [
+            PipelineStage("asr", recognize_stage, self.config.pipeline_queue_size),
+            PipelineStage("translate", self._translate_stage, self.config.pipeline_queue_size),
+            PipelineStage("tts", self._tts_stage, self.config.pipeline_queue_size),
+        ]
+        self.end_to_end_latency = LatencyHistogram()
+        self.dropped_segments = 0
+        
+        self.caches = [self.translation_service.cache, self.tts.cache]
+        self.load_caches()
+        
         # Event loop for async operations
         self.loop = None
         
@@ -434,66 +539,181 @@ class LiveTranslator:
         self.is_running = True
         self.audio_capture.start_recording()
         
+        for stage in self.stages:
+            stage.open()
+        results_queue = asyncio.Queue()
+        output_queues = [stage.input_queue for stage in self.stages[1:]] + [results_queue]
+        stage_tasks = [asyncio.create_task(stage.run(output_queue)) for stage, output_queue in zip(self.stages, output_queues)]
+        results_task = asyncio.create_task(self._collect_results(results_queue))
+        asr_queue = self.stages[0].input_queue
+        
         try:
+            if self.config.streaming_transcription:
+                await self._capture_stream(asr_queue, source_lang, target_lang)
+            
             while self.is_running:
                 # Get audio segment
                 audio_data = self.audio_capture.get_audio_segment()
                 
                 if audio_data is not None:
-                    # Process the audio
-                    result = await self._process_audio_segment(
-                        audio_data, source_lang, target_lang
-                    )
-                    
-                    if result:
-                        self.translation_history.append(result)
-                        logger.info(f"Translation result: {result}")
+                    item = {
+                        "timestamp": datetime.now().isoformat(),
+                        "capture_time": time.perf_counter(),
+                        "audio": audio_data,
+                        "requested_source_language": source_lang,
+                        "target_language": target_lang,
+                        "_enqueue_time": time.perf_counter(),
+                    }
+                    if asr_queue.full():
+                        # Recognition is behind live audio, drop the oldest segment
+                        asr_queue.get_nowait()
+                        self.dropped_segments += 1
+                        logger.warning(f"ASR is behind, dropped {self.dropped_segments} segments")
+                    asr_queue.put_nowait(item)
                 
                 # Small delay to prevent CPU overload
-                await asyncio.sleep(0.1)
+                await asyncio.sleep(0.02)
                 
         except Exception as e:
             logger.error(f"Translation error: {e}")
         finally:
             self.audio_capture.stop_recording()
             self.is_running = False
+            
+            # Finish queued segments
+            await asr_queue.put(None)
+            await asyncio.gather(*stage_tasks, results_task, return_exceptions=True)
+            for stage in self.stages:
+                stage.close()
+            self.save_caches()
+    
+    async def _capture_stream(self, asr_queue: asyncio.Queue, source_lang: str, target_lang: str):
+        """Feed speech to the ASR stage every stream_step seconds while the segment grows."""
+        pending_audio = []
+        last_step_time = time.perf_counter()
+        
+        while self.is_running:
+            increment, complete = self.audio_capture.get_speech_increment()
+            if increment is not None:
+                pending_audio.append(increment)
+            
+            now = time.perf_counter()
+            step_due = len(pending_audio) != 0 and now - last_step_time >= self.config.stream_step
+            # ASR stage is busy: keep accumulating, the next pass gets all of it
+            if complete or (step_due and not asr_queue.full()):
+                item = {
+                    "timestamp": datetime.now().isoformat(),
+                    "capture_time": now,
+                    "audio": np.concatenate(pending_audio) if pending_audio else np.empty((0,), np.float32),
+                    "segment_complete": complete,
+                    "requested_source_language": source_lang,
+                    "target_language": target_lang,
+                    "_enqueue_time": now,
+                }
+                pending_audio = []
+                last_step_time = now
+                await asr_queue.put(item)
+            
+            await asyncio.sleep(0.02)
+        
+        # Commit the words of the segment being spoken
+        now = time.perf_counter()
+        await asr_queue.put({
+            "timestamp": datetime.now().isoformat(),
+            "capture_time": now,
+            "audio": np.concatenate(pending_audio) if pending_audio else np.empty((0,), np.float32),
+            "segment_complete": True,
+            "requested_source_language": source_lang,
+            "target_language": target_lang,
+            "_enqueue_time": now,
+        })
+    
+    async def _collect_results(self, results_queue: asyncio.Queue):
+        while True:
+            item = await results_queue.get()
+            if item is None:
+                break
+            self.end_to_end_latency.record(time.perf_counter() - item["capture_time"])
+            result = self._make_result(item)
+            self.translation_history.append(result)
+            logger.info(f"Translation result: {result}")
+    
+    async def _recognize_stage(self, item: Dict) -> Optional[Dict]:
+        source_lang = item["requested_source_language"]
+        transcription, detected_lang = await self.speech_recognizer.transcribe_audio(
+            item.pop("audio"), language=source_lang if source_lang != "auto" else None
+        )
+        
+        if not transcription.strip():
+            return None
+        
+        item["original_text"] = transcription
+        # Use detected language if auto-detection was requested
+        item["source_language"] = detected_lang if source_lang == "auto" else source_lang
+        return item
+    
+    async def _streaming_recognize_stage(self, item: Dict) -> Optional[Dict]:
+        transcriber = self.streaming_transcriber
+        source_lang = item["requested_source_language"]
+        if source_lang != "auto":
+            transcriber.language = source_lang
+        
+        transcriber.insert_audio(item.pop("audio"))
+        if item["segment_complete"]:
+            committed = await transcriber.finish()
+            self.partial_transcript = {"committed": "", "partial": ""}
+        else:
+            committed = await transcriber.process()
+            self.partial_transcript = {"committed": transcriber.get_committed_text(), "partial": transcriber.get_partial_text()}
+        
+        if not committed:
+            return None
+        
+        # Stable words go to translation before the speaker pauses
+        item["original_text"] = committed
+        item["source_language"] = transcriber.detected_language if source_lang == "auto" else source_lang
+        return item
+    
+    async def _translate_stage(self, item: Dict) -> Optional[Dict]:
+        translation_result = await self.translation_service.translate_text(
+            item["original_text"], item["source_language"], item["target_language"]
+        )
+        item["translation"] = translation_result["best"]
+        item["all_translations"] = translation_result["all"]
+        return item
+    
+    async def _tts_stage(self, item: Dict) -> Optional[Dict]:
+        item["audio_output"] = await self.tts.speak_text(item["translation"], item["target_language"])
+        return item
+    
+    def _make_result(self, item: Dict) -> Dict:
+        audio_output = item.get("audio_output")
+        return {
+            "timestamp": item["timestamp"],
+            "original_text": item["original_text"],
+            "source_language": item["source_language"],
+            "target_language": item["target_language"],
+            "translation": item["translation"],
+            "all_translations": item["all_translations"],
+            "audio_output": base64.b64encode(audio_output).decode() if audio_output else None,
+            "session_id": self.session_id
+        }
     
     async def _process_audio_segment(self, audio_data: np.ndarray, source_lang: str, target_lang: str) -> Optional[Dict]:
-        """Process a single audio segment."""
-        timestamp = datetime.now().isoformat()
+        """Process a single audio segment through all stages sequentially."""
+        item = {
+            "timestamp": datetime.now().isoformat(),
+            "audio": audio_data,
+            "requested_source_language": source_lang,
+            "target_language": target_lang,
+        }
         
         try:
-            # Transcribe audio
-            transcription, detected_lang = await self.speech_recognizer.transcribe_audio(
-                audio_data, language=source_lang if source_lang != "auto" else None
-            )
-            
-            if not transcription.strip():
-                return None
-            
-            # Use detected language if auto-detection was requested
-            actual_source_lang = detected_lang if source_lang == "auto" else source_lang
-            
-            # Translate text
-            translation_result = await self.translation_service.translate_text(
-                transcription, actual_source_lang, target_lang
-            )
-            
-            # Generate speech for translation
-            audio_output = await self.tts.speak_text(
-                translation_result["best"], target_lang
-            )
-            
-            return {
-                "timestamp": timestamp,
-                "original_text": transcription,
-                "source_language": actual_source_lang,
-                "target_language": target_lang,
-                "translation": translation_result["best"],
-                "all_translations": translation_result["all"],
-                "audio_output": base64.b64encode(audio_output).decode() if audio_output else None,
-                "session_id": self.session_id
-            }
+            for stage in self.stages:
+                item = await stage.func(item)
+                if item is None:
+                    return None
+            return self._make_result(item)
             
         except Exception as e:
             logger.error(f"Failed to process audio segment: {e}")
@@ -509,6 +729,39 @@ class LiveTranslator:
         """Get the translation history for this session."""
         return self.translation_history.copy()
     
+    def _get_cache_path(self, cache: ResultCache) -> Optional[Path]:
+        if self.config.cache_dir is None:
+            return None
+        return Path(self.config.cache_dir) / f"{cache.name}_cache.pkl"
+    
+    def load_caches(self):
+        """Load translation and TTS caches of previous sessions if cache_dir is set."""
+        for cache in self.caches:
+            path = self._get_cache_path(cache)
+            if path is not None:
+                cache.load(path)
+    
+    def save_caches(self):
+        """Save translation and TTS caches if cache_dir is set."""
+        for cache in self.caches:
+            path = self._get_cache_path(cache)
+            if path is not None:
+                cache.save(path)
+    
+    def get_partial_transcript(self) -> Dict:
+        """Get committed and partial text of the segment being spoken in streaming mode."""
+        return dict(self.partial_transcript)
+    
+    def get_pipeline_metrics(self) -> Dict:
+        """Get per-stage compute/queue latency summaries in seconds and end-to-end latency."""
+        return {
+            "stages": {stage.name: stage.get_metrics() for stage in self.stages},
+            "end_to_end": self.end_to_end_latency.get_summary(),
+            "dropped_segments": self.dropped_segments,
+            "audio_overrun_samples": self.audio_capture.overrun_samples,
+            "caches": {cache.name: cache.get_stats() for cache in self.caches},
+        }
+    
     def clear_history(self):
         """Clear the translation history."""
         self.translation_history.clear()
@@ -553,6 +806,14 @@ def create_flask_app(translator: LiveTranslator) -> Flask:
     def get_history():
         return jsonify(translator.get_translation_history())
     
+    @app.route('/api/metrics', methods=['GET'])
+    def get_metrics():
+        return jsonify(translator.get_pipeline_metrics())
+    
+    @app.route('/api/partial', methods=['GET'])
+    def get_partial():
+        return jsonify(translator.get_partial_transcript())
+    
     @app.route('/api/clear', methods=['POST'])
     def clear_history():
         translator.clear_history()
@@ -691,6 +952,8 @@ def main():
     parser.add_argument("--whisper-model", default="base", help="Whisper model size")
     parser.add_argument("--source-lang", default="auto", help="Default source language")
     parser.add_argument("--target-lang", default="en", help="Default target language")
+    parser.add_argument("--streaming", action="store_true", help="Transcribe while speaking and emit stable words early")
+    parser.add_argument("--cache-dir", default=None, help="Directory to keep translation and speech caches between sessions")
     
     args = parser.parse_args()
     
@@ -699,6 +962,8 @@ def main():
         whisper_model=args.whisper_model,
         default_source_lang=args.source_lang,
         default_target_lang=args.target_lang,
+        streaming_transcription=args.streaming,
+        cache_dir=args.cache_dir,
         web_port=args.port
     )
     
@@ -0,0 +1,394 @@
+"""
+Live Language Translation System - pipeline helpers.
+Speech segmentation, streaming transcription, result caches and pipeline stages
+of live_translator.py, free of audio device and model dependencies.
+"""
+
+import asyncio
+import logging
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from xlib.audio import AudioRingBuffer
+from xlib.time import LatencyHistogram
+
+
+logger = logging.getLogger(__name__)
+
+
+class SpeechSegmenter:
+    """Cuts captured int16 audio into voice segments.
+
+    The capture side only writes samples into the ring buffer. VAD and segmentation
+    run in the consumer, which accumulates speech into a preallocated float32
+    segment buffer and hands out float32 arrays.
+
+    The vad object provides is_speech(frame_bytes, sample_rate) like webrtcvad.Vad.
+    """
+    
+    def __init__(self, ring_buffer: AudioRingBuffer, vad, sample_rate: int, chunk_size: int,
+                 frame_duration_ms: int, silence_timeout: float, max_audio_length: float):
+        self.ring_buffer = ring_buffer
+        self.vad = vad
+        self.sample_rate = sample_rate
+        self.silence_chunks = 0
+        self.max_silence_chunks = int(silence_timeout * sample_rate / chunk_size)
+        self._chunk = np.empty((chunk_size,), dtype=np.int16)
+        self._vad_frame_size = int(sample_rate * frame_duration_ms / 1000)
+        
+        # Current voice segment
+        self.max_segment_samples = int(max_audio_length * sample_rate)
+        self.segment_buffer = np.empty((self.max_segment_samples,), dtype=np.float32)
+        self.segment_length = 0
+        self._streamed_length = 0
+    
+    def _is_speech(self, chunk: np.ndarray) -> bool:
+        """Run VAD on the frames of the chunk, webrtcvad accepts 10/20/30 ms frames only."""
+        frame_size = self._vad_frame_size
+        for start in range(0, len(chunk) - frame_size + 1, frame_size):
+            if self.vad.is_speech(chunk[start:start+frame_size].tobytes(), self.sample_rate):
+                return True
+        return False
+    
+    def _take_segment(self) -> np.ndarray:
+        segment = self.segment_buffer[:self.segment_length].copy()
+        self.segment_length = 0
+        self.silence_chunks = 0
+        self._streamed_length = 0
+        return segment
+    
+    def get_audio_segment(self) -> Optional[np.ndarray]:
+        """Get the next voice segment as float32 array in [-1, 1], or None."""
+        if self._read_segment():
+            return self._take_segment()
+        return None
+    
+    def get_speech_increment(self) -> Tuple[Optional[np.ndarray], bool]:
+        """Get speech appended to the current segment since the last call, and whether the segment is complete.
+        
+        Used by streaming transcription instead of get_audio_segment().
+        """
+        complete = self._read_segment()
+        
+        increment = None
+        if self.segment_length > self._streamed_length:
+            increment = self.segment_buffer[self._streamed_length:self.segment_length].copy()
+        self._streamed_length = self.segment_length
+        
+        if complete:
+            self._take_segment()
+        return increment, complete
+    
+    def _read_segment(self) -> bool:
+        """Move captured audio into the segment buffer, returns True when the segment is complete."""
+        chunk = self._chunk
+        chunk_size = len(chunk)
+        
+        while self.ring_buffer.get_read_available() >= chunk_size:
+            self.ring_buffer.read(chunk)
+            
+            if self._is_speech(chunk):
+                self.silence_chunks = 0
+            else:
+                self.silence_chunks += 1
+                if self.segment_length == 0:
+                    continue
+            
+            n = min(chunk_size, self.max_segment_samples - self.segment_length)
+            np.multiply(chunk[:n], 1.0 / 32768.0, out=self.segment_buffer[self.segment_length:self.segment_length+n], casting='unsafe')
+            self.segment_length += n
+            
+            # Enough silence or the segment is full
+            if self.silence_chunks >= self.max_silence_chunks or self.segment_length >= self.max_segment_samples:
+                return True
+        
+        return False
+
+
+class ResultCache:
+    """Thread-safe LRU cache of model results.
+
+    Bounded by entry count and optionally by total bytes of bytes values.
+    Can be saved to and loaded from a file to keep results between sessions.
+    """
+    
+    def __init__(self, name: str, max_entries: int, max_bytes: Optional[int] = None):
+        self.name = name
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, key) -> Any:
+        """Get the value and mark it as most recently used, or None."""
+        with self._lock:
+            value = self._entries.get(key, None)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+    
+    def put(self, key, value):
+        """Put the value as most recently used, evicting least recently used entries over the bounds."""
+        with self._lock:
+            old_value = self._entries.pop(key, None)
+            if old_value is not None:
+                self._bytes -= self._get_nbytes(old_value)
+            
+            self._entries[key] = value
+            self._bytes += self._get_nbytes(value)
+            
+            while len(self._entries) > 1 and (len(self._entries) > self.max_entries or
+                                              (self.max_bytes is not None and self._bytes > self.max_bytes)):
+                _, evicted_value = self._entries.popitem(last=False)
+                self._bytes -= self._get_nbytes(evicted_value)
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+    
+    def get_stats(self) -> Dict:
+        return {"entries": len(self._entries), "bytes": self._bytes, "hits": self.hits, "misses": self.misses}
+    
+    def load(self, path: Path) -> bool:
+        """Load entries saved by save(), the current entries are more recent."""
+        try:
+            with open(path, "rb") as f:
+                entries = pickle.load(f)
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            logger.warning(f"Failed to load {self.name} cache from {path}: {e}")
+            return False
+        
+        with self._lock:
+            current = list(self._entries.items())
+        for key, value in entries + current:
+            self.put(key, value)
+        logger.info(f"Loaded {len(entries)} {self.name} cache entries")
+        return True
+    
+    def save(self, path: Path):
+        """Save entries from least to most recently used, the file is replaced atomically."""
+        with self._lock:
+            entries = list(self._entries.items())
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                pickle.dump(entries, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"Failed to save {self.name} cache to {path}: {e}")
+            tmp_path.unlink(missing_ok=True)
+    
+    @staticmethod
+    def _get_nbytes(value) -> int:
+        return len(value) if isinstance(value, bytes) else 0
+
+
+class StreamingTranscriber:
+    """Streaming transcription of a growing speech segment.
+
+    The uncommitted part of the segment is transcribed again as audio arrives.
+    Words on which two consecutive hypotheses agree are committed (local agreement)
+    and never change, the rest of the latest hypothesis is a partial that may still
+    be revised. Audio before committed words is trimmed when the window grows past
+    stream_window, so a pass transcribes a few seconds of audio at most.
+
+    The recognizer provides coroutine transcribe_words(audio, language, prompt)
+    returning a list of (start sec, end sec, word) and the detected language.
+    """
+    
+    # Hypothesis words starting this much before the last committed word end are still compared
+    OVERLAP_TOLERANCE = 0.1
+    
+    def __init__(self, recognizer, sample_rate: int, stream_window: float, max_audio_length: float):
+        self.recognizer = recognizer
+        self.sample_rate = sample_rate
+        self.max_window_samples = int(stream_window * sample_rate)
+        
+        # The window never exceeds a voice segment
+        self.window = np.empty((int(max_audio_length * sample_rate),), dtype=np.float32)
+        self.detected_language = "unknown"
+        self.reset()
+    
+    def reset(self):
+        """Start a new segment."""
+        self.window_length = 0
+        self.window_offset = 0.0        # segment time of the first window sample
+        self.unprocessed_samples = 0
+        self.committed_words = []
+        self.committed_end = 0.0
+        self.hypothesis = []
+        self.language = None
+    
+    def insert_audio(self, audio: np.ndarray):
+        """Append float32 audio of the segment."""
+        n = min(len(audio), len(self.window) - self.window_length)
+        self.window[self.window_length:self.window_length+n] = audio[:n]
+        self.window_length += n
+        self.unprocessed_samples += n
+    
+    def get_committed_text(self) -> str:
+        return " ".join(word for _, _, word in self.committed_words)
+    
+    def get_partial_text(self) -> str:
+        return " ".join(word for _, _, word in self.hypothesis)
+    
+    async def process(self) -> str:
+        """Transcribe the window, returns newly committed text."""
+        if self.unprocessed_samples == 0:
+            return ""
+        hypothesis = await self._transcribe()
+        
+        # Commit the longest common prefix of the previous and the current hypothesis
+        n = 0
+        while n < min(len(hypothesis), len(self.hypothesis)) and \
+              self._normalize(hypothesis[n][2]) == self._normalize(self.hypothesis[n][2]):
+            n += 1
+        committed, self.hypothesis = hypothesis[:n], hypothesis[n:]
+        
+        self._commit(committed)
+        self._trim()
+        return " ".join(word for _, _, word in committed)
+    
+    async def finish(self) -> str:
+        """The segment is complete, commit the whole last hypothesis and reset, returns newly committed text."""
+        if self.unprocessed_samples != 0:
+            self.hypothesis = await self._transcribe()
+        committed = self.hypothesis
+        self._commit(committed)
+        self.reset()
+        return " ".join(word for _, _, word in committed)
+    
+    async def _transcribe(self) -> List[Tuple[float, float, str]]:
+        self.unprocessed_samples = 0
+        
+        # Committed text of the segment gives the context of the trimmed audio
+        prompt = self.get_committed_text()[-200:] or None
+        words, detected_language = await self.recognizer.transcribe_words(
+            self.window[:self.window_length], language=self.language, prompt=prompt
+        )
+        if self.language is None and detected_language != "unknown":
+            # Keep the language of the segment stable between passes
+            self.detected_language = self.language = detected_language
+        
+        hypothesis = []
+        for start, end, word in words:
+            start, end, word = start + self.window_offset, end + self.window_offset, word.strip()
+            if word and start >= self.committed_end - self.OVERLAP_TOLERANCE:
+                hypothesis.append((start, end, word))
+        
+        # Drop re-transcribed committed words at the start of the window
+        for n in range(min(len(hypothesis), len(self.committed_words), 5), 0, -1):
+            if [self._normalize(w) for _, _, w in self.committed_words[-n:]] == \
+               [self._normalize(w) for _, _, w in hypothesis[:n]]:
+                hypothesis = hypothesis[n:]
+                break
+        return hypothesis
+    
+    def _commit(self, words: List[Tuple[float, float, str]]):
+        if words:
+            self.committed_words += words
+            self.committed_end = words[-1][1]
+    
+    def _trim(self):
+        """Drop committed audio when the window is longer than stream_window."""
+        if self.window_length <= self.max_window_samples:
+            return
+        cut = int((self.committed_end - self.window_offset) * self.sample_rate)
+        cut = min(max(cut, 0), self.window_length)
+        if cut == 0:
+            return
+        self.window[:self.window_length-cut] = self.window[cut:self.window_length]
+        self.window_length -= cut
+        self.window_offset += cut / self.sample_rate
+    
+    @staticmethod
+    def _normalize(word: str) -> str:
+        return word.strip(" .,!?;:\"'").lower()
+
+
+class PipelineStage:
+    """One stage of the translation pipeline.
+
+    The stage function is a coroutine function taking and returning an item dict,
+    or returning None to drop the item. It runs in a dedicated worker thread with
+    its own event loop, so blocking model calls never stall the main loop or the
+    other stages. Stages are connected by bounded asyncio queues.
+    """
+    
+    def __init__(self, name: str, func, max_queue_size: int):
+        self.name = name
+        self.func = func
+        self.max_queue_size = max_queue_size
+        self.input_queue: Optional[asyncio.Queue] = None
+        self.executor = None
+        self._thread_local = threading.local()
+        
+        self.compute_latency = LatencyHistogram()
+        self.queue_latency = LatencyHistogram()
+    
+    def open(self):
+        """Create the input queue in the running loop and start the worker thread."""
+        self.input_queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"{self.name}_stage")
+    
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
+            self.executor = None
+    
+    def _call(self, item: Dict) -> Optional[Dict]:
+        """Run the stage function in the worker thread."""
+        loop = getattr(self._thread_local, 'loop', None)
+        if loop is None:
+            loop = self._thread_local.loop = asyncio.new_event_loop()
+        return loop.run_until_complete(self.func(item))
+    
+    async def run(self, output_queue: Optional[asyncio.Queue]):
+        """Process items until None is received, None is passed to the next stage."""
+        loop = asyncio.get_running_loop()
+        while True:
+            item = await self.input_queue.get()
+            if item is None:
+                break
+            
+            compute_start = time.perf_counter()
+            self.queue_latency.record(compute_start - item['_enqueue_time'])
+            try:
+                result = await loop.run_in_executor(self.executor, self._call, item)
+            except Exception as e:
+                logger.error(f"{self.name} stage failed: {e}")
+                result = None
+            self.compute_latency.record(time.perf_counter() - compute_start)
+            
+            if result is not None and output_queue is not None:
+                result['_enqueue_time'] = time.perf_counter()
+                # Bounded queue, a slow next stage back-pressures this one
+                await output_queue.put(result)
+        
+        if output_queue is not None:
+            await output_queue.put(None)
+    
+    def get_metrics(self) -> Dict:
+        return {
+            "compute": self.compute_latency.get_summary(),
+            "queue": self.queue_latency.get_summary(),
+            "queue_size": self.input_queue.qsize() if self.input_queue is not None else 0,
+        }
@@ -1,4 +1,5 @@
 import argparse
+import importlib.util
 import os
 import platform
 import sys
@@ -7,12 +8,8 @@ import logging
 from pathlib import Path
 from typing import Optional, Dict, Any
 
-# Conditional import for onnxruntime
-try:
-    import onnxruntime
-    ONNX_AVAILABLE = True
-except ImportError:
-    ONNX_AVAILABLE = False
+# onnxruntime is heavy, it is imported by the stages which use it
+ONNX_AVAILABLE = importlib.util.find_spec('onnxruntime') is not None
 
 # Setup logging early
 logging.basicConfig(
@@ -47,11 +44,30 @@ class StartupTimer:
     def __init__(self):
         self.start_time = time.time()
         self.stages = {}
+        self.profiler = None
+        self.profile_path = None
+    
+    def enable_profile(self, profile_path: Path):
+        """Profile imports, the report of imports and stages is written on every stage mark"""
+        from xlib.python import ImportProfiler
+        self.profiler = ImportProfiler()
+        self.profiler.start()
+        self.profile_path = Path(profile_path)
+        logger.info(f"[PROFILE] Startup profile will be written to {self.profile_path}")
     
     def mark_stage(self, stage_name: str):
         """Mark a startup stage completion"""
         self.stages[stage_name] = time.time() - self.start_time
         logger.info(f"[OK] {stage_name} completed in {self.stages[stage_name]:.2f}s")
+        self.write_profile()
+    
+    def write_profile(self):
+        """Write the startup profile report if profiling is enabled"""
+        if self.profiler is not None:
+            try:
+                self.profiler.write_report(self.profile_path, phases=self.stages)
+            except Exception as e:
+                logger.warning(f"Could not write startup profile: {e}")
     
     def get_summary(self) -> Dict[str, float]:
         """Get startup performance summary"""
@@ -75,6 +91,8 @@ Examples:
   %(prog)s dev split_large_files
             """
         )
+        parser.add_argument('--profile-startup', default=None, metavar='REPORT_JSON',
+                            help="Write import-time tree and startup phase timings to REPORT_JSON (and .txt).")
         subparsers = parser.add_subparsers(dest='command', help='Available commands')
 
         # Run command
@@ -91,6 +109,7 @@ Examples:
             try:
                 from xlib import appargs as lib_appargs
                 lib_appargs.set_arg_bool('NO_CUDA', args.no_cuda)
+                lib_appargs.set_arg_str('BACKEND_IDLE_TIMEOUT', str(getattr(args, 'idle_timeout', 0.0)))
             except ImportError as e:
                 logger.warning(f"Could not import xlib.appargs: {e}")
                 # Set default CUDA behavior
@@ -130,6 +149,9 @@ Examples:
             try:
                 from xlib import appargs as lib_appargs
                 lib_appargs.set_arg_bool('NO_CUDA', args.no_cuda)
+                lib_appargs.set_arg_str('BACKEND_IDLE_TIMEOUT', str(getattr(args, 'idle_timeout', 0.0)))
+                if getattr(args, 'trace_path', None) is not None:
+                    lib_appargs.set_arg_str('TRACE_PATH', str(Path(args.trace_path).resolve()))
             except ImportError as e:
                 logger.warning(f"Could not import xlib.appargs: {e}")
                 # Set default CUDA behavior
@@ -216,12 +238,112 @@ Examples:
                 logger.error(f"[ERROR] Application failed to start: {e}")
                 sys.exit(1)
 
+        def run_PlayaTewsIdentityMaskerBatch(args):
+            """Render a video file or image sequence headless, without UI"""
+            startup_timer.mark_stage("args_parsed")
+
+            userdata_path = Path(args.userdata_dir) if args.userdata_dir else Path.cwd()
+
+            try:
+                from xlib import appargs as lib_appargs
+                lib_appargs.set_arg_bool('NO_CUDA', args.no_cuda)
+            except ImportError as e:
+                logger.warning(f"Could not import xlib.appargs: {e}")
+                os.environ['NO_CUDA'] = str(args.no_cuda).lower()
+
+            def on_progress(frame_num, frame_count, fps):
+                eta = (frame_count - frame_num - 1) / fps if fps != 0 else 0
+                logger.info(f"[RENDER] {frame_num+1}/{frame_count} frames, {fps:.2f} FPS, ETA {eta:.0f}s")
+
+            try:
+                from apps.PlayaTewsIdentityMasker.PlayaTewsIdentityMaskerBatchRenderer import PlayaTewsIdentityMaskerBatchRenderer
+                startup_timer.mark_stage("app_imported")
+
+                renderer = PlayaTewsIdentityMaskerBatchRenderer(userdata_path=userdata_path,
+                                                                input_path=Path(args.input_path),
+                                                                output_path=Path(args.output_path),
+                                                                target_width=args.target_width,
+                                                                crf=args.crf,
+                                                                preset=args.preset,
+                                                                on_progress=on_progress,
+                                                                trace_path=Path(args.trace_path) if args.trace_path else None)
+                stats = renderer.run()
+                startup_timer.mark_stage("app_completed")
+                logger.info(f"[OK] Rendered {stats['frame_count']} frames in {stats['time_elapsed']:.1f}s ({stats['fps']:.2f} FPS)")
+
+                for stage_name, stage_stats in stats['latency']['stages'].items():
+                    queue, compute = stage_stats['queue'], stage_stats['compute']
+                    logger.info(f"[LATENCY] {stage_name}: compute p50/p95/p99 {compute['p50']*1000:.1f}/{compute['p95']*1000:.1f}/{compute['p99']*1000:.1f} ms, "
+                                f"queue p50/p95/p99 {queue['p50']*1000:.1f}/{queue['p95']*1000:.1f}/{queue['p99']*1000:.1f} ms")
+                e2e = stats['latency']['end_to_end']
+                logger.info(f"[LATENCY] end to end p50/p95/p99 {e2e['p50']*1000:.1f}/{e2e['p95']*1000:.1f}/{e2e['p99']*1000:.1f} ms")
+            except ImportError as e:
+                logger.error(f"[ERROR] Failed to import PlayaTewsIdentityMaskerBatchRenderer: {e}")
+                logger.error("Please ensure all dependencies are installed: pip install -r requirements-unified.txt")
+                sys.exit(1)
+            except Exception as e:
+                logger.error(f"[ERROR] Render failed: {e}")
+                sys.exit(1)
+
+        def run_PlayaTewsIdentityMaskerBenchmark(args):
+            """Benchmark the pipeline headless on CPU and compare with baseline results"""
+            try:
+                from xlib import appargs as lib_appargs
+                lib_appargs.set_arg_bool('NO_CUDA', True)
+            except ImportError as e:
+                logger.warning(f"Could not import xlib.appargs: {e}")
+                os.environ['NO_CUDA'] = 'true'
+
+            try:
+                from apps.PlayaTewsIdentityMasker.PlayaTewsIdentityMaskerBenchmark import (
+                    PlayaTewsIdentityMaskerBenchmark, compare_benchmark_results,
+                    load_benchmark_results, save_benchmark_results)
+
+                benchmark = PlayaTewsIdentityMaskerBenchmark(input_path=Path(args.input_path) if args.input_path else None,
+                                                             frame_count=args.frame_count,
+                                                             width=args.width,
+                                                             height=args.height,
+                                                             dfm_model_path=Path(args.dfm_model_path) if args.dfm_model_path else None,
+                                                             require_faces=not args.allow_no_faces)
+                results = benchmark.run()
+            except ImportError as e:
+                logger.error(f"[ERROR] Failed to import PlayaTewsIdentityMaskerBenchmark: {e}")
+                logger.error("Please ensure all dependencies are installed: pip install -r requirements-unified.txt")
+                sys.exit(1)
+            except Exception as e:
+                logger.error(f"[ERROR] Benchmark failed: {e}")
+                sys.exit(1)
+
+            logger.info(f"[BENCHMARK] {results['frames']} frames in {results['time_elapsed']:.1f}s ({results['fps']:.2f} FPS), "
+                        f"{results['faces_per_frame']:.2f} faces per frame, model {results['config']['dfm_model']}")
+            for stage_name, stage_stats in results['stages'].items():
+                compute = stage_stats['compute']
+                logger.info(f"[BENCHMARK] {stage_name}: {stage_stats['fps']:.1f} FPS, compute p50/p95/p99 {compute['p50']*1000:.1f}/{compute['p95']*1000:.1f}/{compute['p99']*1000:.1f} ms")
+            for warning in results['warnings']:
+                logger.warning(f"[BENCHMARK] {warning}")
+            e2e = results['end_to_end']
+            logger.info(f"[BENCHMARK] end to end p50/p95/p99 {e2e['p50']*1000:.1f}/{e2e['p95']*1000:.1f}/{e2e['p99']*1000:.1f} ms")
+
+            if args.output_json:
+                save_benchmark_results(results, Path(args.output_json))
+                logger.info(f"[BENCHMARK] Results saved to {args.output_json}")
+
+            if args.baseline_json:
+                regressions = compare_benchmark_results(load_benchmark_results(Path(args.baseline_json)), results, tolerance=args.tolerance)
+                for regression in regressions:
+                    logger.error(f"[REGRESSION] {regression}")
+                if len(regressions) != 0:
+                    sys.exit(1)
+                logger.info(f"[BENCHMARK] No regressions against {args.baseline_json}")
+
         # Primary OBS-style app parser (now the main interface)
         p = run_subparsers.add_parser('PlayaTewsIdentityMasker', help="Run PlayaTewsIdentityMasker with OBS-style streaming interface")
         p.add_argument('--userdata-dir', default=None, action=fixPathAction, help="Workspace directory.")
         p.add_argument('--no-cuda', action="store_true", default=False, help="Disable CUDA.")
         p.add_argument('--verbose', '-v', action="store_true", default=False, help="Enable verbose logging.")
         p.add_argument('--traditional', action="store_true", default=False, help="Use traditional interface instead of OBS-style.")
+        p.add_argument('--idle-timeout', type=float, default=0.0, metavar='SEC', help="Stop the processing stage after SEC seconds without input, 0 - never.")
+        p.add_argument('--trace-path', default=None, help="Save Chrome trace JSON of per-stage frame latencies on exit, OBS-style interface only.")
         p.set_defaults(func=run_PlayaTewsIdentityMaskerOBS)
 
         # Legacy traditional app parser (for backward compatibility)
@@ -229,6 +351,7 @@ Examples:
         p.add_argument('--userdata-dir', default=None, action=fixPathAction, help="Workspace directory.")
         p.add_argument('--no-cuda', action="store_true", default=False, help="Disable CUDA.")
         p.add_argument('--verbose', '-v', action="store_true", default=False, help="Enable verbose logging.")
+        p.add_argument('--idle-timeout', type=float, default=0.0, metavar='SEC', help="Stop the processing stage after SEC seconds without input, 0 - never.")
         p.set_defaults(func=run_PlayaTewsIdentityMasker)
 
         # Alias for OBS-style (backward compatibility)
@@ -245,6 +368,33 @@ Examples:
         p.add_argument('--verbose', '-v', action="store_true", default=False, help="Enable verbose logging.")
         p.set_defaults(func=run_PlayaTewsIdentityMaskerOptimized)
 
+        # Headless batch render parser
+        p = run_subparsers.add_parser('PlayaTewsIdentityMaskerBatch', help="Render a video file or image sequence without UI, processing every frame.")
+        p.add_argument('--userdata-dir', default=None, action=fixPathAction, help="Workspace directory, settings of the UI session are used.")
+        p.add_argument('--input-path', required=True, help="Video file or image sequence directory.")
+        p.add_argument('--output-path', required=True, help="Output video file.")
+        p.add_argument('--target-width', type=int, default=0, help="Width of processed frames, 0 - source width.")
+        p.add_argument('--crf', type=int, default=18, help="Encoder constant rate factor.")
+        p.add_argument('--preset', default='medium', help="Encoder preset.")
+        p.add_argument('--trace-path', default=None, help="Save Chrome trace JSON of per-stage frame latencies.")
+        p.add_argument('--no-cuda', action="store_true", default=False, help="Disable CUDA.")
+        p.add_argument('--verbose', '-v', action="store_true", default=False, help="Enable verbose logging.")
+        p.set_defaults(func=run_PlayaTewsIdentityMaskerBatch)
+
+        # Headless pipeline benchmark parser
+        p = run_subparsers.add_parser('PlayaTewsIdentityMaskerBenchmark', help="Benchmark the pipeline without UI on CPU, per-stage and end-to-end FPS/latency.")
+        p.add_argument('--input-path', default=None, help="Video file or image sequence directory, default - synthetic clip.")
+        p.add_argument('--frame-count', type=int, default=120, help="Frames of synthetic clip.")
+        p.add_argument('--width', type=int, default=1280, help="Width of synthetic clip.")
+        p.add_argument('--height', type=int, default=720, help="Height of synthetic clip.")
+        p.add_argument('--dfm-model-path', default=None, help="DFM model, default - tiny test model.")
+        p.add_argument('--allow-no-faces', action="store_true", default=False, help="Do not fail when no face is detected or swapped, e.g. in the synthetic clip.")
+        p.add_argument('--output-json', default=None, help="Save results as JSON.")
+        p.add_argument('--baseline-json', default=None, help="Compare with results of previous run, exit code 1 on regression.")
+        p.add_argument('--tolerance', type=float, default=0.1, help="Allowed relative slowdown against baseline.")
+        p.add_argument('--verbose', '-v', action="store_true", default=False, help="Enable verbose logging.")
+        p.set_defaults(func=run_PlayaTewsIdentityMaskerBenchmark)
+
         # Development commands
         dev_parser = subparsers.add_parser("dev", help="Development utilities")
         dev_subparsers = dev_parser.add_subparsers(dest='dev_command', help='Development commands')
@@ -285,6 +435,16 @@ Examples:
                 logger.error(f"❌ Failed to extract FaceSynthetics: {e}")
                 sys.exit(1)
 
+        def run_compile_localization(args):
+            """Compile localization tables with error handling"""
+            try:
+                from localization.localization import compile_tables
+                compile_tables()
+                logger.info("✅ Localization tables compiled")
+            except Exception as e:
+                logger.error(f"❌ Failed to compile localization tables: {e}")
+                sys.exit(1)
+
         # Development command parsers
         p = dev_subparsers.add_parser('split_large_files', help="Split large files for version control")
         p.set_defaults(func=run_split_large_files)
@@ -298,9 +458,15 @@ Examples:
         p.add_argument('--faceset-path', default=None, action=fixPathAction, help="output .dfs path")
         p.set_defaults(func=run_extract_FaceSynthetics)
 
+        p = dev_subparsers.add_parser('compile_localization', help="Compile localization/strings.py to per-language tables")
+        p.set_defaults(func=run_compile_localization)
+
         # Parse arguments
         args = parser.parse_args()
         
+        if args.profile_startup:
+            startup_timer.enable_profile(args.profile_startup)
+        
         # Handle verbose logging
         if hasattr(args, 'verbose') and args.verbose:
             logging.getLogger().setLevel(logging.DEBUG)
@@ -309,6 +475,7 @@ Examples:
         # Execute command
         if hasattr(args, 'func'):
             args.func(args)
+            startup_timer.write_profile()
         else:
             parser.print_help()
             sys.exit(0)
@@ -1,23 +1,25 @@
 from pathlib import Path
-from typing import Iterator, List, Tuple, Union
+from typing import Dict, Iterator, List, Tuple, Union
 
 import numpy as np
 from xlib import onnxruntime as lib_ort
 from xlib import path as lib_path
 from xlib.image import ImageProcessor
-from xlib.net import ThreadFileDownloader
+from xlib.net import ThreadFileDownloader, read_sha256_manifest
 from xlib.onnxruntime.device import ORTDeviceInfo
 
 
 class DFMModelInfo:
-    def __init__(self, name : str, model_path : Path, url : str = None):
+    def __init__(self, name : str, model_path : Path, url : str = None, sha256 : str = None):
         self._name = name
         self._model_path = model_path
         self._url = url
+        self._sha256 = sha256
 
     def get_name(self) -> str: return self._name
     def get_model_path(self) -> Path: return self._model_path
     def get_url(self) -> Union[str, None]: return self._url
+    def get_sha256(self) -> Union[str, None]: return self._sha256
 
     def __eq__(self, other):
         if self is not None and other is not None and isinstance(self, DFMModelInfo) and isinstance(other, DFMModelInfo):
@@ -32,6 +34,12 @@ class DFMModelInfo:
 
 
 def get_available_models_info(models_path : Path) -> List[DFMModelInfo]:
+    """
+    returns predefined models and models found in models_path
+
+    expected digests of predefined models are read from models_path / SHA256SUMS
+    in sha256sum format, downloaded models are checked against them
+    """
     # predefined list of celebs with urls
     dfm_models = [
             DFMModelInfo(name='Albica Johns', model_path=models_path / f'Albica_Johns.dfm', url=rf'https://github.com/iperov/PlayaTewsIdentityMasker/releases/download/ALBICA_JOHNS/Albica_Johns.dfm'),
@@ -67,6 +75,11 @@ def get_available_models_info(models_path : Path) -> List[DFMModelInfo]:
             DFMModelInfo(name='Zahar Lupin', model_path=models_path / f'Zahar_Lupin.dfm', url=rf'https://github.com/iperov/DeepFaceLive/releases/download/ZAHAR_LUPIN/Zahar_Lupin.dfm'),
         ]
 
+    sha256_by_name = _read_models_sha256(models_path)
+    dfm_models = [ DFMModelInfo(name=celeb.get_name(), model_path=celeb.get_model_path(), url=celeb.get_url(),
+                                sha256=sha256_by_name.get(celeb.get_model_path().name, None))
+                   for celeb in dfm_models ]
+
     # scan additional models in directory
     dfm_model_paths = [ celeb.get_model_path() for celeb in dfm_models]
 
@@ -76,6 +89,12 @@ def get_available_models_info(models_path : Path) -> List[DFMModelInfo]:
 
     return dfm_models
 
+def _read_models_sha256(models_path : Path) -> Dict[str, str]:
+    manifest_path = models_path / 'SHA256SUMS'
+    if manifest_path.exists():
+        return read_sha256_manifest(manifest_path)
+    return {}
+
 def get_available_devices() -> List[ORTDeviceInfo]:
     """
     """
@@ -198,7 +217,7 @@ class DFMModelInitializer:
                         new_status = ERROR
                         events.error = 'Model file is not found and URL is not defined.'
                     else:
-                        downloader = ThreadFileDownloader(url=url, savepath=model_path)
+                        downloader = ThreadFileDownloader(url=url, savepath=model_path, sha256=dfm_model_info.get_sha256())
                         new_status = DOWNLOADING
                 else:
                     error = None
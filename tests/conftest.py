@@ -6,6 +6,7 @@ Provides shared fixtures, mocks, and performance optimizations
 import pytest
 import time
 import sys
+import warnings
 from pathlib import Path
 from unittest.mock import Mock, MagicMock, patch
 import numpy as np
@@ -189,7 +190,7 @@ def test_performance_tracking(request, performance_monitor):
     
     # Alert on slow tests
     if duration > 1.0:  # 1 second threshold
-        pytest.warns(UserWarning, f"Slow test detected: {test_name} took {duration:.2f}s")
+        warnings.warn(f"Slow test detected: {test_name} took {duration:.2f}s", UserWarning)
 
 # ============================================================================
 # Parametrized fixtures for comprehensive testing
@@ -302,7 +303,7 @@ def pytest_configure(config):
     print(f"   Benchmarks: {TEST_CONFIG['benchmark_enabled']}")
 
 
-def pytest_addoption(parser):
+def pytest_addoption(parser, pluginmanager):
     """Add custom command line options"""
     parser.addoption(
         "--real-hardware",
@@ -310,12 +311,14 @@ def pytest_addoption(parser):
         default=False,
         help="Enable tests that require real hardware (cameras, GPUs)"
     )
-    parser.addoption(
-        "--benchmark-only",
-        action="store_true",
-        default=False,
-        help="Run only benchmark tests"
-    )
+    # pytest-benchmark provides its own --benchmark-only
+    if not pluginmanager.hasplugin("benchmark"):
+        parser.addoption(
+            "--benchmark-only",
+            action="store_true",
+            default=False,
+            help="Run only benchmark tests"
+        )
 
 
 def pytest_collection_modifyitems(config, items):
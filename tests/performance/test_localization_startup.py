@@ -0,0 +1,46 @@
+"""
+Startup cost of localization: the compiled table of one language
+against building the tables from strings.py of all languages, measured in fresh interpreters
+"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).parent.parent.parent
+
+_MEASURE = """
+import json, sys, time, tracemalloc
+tracemalloc.start()
+time_start = time.perf_counter()
+from localization import localization
+if sys.argv[1] == 'compiled':
+    table = localization.load_table('en-US')
+else:
+    table = localization._build_table('en-US')
+elapsed = time.perf_counter() - time_start
+print(json.dumps({'sec' : elapsed, 'bytes' : tracemalloc.get_traced_memory()[0], 'count' : len(table)}))
+"""
+
+
+def _measure(mode):
+    output = subprocess.check_output([sys.executable, '-c', _MEASURE, mode], cwd=project_root)
+    return json.loads(output)
+
+
+class TestLocalizationStartup:
+    """Startup time and memory of the first lookup"""
+
+    @pytest.mark.benchmark
+    def test_compiled_table_is_smaller(self):
+        compiled = min( (_measure('compiled') for _ in range(3)), key=lambda x: x['sec'])
+        source = min( (_measure('source') for _ in range(3)), key=lambda x: x['sec'])
+
+        print(f"\ncompiled table: {compiled['sec']*1000:.2f} ms, {compiled['bytes']/1024:.0f} KB")
+        print(f"strings.py    : {source['sec']*1000:.2f} ms, {source['bytes']/1024:.0f} KB")
+
+        assert compiled['count'] == source['count']
+        assert compiled['bytes'] < source['bytes']
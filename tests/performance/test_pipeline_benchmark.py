@@ -0,0 +1,91 @@
+"""
+Headless pipeline benchmark tests
+Runs the real backend stages on CPU with a synthetic clip and compares results with baseline
+"""
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+
+class TestBenchmarkResultsComparison:
+    """Tests for regression comparison of benchmark results"""
+
+    @staticmethod
+    def _results(fps, stage_fps, e2e_p95):
+        return {'fps' : fps,
+                'end_to_end' : {'p95' : e2e_p95},
+                'stages' : {'FaceDetectorWorker' : {'fps' : stage_fps, 'compute' : {'p95' : 1.0 / stage_fps}}}}
+
+    @pytest.mark.unit
+    def test_no_regressions_within_tolerance(self):
+        """Slowdown within tolerance is not a regression"""
+        bench = pytest.importorskip('apps.PlayaTewsIdentityMasker.PlayaTewsIdentityMaskerBenchmark')
+        baseline = self._results(30.0, 60.0, 0.1)
+        current = self._results(28.0, 57.0, 0.105)
+        assert bench.compare_benchmark_results(baseline, current, tolerance=0.1) == []
+
+    @pytest.mark.unit
+    def test_regressions_are_reported(self):
+        """Pipeline FPS, stage FPS and latency regressions are reported"""
+        bench = pytest.importorskip('apps.PlayaTewsIdentityMasker.PlayaTewsIdentityMaskerBenchmark')
+        baseline = self._results(30.0, 60.0, 0.1)
+        current = self._results(20.0, 40.0, 0.2)
+        regressions = bench.compare_benchmark_results(baseline, current, tolerance=0.1)
+        assert len(regressions) == 4
+        assert regressions[0].startswith('pipeline')
+
+    @pytest.mark.unit
+    def test_save_and_load_results(self, tmp_path):
+        """Results round-trip through JSON"""
+        bench = pytest.importorskip('apps.PlayaTewsIdentityMasker.PlayaTewsIdentityMaskerBenchmark')
+        results = self._results(30.0, 60.0, 0.1)
+        filepath = tmp_path / 'results.json'
+        bench.save_benchmark_results(results, filepath)
+        assert json.loads(filepath.read_text()) == results
+        assert bench.load_benchmark_results(filepath) == results
+
+
+class TestPipelineBenchmark:
+    """Benchmark of the real pipeline"""
+
+    @pytest.mark.benchmark
+    @pytest.mark.slow
+    def test_synthetic_clip_benchmark(self, tmp_path):
+        """All stages process the synthetic clip and report latencies"""
+        pytest.importorskip('onnxruntime')
+        bench = pytest.importorskip('apps.PlayaTewsIdentityMasker.PlayaTewsIdentityMaskerBenchmark')
+
+        # faces drawn in the synthetic clip may be not detected
+        results = bench.PlayaTewsIdentityMaskerBenchmark(frame_count=30, width=640, height=360, require_faces=False).run()
+
+        assert results['frames'] > 0
+        assert results['fps'] > 0
+        for stage_name in ['FileSourceWorker', 'FaceDetectorWorker', 'FaceMarkerWorker', 'FaceAlignerWorker', 'FaceSwapDFMWorker', 'FaceMergerWorker']:
+            assert stage_name in results['stages']
+            assert results['stages'][stage_name]['compute']['count'] > 0
+        if results['swapped_faces_per_frame'] == 0:
+            assert len(results['warnings']) != 0
+
+        filepath = tmp_path / 'results.json'
+        bench.save_benchmark_results(results, filepath)
+        assert bench.compare_benchmark_results(results, bench.load_benchmark_results(filepath)) == []
+
+    @pytest.mark.benchmark
+    @pytest.mark.slow
+    def test_face_clip_benchmark(self):
+        """Faces of the clip are detected and swapped, so every stage is measured under load"""
+        pytest.importorskip('onnxruntime')
+        pytest.importorskip('torch')
+        bench = pytest.importorskip('apps.PlayaTewsIdentityMasker.PlayaTewsIdentityMaskerBenchmark')
+
+        clip_path = os.environ.get('BENCHMARK_FACE_CLIP', None)
+        if clip_path is None:
+            pytest.skip('BENCHMARK_FACE_CLIP is not set: video file or image sequence directory with a face')
+
+        results = bench.PlayaTewsIdentityMaskerBenchmark(input_path=Path(clip_path)).run()
+
+        assert results['faces_per_frame'] > 0
+        assert results['swapped_faces_per_frame'] > 0
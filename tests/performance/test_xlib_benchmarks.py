@@ -0,0 +1,270 @@
+"""
+Micro-benchmarks of xlib primitives used for every frame
+Shared memory channels, image processing and face geometry with realistic frame sizes and face counts
+
+Run with pytest-benchmark:
+    python -m pytest tests/performance/test_xlib_benchmarks.py --benchmark-autosave
+    python -m pytest tests/performance/test_xlib_benchmarks.py --benchmark-compare
+"""
+
+import multiprocessing
+import multiprocessing.heap
+import multiprocessing.sharedctypes
+import pickle
+import time
+
+import numpy as np
+import pytest
+
+pytest.importorskip('pytest_benchmark')
+
+from xlib import math as lib_math
+from xlib.face import ELandmarks2D, FLandmarks2D
+from xlib.face.FLandmarks2D import uni_landmarks_68
+from xlib.image import ImageProcessor
+from xlib.io import FormattedMemoryViewIO
+from xlib.mp import MPSPSCMRRingData, MPWeakHeap
+
+FRAME_SIZES = { '480p' : (480, 640),
+                '720p' : (720, 1280),
+                '1080p' : (1080, 1920),
+                '4K' : (2160, 3840), }
+
+FACE_COUNTS = [1, 4, 16]
+
+
+def _make_frame(size_name, channels=3, dtype=np.uint8):
+    h, w = FRAME_SIZES[size_name]
+    rnd = np.random.RandomState(0)
+    return rnd.randint(0, 256, (h, w, channels)).astype(dtype)
+
+
+def _make_face_landmarks(h_w, face_count):
+    """68-point landmarks of face_count faces placed over the frame"""
+    h, w = h_w
+    rnd = np.random.RandomState(0)
+    result = []
+    for i in range(face_count):
+        size = rnd.uniform(0.1, 0.3)
+        x, y = rnd.uniform(0, 1-size), rnd.uniform(0, 1-size)
+
+        ulmrks = np.zeros( (68,2), np.float32)
+        ulmrks[0:17] = np.stack([np.linspace(0, 1, 17), 0.6+0.4*np.sin(np.linspace(0, np.pi, 17))], -1)
+        ulmrks[[*range(17,36), 36, 39, 42, 45, 48, 54]] = uni_landmarks_68
+        ulmrks[[37,38,40,41]] = ulmrks[36] + (ulmrks[39]-ulmrks[36])*0.5
+        ulmrks[[43,44,46,47]] = ulmrks[42] + (ulmrks[45]-ulmrks[42])*0.5
+        ulmrks[[*range(49,54), *range(55,68)]] = ulmrks[48] + (ulmrks[54]-ulmrks[48])*0.5
+
+        # uniform face space -> uniform frame space, square face on non square frame
+        ulmrks = (ulmrks*size*(min(h,w)/w, min(h,w)/h) + (x, y)).astype(np.float32)
+        result.append( FLandmarks2D.create(ELandmarks2D.L68, ulmrks) )
+    return result
+
+
+def _make_boxes(count):
+    rnd = np.random.RandomState(0)
+    x1, y1 = rnd.uniform(0, 1800, count), rnd.uniform(0, 1000, count)
+    size = rnd.uniform(20, 300, count)
+    return x1, y1, x1+size, y1+size, rnd.uniform(0, 1, count)
+
+
+class TestSharedMemoryBenchmarks:
+    """Benchmarks of shared memory primitives in a single process"""
+
+    @pytest.mark.benchmark
+    @pytest.mark.parametrize('size_name', list(FRAME_SIZES))
+    def test_weak_heap_add_get(self, benchmark, size_name):
+        """MPWeakHeap.add_data + get_data of a frame"""
+        heap = MPWeakHeap(size_mb=256)
+        data = _make_frame(size_name).data
+
+        def run():
+            return heap.get_data(heap.add_data(data))
+
+        result = benchmark(run)
+        assert result is not None and len(result) == data.nbytes
+        benchmark.extra_info['frame_mb'] = data.nbytes / 1024**2
+
+    @pytest.mark.benchmark
+    @pytest.mark.parametrize('data_size', [1024, 64*1024, 1024*1024])
+    def test_ring_data_write_read(self, benchmark, data_size):
+        """MPSPSCMRRingData.write + read, sizes of pickled BackendConnectionData"""
+        ring = MPSPSCMRRingData(table_size=1024, heap_size_mb=64)
+        data = bytes(data_size)
+
+        def run():
+            ring.write(data)
+            return ring.read()
+
+        result = benchmark(run)
+        assert result is not None and len(result) == data_size
+
+    @pytest.mark.benchmark
+    def test_formatted_memory_view_io(self, benchmark):
+        """FormattedMemoryViewIO formatted records, as used by ring and heap headers"""
+        mv = memoryview(bytearray(64*1024))
+        record_count = 1024
+
+        def run():
+            fmv = FormattedMemoryViewIO(mv)
+            for i in range(record_count):
+                fmv.write_fmt('QQ', i, i*2)
+            fmv.seek(0)
+            for i in range(record_count):
+                fmv.read_fmt('QQ')
+            return fmv.tell()
+
+        assert benchmark(run) == record_count*16
+
+
+def _ring_consumer(ring, heap, item_count, received, timeout):
+    time_start = time.time()
+    count = 0
+    while count < item_count and time.time() - time_start < timeout:
+        data = ring.read(timeout=0.1)
+        if data is None:
+            continue
+        if heap is not None:
+            data = heap.get_data(pickle.loads(data))
+            if data is None:
+                continue
+        count += 1
+    received.value = count
+
+
+class TestSharedMemoryThroughput:
+    """Cross-process throughput of shared memory channels"""
+
+    @staticmethod
+    def _run_channel(frame, item_count, use_heap):
+        """
+        producer in this process, consumer in child process.
+        Producer waits until the previous item is read, like backend stages do.
+
+        returns received item count, elapsed sec
+        """
+        ring = MPSPSCMRRingData(table_size=8, heap_size_mb=64 if not use_heap else 1)
+        heap = MPWeakHeap(size_mb=256) if use_heap else None
+        received = multiprocessing.Value('q', 0)
+        consumer = multiprocessing.Process(target=_ring_consumer, args=(ring, heap, item_count, received, 30.0), daemon=True)
+        consumer.start()
+
+        data = frame.tobytes() if not use_heap else frame.data
+        time_start = time.perf_counter()
+        for _ in range(item_count):
+            while ring.get_write_id() != ring.get_read_id():
+                time.sleep(0)
+            if use_heap:
+                ring.write(pickle.dumps(heap.add_data(data)))
+            else:
+                ring.write(data)
+
+        consumer.join(timeout=60)
+        return received.value, time.perf_counter() - time_start
+
+    @pytest.mark.benchmark
+    @pytest.mark.slow
+    @pytest.mark.parametrize('use_heap', [False, True], ids=['ring', 'heap_ref'])
+    @pytest.mark.parametrize('size_name', ['480p', '1080p'])
+    def test_frame_channel_throughput(self, benchmark, size_name, use_heap):
+        """Frames through ring data, or DataRef through ring data and frame through weak heap"""
+        frame = _make_frame(size_name)
+        item_count = 100
+
+        received, elapsed = benchmark.pedantic(self._run_channel, args=(frame, item_count, use_heap), rounds=3, iterations=1)
+
+        assert received == item_count
+        benchmark.extra_info['fps'] = item_count / elapsed
+        benchmark.extra_info['mb_per_sec'] = item_count * frame.nbytes / 1024**2 / elapsed
+
+
+class TestImageProcessorBenchmarks:
+    """Benchmarks of ImageProcessor operations of the face pipeline"""
+
+    @pytest.mark.benchmark
+    @pytest.mark.parametrize('size_name', list(FRAME_SIZES))
+    def test_resize_frame(self, benchmark, size_name):
+        """Resize of a frame to half size, as FileSource target_width"""
+        frame = _make_frame(size_name)
+        h, w = frame.shape[:2]
+        result = benchmark(lambda: ImageProcessor(frame).resize( (w//2, h//2) ).get_image('HWC'))
+        assert result.shape == (h//2, w//2, 3)
+
+    @pytest.mark.benchmark
+    @pytest.mark.parametrize('size_name', list(FRAME_SIZES))
+    def test_warp_affine_face_to_frame(self, benchmark, size_name):
+        """Warp of a swapped face back to frame space, as FaceMerger does"""
+        frame = _make_frame(size_name)
+        h, w = frame.shape[:2]
+        face = _make_frame('480p')[:224,:224]
+        mat = lib_math.Affine2DMat.from_transformation(112, 112, 10, min(h,w)/3/224, w/3, h/3)
+        result = benchmark(lambda: ImageProcessor(face).warp_affine(mat, w, h).get_image('HWC'))
+        assert result.shape == (h, w, 3)
+
+    @pytest.mark.benchmark
+    @pytest.mark.parametrize('face_size', [224, 512])
+    def test_erode_blur_mask(self, benchmark, face_size):
+        """erode_blur of a face mask"""
+        mask = np.zeros( (face_size, face_size, 1), np.float32)
+        mask[face_size//8:-face_size//8, face_size//8:-face_size//8] = 1.0
+        result = benchmark(lambda: ImageProcessor(mask).erode_blur(5, 25, fade_to_border=True).get_image('HWC'))
+        assert result.shape == (face_size, face_size, 1)
+
+    @pytest.mark.benchmark
+    @pytest.mark.parametrize('face_size', [224, 512])
+    def test_rct(self, benchmark, face_size):
+        """rct color transfer of a swapped face"""
+        rnd = np.random.RandomState(0)
+        face = rnd.uniform(0, 1, (face_size, face_size, 3)).astype(np.float32)
+        like = rnd.uniform(0, 1, (face_size, face_size, 3)).astype(np.float32)
+        result = benchmark(lambda: ImageProcessor(face).rct(like).get_image('HWC'))
+        assert result.shape == (face_size, face_size, 3)
+
+    @pytest.mark.benchmark
+    @pytest.mark.parametrize('size_name', list(FRAME_SIZES))
+    def test_to_ufloat32(self, benchmark, size_name):
+        """uint8 frame to float32"""
+        frame = _make_frame(size_name)
+        result = benchmark(lambda: ImageProcessor(frame).to_ufloat32().get_image('HWC'))
+        assert result.dtype == np.float32
+
+
+class TestFaceGeometryBenchmarks:
+    """Benchmarks of face geometry of FaceDetector, FaceAligner"""
+
+    @pytest.mark.benchmark
+    @pytest.mark.parametrize('face_count', FACE_COUNTS)
+    def test_landmarks_calc_cut(self, benchmark, face_count):
+        """FLandmarks2D.calc_cut of all faces of a 1080p frame"""
+        h_w = FRAME_SIZES['1080p']
+        lmrks_list = _make_face_landmarks(h_w, face_count)
+        result = benchmark(lambda: [lmrks.calc_cut(h_w, 2.2, 224) for lmrks in lmrks_list])
+        assert len(result) == face_count
+
+    @pytest.mark.benchmark
+    @pytest.mark.parametrize('face_count', FACE_COUNTS)
+    @pytest.mark.parametrize('size_name', ['720p', '4K'])
+    def test_landmarks_cut(self, benchmark, size_name, face_count):
+        """FLandmarks2D.cut of all faces of a frame"""
+        frame = _make_frame(size_name)
+        lmrks_list = _make_face_landmarks(frame.shape[:2], face_count)
+        result = benchmark(lambda: [lmrks.cut(frame, 2.2, 224) for lmrks in lmrks_list])
+        assert all(face_image.shape == (224, 224, 3) for face_image, _ in result)
+
+    @pytest.mark.benchmark
+    @pytest.mark.parametrize('point_count', [25, 468])
+    def test_umeyama(self, benchmark, point_count):
+        """Affine2DMat.umeyama of 68-point and FaceMesh landmarks"""
+        rnd = np.random.RandomState(0)
+        src = rnd.uniform(0, 1, (point_count, 2)).astype(np.float32)
+        dst = src * 1.5 + 0.1
+        result = benchmark(lambda: lib_math.Affine2DMat.umeyama(src, dst))
+        assert isinstance(result, lib_math.Affine2DMat)
+
+    @pytest.mark.benchmark
+    @pytest.mark.parametrize('box_count', [100, 1000, 5000])
+    def test_nms(self, benchmark, box_count):
+        """lib_math.nms of detector candidate boxes"""
+        x1, y1, x2, y2, scores = _make_boxes(box_count)
+        result = benchmark(lambda: lib_math.nms(x1, y1, x2, y2, scores, 0.3))
+        assert 0 < len(result) <= box_count
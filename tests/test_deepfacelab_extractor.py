@@ -161,6 +161,38 @@ class TestFaceExtractor:
                     )
                     
                     assert len(result) > 0
+    
+    def test_extract_faces_from_video_skips_and_batches(self, extractor):
+        """Test skipped frames are only grabbed and sampled frames are detected in batches"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            video_path = Path(temp_dir) / "test_video.mp4"
+            
+            with patch('cv2.VideoCapture') as mock_cap:
+                mock_instance = Mock()
+                mock_instance.isOpened.return_value = True
+                mock_instance.read.side_effect = [
+                    (True, np.random.randint(0, 255, (480, 640, 3), dtype=np.uint8))
+                    for _ in range(5)
+                ] + [(False, None)]
+                mock_instance.grab.return_value = True
+                mock_cap.return_value = mock_instance
+                
+                extractor.detector.extract.side_effect = \
+                    lambda img, **kwargs: [np.array([[100, 100, 200, 200]])] * img.shape[0]
+                
+                with patch('cv2.imwrite') as mock_imwrite:
+                    mock_imwrite.return_value = True
+                    
+                    result = extractor.extract_faces_from_video(
+                        video_path, Path(temp_dir), frame_interval=3, batch_size=4
+                    )
+                    
+                    assert [path.name for path in result] == [
+                        f"face_{idx:06d}_00.jpg" for idx in (0, 3, 6, 9, 12)
+                    ]
+                    assert mock_instance.read.call_count == 6
+                    assert mock_instance.grab.call_count == 10
+                    assert extractor.detector.extract.call_count == 2
 
 
 class TestDeepFaceLabDataPreparer:
@@ -0,0 +1,72 @@
+"""
+Unit tests for xlib.audio.AudioRingBuffer
+"""
+
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from xlib.audio import AudioRingBuffer
+
+
+class TestAudioRingBuffer:
+    """Tests for single producer single consumer audio ring buffer"""
+
+    @pytest.mark.unit
+    def test_wraparound(self):
+        ring = AudioRingBuffer(10)
+        out = np.empty( (7,), np.float32)
+        for i in range(5):
+            data = np.arange(i*7, i*7+7, dtype=np.float32)
+            assert ring.write(data) == 7
+            assert ring.read(out) == 7
+            assert np.array_equal(out, data)
+        assert ring.get_read_available() == 0
+
+    @pytest.mark.unit
+    def test_overrun_and_underrun(self):
+        ring = AudioRingBuffer(8)
+        assert ring.write(np.ones( (6,), np.float32)) == 6
+        assert ring.write(np.ones( (6,), np.float32)) == 2
+        assert ring.get_write_available() == 0
+
+        out = np.zeros( (16,), np.float32)
+        assert ring.read(out) == 8
+        assert ring.read(out) == 0
+
+    @pytest.mark.unit
+    def test_skip(self):
+        ring = AudioRingBuffer(8)
+        ring.write(np.arange(8, dtype=np.float32))
+        assert ring.skip(5) == 5
+        out = np.zeros( (8,), np.float32)
+        assert ring.read(out) == 3
+        assert np.array_equal(out[:3], [5,6,7])
+
+    @pytest.mark.unit
+    def test_threaded_stream_order(self):
+        ring = AudioRingBuffer(1000)
+        total = 100000
+        src = np.arange(total, dtype=np.float32)
+        dst = np.empty_like(src)
+
+        def producer():
+            pos = 0
+            while pos < total:
+                n = ring.write(src[pos:pos+370])
+                if n == 0:
+                    time.sleep(0)
+                pos += n
+
+        thread = threading.Thread(target=producer)
+        thread.start()
+        pos = 0
+        while pos < total:
+            n = ring.read(dst[pos:pos+290])
+            if n == 0:
+                time.sleep(0)
+            pos += n
+        thread.join()
+        assert np.array_equal(src, dst)
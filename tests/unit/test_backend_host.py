@@ -0,0 +1,96 @@
+"""
+Unit tests for on demand start of BackendHost stages sharing the input connection
+"""
+
+import time
+
+import pytest
+
+from xlib.mp import csw as lib_csw
+
+
+class _Sheet:
+    class Host(lib_csw.Sheet.Host):
+        pass
+
+    class Worker(lib_csw.Sheet.Worker):
+        pass
+
+
+class _Worker(lib_csw.Worker):
+    def on_tick(self):
+        time.sleep(0.005)
+
+
+def _process_until(hosts, cond, timeout=5.0):
+    time_start = time.perf_counter()
+    while not cond() and time.perf_counter() - time_start < timeout:
+        for host in hosts:
+            host.process_messages()
+        time.sleep(0.005)
+    return cond()
+
+
+@pytest.fixture
+def backend():
+    pytest.importorskip('onnxruntime')
+    from apps.PlayaTewsIdentityMasker import backend
+    return backend
+
+
+@pytest.fixture
+def shared_input(backend):
+    """connection and two stopped hosts reading it"""
+    bc = backend.BackendConnection()
+    hosts = [ backend.BackendHost(bc_in=bc, sheet_cls=_Sheet, worker_cls=_Worker) for _ in range(2) ]
+    yield bc, hosts
+    # starting host is stopped when it is started
+    _process_until(hosts, lambda: not any(host.is_starting() for host in hosts))
+    for host in hosts:
+        host.stop()
+    _process_until(hosts, lambda: all(host.is_stopped() for host in hosts))
+
+
+def _write(backend, bc, frame_nums):
+    for frame_num in frame_nums:
+        bcd = backend.BackendConnectionData(uid=frame_num)
+        bcd.set_frame_num(frame_num)
+        bc.write(bcd)
+
+
+class TestBackendHostSharedInput:
+    """Tests for stages reading the same connection"""
+
+    @pytest.mark.unit
+    def test_start_skips_stale_frames(self, backend, shared_input):
+        bc, (host, _) = shared_input
+        _write(backend, bc, range(4))
+        host.start()
+        assert bc.read().get_frame_num() == 3
+
+    @pytest.mark.unit
+    def test_start_keeps_read_position_of_running_sibling(self, backend, shared_input):
+        bc, (host, sibling) = shared_input
+        sibling.start()
+        assert _process_until([sibling], sibling.is_started)
+
+        _write(backend, bc, range(4))
+        host.start()
+        assert bc.read().get_frame_num() == 0
+
+    @pytest.mark.unit
+    def test_sibling_traffic_does_not_wake_hibernated(self, backend, shared_input):
+        bc, (host, sibling) = shared_input
+        sibling.start()
+        assert _process_until([sibling], sibling.is_started)
+
+        host.start_on_demand()
+        _write(backend, bc, range(4))
+        assert not _process_until([host, sibling], host.is_started, timeout=0.2)
+        assert host.is_pending()
+
+        # the sibling is stopped, next frame wakes the stage
+        sibling.stop()
+        assert _process_until([sibling], sibling.is_stopped)
+        _write(backend, bc, [4])
+        assert _process_until([host], host.is_started)
@@ -0,0 +1,41 @@
+"""
+Unit tests for side reading of the live pipeline output by BackendTracer
+"""
+
+import time
+
+import pytest
+
+
+class TestBackendTracerSideRead:
+    """Tests for traces added from a connection without consuming it"""
+
+    @pytest.mark.unit
+    def test_add_written(self):
+        pytest.importorskip('onnxruntime')
+        from apps.PlayaTewsIdentityMasker import backend
+
+        bc = backend.BackendConnection()
+        tracer = backend.BackendTracer()
+        tracer.start_recording()
+
+        def write(frame_num):
+            bcd = backend.BackendConnectionData(uid=frame_num)
+            bcd.set_frame_num(frame_num)
+            bcd.trace_compute('FaceMerger', time.perf_counter())
+            bc.write(bcd)
+
+        write(0)
+        # data written before the first call is not added
+        tracer.add_written(bc)
+        assert tracer.get_stats()['end_to_end']['count'] == 0
+
+        for frame_num in range(1, 4):
+            write(frame_num)
+        tracer.add_written(bc)
+        tracer.add_written(bc)
+        assert tracer.get_stats()['end_to_end']['count'] == 3
+        assert [ frame_num for _, frame_num, _, _ in tracer._recorded ] == [1, 2, 3]
+
+        # the consumer still reads all data
+        assert bc.read().get_frame_num() == 0
@@ -0,0 +1,60 @@
+"""
+Unit tests for xlib.image.BatchAugmentor
+"""
+
+import numpy as np
+import pytest
+
+from xlib.image import BatchAugmentor, RandomMaskPool
+
+
+class TestRandomMaskPool:
+    """Tests for pre-generated random mask pool"""
+
+    @pytest.mark.unit
+    def test_sample_shape_and_range(self):
+        pool = RandomMaskPool(32, pool_size=8, rnd_state=np.random.RandomState(0))
+        masks = pool.sample(20)
+        assert masks.shape == (20, 32, 32, 1)
+        assert masks.dtype == np.float32
+        assert masks.min() >= 0.0 and masks.max() <= 1.0
+
+    @pytest.mark.unit
+    def test_sample_does_not_modify_pool(self):
+        pool = RandomMaskPool(16, pool_size=4, rnd_state=np.random.RandomState(0))
+        before = pool._masks.copy()
+        pool.sample(16)[...] = 0
+        assert np.array_equal(before, pool._masks)
+
+
+class TestBatchAugmentor:
+    """Tests for batch-vectorized augmentation"""
+
+    @pytest.mark.unit
+    def test_augment_in_place(self):
+        augmentor = BatchAugmentor(32, mask_pool_size=8, rnd_state=np.random.RandomState(0))
+        img = np.random.RandomState(1).rand(16, 32, 32, 3).astype(np.float32)
+        orig = img.copy()
+
+        out = augmentor.augment(img)
+
+        assert out is img
+        assert img.dtype == np.float32
+        assert img.min() >= 0.0 and img.max() <= 1.0
+        assert not np.array_equal(img, orig)
+
+    @pytest.mark.unit
+    def test_all_augmentations_applied(self):
+        augmentor = BatchAugmentor(32, mask_pool_size=8,
+                                   sharpen_chance=100, motion_blur_chance=100, gaussian_blur_chance=100,
+                                   reresize_chance=100, recompress_chance=100,
+                                   rnd_state=np.random.RandomState(0))
+        img = np.random.RandomState(1).rand(64, 32, 32, 3).astype(np.float32)
+        augmentor.augment(img)
+        assert np.isfinite(img).all()
+
+    @pytest.mark.unit
+    def test_wrong_resolution_raises(self):
+        augmentor = BatchAugmentor(32, mask_pool_size=2)
+        with pytest.raises(ValueError):
+            augmentor.augment(np.zeros((2, 16, 16, 3), np.float32))
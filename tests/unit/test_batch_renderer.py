@@ -0,0 +1,120 @@
+"""
+Unit tests for the frame loop of PlayaTewsIdentityMaskerBatchRenderer and xlib.ffmpeg.FFMPEGVideoWriter
+"""
+
+import io
+import sys
+
+import numpy as np
+import pytest
+
+from xlib import ffmpeg as lib_ffmpeg
+from xlib.ffmpeg import FFMPEGVideoWriter
+
+_writer_module = sys.modules[FFMPEGVideoWriter.__module__]
+
+
+class _FakeProc:
+    """Stand-in of ffmpeg process, keeps written stdin"""
+
+    def __init__(self, returncode=0):
+        self.stdin = io.BytesIO()
+        self.stdin.close = lambda: None
+        self._returncode = returncode
+
+    def wait(self):
+        return self._returncode
+
+
+class TestFFMPEGVideoWriter:
+    """Tests for raw frames piped to the encoder"""
+
+    @pytest.mark.unit
+    def test_write_pads_odd_size(self, monkeypatch, tmp_path):
+        procs = []
+        def run(args, **kwargs):
+            procs.append( (args, _FakeProc()) )
+            return procs[-1][1]
+        monkeypatch.setattr(_writer_module, 'run', run)
+
+        writer = FFMPEGVideoWriter(tmp_path / 'out.mp4', fps=25)
+        for i in range(3):
+            writer.write(np.full( (5, 7, 3), i, np.uint8))
+        assert writer.close()
+
+        args, proc = procs[0]
+        assert args[args.index('-s')+1] == '8x6'
+        assert writer.get_frame_count() == 3
+        data = np.frombuffer(proc.stdin.getvalue(), np.uint8).reshape(3, 6, 8, 3)
+        assert [ data[i,5,7,0] for i in range(3) ] == [0, 1, 2]
+
+    @pytest.mark.unit
+    def test_frame_size_change(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(_writer_module, 'run', lambda args, **kwargs: _FakeProc())
+        writer = FFMPEGVideoWriter(tmp_path / 'out.mp4', fps=25)
+        writer.write(np.zeros( (4, 4, 3), np.uint8))
+        with pytest.raises(ValueError):
+            writer.write(np.zeros( (8, 8, 3), np.uint8))
+        writer.close()
+
+
+class _FakeBCD:
+    """Stand-in of BackendConnectionData of the merger output"""
+
+    def __init__(self, frame_num, frame_count, is_reemitted=False):
+        self._frame_num = frame_num
+        self._frame_count = frame_count
+        self._is_reemitted = is_reemitted
+
+    def get_trace(self): return []
+    def assign_weak_heap(self, weak_heap): pass
+    def get_frame_num(self): return self._frame_num
+    def get_frame_count(self): return self._frame_count
+    def get_frame_fps(self): return 25.0
+    def get_is_frame_reemitted(self): return self._is_reemitted
+    def get_merged_image_name(self): return 'merged'
+    def get_frame_image_name(self): return 'frame'
+    def get_image(self, name):
+        return np.full( (4, 4, 3), self._frame_num, np.uint8) if name == 'merged' else None
+
+
+class _FakeConnection:
+    def __init__(self, bcds):
+        self._bcds = list(bcds)
+
+    def read(self, timeout=0):
+        return self._bcds.pop(0) if len(self._bcds) != 0 else None
+
+
+class _FakeWriter:
+    def __init__(self, filepath, fps, **kwargs):
+        self.frames = []
+        _FakeWriter.inst = self
+
+    def get_frame_count(self): return len(self.frames)
+    def write(self, img): self.frames.append(int(img[0,0,0]))
+    def close(self): return True
+
+
+class TestBatchRendererLoop:
+    """Tests for frames written by the render loop"""
+
+    @pytest.mark.unit
+    def test_reemitted_and_repeated_frames_are_skipped(self, monkeypatch, tmp_path):
+        pytest.importorskip('onnxruntime')
+        from apps.PlayaTewsIdentityMasker.PlayaTewsIdentityMaskerBatchRenderer import PlayaTewsIdentityMaskerBatchRenderer
+        monkeypatch.setattr(lib_ffmpeg, 'FFMPEGVideoWriter', _FakeWriter)
+
+        input_dir = tmp_path / 'frames'
+        input_dir.mkdir()
+        renderer = PlayaTewsIdentityMaskerBatchRenderer(tmp_path, input_dir, tmp_path / 'out.mp4')
+
+        bcds = [ _FakeBCD(0, 5), _FakeBCD(0, 5, is_reemitted=True), _FakeBCD(1, 5),
+                 _FakeBCD(1, 5), _FakeBCD(2, 5, is_reemitted=True), _FakeBCD(2, 5),
+                 _FakeBCD(0, 5), _FakeBCD(3, 5), _FakeBCD(4, 5) ]
+        stats = renderer._render([], None, _FakeConnection(bcds), None, frame_timeout=5.0)
+
+        assert _FakeWriter.inst.frames == [0, 1, 2, 3, 4]
+        assert stats['frame_count'] == 5
+        assert stats['skipped'] == 4
+        assert stats['out_of_order'] == 0
@@ -0,0 +1,95 @@
+"""
+Unit tests for on demand start and idle stop of xlib.mp.csw.Host
+"""
+
+import time
+
+import pytest
+
+from xlib.mp import csw as lib_csw
+
+
+class _Sheet:
+    class Host(lib_csw.Sheet.Host):
+        pass
+
+    class Worker(lib_csw.Sheet.Worker):
+        pass
+
+
+class _Worker(lib_csw.Worker):
+    def on_tick(self):
+        time.sleep(0.005)
+
+
+class _Host(lib_csw.Host):
+    """Host with the demand set by the test"""
+
+    def __init__(self):
+        super().__init__(sheet_cls=_Sheet, worker_cls=_Worker)
+        self.demand = False
+
+    def _has_demand(self) -> bool:
+        demand, self.demand = self.demand, False
+        return demand
+
+
+def _process_until(host, cond, timeout=5.0):
+    time_start = time.perf_counter()
+    while not cond() and time.perf_counter() - time_start < timeout:
+        host.process_messages()
+        time.sleep(0.005)
+    return cond()
+
+
+@pytest.fixture
+def host():
+    host = _Host()
+    yield host
+    host.stop()
+    _process_until(host, host.is_stopped)
+
+
+class TestHostOnDemand:
+    """Tests for deferred start and hibernation of the worker process"""
+
+    @pytest.mark.unit
+    def test_starts_on_demand(self, host):
+        host.restore_on_off_state(default_state=True, on_demand=True)
+        assert host.is_pending()
+        assert not _process_until(host, host.is_started, timeout=0.2)
+
+        host.demand = True
+        assert _process_until(host, host.is_started)
+        assert not host.is_pending()
+
+    @pytest.mark.unit
+    def test_restore_off_state(self, host):
+        host.restore_on_off_state(default_state=False, on_demand=True)
+        assert not host.is_pending()
+
+    @pytest.mark.unit
+    def test_stop_cancels_pending(self, host):
+        host.start_on_demand()
+        host.stop()
+        host.demand = True
+        host.process_messages()
+        assert not host.is_pending()
+        assert host.is_stopped()
+
+        host.save_on_off_state()
+        assert host._db.get_value(host._db_key_host_onoff) == False
+
+    @pytest.mark.unit
+    def test_hibernates_after_idle_timeout(self, host):
+        host.set_idle_timeout(0.2)
+        host.start_on_demand()
+        host.demand = True
+        assert _process_until(host, host.is_started)
+
+        assert _process_until(host, lambda: host.is_stopped() and host.is_pending())
+        host.save_on_off_state()
+        assert host._db.get_value(host._db_key_host_onoff) == True
+
+        host.demand = True
+        assert _process_until(host, host.is_started)
@@ -0,0 +1,188 @@
+"""
+Unit tests for xlib.face.Faceset index and bulk import
+"""
+
+import os
+import pickle
+
+import numpy as np
+import pytest
+
+pytest.importorskip('h5py')
+
+from xlib import face as lib_face
+
+
+def _make_ufm(UPerson_uuid=None, with_lmrks=True):
+    ufm = lib_face.UFaceMark()
+    ufm.set_UImage_uuid(os.urandom(16))
+    ufm.set_UPerson_uuid(UPerson_uuid)
+    ufm.set_FRect(lib_face.FRect.from_ltrb([0.1, 0.2, 0.5, 0.6]))
+    if with_lmrks:
+        ufm.add_FLandmarks2D(lib_face.FLandmarks2D.create(lib_face.ELandmarks2D.L68, np.random.rand(68, 2)))
+    return ufm
+
+
+@pytest.fixture
+def faceset_path(tmp_path):
+    return tmp_path / 'test.dfs'
+
+
+class TestUFaceMarkIndex:
+    """Tests for index maintained on Faceset writes"""
+
+    @pytest.mark.unit
+    def test_index_follows_writes(self, faceset_path):
+        person_uuid = os.urandom(16)
+        ufms = [ _make_ufm(person_uuid if i % 2 == 0 else None, with_lmrks=i < 3) for i in range(10) ]
+
+        fs = lib_face.Faceset(faceset_path, write_access=True, recreate=True)
+        fs.add_UFaceMark(ufms)
+        fs.delete_UFaceMark_by_uuid(ufms[0].get_uuid())
+        fs.close()
+
+        fs = lib_face.Faceset(faceset_path)
+        index = fs.get_UFaceMark_index()
+        assert index.get_count() == 9
+        assert set(fs.get_all_UFaceMark_uuids()) == { ufm.get_uuid() for ufm in ufms[1:] }
+        assert len(fs.get_UFaceMark_uuids_by_UPerson_uuid(person_uuid)) == 4
+        assert len(fs.get_UFaceMark_uuids_by_UPerson_uuid(None)) == 5
+        assert index.get_mask_has_FLandmarks2D(lib_face.ELandmarks2D.L68).sum() == 2
+        assert np.allclose(index.get_FRects()[0], ufms[1].get_FRect().as_4pts())
+        fs.close()
+
+    @pytest.mark.unit
+    def test_update_existing(self, faceset_path):
+        fs = lib_face.Faceset(faceset_path, write_access=True, recreate=True)
+        ufm = _make_ufm()
+        fs.add_UFaceMark(ufm)
+
+        person_uuid = os.urandom(16)
+        ufm.set_UPerson_uuid(person_uuid)
+        fs.add_UFaceMark(ufm)
+
+        assert fs.get_UFaceMark_index().get_count() == 1
+        assert fs.get_UFaceMark_uuids_by_UPerson_uuid(person_uuid) == [ufm.get_uuid()]
+        fs.close()
+
+    @pytest.mark.unit
+    def test_optimize_compacts_index(self, faceset_path):
+        fs = lib_face.Faceset(faceset_path, write_access=True, recreate=True)
+        ufms = [ _make_ufm() for _ in range(5) ]
+        fs.add_UFaceMark(ufms)
+        fs.delete_UFaceMark_by_uuid(ufms[2].get_uuid())
+        fs.optimize(verbose=False)
+
+        index = fs.get_UFaceMark_index()
+        assert index.get_count() == 4
+        assert index._get_n_rows() == 4
+        fs.close()
+
+    @pytest.mark.unit
+    def test_rebuild_missing_index(self, faceset_path):
+        fs = lib_face.Faceset(faceset_path, write_access=True, recreate=True)
+        fs.add_UFaceMark([ _make_ufm() for _ in range(3) ])
+        del fs._f['UFaceMark_index']
+        fs.close()
+
+        fs = lib_face.Faceset(faceset_path)
+        assert fs.get_UFaceMark_index().get_count() == 3
+        fs.close()
+
+    @pytest.mark.unit
+    def test_read_only_listing_does_not_build_index(self, faceset_path):
+        fs = lib_face.Faceset(faceset_path, write_access=True, recreate=True)
+        ufms = [ _make_ufm() for _ in range(3) ]
+        fs.add_UFaceMark(ufms)
+        del fs._f['UFaceMark_index']
+        fs.close()
+
+        fs = lib_face.Faceset(faceset_path)
+        assert fs.get_all_UFaceMark_uuids() == sorted(ufm.get_uuid() for ufm in ufms)
+        assert not fs._UFaceMark_index_checked
+        fs.close()
+
+    @pytest.mark.unit
+    def test_rebuild_stale_index_of_same_count(self, faceset_path):
+        fs = lib_face.Faceset(faceset_path, write_access=True, recreate=True)
+        ufms = [ _make_ufm() for _ in range(3) ]
+        fs.add_UFaceMark(ufms)
+
+        # edited by a build without the index: one deleted, one added
+        new_ufm = _make_ufm()
+        del fs._UFaceMark_grp[ufms[0].get_uuid().hex()]
+        fs._group_write_bytes(fs._UFaceMark_grp, new_ufm.get_uuid().hex(), pickle.dumps(new_ufm.dump_state()))
+        fs.close()
+
+        fs = lib_face.Faceset(faceset_path)
+        assert set(fs.get_UFaceMark_index().get_uuids_list()) == { ufms[1].get_uuid(), ufms[2].get_uuid(), new_ufm.get_uuid() }
+        fs.close()
+
+    @pytest.mark.unit
+    def test_duplicate_uuids_in_one_call(self, faceset_path):
+        fs = lib_face.Faceset(faceset_path, write_access=True, recreate=True)
+        ufm = _make_ufm()
+        ufm.get_uuid()
+        duplicate = lib_face.UFaceMark.from_state(ufm.dump_state())
+        duplicate.set_UPerson_uuid(os.urandom(16))
+
+        fs.add_UFaceMark([ufm, duplicate], update_existing=False)
+        index = fs.get_UFaceMark_index()
+        assert index._get_n_rows() == 1
+        # the first one is stored, in DB and in the index
+        assert fs.get_UFaceMark_by_uuid(ufm.get_uuid()).get_UPerson_uuid() is None
+        assert fs.get_UFaceMark_uuids_by_UPerson_uuid(None) == [ufm.get_uuid()]
+        fs.close()
+
+
+class TestUImageBulkImport:
+    """Tests for parallel bulk import of UImage"""
+
+    def _make_uimages(self, count):
+        uimages = []
+        for _ in range(count):
+            uimage = lib_face.UImage()
+            uimage.assign_image(np.random.randint(0, 255, size=(32, 32, 3), dtype=np.uint8))
+            uimages.append(uimage)
+        return uimages
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize('process_count', [0, 2])
+    def test_bulk_import_lossless(self, faceset_path, process_count):
+        uimages = self._make_uimages(10)
+
+        fs = lib_face.Faceset(faceset_path, write_access=True, recreate=True)
+        assert fs.add_UImage_bulk(iter(uimages), process_count=process_count, chunk_size=3) == 10
+        assert fs.get_UImage_count() == 10
+        for uimage in uimages:
+            assert np.array_equal(fs.get_UImage_by_uuid(uimage.get_uuid()).get_image(), uimage.get_image())
+        fs.close()
+
+    @pytest.mark.unit
+    def test_faceset_encoding(self, faceset_path):
+        fs = lib_face.Faceset(faceset_path, write_access=True, recreate=True)
+        assert fs.get_UImage_encoding() == ('png', 100, None)
+        fs.set_UImage_encoding('webp', 101)
+        fs.close()
+
+        fs = lib_face.Faceset(faceset_path, write_access=True)
+        assert fs.get_UImage_encoding() == ('webp', 101, None)
+        uimage = self._make_uimages(1)[0]
+        fs.add_UImage(uimage)
+        assert fs._UImage_image_data_grp[uimage.get_uuid().hex()].attrs['format'] == 'webp'
+        assert np.array_equal(fs.get_UImage_by_uuid(uimage.get_uuid()).get_image(), uimage.get_image())
+
+        with pytest.raises(ValueError):
+            fs.set_UImage_encoding('png', compression=10)
+        fs.close()
+
+    @pytest.mark.unit
+    def test_optimize_keeps_encoding(self, faceset_path):
+        fs = lib_face.Faceset(faceset_path, write_access=True, recreate=True)
+        fs.set_UImage_encoding('webp', 101)
+        fs.add_UImage(self._make_uimages(2))
+        fs.optimize(verbose=False)
+
+        assert fs.get_UImage_encoding() == ('webp', 101, None)
+        assert fs.get_UImage_count() == 2
+        fs.close()
@@ -0,0 +1,225 @@
+"""
+Unit tests for xlib.streamer.FFMPEGFanoutStreamer
+"""
+
+import subprocess
+import sys
+import time
+
+import numpy as np
+import pytest
+
+from xlib import ffmpeg as lib_ffmpeg
+from xlib.streamer import FFMPEGFanoutStreamer
+from xlib.streamer.FFMPEGFanoutStreamer import _FanoutOutput, ts_chunk_has_keyframe
+
+
+def _ts_packet(keyframe=False):
+    packet = bytearray(188)
+    packet[0] = 0x47
+    if keyframe:
+        packet[3] = 0x30    # adaptation field and payload
+        packet[4] = 1       # adaptation field length
+        packet[5] = 0x40    # random access indicator
+    else:
+        packet[3] = 0x10
+    return bytes(packet)
+
+
+# Stand-ins of ffmpeg processes: encoder emits a keyframe TS packet per yuv420p frame,
+# output copies stdin to the file given as the last argument, network output discards it
+_FAKE_ENCODER = """
+import sys
+frame_size = int(sys.argv[1])
+packet = bytearray(188); packet[0] = 0x47; packet[3] = 0x30; packet[4] = 1; packet[5] = 0x40
+while True:
+    data = sys.stdin.buffer.read(frame_size)
+    if len(data) < frame_size:
+        break
+    sys.stdout.buffer.write(packet); sys.stdout.buffer.flush()
+"""
+
+_FAKE_OUTPUT = """
+import os, sys, shutil
+with open(os.devnull if '://' in sys.argv[1] else sys.argv[1], 'wb') as f:
+    shutil.copyfileobj(sys.stdin.buffer, f)
+"""
+
+
+@pytest.fixture
+def started(monkeypatch):
+    """ffmpeg is replaced by the stand-ins, returns list of started processes"""
+    started = []
+
+    def fake_run(args, pipe_stdin=False, pipe_stdout=False, pipe_stderr=False, quiet_stderr=False):
+        if pipe_stdout:
+            width, height = map(int, args[args.index('-s')+1].split('x'))
+            cmd = [sys.executable, '-c', _FAKE_ENCODER, str(width*height*3//2)]
+        else:
+            cmd = [sys.executable, '-c', _FAKE_OUTPUT, args[-1]]
+        started.append('encoder' if pipe_stdout else 'output')
+        return subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE if pipe_stdout else None)
+
+    monkeypatch.setattr(lib_ffmpeg, 'run', fake_run)
+    return started
+
+
+def _write_frames(streamer, count):
+    frames_written = streamer.get_stats()['frames_written'] + count
+    for _ in range(count):
+        assert streamer.write_frame(np.zeros( (16,16,3), np.uint8))
+
+    time_start = time.time()
+    while streamer.get_stats()['frames_written'] != frames_written and time.time() - time_start < 10.0:
+        time.sleep(0.01)
+
+
+def _wait_bytes_written(streamer, name, size):
+    time_start = time.time()
+    while streamer.get_stats()['outputs'][name]['bytes_written'] != size and time.time() - time_start < 10.0:
+        time.sleep(0.01)
+    return streamer.get_stats()['outputs'][name]['bytes_written'] == size
+
+
+class TestTSKeyframeDetection:
+    """Tests for random access indicator detection in MPEG-TS chunks"""
+
+    @pytest.mark.unit
+    def test_detects_keyframe_packet(self):
+        assert ts_chunk_has_keyframe(_ts_packet() * 3 + _ts_packet(keyframe=True))
+        assert not ts_chunk_has_keyframe(_ts_packet() * 4)
+
+
+class TestFanoutOutputDropPolicy:
+    """Tests for bounded queue of a single output"""
+
+    @pytest.mark.unit
+    def test_waits_for_first_keyframe(self):
+        output = _FanoutOutput('test', 'out.ts', 'mpegts', max_queue_bytes=188*10)
+        output.put(_ts_packet(), False)
+        output.put(_ts_packet(keyframe=True), True)
+        output.put(_ts_packet(), False)
+
+        stats = output.get_stats()
+        assert stats['bytes_dropped'] == 188
+        assert len(output._chunks) == 2
+
+    @pytest.mark.unit
+    def test_overflow_drops_until_next_keyframe(self):
+        output = _FanoutOutput('test', 'out.ts', 'mpegts', max_queue_bytes=188*4)
+        output.put(_ts_packet(keyframe=True), True)
+        for _ in range(3):
+            output.put(_ts_packet(), False)
+
+        # queue is full: queued data is dropped and the output waits for a keyframe
+        output.put(_ts_packet(), False)
+        output.put(_ts_packet(), False)
+        assert len(output._chunks) == 0
+        assert output.get_stats()['drop_count'] == 1
+
+        output.put(_ts_packet(keyframe=True), True)
+        assert len(output._chunks) == 1
+        assert output.get_stats()['bytes_dropped'] == 188*6
+
+
+class TestFFMPEGFanoutStreamer:
+    """Tests for single encoder with multiple outputs"""
+
+    @pytest.mark.unit
+    def test_no_outputs_does_not_start_encoder(self):
+        streamer = FFMPEGFanoutStreamer()
+        assert not streamer.write_frame(np.zeros( (4,4,3), np.uint8))
+        assert not streamer.is_running()
+
+    @pytest.mark.unit
+    def test_single_encode_fans_out_to_all_outputs(self, tmp_path, started):
+        streamer = FFMPEGFanoutStreamer(max_frame_queue=100)
+        output_paths = [tmp_path / f'out{i}.ts' for i in range(3)]
+        for i, output_path in enumerate(output_paths):
+            streamer.add_output(f'out{i}', output_path)
+
+        frame_count = 10
+        _write_frames(streamer, frame_count)
+        streamer.stop()
+
+        assert started.count('encoder') == 1
+        assert started.count('output') == 3
+        for output_path in output_paths:
+            assert output_path.stat().st_size == 188*frame_count
+
+    @pytest.mark.unit
+    def test_stream_started_during_recording_keeps_recorded_data(self, tmp_path, started):
+        streamer = FFMPEGFanoutStreamer(max_frame_queue=100)
+        record_path = tmp_path / 'record.ts'
+        streamer.add_output('Recording', record_path)
+        _write_frames(streamer, 10)
+
+        streamer.add_output('Twitch', 'rtmp://localhost/app/key')
+        _write_frames(streamer, 5)
+        streamer.stop()
+
+        # the encoder and the recording are not restarted by the new output
+        assert started == ['encoder', 'output', 'output']
+        assert record_path.stat().st_size == 188*15
+
+    @pytest.mark.unit
+    def test_encoder_restart_rolls_file_to_next_segment(self, tmp_path, started):
+        streamer = FFMPEGFanoutStreamer(max_frame_queue=100)
+        record_path = tmp_path / 'record.ts'
+        streamer.add_output('Recording', record_path)
+        streamer.add_output('Twitch', 'rtmp://localhost/app/key')
+        _write_frames(streamer, 10)
+
+        streamer.set_encoder_params(bitrate=6000)
+        _write_frames(streamer, 4)
+        # frame size change restarts the encoder as well
+        for _ in range(3):
+            assert streamer.write_frame(np.zeros( (32,32,3), np.uint8))
+        time_start = time.time()
+        while streamer.get_stats()['frames_written'] != 17 and time.time() - time_start < 10.0:
+            time.sleep(0.01)
+        streamer.stop()
+
+        # network output is kept connected, the recording continues in new files
+        assert started.count('encoder') == 3
+        assert started.count('output') == 4
+        assert record_path.stat().st_size == 188*10
+        assert (tmp_path / 'record_001.ts').stat().st_size == 188*4
+        assert (tmp_path / 'record_002.ts').stat().st_size == 188*3
+
+
+class TestEnhancedStreamOutputEncoderSession:
+    """Tests for outputs of EnhancedStreamOutput sharing the encoder"""
+
+    @pytest.mark.unit
+    def test_stream_started_during_recording(self, tmp_path, started):
+        pytest.importorskip('onnxruntime')
+        from apps.PlayaTewsIdentityMasker.backend.EnhancedStreamOutput import (
+            EnhancedStreamOutputWorker, RecordingFormat, StreamingPlatform)
+
+        worker = EnhancedStreamOutputWorker.__new__(EnhancedStreamOutputWorker)
+        worker._fanout = FFMPEGFanoutStreamer(max_frame_queue=100)
+        worker._streamers = {}
+        worker._recorder = None
+        worker._current_scene = None
+        worker.streaming_platforms = { StreamingPlatform.TWITCH : {'name': 'Twitch', 'rtmp_base': 'rtmp://localhost/app/',
+                                                                   'enabled': False, 'fps': 60, 'bitrate': 6000} }
+        worker.recording_settings = {'enabled': False, 'format': RecordingFormat.MP4, 'fps': 30, 'bitrate': 8000,
+                                     'path': tmp_path, 'filename_pattern': 'record'}
+
+        worker.start_recording()
+        _write_frames(worker._fanout, 10)
+        assert _wait_bytes_written(worker._fanout, 'Recording', 188*10)
+        assert worker.start_streaming(StreamingPlatform.TWITCH, 'key')
+        _write_frames(worker._fanout, 5)
+        assert _wait_bytes_written(worker._fanout, 'Recording', 188*15)
+        worker.stop_streaming(StreamingPlatform.TWITCH)
+        _write_frames(worker._fanout, 5)
+        assert _wait_bytes_written(worker._fanout, 'Recording', 188*20)
+        worker.stop_recording()
+        worker._fanout.stop()
+
+        # encoder settings of the session are taken from the recording
+        assert started.count('encoder') == 1
+        assert worker._fanout._bitrate == 8000
+        assert (tmp_path / 'record.mp4').stat().st_size == 188*20
@@ -0,0 +1,80 @@
+"""
+Unit tests for xlib.streamer.FFMPEGStreamer
+"""
+
+import subprocess
+import sys
+import time
+
+import cv2
+import numpy as np
+import pytest
+
+from xlib import ffmpeg as lib_ffmpeg
+from xlib.streamer import FFMPEGStreamer
+from xlib.streamer.FFMPEGStreamer import bgr_to_pix_fmt
+
+# Stand-in of ffmpeg which reads the pipe slowly
+_SLOW_FFMPEG = """
+import sys, time
+while True:
+    data = sys.stdin.buffer.read1(65536)
+    if len(data) == 0:
+        break
+    time.sleep(0.005)
+"""
+
+
+class TestPixFmtConversion:
+    """Tests for BGR to raw YUV planes conversion"""
+
+    @pytest.mark.unit
+    def test_yuv420p_is_half_of_bgr24(self):
+        img = np.random.RandomState(0).randint(0, 256, (48, 64, 3)).astype(np.uint8)
+        yuv = bgr_to_pix_fmt(img, 'yuv420p')
+        assert yuv.nbytes == img.nbytes // 2
+        assert np.array_equal(yuv, cv2.cvtColor(img, cv2.COLOR_BGR2YUV_I420))
+
+    @pytest.mark.unit
+    def test_nv12_interleaves_chroma(self):
+        img = np.random.RandomState(0).randint(0, 256, (48, 64, 3)).astype(np.uint8)
+        i420 = bgr_to_pix_fmt(img, 'yuv420p').reshape(-1)
+        nv12 = bgr_to_pix_fmt(img, 'nv12').reshape(-1)
+        y_size, uv_size = 48*64, 24*32
+        assert np.array_equal(nv12[:y_size], i420[:y_size])
+        assert np.array_equal(nv12[y_size::2], i420[y_size:y_size+uv_size])
+        assert np.array_equal(nv12[y_size+1::2], i420[y_size+uv_size:])
+
+    @pytest.mark.unit
+    def test_odd_size_is_padded(self):
+        img = np.zeros( (47, 63, 3), np.uint8)
+        assert bgr_to_pix_fmt(img, 'yuv420p').shape == (48*3//2, 64)
+        assert bgr_to_pix_fmt(img, 'bgr24').shape == (48, 64, 3)
+
+
+class TestFFMPEGStreamer:
+    """Tests for non-blocking writer thread"""
+
+    @pytest.mark.unit
+    def test_slow_encoder_drops_frames_without_blocking(self, monkeypatch):
+        def fake_run(args, pipe_stdin=False, pipe_stdout=False, pipe_stderr=False, quiet_stderr=False):
+            return subprocess.Popen([sys.executable, '-c', _SLOW_FFMPEG], stdin=subprocess.PIPE)
+        monkeypatch.setattr(lib_ffmpeg, 'run', fake_run)
+
+        streamer = FFMPEGStreamer()
+        img = np.zeros( (360, 640, 3), np.uint8)
+        frame_count = 50
+        time_start = time.perf_counter()
+        for _ in range(frame_count):
+            streamer.push_frame(img)
+        push_time = time.perf_counter() - time_start
+
+        time.sleep(0.3)
+        streamer.stop()
+        stats = streamer.get_stats()
+
+        assert push_time < 0.5
+        assert stats['frames_pushed'] == frame_count
+        assert stats['frames_dropped'] > 0
+        assert stats['frames_written'] + stats['frames_dropped'] <= frame_count
+        assert stats['encoder_lag'] > 0
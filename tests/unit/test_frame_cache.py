@@ -0,0 +1,52 @@
+"""
+Unit tests for xlib.player.FrameCache
+"""
+
+import numpy as np
+import pytest
+
+from xlib.player import FrameCache
+
+
+def _frame(nbytes):
+    return (np.zeros( (nbytes,), np.uint8), 'frame')
+
+
+class TestFrameCache:
+    """Tests for byte-budgeted LRU frame cache"""
+
+    @pytest.mark.unit
+    def test_evicts_least_recently_used_over_budget(self):
+        cache = FrameCache(300)
+        for idx in range(3):
+            cache.put(idx, _frame(100))
+        assert cache.get(0) is not None
+
+        cache.put(3, _frame(100))
+        assert 1 not in cache
+        assert all(idx in cache for idx in [0, 2, 3])
+        assert cache.get_bytes() == 300
+
+    @pytest.mark.unit
+    def test_replace_updates_bytes(self):
+        cache = FrameCache(1000)
+        cache.put(0, _frame(100))
+        cache.put(0, _frame(250))
+        assert cache.get_count() == 1
+        assert cache.get_bytes() == 250
+
+    @pytest.mark.unit
+    def test_keeps_last_frame_larger_than_budget(self):
+        cache = FrameCache(100)
+        cache.put(0, _frame(50))
+        cache.put(1, _frame(500))
+        assert cache.get_count() == 1
+        assert cache.get(1) is not None
+
+    @pytest.mark.unit
+    def test_clear(self):
+        cache = FrameCache(1000)
+        cache.put(0, _frame(100))
+        cache.clear()
+        assert cache.get(0) is None
+        assert cache.get_bytes() == 0
@@ -0,0 +1,46 @@
+"""
+Unit tests for xlib.player.ImageSequencePlayer
+"""
+
+import cv2
+import numpy as np
+import pytest
+
+from xlib.player import ImageSequencePlayer
+
+
+@pytest.fixture
+def sequence_dir(tmp_path):
+    for i in range(12):
+        img = np.full( (64,128,3), i*10, np.uint8)
+        cv2.imwrite(str(tmp_path / f'{i:04}.png'), img)
+    return tmp_path
+
+
+class TestImageSequencePlayer:
+    """Tests for prefetching image sequence player"""
+
+    @pytest.mark.unit
+    def test_frames_in_order(self, sequence_dir):
+        player = ImageSequencePlayer(sequence_dir, prefetch_count=4, thread_count=2)
+        try:
+            for idx in list(range(12)) + [3, 0, 11]:
+                img, name = player._on_get_frame(idx)
+                assert name == f'{idx:04}.png'
+                assert img[0,0,0] == idx*10
+            assert len(player._futures) <= 5
+        finally:
+            player.dispose()
+
+    @pytest.mark.unit
+    def test_reduced_decode_for_smaller_target_width(self, sequence_dir):
+        player = ImageSequencePlayer(sequence_dir, prefetch_count=2, thread_count=1)
+        try:
+            img, _ = player._on_get_frame(0)
+            assert img.shape[1] == 128
+
+            player.set_target_width(32)
+            img, _ = player._on_get_frame(1)
+            assert img.shape[1] == 32
+        finally:
+            player.dispose()
@@ -0,0 +1,97 @@
+"""
+Unit tests for xlib.python.ImportProfiler and lazy_import
+"""
+
+import json
+import sys
+
+import pytest
+
+from xlib.python import ImportProfiler, lazy_import
+
+
+@pytest.fixture
+def tmp_package(tmp_path, monkeypatch):
+    (tmp_path / 'prof_pkg_outer.py').write_text('import prof_pkg_inner\nVALUE = prof_pkg_inner.VALUE + 1\n')
+    (tmp_path / 'prof_pkg_inner.py').write_text('VALUE = 41\n')
+    rel_pkg_path = tmp_path / 'prof_rel_pkg'
+    rel_pkg_path.mkdir()
+    (rel_pkg_path / '__init__.py').write_text('from . import sub_a\nfrom .sub_b import VALUE\n')
+    (rel_pkg_path / 'sub_a.py').write_text('VALUE = 1\n')
+    (rel_pkg_path / 'sub_b.py').write_text('from .sub_a import VALUE as A\nVALUE = A + 1\n')
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield tmp_path
+    for name in ['prof_pkg_outer', 'prof_pkg_inner', 'prof_rel_pkg', 'prof_rel_pkg.sub_a', 'prof_rel_pkg.sub_b']:
+        sys.modules.pop(name, None)
+
+
+class TestImportProfiler:
+    """Tests for the import tree of ImportProfiler"""
+
+    @pytest.mark.unit
+    def test_import_tree(self, tmp_package):
+        profiler = ImportProfiler()
+        profiler.start()
+        try:
+            import prof_pkg_outer
+        finally:
+            profiler.stop()
+
+        assert not profiler.is_started()
+        tree = profiler.get_tree()
+        outer = next(node for node in tree if node.name == 'prof_pkg_outer')
+        assert [ child.name for child in outer.children ] == ['prof_pkg_inner']
+        assert outer.cumulative >= outer.children[0].cumulative
+        assert outer.get_self_time() >= 0
+
+    @pytest.mark.unit
+    def test_relative_imports(self, tmp_package):
+        profiler = ImportProfiler()
+        profiler.start()
+        try:
+            import prof_rel_pkg
+        finally:
+            profiler.stop()
+
+        assert prof_rel_pkg.VALUE == 2
+        package = next(node for node in profiler.get_tree() if node.name == 'prof_rel_pkg')
+        # loaded sub_a imported again by sub_b is not recorded
+        assert [ child.name for child in package.children ] == ['prof_rel_pkg.sub_a', 'prof_rel_pkg.sub_b']
+        assert package.children[1].children == []
+
+    @pytest.mark.unit
+    def test_write_report(self, tmp_package):
+        profiler = ImportProfiler()
+        profiler.start()
+        try:
+            import prof_pkg_outer
+        finally:
+            profiler.stop()
+
+        report_path = tmp_package / 'report.json'
+        profiler.write_report(report_path, phases={'imports' : 0.5})
+        report = json.loads(report_path.read_text())
+        assert report['phases'] == {'imports' : 0.5}
+        assert any(node['name'] == 'prof_pkg_outer' for node in report['imports'])
+        assert 'module' in (tmp_package / 'report.txt').read_text()
+
+
+class TestLazyImport:
+    """Tests for deferred module import"""
+
+    @pytest.mark.unit
+    def test_import_on_first_access(self, tmp_package):
+        module = lazy_import('prof_pkg_inner')
+        assert 'prof_pkg_inner' not in sys.modules
+        assert module.VALUE == 41
+        assert 'prof_pkg_inner' in sys.modules
+
+    @pytest.mark.unit
+    def test_returns_loaded_module(self):
+        assert lazy_import('json') is json
+
+    @pytest.mark.unit
+    def test_missing_module_raises_on_access(self):
+        module = lazy_import('no_such_module_xyz')
+        with pytest.raises(ImportError):
+            module.anything
@@ -0,0 +1,103 @@
+"""
+Unit tests for xlib.db.KeyValueDB
+"""
+
+import pytest
+
+from xlib.db import KeyValueDB
+from xlib.io import FormattedFileIO
+
+
+class TestKeyValueDBLog:
+    """Tests for append-only log persistence"""
+
+    @pytest.mark.unit
+    def test_save_appends_only_changed_keys(self, tmp_path):
+        filepath = tmp_path / 'states.dat'
+        db = KeyValueDB(filepath)
+        for i in range(10):
+            db.set_value(f'key{i}', 'x'*1000)
+        db.finish_pending_jobs()
+        size = filepath.stat().st_size
+
+        db.set_value('key3', 'y')
+        db.finish_pending_jobs()
+        assert size < filepath.stat().st_size < size + 200
+
+        db = KeyValueDB(filepath)
+        assert db.get_value('key3') == 'y'
+        assert db.get_value('key9') == 'x'*1000
+
+    @pytest.mark.unit
+    def test_compacts_log(self, tmp_path):
+        filepath = tmp_path / 'states.dat'
+        db = KeyValueDB(filepath, compact_min_records=8)
+        for i in range(20):
+            db.set_value('key', i)
+            db.finish_pending_jobs()
+
+        assert db._log_records <= 8
+        assert KeyValueDB(filepath).get_value('key') == 19
+
+    @pytest.mark.unit
+    def test_background_save(self, tmp_path):
+        filepath = tmp_path / 'states.dat'
+        db = KeyValueDB(filepath)
+        db.set_value('key', 1)
+        db._save_timestamp = 0
+        db.process_messages()
+        db.finish_pending_jobs()
+        assert KeyValueDB(filepath).get_value('key') == 1
+
+    @pytest.mark.unit
+    def test_clear(self, tmp_path):
+        filepath = tmp_path / 'states.dat'
+        db = KeyValueDB(filepath)
+        db.set_value('a', 1)
+        db.finish_pending_jobs()
+        db.clear()
+        db.set_value('b', 2)
+        db.finish_pending_jobs()
+
+        db = KeyValueDB(filepath)
+        assert db.get_value('a') is None
+        assert db.get_value('b') == 2
+
+    @pytest.mark.unit
+    def test_ignores_torn_tail(self, tmp_path):
+        filepath = tmp_path / 'states.dat'
+        db = KeyValueDB(filepath)
+        db.set_value('a', 1)
+        db.finish_pending_jobs()
+        db.set_value('b', 2)
+        db.finish_pending_jobs()
+
+        with open(filepath, 'r+b') as f:
+            f.truncate(filepath.stat().st_size - 3)
+
+        db = KeyValueDB(filepath)
+        assert db.get_value('a') == 1
+        assert db.get_value('b') is None
+
+        # appends after the last complete record
+        db.set_value('c', 3)
+        db.finish_pending_jobs()
+        db = KeyValueDB(filepath)
+        assert db.get_value('a') == 1 and db.get_value('c') == 3
+
+    @pytest.mark.unit
+    def test_reads_snapshot_format(self, tmp_path):
+        filepath = tmp_path / 'states.dat'
+        with FormattedFileIO(filepath, 'w+') as f:
+            f.write_fmt('I', 1)
+            f.write_fmt('I', 2)
+            f.write_pickled( ('a', 1) )
+            f.write_pickled( ('b', 2) )
+
+        db = KeyValueDB(filepath)
+        assert db.get_value('a') == 1 and db.get_value('b') == 2
+
+        db.set_value('a', 3)
+        db.finish_pending_jobs()
+        db = KeyValueDB(filepath)
+        assert db.get_value('a') == 3 and db.get_value('b') == 2
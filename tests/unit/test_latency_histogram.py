@@ -0,0 +1,54 @@
+"""
+Unit tests for xlib.time.LatencyHistogram
+"""
+
+import numpy as np
+import pytest
+
+from xlib.time import LatencyHistogram
+
+
+class TestLatencyHistogram:
+    """Tests for log-linear latency histogram"""
+
+    @pytest.mark.unit
+    def test_percentiles_within_precision(self):
+        values = np.random.RandomState(0).exponential(0.02, 20000)
+        hist = LatencyHistogram()
+        for value in values:
+            hist.record(value)
+
+        assert hist.get_count() == 20000
+        for percentile in [50, 95, 99]:
+            expected = np.percentile(values, percentile)
+            assert abs(hist.get_percentile(percentile) - expected) <= expected * 0.02 + 2e-6
+
+    @pytest.mark.unit
+    def test_small_values_are_exact(self):
+        hist = LatencyHistogram()
+        for us in [5, 10, 20]:
+            hist.record(us * 1e-6)
+        assert hist.get_percentile(50) == pytest.approx(10e-6)
+        assert hist.get_min() == pytest.approx(5e-6)
+        assert hist.get_max() == pytest.approx(20e-6)
+
+    @pytest.mark.unit
+    def test_merge_and_reset(self):
+        hist1, hist2 = LatencyHistogram(), LatencyHistogram()
+        hist1.record(0.001)
+        hist2.record(0.003)
+        hist1.merge(hist2)
+        summary = hist1.get_summary()
+        assert summary['count'] == 2
+        assert summary['mean'] == pytest.approx(0.002)
+
+        hist1.reset()
+        assert hist1.get_count() == 0
+        assert hist1.get_percentile(99) == 0.0
+
+    @pytest.mark.unit
+    def test_clamps_to_max_value(self):
+        hist = LatencyHistogram(max_value=1.0)
+        hist.record(5.0)
+        assert hist.get_max() == 5.0
+        assert hist.get_percentile(100) <= 5.0
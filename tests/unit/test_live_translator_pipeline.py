@@ -0,0 +1,217 @@
+"""
+Unit tests for pipeline helpers of the live translator in live_translator_pipeline
+"""
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from xlib.audio import AudioRingBuffer
+from live_translator_pipeline import PipelineStage, ResultCache, SpeechSegmenter, StreamingTranscriber
+
+
+class _ScriptedRecognizer:
+    """Returns scripted word lists with window relative times, records the calls"""
+
+    def __init__(self, hypotheses, language='en'):
+        self._hypotheses = list(hypotheses)
+        self._language = language
+        self.calls = []
+
+    async def transcribe_words(self, audio, language=None, prompt=None):
+        self.calls.append( (len(audio), language, prompt) )
+        return self._hypotheses.pop(0), self._language
+
+
+class _EnergyVAD:
+    """Speech is any non zero sample"""
+
+    def is_speech(self, frame_bytes, sample_rate):
+        return np.any(np.frombuffer(frame_bytes, np.int16) != 0)
+
+
+class TestStreamingTranscriber:
+    """Tests for local agreement of consecutive hypotheses"""
+
+    @pytest.mark.unit
+    def test_commits_agreed_prefix(self):
+        recognizer = _ScriptedRecognizer([ [(0.0, 0.4, ' hello'), (0.4, 0.8, ' big')],
+                                           [(0.0, 0.4, ' Hello,'), (0.4, 0.8, ' bag'), (0.8, 1.2, ' world')] ])
+        transcriber = StreamingTranscriber(recognizer, sample_rate=10, stream_window=8.0, max_audio_length=10.0)
+
+        transcriber.insert_audio(np.zeros( (8,), np.float32))
+        assert asyncio.run(transcriber.process()) == ''
+        assert transcriber.get_partial_text() == 'hello big'
+
+        # nothing new to transcribe
+        assert asyncio.run(transcriber.process()) == ''
+        assert len(recognizer.calls) == 1
+
+        transcriber.insert_audio(np.zeros( (4,), np.float32))
+        assert asyncio.run(transcriber.process()) == 'Hello,'
+        assert transcriber.get_committed_text() == 'Hello,'
+        assert transcriber.get_partial_text() == 'bag world'
+        assert transcriber.detected_language == 'en'
+        assert recognizer.calls[-1] == (12, 'en', None)
+
+    @pytest.mark.unit
+    def test_trims_committed_audio(self):
+        recognizer = _ScriptedRecognizer([ [(0.0, 0.4, 'hello'), (0.4, 0.8, 'big'), (0.8, 1.4, 'world')],
+                                           [(0.0, 0.4, 'hello'), (0.4, 0.8, 'big'), (0.8, 1.4, 'world'), (1.4, 1.9, 'again')],
+                                           # times are relative to the trimmed window
+                                           [(0.0, 0.5, 'again'), (0.5, 0.9, 'and')] ])
+        transcriber = StreamingTranscriber(recognizer, sample_rate=10, stream_window=1.0, max_audio_length=10.0)
+
+        transcriber.insert_audio(np.arange(15, dtype=np.float32))
+        asyncio.run(transcriber.process())
+        transcriber.insert_audio(np.arange(15, 20, dtype=np.float32))
+        assert asyncio.run(transcriber.process()) == 'hello big world'
+
+        # audio before the end of committed words is dropped
+        assert transcriber.window_offset == pytest.approx(1.4)
+        assert np.array_equal(transcriber.window[:transcriber.window_length], np.arange(14, 20, dtype=np.float32))
+
+        transcriber.insert_audio(np.zeros( (4,), np.float32))
+        assert asyncio.run(transcriber.process()) == 'again'
+        assert recognizer.calls[-1] == (10, 'en', 'hello big world')
+        assert transcriber.committed_words[-1] == (pytest.approx(1.4), pytest.approx(1.9), 'again')
+
+    @pytest.mark.unit
+    def test_finish_commits_last_hypothesis(self):
+        recognizer = _ScriptedRecognizer([ [(0.0, 0.4, 'good')],
+                                           [(0.0, 0.4, 'good'), (0.4, 0.9, 'morning')] ])
+        transcriber = StreamingTranscriber(recognizer, sample_rate=10, stream_window=8.0, max_audio_length=10.0)
+
+        transcriber.insert_audio(np.zeros( (5,), np.float32))
+        asyncio.run(transcriber.process())
+        transcriber.insert_audio(np.zeros( (5,), np.float32))
+        assert asyncio.run(transcriber.finish()) == 'good morning'
+
+        # next segment starts empty
+        assert transcriber.window_length == 0
+        assert transcriber.get_committed_text() == ''
+        assert transcriber.get_partial_text() == ''
+        assert asyncio.run(transcriber.finish()) == ''
+
+
+class TestResultCache:
+    """Tests for bounded LRU cache of model results"""
+
+    @pytest.mark.unit
+    def test_evicts_by_count(self):
+        cache = ResultCache('test', max_entries=2)
+        cache.put('a', 'A')
+        cache.put('b', 'B')
+        assert cache.get('a') == 'A'
+        cache.put('c', 'C')
+
+        # 'b' is least recently used
+        assert cache.get('b') is None
+        assert cache.get('a') == 'A'
+        assert cache.get('c') == 'C'
+        assert cache.get_stats()['hits'] == 3
+        assert cache.get_stats()['misses'] == 1
+
+    @pytest.mark.unit
+    def test_evicts_by_bytes(self):
+        cache = ResultCache('test', max_entries=10, max_bytes=10)
+        cache.put('a', b'1234')
+        cache.put('b', b'1234')
+        cache.put('c', b'1234')
+        assert cache.get('a') is None
+        assert cache.get_stats()['bytes'] == 8
+
+        # replaced value is not counted twice
+        cache.put('c', b'12')
+        assert cache.get_stats()['bytes'] == 6
+
+        # single entry over the bound is kept
+        cache.put('d', b'0'*20)
+        assert cache.get_stats()['entries'] == 1
+        assert cache.get('d') == b'0'*20
+
+    @pytest.mark.unit
+    def test_save_load(self, tmp_path):
+        path = tmp_path / 'cache' / 'tts.pkl'
+        cache = ResultCache('test', max_entries=3)
+        for key in ['a', 'b', 'c']:
+            cache.put(key, key.upper())
+        cache.save(path)
+        assert not path.with_suffix('.pkl.tmp').exists()
+
+        loaded = ResultCache('test', max_entries=3)
+        loaded.put('d', 'D')
+        assert loaded.load(path)
+
+        # entries of the current session are more recent than the loaded ones
+        assert loaded.get('a') is None
+        assert [ loaded.get(key) for key in ['b', 'c', 'd'] ] == ['B', 'C', 'D']
+
+        assert not ResultCache('test', max_entries=3).load(tmp_path / 'missing.pkl')
+
+
+class TestSpeechSegmenter:
+    """Tests for voice segments cut from the capture ring buffer"""
+
+    def _make(self):
+        ring = AudioRingBuffer(1024, dtype=np.int16)
+        segmenter = SpeechSegmenter(ring, _EnergyVAD(), sample_rate=1000, chunk_size=10, frame_duration_ms=10,
+                                    silence_timeout=0.02, max_audio_length=0.1)
+        return ring, segmenter
+
+    @pytest.mark.unit
+    def test_segment_ends_on_silence(self):
+        ring, segmenter = self._make()
+        ring.write(np.zeros( (30,), np.int16))
+        ring.write(np.full( (20,), 16384, np.int16))
+        assert segmenter.get_audio_segment() is None
+
+        ring.write(np.zeros( (20,), np.int16))
+        segment = segmenter.get_audio_segment()
+        # leading silence is skipped, trailing silence is kept
+        assert segment.dtype == np.float32
+        assert len(segment) == 40
+        assert np.all(segment[:20] == 0.5)
+
+    @pytest.mark.unit
+    def test_speech_increments(self):
+        ring, segmenter = self._make()
+        ring.write(np.full( (20,), 16384, np.int16))
+        increment, complete = segmenter.get_speech_increment()
+        assert len(increment) == 20 and not complete
+
+        ring.write(np.full( (100,), 16384, np.int16))
+        increment, complete = segmenter.get_speech_increment()
+        # segment is full at max_audio_length
+        assert len(increment) == 80 and complete
+        assert segmenter.segment_length == 0
+
+
+class TestPipelineStage:
+    """Tests for a stage running in its worker thread"""
+
+    @pytest.mark.unit
+    def test_passes_items_and_end(self):
+        async def double(item):
+            return None if item['value'] < 0 else {'value' : item['value']*2}
+
+        async def run():
+            stage = PipelineStage('double', double, max_queue_size=4)
+            stage.open()
+            output_queue = asyncio.Queue()
+            for value in [1, -1, 2]:
+                await stage.input_queue.put({'value' : value, '_enqueue_time' : 0.0})
+            await stage.input_queue.put(None)
+            await stage.run(output_queue)
+            stage.close()
+
+            results = []
+            while not output_queue.empty():
+                results.append(output_queue.get_nowait())
+            return stage, results
+
+        stage, results = asyncio.run(run())
+        assert [ result['value'] for result in results[:-1] ] == [2, 4]
+        assert results[-1] is None
+        assert stage.get_metrics()['compute']['count'] == 3
@@ -0,0 +1,65 @@
+"""
+Unit tests for xlib.image.PerceptualHashIndex
+"""
+
+import numpy as np
+import pytest
+
+from xlib.image import (PerceptualHashIndex, compute_dhash, compute_phash,
+                        hamming_distance)
+
+
+def _face(seed):
+    rnd = np.random.RandomState(seed)
+    small = rnd.randint(0, 255, (8, 8, 3)).astype(np.uint8)
+    return np.repeat(np.repeat(small, 32, axis=0), 32, axis=1)
+
+
+class TestPerceptualHash:
+    """Tests for dhash and phash functions"""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize('hash_func', [compute_dhash, compute_phash])
+    def test_near_duplicates_are_close(self, hash_func):
+        img = _face(0)
+        noisy = np.clip(img.astype(np.int32) + np.random.RandomState(1).randint(-8, 8, img.shape), 0, 255).astype(np.uint8)
+        other = _face(2)
+
+        assert hamming_distance(hash_func(img), hash_func(noisy)) <= 6
+        assert hamming_distance(hash_func(img), hash_func(other)) > 12
+
+    @pytest.mark.unit
+    def test_hash_size(self):
+        assert compute_dhash(_face(0), hash_size=16) < 2**256
+        assert compute_dhash(_face(0)[...,0]) == compute_dhash(_face(0)[...,0:1])
+
+
+class TestPerceptualHashIndex:
+    """Tests for BK-tree hash index"""
+
+    @pytest.mark.unit
+    def test_find_matches_brute_force(self):
+        rnd = np.random.RandomState(0)
+        hashes = [int(x) for x in rnd.randint(0, 2**62, size=500, dtype=np.int64)]
+        index = PerceptualHashIndex(max_distance=20)
+        for i, h in enumerate(hashes):
+            index.add(h, i)
+        assert index.get_count() == 500
+
+        query = hashes[7] ^ 0b1011
+        expected = sorted( (i, hamming_distance(query, h)) for i, h in enumerate(hashes) if hamming_distance(query, h) <= 20)
+        assert sorted(index.find(query)) == expected
+        assert index.find_nearest(query) == (7, 3)
+
+    @pytest.mark.unit
+    def test_add_if_unique(self):
+        index = PerceptualHashIndex(max_distance=6)
+        assert index.add_if_unique(_face(0), 'a')
+        assert not index.add_if_unique(_face(0).copy(), 'b')
+        assert index.add_if_unique(_face(1), 'c')
+        assert index.get_count() == 2
+
+    @pytest.mark.unit
+    def test_unknown_hash_type(self):
+        with pytest.raises(ValueError):
+            PerceptualHashIndex(hash_type='ahash')
@@ -0,0 +1,57 @@
+"""
+Unit tests for xlib.audio.StreamingVoiceShifter
+"""
+
+import numpy as np
+import pytest
+
+from xlib.audio import StreamingVoiceShifter
+
+
+def _sine(freq, sample_rate=44100, duration=1.0):
+    t = np.arange(int(sample_rate*duration), dtype=np.float32) / sample_rate
+    return (0.5*np.sin(2*np.pi*freq*t)).astype(np.float32)
+
+def _peak_freq(audio, sample_rate=44100):
+    spec = np.abs(np.fft.rfft(audio * np.hanning(len(audio))))
+    return np.argmax(spec) * sample_rate / len(audio)
+
+def _process_by_blocks(shifter, audio, block_size):
+    return np.concatenate([ shifter.process(audio[i:i+block_size]) for i in range(0, len(audio), block_size) ])
+
+
+class TestStreamingVoiceShifter:
+    """Tests for streaming phase vocoder shifter"""
+
+    @pytest.mark.unit
+    def test_neutral_is_delayed_identity(self):
+        shifter = StreamingVoiceShifter(44100)
+        audio = _sine(440)
+        out = _process_by_blocks(shifter, audio, 2048)
+        lat = shifter.get_latency()
+        assert np.allclose(out[lat:], audio[:-lat], atol=1e-4)
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize('semitones, expected_freq', [ (12, 880.0), (-5, 440.0*2**(-5/12)) ])
+    def test_pitch_shift(self, semitones, expected_freq):
+        shifter = StreamingVoiceShifter(44100)
+        shifter.set_pitch_shift(semitones)
+        out = _process_by_blocks(shifter, _sine(440), 2048)
+        assert abs(_peak_freq(out[8192:]) - expected_freq) < 10.0
+
+    @pytest.mark.unit
+    def test_block_size_independence(self):
+        audio = _sine(300)
+        outs = []
+        for block_size in [256, 2048, 3001]:
+            shifter = StreamingVoiceShifter(44100)
+            shifter.set_pitch_shift(3)
+            shifter.set_formant_shift(1.2)
+            outs.append(_process_by_blocks(shifter, audio, block_size))
+        assert np.allclose(outs[0], outs[1], atol=1e-5)
+        assert np.allclose(outs[0], outs[2], atol=1e-5)
+
+    @pytest.mark.unit
+    def test_invalid_frame_size(self):
+        with pytest.raises(ValueError):
+            StreamingVoiceShifter(44100, frame_size=1000)
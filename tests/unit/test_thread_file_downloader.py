@@ -0,0 +1,185 @@
+"""
+Unit tests for xlib.net.ThreadFileDownloader
+"""
+
+import hashlib
+import http.server
+import json
+import re
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from xlib.net import ThreadFileDownloader, read_sha256_manifest
+
+_DATA = np.random.RandomState(0).randint(0, 256, (1000*1000,)).astype(np.uint8).tobytes()
+_SHA256 = hashlib.sha256(_DATA).hexdigest()
+_SEGMENT_SIZE = 64*1024
+
+
+class _RangeHandler(http.server.BaseHTTPRequestHandler):
+    """Stand-in of file hosting, serves _DATA with optional range support"""
+
+    def do_GET(self):
+        self.server.requests.append(self.headers.get('Range'))
+        start, end = 0, len(_DATA)-1
+        range_header = self.headers.get('Range')
+        match = re.match(r'bytes=(\d+)-(\d*)', range_header) if range_header is not None and self.server.ranges else None
+        if match is not None:
+            start = int(match.group(1))
+            end = int(match.group(2)) if match.group(2) else end
+            self.send_response(206)
+            self.send_header('Content-Range', f'bytes {start}-{end}/{len(_DATA)}')
+        else:
+            self.send_response(200)
+        self.send_header('Content-Length', str(end-start+1))
+        self.send_header('ETag', '"v1"')
+        self.end_headers()
+
+        if start != end and self.server.fail_count != 0:
+            # connection is dropped in the middle of the segment
+            self.server.fail_count -= 1
+            self.server.fail_times.append(time.time())
+            self.wfile.write(_DATA[start:start+(end-start)//2])
+            self.close_connection = True
+            return
+        self.wfile.write(_DATA[start:end+1])
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def http_server():
+    server = http.server.ThreadingHTTPServer( ('127.0.0.1', 0), _RangeHandler)
+    server.requests = []
+    server.ranges = True
+    server.fail_count = 0
+    server.fail_times = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _url(server):
+    return f'http://127.0.0.1:{server.server_address[1]}/model.dfm'
+
+
+def _wait(downloader, timeout=10.0):
+    time_start = time.time()
+    while downloader.get_progress() != 100.0 and downloader.get_error() is None and time.time() - time_start < timeout:
+        time.sleep(0.01)
+
+
+class TestThreadFileDownloader:
+    """Tests for parallel, resumable, checksum verified downloads"""
+
+    @pytest.mark.unit
+    def test_parallel_range_download(self, http_server, tmp_path):
+        savepath = tmp_path / 'model.dfm'
+        downloader = ThreadFileDownloader(_url(http_server), savepath, sha256=_SHA256, segment_size=_SEGMENT_SIZE)
+        _wait(downloader)
+
+        assert downloader.get_error() is None
+        assert savepath.read_bytes() == _DATA
+        assert not (tmp_path / 'model.dfm.part').exists()
+        assert not (tmp_path / 'model.dfm.part.json').exists()
+        segment_count = (len(_DATA) + _SEGMENT_SIZE - 1) // _SEGMENT_SIZE
+        assert len(http_server.requests) == 1 + segment_count
+
+    @pytest.mark.unit
+    def test_without_range_support(self, http_server, tmp_path):
+        http_server.ranges = False
+        savepath = tmp_path / 'model.dfm'
+        downloader = ThreadFileDownloader(_url(http_server), savepath, sha256=_SHA256, segment_size=_SEGMENT_SIZE)
+        _wait(downloader)
+
+        assert downloader.get_error() is None
+        assert savepath.read_bytes() == _DATA
+
+    @pytest.mark.unit
+    def test_resumes_partial_file(self, http_server, tmp_path):
+        savepath = tmp_path / 'model.dfm'
+        done = [0, 1, 5]
+        part = bytearray(len(_DATA))
+        for idx in done:
+            part[idx*_SEGMENT_SIZE:(idx+1)*_SEGMENT_SIZE] = _DATA[idx*_SEGMENT_SIZE:(idx+1)*_SEGMENT_SIZE]
+        (tmp_path / 'model.dfm.part').write_bytes(part)
+        (tmp_path / 'model.dfm.part.json').write_text(json.dumps(
+            { 'url' : _url(http_server), 'size' : len(_DATA), 'validator' : '"v1"', 'segment_size' : _SEGMENT_SIZE, 'done' : done } ))
+
+        downloader = ThreadFileDownloader(_url(http_server), savepath, sha256=_SHA256, segment_size=_SEGMENT_SIZE)
+        _wait(downloader)
+
+        assert downloader.get_error() is None
+        assert savepath.read_bytes() == _DATA
+        requested_starts = [ int(re.match(r'bytes=(\d+)-', r).group(1)) for r in http_server.requests[1:] ]
+        assert all(idx*_SEGMENT_SIZE not in requested_starts for idx in done)
+
+    @pytest.mark.unit
+    def test_sha256_mismatch(self, http_server, tmp_path):
+        savepath = tmp_path / 'model.dfm'
+        downloader = ThreadFileDownloader(_url(http_server), savepath, sha256='0'*64, segment_size=_SEGMENT_SIZE)
+        _wait(downloader)
+
+        assert downloader.get_error() is not None
+        assert downloader.get_progress() != 100.0
+        assert not savepath.exists()
+        assert not (tmp_path / 'model.dfm.part').exists()
+
+    @pytest.mark.unit
+    def test_download_to_bytes(self, http_server):
+        downloader = ThreadFileDownloader(_url(http_server), sha256=_SHA256, segment_size=_SEGMENT_SIZE)
+        _wait(downloader)
+
+        assert downloader.get_error() is None
+        assert downloader.get_bytes() == _DATA
+
+    @pytest.mark.unit
+    def test_segment_retry_backs_off(self, http_server, tmp_path, monkeypatch):
+        monkeypatch.setattr(ThreadFileDownloader, '_RETRY_DELAY', 0.2)
+        http_server.fail_count = 2
+        savepath = tmp_path / 'model.dfm'
+        downloader = ThreadFileDownloader(_url(http_server), savepath, sha256=_SHA256, connections=1, segment_size=len(_DATA))
+        _wait(downloader)
+
+        assert downloader.get_error() is None
+        assert savepath.read_bytes() == _DATA
+        # the second retry waits twice as long
+        assert http_server.fail_times[1] - http_server.fail_times[0] >= 0.2
+        assert len(http_server.requests) == 4
+
+    @pytest.mark.unit
+    def test_read_sha256_manifest(self, tmp_path):
+        manifest_path = tmp_path / 'SHA256SUMS'
+        manifest_path.write_text(f'{_SHA256.upper()}  model.dfm\n# comment\nmalformed\n{"0"*64} *other.onnx\n')
+        assert read_sha256_manifest(manifest_path) == { 'model.dfm' : _SHA256, 'other.onnx' : '0'*64 }
+
+
+class TestDFMModelsManifest:
+    """Tests for digests of predefined models read from the models directory"""
+
+    @pytest.mark.unit
+    def test_models_info_sha256(self, tmp_path):
+        pytest.importorskip('onnxruntime')
+        from modelhub import DFLive
+
+        (tmp_path / 'SHA256SUMS').write_text(f'{_SHA256}  Joker.dfm\n')
+        (tmp_path / 'Custom.dfm').write_bytes(b'')
+        models_info = { info.get_name() : info for info in DFLive.get_available_models_info(tmp_path) }
+
+        assert models_info['Joker'].get_sha256() == _SHA256
+        assert models_info['Keanu Reeves'].get_sha256() is None
+        assert models_info['Keanu Reeves'].get_url() is not None
+        assert models_info['Custom'].get_url() is None
+
+    @pytest.mark.unit
+    def test_models_info_without_manifest(self, tmp_path):
+        pytest.importorskip('onnxruntime')
+        from modelhub import DFLive
+
+        assert all( info.get_sha256() is None for info in DFLive.get_available_models_info(tmp_path) )
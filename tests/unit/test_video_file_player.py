@@ -0,0 +1,178 @@
+"""
+Unit tests for the decode thread of xlib.player.VideoFilePlayer
+"""
+
+import threading
+
+import numpy as np
+import pytest
+
+from xlib import ffmpeg as lib_ffmpeg
+from xlib.player import VideoFilePlayer
+
+_FPS = 25
+_FRAME_COUNT = 40
+_KEYFRAME_EVERY = 10
+
+
+class _VideoFilePlayer(VideoFilePlayer):
+    """VideoFilePlayer with ffmpeg process replaced by generator of frames filled with their idx"""
+
+    def __init__(self, *args, **kwargs):
+        self.restarts = []
+        self.get_frame_idxs = []
+        self._fake_pos = None
+        super().__init__(*args, **kwargs)
+
+    def _ffmpeg_stop(self):
+        self._fake_pos = None
+
+    def _ffmpeg_restart(self, start_frame_number=0):
+        self.restarts.append(start_frame_number)
+        self._fake_pos = start_frame_number
+        return True
+
+    def _ffmpeg_next_frame(self):
+        pos = self._fake_pos
+        if pos is None or pos >= _FRAME_COUNT:
+            return None, 'end of file'
+        self._fake_pos = pos + 1
+        width = self._target_width if self._target_width != 0 else 64
+        return np.full( (16, width, 3), pos, np.uint8), None
+
+    def _on_get_frame(self, idx):
+        self.get_frame_idxs.append(idx)
+        return super()._on_get_frame(idx)
+
+
+@pytest.fixture
+def keyframes_ready(monkeypatch):
+    """ffprobe of keyframes is blocked until the event is set"""
+    keyframes_ready = threading.Event()
+
+    def probe(filename):
+        return {'streams' : [ {'codec_type' : 'video', 'width' : 64, 'height' : 16, 'start_time' : '0',
+                               'duration' : str(_FRAME_COUNT / _FPS), 'avg_frame_rate' : f'{_FPS}/1'} ]}
+
+    def probe_keyframes(filename, stream_idx=0):
+        keyframes_ready.wait()
+        return [ idx / _FPS for idx in range(0, _FRAME_COUNT, _KEYFRAME_EVERY) ]
+
+    monkeypatch.setattr(lib_ffmpeg, 'probe', probe)
+    monkeypatch.setattr(lib_ffmpeg, 'probe_keyframes', probe_keyframes)
+    yield keyframes_ready
+    keyframes_ready.set()
+
+
+@pytest.fixture
+def video_path(tmp_path):
+    path = tmp_path / 'video.mp4'
+    path.write_bytes(b'')
+    return path
+
+
+def _wait_until(cond):
+    for _ in range(500):
+        if cond():
+            return True
+        threading.Event().wait(0.01)
+    return cond()
+
+
+def _wait_keyframe_index(player):
+    _wait_until(lambda: player._keyframe_idxs is not None)
+
+
+class TestVideoFilePlayerDecode:
+    """Tests for decoding ahead, seeking and restarts of ffmpeg"""
+
+    @pytest.mark.unit
+    def test_first_frame_without_keyframe_index(self, keyframes_ready, video_path):
+        player = _VideoFilePlayer(video_path, decode_ahead=4)
+        try:
+            img, name = player._on_get_frame(0)
+            assert img[0,0,0] == 0
+            assert name == 'video.mp4_000000'
+            assert player._keyframe_idxs is None
+        finally:
+            keyframes_ready.set()
+            player.dispose()
+
+    @pytest.mark.unit
+    def test_sequential_and_seek(self, keyframes_ready, video_path):
+        keyframes_ready.set()
+        player = _VideoFilePlayer(video_path, decode_ahead=4)
+        try:
+            _wait_keyframe_index(player)
+            for idx in range(6):
+                img, _ = player._on_get_frame(idx)
+                assert img[0,0,0] == idx
+            assert player.restarts == [0]
+
+            # seek forward past the keyframe restarts from the keyframe
+            img, _ = player._on_get_frame(22)
+            assert img[0,0,0] == 22
+            assert player.restarts[-1] == 20
+
+            # seek back to not decoded frame restarts from its keyframe
+            img, _ = player._on_get_frame(12)
+            assert img[0,0,0] == 12
+            assert player.restarts[-1] == 10
+
+            # decoded frames are served from the cache
+            restart_count = len(player.restarts)
+            img, _ = player._on_get_frame(3)
+            assert img[0,0,0] == 3
+            assert len(player.restarts) == restart_count
+        finally:
+            keyframes_ready.set()
+            player.dispose()
+
+    @pytest.mark.unit
+    def test_end_of_file(self, keyframes_ready, video_path):
+        player = _VideoFilePlayer(video_path, decode_ahead=4)
+        try:
+            img, _ = player._on_get_frame(_FRAME_COUNT-1)
+            assert img[0,0,0] == _FRAME_COUNT-1
+
+            img, err = player._on_get_frame(_FRAME_COUNT)
+            assert img is None
+            assert 'end of file' in err
+        finally:
+            keyframes_ready.set()
+            player.dispose()
+
+    @pytest.mark.unit
+    def test_target_width_restarts_decode(self, keyframes_ready, video_path):
+        player = _VideoFilePlayer(video_path, decode_ahead=4)
+        try:
+            img, _ = player._on_get_frame(2)
+            assert img.shape[1] == 64
+
+            player.set_target_width(32)
+            for idx in range(2, 8):
+                img, _ = player._on_get_frame(idx)
+                assert img.shape[1] == 32
+                assert img[0,0,0] == idx
+        finally:
+            keyframes_ready.set()
+            player.dispose()
+
+    @pytest.mark.unit
+    def test_process_keeps_decoding_ahead(self, keyframes_ready, video_path):
+        keyframes_ready.set()
+        player = _VideoFilePlayer(video_path, decode_ahead=4)
+        try:
+            player.set_is_realtime(False)
+            player.req_play_start()
+            for idx in range(30):
+                result = player.process()
+                assert result.new_frame.frame_num == idx
+                assert result.new_frame.image[0,0,0] == idx
+                # frames served from the cache move the decode window too
+                assert _wait_until(lambda: player._dec_pos == idx + 5)
+
+            assert player.get_frame_idxs == [0]
+            assert player.restarts == [0]
+        finally:
+            player.dispose()
@@ -0,0 +1,71 @@
+import numpy as np
+
+
+class AudioRingBuffer:
+    """
+    Lockless Single Producer, Single Consumer ring buffer of audio samples between threads.
+
+    Storage is preallocated, write() and read() only copy samples,
+    so they are safe to call from realtime audio callbacks.
+
+    Producer only advances write position, Consumer only advances read position,
+    positions are monotonic ints, so no lock is required.
+    """
+
+    def __init__(self, capacity : int, dtype=np.float32):
+        self._capacity = capacity
+        self._buffer = np.zeros( (capacity,), dtype)
+        self._write_pos = 0
+        self._read_pos = 0
+
+    def get_capacity(self) -> int: return self._capacity
+
+    def get_read_available(self) -> int:
+        """returns number of samples available to read"""
+        return self._write_pos - self._read_pos
+
+    def get_write_available(self) -> int:
+        """returns number of samples that can be written without overrun"""
+        return self._capacity - (self._write_pos - self._read_pos)
+
+    def write(self, data : np.ndarray) -> int:
+        """
+        Producer: write samples.
+
+        returns number of written samples, less than len(data) if the buffer is full
+        """
+        n = min(data.shape[0], self.get_write_available())
+        if n != 0:
+            capacity = self._capacity
+            start = self._write_pos % capacity
+            first = min(n, capacity - start)
+            self._buffer[start:start+first] = data[:first]
+            self._buffer[:n-first] = data[first:n]
+            self._write_pos += n
+        return n
+
+    def read(self, out : np.ndarray) -> int:
+        """
+        Consumer: read samples into out.
+
+        returns number of read samples, less than len(out) if not enough data
+        """
+        n = min(out.shape[0], self.get_read_available())
+        if n != 0:
+            capacity = self._capacity
+            start = self._read_pos % capacity
+            first = min(n, capacity - start)
+            out[:first] = self._buffer[start:start+first]
+            out[first:n] = self._buffer[:n-first]
+            self._read_pos += n
+        return n
+
+    def skip(self, count : int) -> int:
+        """
+        Consumer: drop oldest samples.
+
+        returns number of dropped samples
+        """
+        n = min(count, self.get_read_available())
+        self._read_pos += n
+        return n
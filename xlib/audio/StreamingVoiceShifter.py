@@ -0,0 +1,171 @@
+from typing import List, Tuple
+
+import numpy as np
+
+
+class StreamingVoiceShifter:
+    def __init__(self, sample_rate : int, frame_size : int = 1024, oversampling : int = 4):
+        """
+        Streaming phase vocoder pitch and formant shifter.
+
+        Audio is processed by blocks of any size, overlap-add state is kept between blocks,
+        so there are no artifacts on block boundaries.
+        Cost of a block is (block_size / hop_size) FFTs of frame_size, independent of the content.
+
+            sample_rate     int
+
+            frame_size(1024)    FFT frame size, power of 2
+
+            oversampling(4)     frame overlap, hop_size = frame_size // oversampling
+
+        Output is delayed by get_latency() samples.
+        """
+        if frame_size & (frame_size-1) != 0:
+            raise ValueError('frame_size must be power of 2')
+
+        self._sample_rate = sample_rate
+        self._frame_size = frame_size
+        self._oversampling = oversampling
+        self._hop_size = hop_size = frame_size // oversampling
+        self._latency = frame_size - hop_size
+
+        n_bins = frame_size // 2 + 1
+        self._bins = np.arange(n_bins, dtype=np.float32)
+        self._window = np.hanning(frame_size).astype(np.float32)
+        self._expected_phase = (2.0*np.pi*hop_size/frame_size) * self._bins
+        self._freq_per_bin = sample_rate / frame_size
+        self._norm = np.float32(hop_size / np.sum(self._window**2))
+
+        self._pitch_factor = 1.0
+        self._formant_factor = 1.0
+        self._band_gains = None
+
+        self.reset()
+
+    def get_latency(self) -> int:
+        """returns delay of output in samples"""
+        return self._frame_size
+
+    def get_hop_size(self) -> int: return self._hop_size
+
+    def set_pitch_shift(self, semitones : float):
+        """shift pitch with formants"""
+        self._pitch_factor = 2.0 ** (semitones / 12.0)
+
+    def set_formant_shift(self, factor : float):
+        """shift spectral envelope by factor keeping the pitch"""
+        self._formant_factor = factor
+
+    def set_band_gains(self, band_gains : List[Tuple[float, float, float]] = None):
+        """
+        set static equalizer applied in the same frames
+
+            band_gains  list of (low_hz, high_hz, gain)
+        """
+        if band_gains is None or len(band_gains) == 0:
+            self._band_gains = None
+            return
+
+        freqs = self._bins * self._freq_per_bin
+        gains = np.ones_like(freqs)
+        for low_hz, high_hz, gain in band_gains:
+            gains[(freqs >= low_hz) & (freqs <= high_hz)] *= gain
+        self._band_gains = gains
+
+    def reset(self):
+        """reset overlap-add state"""
+        frame_size = self._frame_size
+        n_bins = frame_size // 2 + 1
+        self._in_fifo = np.zeros( (frame_size,), np.float32)
+        self._out_fifo = np.zeros( (frame_size,), np.float32)
+        self._out_acc = np.zeros( (frame_size*2,), np.float32)
+        self._last_phase = np.zeros( (n_bins,), np.float32)
+        self._sum_phase = np.zeros( (n_bins,), np.float32)
+        self._rover = self._latency
+
+    def process(self, audio : np.ndarray) -> np.ndarray:
+        """
+        process block of mono audio
+
+            audio   np.ndarray (N,) float32
+
+        returns np.ndarray (N,) float32
+        """
+        audio = audio.astype(np.float32, copy=False)
+        out = np.empty_like(audio)
+
+        frame_size, latency = self._frame_size, self._latency
+        pos, n = 0, audio.shape[0]
+        while pos < n:
+            m = min(n - pos, frame_size - self._rover)
+            rover = self._rover
+            self._in_fifo[rover:rover+m] = audio[pos:pos+m]
+            out[pos:pos+m] = self._out_fifo[rover-latency:rover-latency+m]
+            self._rover += m
+            pos += m
+
+            if self._rover >= frame_size:
+                self._rover = latency
+                self._process_frame()
+        return out
+
+    def _process_frame(self):
+        frame_size, hop_size, oversampling = self._frame_size, self._hop_size, self._oversampling
+        bins = self._bins
+
+        spec = np.fft.rfft(self._in_fifo * self._window)
+        mag = np.abs(spec).astype(np.float32)
+        phase = np.angle(spec).astype(np.float32)
+
+        # True frequency of every bin, in bins
+        delta = phase - self._last_phase - self._expected_phase
+        self._last_phase = phase
+        delta -= (2.0*np.pi) * np.round(delta / (2.0*np.pi))
+        true_bins = bins + delta * (oversampling / (2.0*np.pi))
+
+        pitch_factor = self._pitch_factor
+        if pitch_factor != 1.0:
+            n_bins = bins.shape[0]
+            target = np.round(bins*pitch_factor).astype(np.intp)
+            valid = target < n_bins
+            syn_mag = np.zeros_like(mag)
+            syn_bins = np.zeros_like(true_bins)
+            np.add.at(syn_mag, target[valid], mag[valid])
+            syn_bins[target[valid]] = true_bins[valid]*pitch_factor
+        else:
+            syn_mag, syn_bins = mag, true_bins
+
+        formant_factor = self._formant_factor
+        if formant_factor != 1.0:
+            env = _spectral_envelope(syn_mag)
+            warped_env = np.interp(bins / formant_factor, bins, env, right=0.0)
+            syn_mag = syn_mag / np.maximum(env, 1e-6) * warped_env
+
+        if self._band_gains is not None:
+            syn_mag = syn_mag * self._band_gains
+
+        if pitch_factor != 1.0:
+            self._sum_phase += (2.0*np.pi*hop_size/frame_size) * syn_bins
+            self._sum_phase %= 2.0*np.pi
+        else:
+            # Unshifted bins keep analysis phase, so neutral settings pass audio unchanged
+            self._sum_phase = phase
+
+        frame = np.fft.irfft(syn_mag * np.exp(1j*self._sum_phase), n=frame_size).astype(np.float32)
+        frame *= self._window
+        frame *= self._norm
+
+        out_acc = self._out_acc
+        out_acc[:frame_size] += frame
+        self._out_fifo[:hop_size] = out_acc[:hop_size]
+        out_acc[:-hop_size] = out_acc[hop_size:]
+        out_acc[-hop_size:] = 0
+        self._in_fifo[:self._latency] = self._in_fifo[hop_size:]
+
+
+def _spectral_envelope(mag : np.ndarray, width : int = 16) -> np.ndarray:
+    """
+    smoothed magnitude spectrum by moving average over bins
+    """
+    kernel = np.ones( (width,), np.float32) / width
+    return np.convolve(mag, kernel, mode='same')
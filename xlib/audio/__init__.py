@@ -0,0 +1,2 @@
+from .AudioRingBuffer import AudioRingBuffer
+from .StreamingVoiceShifter import StreamingVoiceShifter
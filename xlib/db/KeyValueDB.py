@@ -1,3 +1,5 @@
+import pickle
+import threading
 import traceback
 from datetime import datetime
 from pathlib import Path
@@ -7,22 +9,55 @@ from ..io import FormattedFileIO
 
 class KeyValueDB:
     _KeyValueDB_VERSION = 1
+    _KeyValueDB_LOG_VERSION = 2
 
-    def __init__(self, filepath = None):
+    # log record ops
+    _OP_SET = 0
+    _OP_CLEAR = 1
+
+    def __init__(self, filepath = None, compact_min_records : int = 64, compact_ratio : float = 2.0):
         """
         Simple key/value database.
 
         each key/value pickled/unpickled separately,
         thus unpickling error will not corrupt whole db
 
-          filepath(None) if None, DB will not be saved on disk
+        File is an append-only log of records.
+        A save appends only keys changed since the last save,
+        the log is compacted to a snapshot of current values when it grows
+        over compact_ratio * key count records.
+        Pickling of changed values is done in process_messages(),
+        writing to the file and compaction are done in a writer thread
+        from already pickled records, live values are never touched there.
+
+          filepath(None)            if None, DB will not be saved on disk
+
+          compact_min_records(64)   don't compact smaller logs
+
+          compact_ratio(2.0)
         """
         self._filepath = Path(filepath) if filepath is not None else None
+        self._compact_min_records = compact_min_records
+        self._compact_ratio = compact_ratio
         self._save_timestamp = None
 
+        self._dirty_keys = set()
+        self._cleared = False
+
+        # Owned by the writer
+        self._records = {}      # key -> latest pickled record
+        self._log_records = 0
+        self._log_end = None
+
+        self._lock = threading.Lock()
+        self._cond = threading.Condition(self._lock)
+        self._pending = []
+        self._writing = False
+        self._thread = None
+
         try:
             d = {}
-            if self._filepath is not None:
+            if self._filepath is not None and self._filepath.exists():
                 with FormattedFileIO(self._filepath, 'r+') as f:
                     ver, = f.read_fmt('I')
                     if ver == KeyValueDB._KeyValueDB_VERSION:
@@ -32,12 +67,56 @@ class KeyValueDB:
                             if obj is not None:
                                 key, data = obj
                                 d[key] = data
+                        # converted to log on the first save
+                        self._records = { key : pickle.dumps( (KeyValueDB._OP_SET, key, data), 4) for key, data in d.items() }
+                    elif ver == KeyValueDB._KeyValueDB_LOG_VERSION:
+                        d, self._records, self._log_records, self._log_end = self._read_log(f)
         except:
             d = {}
+            self._records = {}
+            self._log_records = 0
+            self._log_end = None
         self._data = d
-        
+
+    @staticmethod
+    def _read_log(f):
+        """
+        returns dict, dict of pickled records, record count, offset of the end of the last complete record
+        """
+        file_size = f.seek(0, 2)
+        f.seek(4)
+
+        d = {}
+        records = {}
+        log_records = 0
+        log_end = f.tell()
+        while file_size - log_end >= 8:
+            size, = f.read_fmt('Q')
+            if size <= 8 or log_end + size > file_size:
+                # torn tail of interrupted save
+                break
+            record = f.read(size-8)
+            try:
+                op, key, data = pickle.loads(record)
+            except Exception as e:
+                print(f"Warning: Failed to unpickle object: {e}")
+                op = None
+
+            if op == KeyValueDB._OP_SET:
+                d[key] = data
+                records[key] = record
+            elif op == KeyValueDB._OP_CLEAR:
+                d = {}
+                records = {}
+            log_records += 1
+            log_end = f.tell()
+        return d, records, log_records, log_end
+
     def clear(self):
         self._data = {}
+        self._dirty_keys = set()
+        self._cleared = True
+        self._schedule_save()
 
     def get_value(self, key, default_value=None):
         """
@@ -50,32 +129,129 @@ class KeyValueDB:
         set value by key
         """
         self._data[key] = value
+        self._dirty_keys.add(key)
+        self._schedule_save()
 
+    def _schedule_save(self):
         if self._save_timestamp is None:
             # Save in 1 sec
             self._save_timestamp = datetime.now().timestamp() + 1.0
 
-    def _save_data(self):
-        if self._filepath is not None:
-            try:
-                with FormattedFileIO(self._filepath, 'w+') as f:
-                    f.write_fmt('I', KeyValueDB._KeyValueDB_VERSION)
+    def _save_data(self, wait : bool = False):
+        """
+        pickle changed keys and pass them to the writer thread
+
+            wait(False)     wait until the data is written
+        """
+        if self._filepath is None:
+            self._dirty_keys = set()
+            self._cleared = False
+            return
+
+        records = []
+        if self._cleared:
+            records.append( (KeyValueDB._OP_CLEAR, None, pickle.dumps( (KeyValueDB._OP_CLEAR, None, None), 4)) )
+            self._cleared = False
+
+        d = self._data
+        for key in self._dirty_keys:
+            if key in d:
+                try:
+                    records.append( (KeyValueDB._OP_SET, key, pickle.dumps( (KeyValueDB._OP_SET, key, d[key]), 4)) )
+                except:
+                    print(f'Unable to save the data. {traceback.format_exc()}')
+        self._dirty_keys = set()
+
+        with self._cond:
+            self._pending += records
+            if wait:
+                # Nothing is lost if the process exits right after
+                self._write_pending()
+            else:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._write_thread_proc, daemon=True)
+                    self._thread.start()
+                self._cond.notify()
+
+    def _write_thread_proc(self):
+        with self._cond:
+            while True:
+                while len(self._pending) == 0:
+                    self._cond.wait()
+                self._write_pending()
 
-                    d = self._data
-                    keys = list(d.keys())
-                    f.write_fmt('I', len(keys))
-                    for key in keys:
-                        f.write_pickled( (key, d[key]) )
+    def _write_pending(self):
+        """
+        write all pending records, called under lock
+        """
+        # wait the writer thread finishes its batch
+        while self._writing:
+            self._cond.wait()
+        records, self._pending = self._pending, []
+        if len(records) == 0:
+            return
+
+        self._writing = True
+        self._cond.release()
+        try:
+            for op, key, record in records:
+                if op == KeyValueDB._OP_SET:
+                    self._records[key] = record
+                elif op == KeyValueDB._OP_CLEAR:
+                    self._records = {}
 
-                    f.truncate()
+            try:
+                log_records = self._log_records + len(records)
+                if self._log_end is None or \
+                   (log_records >= self._compact_min_records and \
+                    log_records > len(self._records)*self._compact_ratio):
+                    self._write_snapshot()
+                else:
+                    self._append_records( [ record for _, _, record in records ] )
             except:
                 print(f'Unable to save the data. {traceback.format_exc()}')
+        finally:
+            self._cond.acquire()
+            self._writing = False
+            self._cond.notify_all()
+
+    def _append_records(self, records):
+        with FormattedFileIO(self._filepath, 'r+') as f:
+            f.seek(self._log_end)
+            for record in records:
+                f.write_fmt('Q', 8 + len(record) )
+                f.write(record)
+            f.truncate()
+            self._log_end = f.tell()
+        self._log_records += len(records)
+
+    def _write_snapshot(self):
+        """
+        compact the log to latest records of keys, the file is replaced atomically
+        """
+        records = list(self._records.values())
+
+        tmp_filepath = self._filepath.parent / (self._filepath.name + '.tmp')
+        with FormattedFileIO(tmp_filepath, 'w+') as f:
+            f.write_fmt('I', KeyValueDB._KeyValueDB_LOG_VERSION)
+            for record in records:
+                f.write_fmt('Q', 8 + len(record) )
+                f.write(record)
+            f.truncate()
+            log_end = f.tell()
+        tmp_filepath.replace(self._filepath)
+
+        self._log_end = log_end
+        self._log_records = len(records)
 
     def finish_pending_jobs(self):
         """finish any pending jobs now"""
         if self._save_timestamp is not None:
             self._save_timestamp = None
-            self._save_data()
+            self._save_data(wait=True)
+        else:
+            with self._cond:
+                self._write_pending()
 
     def process_messages(self):
         save_timestamp = self._save_timestamp
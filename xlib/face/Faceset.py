@@ -1,7 +1,10 @@
+import multiprocessing
 import pickle
 import uuid
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Generator, Iterable, List, Union
+from typing import Generator, Iterable, List, Tuple, Union
 
 import cv2
 import h5py
@@ -10,6 +13,7 @@ import numpy as np
 from .. import console as lib_con
 from .FMask import FMask
 from .UFaceMark import UFaceMark
+from .UFaceMarkIndex import UFaceMarkIndex
 from .UImage import UImage
 from .UPerson import UPerson
 
@@ -20,6 +24,10 @@ class Faceset:
         """
         Faceset is a class to store and manage face related data.
 
+        UFaceMark metadata is also kept in columnar UFaceMarkIndex,
+        which is used for fast counting, filtering and listing of faces
+        without unpickling every UFaceMark.
+
         arguments:
 
             path       path to faceset .dfs file
@@ -69,6 +77,11 @@ class Faceset:
             self._UImage_image_data_grp = f.require_group('UImage_image_data')
             self._UPerson_grp = f.require_group('UPerson')
 
+            if self._mode != 'r' or 'UFaceMark_index/uuid' in f:
+                self._UFaceMark_index = UFaceMarkIndex(f.require_group('UFaceMark_index'))
+            else:
+                self._UFaceMark_index = UFaceMarkIndex(None)
+            self._UFaceMark_index_checked = False
 
     def close(self):
         if self._f is not None:
@@ -85,10 +98,13 @@ class Faceset:
         tmp_path = self._path.parent / (self._path.stem + '_optimizing' + self._path.suffix)
 
         tmp_fs = Faceset(tmp_path, write_access=True, recreate=True)
+        for key, value in self._f.attrs.items():
+            tmp_fs._f.attrs[key] = value
         self._group_copy(tmp_fs._UFaceMark_grp, self._UFaceMark_grp, verbose=verbose)
         self._group_copy(tmp_fs._UPerson_grp, self._UPerson_grp, verbose=verbose)
         self._group_copy(tmp_fs._UImage_grp, self._UImage_grp, verbose=verbose)
         self._group_copy(tmp_fs._UImage_image_data_grp, self._UImage_image_data_grp, verbose=verbose)
+        tmp_fs._UFaceMark_index.assign_compacted(self.get_UFaceMark_index())
         tmp_fs.close()
 
         self.close()
@@ -129,18 +145,66 @@ class Faceset:
         if not isinstance(ufacemark_or_list, Iterable):
             ufacemark_or_list : List[UFaceMark] = [ufacemark_or_list]
 
+        index = self.get_UFaceMark_index()
+
+        # one entry per uuid, the same one is written to DB and to the index
+        ufm_by_uuid = {}
+        for ufm in ufacemark_or_list:
+            if update_existing:
+                ufm_by_uuid[ufm.get_uuid()] = ufm
+            else:
+                ufm_by_uuid.setdefault(ufm.get_uuid(), ufm)
+        ufacemark_or_list = list(ufm_by_uuid.values())
+
         for ufm in ufacemark_or_list:
             self._group_write_bytes(self._UFaceMark_grp, ufm.get_uuid().hex(), pickle.dumps(ufm.dump_state()), update_existing=update_existing )
 
+        index.add(ufacemark_or_list, update_existing=update_existing)
+
     def get_UFaceMark_count(self) -> int:
         return len(self._UFaceMark_grp.keys())
 
     def get_all_UFaceMark(self) -> List[UFaceMark]:
         return [ UFaceMark.from_state(pickle.loads(self._group_read_bytes(self._UFaceMark_grp, key, check_key=False))) for key in self._UFaceMark_grp.keys() ]
-    
+
     def get_all_UFaceMark_uuids(self) -> List[bytes]:
+        # listed from DB keys, so read-only faceset without the index is not indexed on open
         return [ uuid.UUID(key).bytes for key in self._UFaceMark_grp.keys() ]
-     
+
+    def get_UFaceMark_uuids_by_UImage_uuid(self, UImage_uuid : bytes) -> List[bytes]:
+        index = self.get_UFaceMark_index()
+        return index.get_uuids_list(index.get_mask_by_UImage_uuid(UImage_uuid))
+
+    def get_UFaceMark_uuids_by_UPerson_uuid(self, UPerson_uuid : Union[bytes, None]) -> List[bytes]:
+        """
+        UPerson_uuid None returns UFaceMark without UPerson
+        """
+        index = self.get_UFaceMark_index()
+        return index.get_uuids_list(index.get_mask_by_UPerson_uuid(UPerson_uuid))
+
+    def get_UFaceMark_index(self) -> UFaceMarkIndex:
+        """
+        returns UFaceMarkIndex for vectorized queries over all UFaceMark.
+
+        The index is rebuilt on first access if it is missing or outdated,
+        for example in facesets created before the index existed.
+        """
+        index = self._UFaceMark_index
+        if not self._UFaceMark_index_checked:
+            self._UFaceMark_index_checked = True
+
+            if not index.is_consistent(self.get_all_UFaceMark_uuids()):
+                if self._mode == 'r':
+                    # Cannot update the file, keep rebuilt index in memory
+                    index = self._UFaceMark_index = UFaceMarkIndex(None)
+                index.clear()
+
+                keys = list(self._UFaceMark_grp.keys())
+                for i in range(0, len(keys), 1024):
+                    index.add( UFaceMark.from_state(pickle.loads(self._group_read_bytes(self._UFaceMark_grp, key, check_key=False)))
+                               for key in keys[i:i+1024] )
+        return index
+
     def get_UFaceMark_by_uuid(self, uuid : bytes) -> Union[UFaceMark, None]:
         data = self._group_read_bytes(self._UFaceMark_grp, uuid.hex())
         if data is None:
@@ -148,13 +212,24 @@ class Faceset:
         return UFaceMark.from_state(pickle.loads(data))
 
     def delete_UFaceMark_by_uuid(self, uuid : bytes) -> bool:
+        index = self.get_UFaceMark_index()
         key = uuid.hex()
         if key in self._UFaceMark_grp:
             del self._UFaceMark_grp[key]
+            index.delete(uuid)
             return True
         return False
-    
-           
+
+    def iter_UFaceMark_by_uuids(self, uuids : Iterable[bytes]) -> Generator[UFaceMark, None, None]:
+        """
+        returns Generator of UFaceMark materialized on demand,
+        for example from uuids selected with UFaceMarkIndex
+        """
+        for uuid in uuids:
+            ufm = self.get_UFaceMark_by_uuid(uuid)
+            if ufm is not None:
+                yield ufm
+
     def iter_UFaceMark(self) -> Generator[UFaceMark, None, None]:
         """
         returns Generator of UFaceMark
@@ -168,50 +243,139 @@ class Faceset:
         """
         for key in self._UFaceMark_grp.keys():
             del self._UFaceMark_grp[key]
+        self._UFaceMark_index.clear()
 
     ###################
     ### UImage
     ###################
-    def add_UImage(self, uimage_or_list : UImage, format : str = 'png', quality : int = 100, update_existing=True):
+    def set_UImage_encoding(self, format : str = 'png', quality : int = 100, compression : int = None):
         """
-        add or update UImage in DB
+        set default encoding of UImage added to this faceset.
+        Stored in the faceset file.
 
-         uimage       UImage or list
-
-         format('png')  webp    ( does not support lossless on 100 quality ! )
+         format('png')  webp    ( lossless on quality 101 )
                         png     ( lossless )
                         jpg
                         jp2 ( jpeg2000 )
 
-         quality(100)   0-100 for formats jpg,jp2,webp
+         quality(100)   0-101 for webp, 0-100 for formats jpg,jp2
+
+         compression(None)  0-9 png compression level,
+                            lower is faster and larger. None - cv2 default.
+        """
+        _check_UImage_encoding(format, quality, compression)
+        self._f.attrs['UImage_format'] = format
+        self._f.attrs['UImage_quality'] = quality
+        self._f.attrs['UImage_compression'] = -1 if compression is None else compression
+
+    def get_UImage_encoding(self) -> Tuple[str, int, Union[int, None]]:
+        """
+        returns default (format, quality, compression) of this faceset
         """
-        if format not in ['webp','png', 'jpg', 'jp2']:
-            raise ValueError(f'format {format} is unsupported')
+        attrs = self._f.attrs
+        compression = int(attrs.get('UImage_compression', -1))
+        return ( str(attrs.get('UImage_format', 'png')),
+                 int(attrs.get('UImage_quality', 100)),
+                 None if compression == -1 else compression )
+
+    def _get_UImage_encoding(self, format, quality, compression):
+        def_format, def_quality, def_compression = self.get_UImage_encoding()
+        if format is None:
+            format = def_format
+        if quality is None:
+            quality = def_quality
+        if compression is None:
+            compression = def_compression
+        _check_UImage_encoding(format, quality, compression)
+        return format, quality, compression
+
+    def add_UImage(self, uimage_or_list : UImage, format : str = None, quality : int = None, compression : int = None, update_existing=True):
+        """
+        add or update UImage in DB
+
+         uimage       UImage or list
 
-        if format in ['jpg','jp2'] and quality < 0 or quality > 100:
-            raise ValueError('quality must be in range [0..100]')
+         format, quality, compression   see set_UImage_encoding
+                                        None - use encoding of faceset
+        """
+        format, quality, compression = self._get_UImage_encoding(format, quality, compression)
 
         if not isinstance(uimage_or_list, Iterable):
             uimage_or_list : List[UImage] = [uimage_or_list]
 
+        imencode_args = _get_imencode_args(format, quality, compression)
         for uimage in uimage_or_list:
-            if format == 'webp':
-                imencode_args = [int(cv2.IMWRITE_WEBP_QUALITY), quality]
-            elif format == 'jpg':
-                imencode_args = [int(cv2.IMWRITE_JPEG_QUALITY), quality]
-            elif format == 'jp2':
-                imencode_args = [int(cv2.IMWRITE_JPEG2000_COMPRESSION_X1000), quality*10]
-            else:
-                imencode_args = []
+            data_bytes = _imencode(uimage.get_image(), format, imencode_args)
+            self._write_UImage(uimage, data_bytes, format, quality, update_existing=update_existing)
 
-            ret, data_bytes = cv2.imencode( f'.{format}', uimage.get_image(), imencode_args)
-            if not ret:
-                raise Exception(f'Unable to encode image format {format}')
+    def add_UImage_bulk(self, uimages : Iterable[UImage], format : str = None, quality : int = None, compression : int = None,
+                              update_existing=True, process_count : int = None, chunk_size : int = 32, verbose=False) -> int:
+        """
+        add or update many UImage, encoding images in a process pool.
+
+        Encoding of next chunks runs in parallel while encoded chunks
+        are written to the file from the calling thread, which is the only writer.
+        At most process_count*2 chunks are in flight, so uimages can be a lazy generator.
+
+         uimages        Iterable of UImage
 
-            key = uimage.get_uuid().hex()
+         format, quality, compression   see set_UImage_encoding
+                                        None - use encoding of faceset
 
-            self._group_write_bytes(self._UImage_grp, key, pickle.dumps(uimage.dump_state(exclude_image=True)), update_existing=update_existing )
-            d = self._group_write_bytes(self._UImage_image_data_grp, key, data_bytes.data, update_existing=update_existing )
+         process_count(None)    number of encoding processes. Default: cpu count.
+                                0 - encode in the calling thread
+
+         chunk_size(32)         number of images encoded per task
+
+        returns number of added images
+        """
+        format, quality, compression = self._get_UImage_encoding(format, quality, compression)
+        imencode_args = _get_imencode_args(format, quality, compression)
+
+        if process_count is None:
+            process_count = multiprocessing.cpu_count()
+
+        def chunks_gen():
+            chunk = []
+            for uimage in uimages:
+                chunk.append(uimage)
+                if len(chunk) == chunk_size:
+                    yield chunk
+                    chunk = []
+            if len(chunk) != 0:
+                yield chunk
+
+        def write_chunk(chunk, datas):
+            for uimage, data_bytes in zip(chunk, datas):
+                self._write_UImage(uimage, data_bytes, format, quality, update_existing=update_existing)
+            return len(chunk)
+
+        count = 0
+        if process_count == 0:
+            for chunk in chunks_gen():
+                count += write_chunk(chunk, _imencode_list([uimage.get_image() for uimage in chunk], format, imencode_args))
+        else:
+            with ProcessPoolExecutor(max_workers=process_count) as executor:
+                pending = deque()
+                for chunk in chunks_gen():
+                    pending.append( (chunk, executor.submit(_imencode_list, [uimage.get_image() for uimage in chunk], format, imencode_args)) )
+                    if len(pending) >= process_count*2:
+                        chunk, future = pending.popleft()
+                        count += write_chunk(chunk, future.result())
+
+                while len(pending) != 0:
+                    chunk, future = pending.popleft()
+                    count += write_chunk(chunk, future.result())
+        if verbose:
+            print(f'Added {count} images.')
+        return count
+
+    def _write_UImage(self, uimage : UImage, data_bytes : bytes, format : str, quality : int, update_existing=True):
+        key = uimage.get_uuid().hex()
+
+        self._group_write_bytes(self._UImage_grp, key, pickle.dumps(uimage.dump_state(exclude_image=True)), update_existing=update_existing )
+        d = self._group_write_bytes(self._UImage_image_data_grp, key, data_bytes, update_existing=update_existing )
+        if d is not None:
             d.attrs['format'] = format
             d.attrs['quality'] = quality
 
@@ -312,3 +476,36 @@ class Faceset:
         """
         for key in self._UPerson_grp.keys():
             del self._UPerson_grp[key]
+
+
+def _check_UImage_encoding(format : str, quality : int, compression : Union[int, None]):
+    if format not in ['webp','png', 'jpg', 'jp2']:
+        raise ValueError(f'format {format} is unsupported')
+
+    max_quality = 101 if format == 'webp' else 100
+    if format in ['webp','jpg','jp2'] and (quality < 0 or quality > max_quality):
+        raise ValueError(f'quality must be in range [0..{max_quality}]')
+
+    if compression is not None and (compression < 0 or compression > 9):
+        raise ValueError('compression must be in range [0..9]')
+
+def _get_imencode_args(format : str, quality : int, compression : Union[int, None]) -> List[int]:
+    if format == 'webp':
+        return [int(cv2.IMWRITE_WEBP_QUALITY), quality]
+    elif format == 'jpg':
+        return [int(cv2.IMWRITE_JPEG_QUALITY), quality]
+    elif format == 'jp2':
+        return [int(cv2.IMWRITE_JPEG2000_COMPRESSION_X1000), quality*10]
+    elif format == 'png' and compression is not None:
+        return [int(cv2.IMWRITE_PNG_COMPRESSION), compression]
+    return []
+
+def _imencode(img : np.ndarray, format : str, imencode_args : List[int]) -> bytes:
+    ret, data_bytes = cv2.imencode( f'.{format}', img, imencode_args)
+    if not ret:
+        raise Exception(f'Unable to encode image format {format}')
+    return data_bytes.tobytes()
+
+def _imencode_list(imgs : List[np.ndarray], format : str, imencode_args : List[int]) -> List[bytes]:
+    """runs in encoding process"""
+    return [ _imencode(img, format, imencode_args) for img in imgs ]
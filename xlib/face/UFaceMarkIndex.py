@@ -0,0 +1,275 @@
+from typing import Dict, Iterable, List, Union
+
+import h5py
+import numpy as np
+
+from .ELandmarks2D import ELandmarks2D
+from .UFaceMark import UFaceMark
+
+_lmrks_count = { ELandmarks2D.L5   : 5,
+                 ELandmarks2D.L68  : 68,
+                 ELandmarks2D.L106 : 106,
+                 ELandmarks2D.L468 : 468, }
+
+_zero_uuid = bytes(16)
+
+class UFaceMarkIndex:
+    def __init__(self, group : Union[h5py.Group, None]):
+        """
+        Columnar metadata index of UFaceMark stored in Faceset.
+
+        Every UFaceMark is a row in fixed-size column datasets:
+
+            uuid            (N,16)      uint8
+            UImage_uuid     (N,16)      uint8   zeros if None
+            UPerson_uuid    (N,16)      uint8   zeros if None
+            FRect           (N,4,2)     float32 nan if None
+            FPose           (N,3)       float32 nan if None
+            FLandmarks2D_*  (N,K,2)     float32 nan if FLandmarks2D of type does not exist
+
+        Deleted rows are marked in 'valid' column and dropped on Faceset.optimize().
+
+        All get_* return arrays of valid rows only, in the same order,
+        so they can be combined in vectorized queries.
+
+            group   h5py.Group to store the index,
+                    or None to keep the index only in memory (read-only Faceset)
+        """
+        self._group = group
+        self._mem_columns : Dict[str, np.ndarray] = None if group is not None else _create_columns(0)
+        self._columns : Dict[str, np.ndarray] = None
+        self._row_by_uuid : Dict[bytes, int] = None
+
+    def get_count(self) -> int:
+        """returns number of indexed UFaceMark"""
+        if self._group is not None:
+            return int(self._group.attrs.get('valid_count', 0))
+        return int(self._mem_columns['valid'].sum())
+
+    def get_uuids(self) -> np.ndarray:
+        """returns (N,16) uint8"""
+        return self._get_column('uuid')
+
+    def get_uuids_list(self, mask : np.ndarray = None) -> List[bytes]:
+        """
+        returns list of uuid bytes, optionally filtered by bool mask from get_mask_* methods
+        """
+        uuids = self.get_uuids()
+        if mask is not None:
+            uuids = uuids[mask]
+        return [ x.tobytes() for x in uuids ]
+
+    def get_UImage_uuids(self) -> np.ndarray:
+        """returns (N,16) uint8, zeros if UImage_uuid is None"""
+        return self._get_column('UImage_uuid')
+
+    def get_UPerson_uuids(self) -> np.ndarray:
+        """returns (N,16) uint8, zeros if UPerson_uuid is None"""
+        return self._get_column('UPerson_uuid')
+
+    def get_FRects(self) -> np.ndarray:
+        """returns (N,4,2) float32 uniform 4pts, nan if FRect is None"""
+        return self._get_column('FRect')
+
+    def get_FPoses(self) -> np.ndarray:
+        """returns (N,3) float32 pitch,yaw,roll radians, nan if FPose is None"""
+        return self._get_column('FPose')
+
+    def get_FLandmarks2D(self, type : ELandmarks2D) -> np.ndarray:
+        """returns (N,K,2) float32 uniform landmarks, nan if UFaceMark has no FLandmarks2D of type"""
+        if not isinstance(type, ELandmarks2D):
+            raise ValueError('type must be an instance of ELandmarks2D')
+        return self._get_column(_lmrks_key(type))
+
+    def get_mask_by_UImage_uuid(self, UImage_uuid : bytes) -> np.ndarray:
+        """returns (N,) bool"""
+        return (self.get_UImage_uuids() == np.frombuffer(UImage_uuid, np.uint8)).all(-1)
+
+    def get_mask_by_UPerson_uuid(self, UPerson_uuid : Union[bytes, None]) -> np.ndarray:
+        """returns (N,) bool. None selects UFaceMark without UPerson"""
+        if UPerson_uuid is None:
+            UPerson_uuid = _zero_uuid
+        return (self.get_UPerson_uuids() == np.frombuffer(UPerson_uuid, np.uint8)).all(-1)
+
+    def get_mask_has_FLandmarks2D(self, type : ELandmarks2D) -> np.ndarray:
+        """returns (N,) bool"""
+        return ~np.isnan(self.get_FLandmarks2D(type)[:,0,0])
+
+    ##########
+    ### Write
+
+    def add(self, ufm_list : Iterable[UFaceMark], update_existing=True):
+        """
+        add or update rows
+        """
+        row_by_uuid = self._get_row_by_uuid()
+
+        new_ufms = {}
+        for ufm in ufm_list:
+            ufm_uuid = ufm.get_uuid()
+            row = row_by_uuid.get(ufm_uuid, None)
+            if row is not None:
+                if update_existing:
+                    self._write_rows(slice(row, row+1), _create_columns(1, [ufm]))
+            elif update_existing or ufm_uuid not in new_ufms:
+                new_ufms[ufm_uuid] = ufm
+
+        if len(new_ufms) != 0:
+            n_rows = self._get_n_rows()
+            self._append_rows( _create_columns(len(new_ufms), new_ufms.values()) )
+            for i, ufm_uuid in enumerate(new_ufms.keys()):
+                row_by_uuid[ufm_uuid] = n_rows + i
+            self._set_valid_count(self.get_count() + len(new_ufms))
+
+        self._columns = None
+
+    def delete(self, uuid : bytes) -> bool:
+        row_by_uuid = self._get_row_by_uuid()
+        row = row_by_uuid.pop(uuid, None)
+        if row is None:
+            return False
+
+        self._get_storage()['valid'][row] = False
+        self._set_valid_count(self.get_count() - 1)
+        self._columns = None
+        return True
+
+    def clear(self):
+        if self._group is not None:
+            for key in list(self._group.keys()):
+                del self._group[key]
+            self._group.attrs['valid_count'] = 0
+        else:
+            self._mem_columns = _create_columns(0)
+        self._columns = None
+        self._row_by_uuid = None
+
+    def assign_compacted(self, other : 'UFaceMarkIndex'):
+        """
+        replace content with valid rows of other index
+        """
+        self.clear()
+        columns = { key : other._get_column(key) for key in _column_keys() }
+        columns['valid'] = np.ones( (columns['uuid'].shape[0],), bool)
+        self._append_rows(columns)
+        self._set_valid_count(columns['uuid'].shape[0])
+
+    def is_consistent(self, ufm_uuids : List[bytes]) -> bool:
+        """
+        returns False if the index does not exist or its uuids do not match uuids of stored UFaceMark,
+        for example if faceset was created or edited by a build without the index.
+        """
+        if self._group is not None and 'uuid' not in self._group:
+            return len(ufm_uuids) == 0
+        if self.get_count() != len(ufm_uuids):
+            return False
+        return self._get_row_by_uuid().keys() == set(ufm_uuids)
+
+    ##########
+    ### Internal
+
+    def _get_storage(self) -> Dict[str, Union[np.ndarray, h5py.Dataset]]:
+        if self._group is None:
+            return self._mem_columns
+
+        group = self._group
+        if 'uuid' not in group:
+            for key, value in _create_columns(0).items():
+                group.create_dataset(key, shape=value.shape, maxshape=(None,)+value.shape[1:],
+                                          dtype=value.dtype, chunks=(256,)+value.shape[1:])
+        return { key : group[key] for key in _column_keys() + ['valid'] }
+
+    def _get_n_rows(self) -> int:
+        return self._get_storage()['uuid'].shape[0]
+
+    def _get_column(self, key) -> np.ndarray:
+        columns = self._columns
+        if columns is None:
+            columns = self._columns = {}
+        column = columns.get(key, None)
+        if column is None:
+            storage = self._get_storage()
+            valid = columns.get('valid', None)
+            if valid is None:
+                valid = columns['valid'] = storage['valid'][()]
+            column = columns[key] = storage[key][()][valid]
+        return column
+
+    def _get_row_by_uuid(self) -> Dict[bytes, int]:
+        row_by_uuid = self._row_by_uuid
+        if row_by_uuid is None:
+            storage = self._get_storage()
+            uuids = storage['uuid'][()]
+            valid = storage['valid'][()]
+            row_by_uuid = self._row_by_uuid = { uuids[row].tobytes() : row for row in np.flatnonzero(valid) }
+        return row_by_uuid
+
+    def _write_rows(self, rows : slice, columns : Dict[str, np.ndarray]):
+        storage = self._get_storage()
+        for key, value in columns.items():
+            storage[key][rows] = value
+
+    def _append_rows(self, columns : Dict[str, np.ndarray]):
+        n_rows = self._get_n_rows()
+        n_new = columns['uuid'].shape[0]
+        if n_new == 0:
+            return
+
+        if self._group is not None:
+            storage = self._get_storage()
+            for key, value in columns.items():
+                dataset = storage[key]
+                dataset.resize(n_rows+n_new, axis=0)
+                dataset[n_rows:] = value
+        else:
+            mem_columns = self._mem_columns
+            for key, value in columns.items():
+                mem_columns[key] = np.concatenate([mem_columns[key], value], 0)
+
+    def _set_valid_count(self, count : int):
+        if self._group is not None:
+            self._group.attrs['valid_count'] = count
+
+
+def _lmrks_key(type : ELandmarks2D) -> str:
+    return f'FLandmarks2D_{type.name}'
+
+def _column_keys() -> List[str]:
+    return ['uuid', 'UImage_uuid', 'UPerson_uuid', 'FRect', 'FPose'] + [ _lmrks_key(type) for type in _lmrks_count.keys() ]
+
+def _create_columns(n : int, ufm_list : Iterable[UFaceMark] = None) -> Dict[str, np.ndarray]:
+    """
+    create column arrays of n rows, filled from ufm_list if specified
+    """
+    columns = { 'uuid'         : np.zeros( (n,16), np.uint8),
+                'valid'        : np.ones( (n,), bool),
+                'UImage_uuid'  : np.zeros( (n,16), np.uint8),
+                'UPerson_uuid' : np.zeros( (n,16), np.uint8),
+                'FRect'        : np.full( (n,4,2), np.nan, np.float32),
+                'FPose'        : np.full( (n,3), np.nan, np.float32), }
+    for type, count in _lmrks_count.items():
+        columns[_lmrks_key(type)] = np.full( (n,count,2), np.nan, np.float32)
+
+    if ufm_list is not None:
+        for i, ufm in enumerate(ufm_list):
+            columns['uuid'][i] = np.frombuffer(ufm.get_uuid(), np.uint8)
+
+            UImage_uuid = ufm.get_UImage_uuid()
+            if UImage_uuid is not None:
+                columns['UImage_uuid'][i] = np.frombuffer(UImage_uuid, np.uint8)
+
+            UPerson_uuid = ufm.get_UPerson_uuid()
+            if UPerson_uuid is not None:
+                columns['UPerson_uuid'][i] = np.frombuffer(UPerson_uuid, np.uint8)
+
+            frect = ufm.get_FRect()
+            if frect is not None:
+                columns['FRect'][i] = frect.as_4pts()
+
+            fpose = ufm.get_FPose()
+            if fpose is not None:
+                columns['FPose'][i] = fpose.as_radians()
+
+            for flmrks in ufm.get_all_FLandmarks2D():
+                columns[_lmrks_key(flmrks.get_type())][i] = flmrks.as_numpy()
+    return columns
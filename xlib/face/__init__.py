@@ -9,6 +9,7 @@ Faceset
         .List[UImage]
         .List[UFaceMark]
         .List[UPerson]
+        .UFaceMarkIndex     columnar metadata of all UFaceMark for vectorized queries
         
 FaceWarper   A class for face augmentation with geometric transformations.
 
@@ -62,5 +63,6 @@ from .FMask import FMask
 from .FPose import FPose
 from .FRect import FRect
 from .UFaceMark import UFaceMark
+from .UFaceMarkIndex import UFaceMarkIndex
 from .UImage import UImage
 from .UPerson import UPerson
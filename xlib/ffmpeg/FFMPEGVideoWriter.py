@@ -0,0 +1,106 @@
+from pathlib import Path
+
+import numpy as np
+
+from .ffmpeg import run
+
+
+class FFMPEGVideoWriter:
+    """
+    Encode BGR frames to a video file using subprocess ffmpeg.
+
+    arguments
+
+        filepath        str/Path    output video file
+
+        fps             float
+
+        codec('libx264')    str     ffmpeg video encoder
+
+        crf(18)         int         constant rate factor of the encoder
+
+        preset('medium')    str     encoder preset
+
+        audio_filepath(None)    str/Path    copy audio track from this file if exists
+
+    Encoder process is started on first frame, using its resolution.
+    """
+
+    def __init__(self, filepath, fps : float, codec='libx264', crf=18, preset='medium', audio_filepath=None):
+        self._filepath = Path(filepath)
+        self._fps = fps
+        self._codec = codec
+        self._crf = crf
+        self._preset = preset
+        self._audio_filepath = Path(audio_filepath) if audio_filepath is not None else None
+        self._ffmpeg_proc = None
+        self._width = None
+        self._height = None
+        self._frame_count = 0
+
+    def get_frame_count(self) -> int: return self._frame_count
+
+    def _start(self, width, height):
+        args = ['-y',
+                '-f', 'rawvideo',
+                '-vcodec', 'rawvideo',
+                '-pix_fmt', 'bgr24',
+                '-s', f'{width}x{height}',
+                '-r', str(self._fps),
+                '-i', '-' ]
+
+        if self._audio_filepath is not None:
+            args += ['-i', str(self._audio_filepath),
+                     '-map', '0:v:0', '-map', '1:a:0?', '-c:a', 'copy', '-shortest']
+
+        args += ['-c:v', self._codec,
+                 '-crf', str(self._crf),
+                 '-preset', self._preset,
+                 '-pix_fmt', 'yuv420p',
+                 str(self._filepath) ]
+
+        self._ffmpeg_proc = run(args, pipe_stdin=True, quiet_stderr=True)
+        if self._ffmpeg_proc is None:
+            raise Exception('Unable to start ffmpeg encoder.')
+        self._width = width
+        self._height = height
+
+    def write(self, img : np.ndarray):
+        """
+        write frame
+
+            img     np.ndarray  HWC uint8 BGR
+        """
+        H,W,C = img.shape
+        if C != 3 or img.dtype != np.uint8:
+            raise ValueError('img must be HWC uint8 BGR')
+
+        if self._ffmpeg_proc is None:
+            self._start(W + W % 2, H + H % 2)
+        elif W + W % 2 != self._width or H + H % 2 != self._height:
+            raise ValueError(f'Frame size {W}x{H} differs from encoding size {self._width}x{self._height}')
+
+        if W % 2 != 0 or H % 2 != 0:
+            # yuv420p is required by most players, it needs even dimensions
+            img = np.pad(img, ( (0, H % 2), (0, W % 2), (0,0) ), mode='edge')
+
+        try:
+            self._ffmpeg_proc.stdin.write( np.ascontiguousarray(img).data )
+        except Exception as e:
+            raise Exception(f'ffmpeg encoder error: {e}')
+        self._frame_count += 1
+
+    def close(self) -> bool:
+        """
+        finish encoding and wait ffmpeg
+
+        returns True if ffmpeg is finished successfully
+        """
+        ffmpeg_proc, self._ffmpeg_proc = self._ffmpeg_proc, None
+        if ffmpeg_proc is None:
+            return self._frame_count == 0
+        try:
+            ffmpeg_proc.stdin.close()
+        except Exception:
+            pass
+        return ffmpeg_proc.wait() == 0
@@ -1 +1,2 @@
-from .ffmpeg import probe, run
\ No newline at end of file
+from .ffmpeg import probe, probe_keyframes, run
+from .FFMPEGVideoWriter import FFMPEGVideoWriter
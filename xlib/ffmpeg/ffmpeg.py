@@ -97,3 +97,33 @@ def probe(filename):
     except Exception as e:
         raise Exception(f"ffprobe error: {e}")
 
+
+
+def probe_keyframes(filename, stream_idx=0) -> List[float]:
+    """
+    Run ffprobe on the specified file and return sorted timestamps in seconds of keyframes of the video stream.
+
+    Only packet headers are read, frames are not decoded.
+
+    Raises:
+        Exception if ffprobe returns a non-zero exit code,
+    """
+    if not _validate_filename(filename):
+        raise ValueError(f"Invalid or unsafe filename: {filename}")
+
+    args = ['ffprobe', '-v', 'error', '-select_streams', f'v:{stream_idx}',
+            '-show_entries', 'packet=pts_time,flags', '-of', 'csv=print_section=0', filename]
+    try:
+        p = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.PIPE, shell=False)
+        out, err = p.communicate()
+        if p.returncode != 0:
+            raise Exception('ffprobe', out, err)
+    except subprocess.SubprocessError as e:
+        raise Exception(f"ffprobe subprocess error: {e}")
+
+    keyframes = []
+    for line in out.decode('utf-8').splitlines():
+        pts_time, _, flags = line.partition(',')
+        if 'K' in flags and pts_time not in ('', 'N/A'):
+            keyframes.append(float(pts_time))
+    return sorted(keyframes)
@@ -0,0 +1,289 @@
+import cv2
+import numpy as np
+
+from ..python import lazy_import
+from . import sd as lib_sd
+
+ne = lazy_import('numexpr')
+
+
+class RandomMaskPool:
+    def __init__(self, resolution : int, pool_size : int = 256, complexity : int = 3, rnd_state : np.random.RandomState = None):
+        """
+        Pool of pre-generated random faded masks.
+
+        Generating a random_circle_faded_multi mask costs several full-resolution
+        distance fields, so masks are generated once and reused.
+        Every sample() picks random masks from the pool and applies random flips/transposes,
+        which gives 8x more distinct masks than pool_size.
+
+            resolution  int     square resolution of masks
+
+            pool_size   int     number of pre-generated masks
+
+            complexity  int     complexity of random_circle_faded_multi
+        """
+        if rnd_state is None:
+            rnd_state = np.random.RandomState()
+        self._rnd_state = rnd_state
+        self._resolution = resolution
+
+        self._masks = masks = np.empty( (pool_size, resolution, resolution, 1), np.float32 )
+        for i in range(pool_size):
+            masks[i] = lib_sd.random_circle_faded_multi( (resolution,resolution), complexity=complexity, rnd_state=rnd_state)
+
+    def get_resolution(self) -> int: return self._resolution
+    def get_pool_size(self) -> int: return self._masks.shape[0]
+
+    def sample(self, count : int) -> np.ndarray:
+        """
+        returns random masks  np.ndarray  (N,H,W,1) float32 [0..1]
+        """
+        rnd_state = self._rnd_state
+        masks = self._masks[ rnd_state.randint(self.get_pool_size(), size=count) ]
+
+        sel = rnd_state.randint(2, size=count) == 0
+        masks[sel] = masks[sel][:,:,::-1]
+        sel = rnd_state.randint(2, size=count) == 0
+        masks[sel] = masks[sel][:,::-1,:]
+        sel = rnd_state.randint(2, size=count) == 0
+        masks[sel] = masks[sel].transpose( (0,2,1,3) )
+        return masks
+
+
+class BatchAugmentor:
+    def __init__(self, resolution : int,
+                       mask_pool_size : int = 256,
+                       mask_complexity : int = 3,
+                       sharpen_chance : int = 25,
+                       motion_blur_chance : int = 25,
+                       gaussian_blur_chance : int = 25,
+                       reresize_chance : int = 25,
+                       recompress_chance : int = 25,
+                       rnd_state : np.random.RandomState = None):
+        """
+        Color and quality augmentation of a whole NHWC batch.
+
+        Every augmentation is applied to all selected samples at once
+        with per-sample random parameters, masked by random faded masks from RandomMaskPool.
+
+            resolution      int     square resolution of images in a batch
+
+            *_chance        int     0..100 chance of augmentation per sample
+        """
+        if rnd_state is None:
+            rnd_state = np.random.RandomState()
+        self._rnd_state = rnd_state
+        self._resolution = resolution
+        self._mask_pool = RandomMaskPool(resolution, pool_size=mask_pool_size, complexity=mask_complexity, rnd_state=rnd_state)
+
+        self._sharpen_chance = sharpen_chance
+        self._motion_blur_chance = motion_blur_chance
+        self._gaussian_blur_chance = gaussian_blur_chance
+        self._reresize_chance = reresize_chance
+        self._recompress_chance = recompress_chance
+
+    def get_resolution(self) -> int: return self._resolution
+
+    def augment(self, img : np.ndarray) -> np.ndarray:
+        """
+        augment batch in-place
+
+            img     np.ndarray  (N,H,W,3) float32 [0..1]
+
+        returns the same img
+        """
+        N,H,W,C = img.shape
+        if H != self._resolution or W != self._resolution:
+            raise ValueError(f'img resolution must be {self._resolution}')
+        if C != 3:
+            raise ValueError('img channels must be == 3')
+        if img.dtype != np.float32:
+            raise ValueError('img dtype must be float32')
+
+        rnd = self._rnd_state
+        def chance(x):
+            return rnd.randint(100, size=N) < x
+        def coin():
+            return rnd.randint(2, size=N) == 0
+
+        hsv_sel = coin()
+        self._hsv(img, np.flatnonzero(hsv_sel))
+        self._levels(img, np.flatnonzero(~hsv_sel))
+
+        sharpen_branch = coin()
+        sharpen_sel = sharpen_branch & chance(self._sharpen_chance)
+        box_sel = coin()
+        self._box_sharpen(img, np.flatnonzero(sharpen_sel & box_sel))
+        self._gaussian_sharpen(img, np.flatnonzero(sharpen_sel & ~box_sel))
+
+        self._motion_blur(img, np.flatnonzero(~sharpen_branch & chance(self._motion_blur_chance)))
+        self._gaussian_blur(img, np.flatnonzero(~sharpen_branch & chance(self._gaussian_blur_chance)))
+
+        self._reresize(img, np.flatnonzero(coin() & chance(self._reresize_chance)), cv2.INTER_NEAREST)
+        self._reresize(img, np.flatnonzero(coin() & chance(self._reresize_chance)), cv2.INTER_LINEAR)
+        self._jpeg_recompress(img, np.flatnonzero(chance(self._recompress_chance)))
+        return img
+
+    def _blend(self, img : np.ndarray, idxs : np.ndarray, aug_img : np.ndarray):
+        """
+        writes aug_img into img[idxs] through random masks
+        """
+        orig_img = img[idxs]
+        mask = self._mask_pool.sample(len(idxs))
+        np.clip(aug_img, 0, 1, out=aug_img)
+        img[idxs] = ne.evaluate('orig_img*(1-mask) + aug_img*mask')
+
+    def _hsv(self, img, idxs):
+        n = len(idxs)
+        if n == 0:
+            return
+        rnd = self._rnd_state
+        sub = img[idxs]
+        _,H,W,C = sub.shape
+
+        hsv = cv2.cvtColor(sub.reshape( (n*H,W,C) ), cv2.COLOR_BGR2HSV).reshape( (n,H,W,C) )
+        hsv[...,0] += rnd.uniform(0, 1, size=n).astype(np.float32)[:,None,None]*360.0
+        hsv[...,0] %= 360.0
+        hsv[...,1] += rnd.uniform(-0.5, 0.5, size=n).astype(np.float32)[:,None,None]
+        hsv[...,2] += rnd.uniform(-0.5, 0.5, size=n).astype(np.float32)[:,None,None]
+        np.clip(hsv[...,1:], 0, 1, out=hsv[...,1:])
+
+        aug_img = cv2.cvtColor(hsv.reshape( (n*H,W,C) ), cv2.COLOR_HSV2BGR).reshape( (n,H,W,C) )
+        self._blend(img, idxs, aug_img)
+
+    def _levels(self, img, idxs):
+        n = len(idxs)
+        if n == 0:
+            return
+        rnd = self._rnd_state
+        _,_,_,C = img.shape
+
+        v = np.empty( (n,C,5), np.float32)
+        v[...,0] = rnd.uniform(0, 0.25, size=(n,C))
+        v[...,1] = rnd.uniform(0.75, 1.0, size=(n,C))
+        v[...,2] = rnd.uniform(0.5, 1.5, size=(n,C))
+        v[...,3] = rnd.uniform(0, 0.25, size=(n,C))
+        v[...,4] = rnd.uniform(0.75, 1.0, size=(n,C))
+        v = v[:,None,None,:,:]
+
+        sub = img[idxs]
+        aug_img = np.clip( (sub - v[...,0]) / (v[...,1] - v[...,0]), 0, 1 )
+        aug_img = ( aug_img ** (1/v[...,2]) ) * (v[...,4] - v[...,3]) + v[...,3]
+        self._blend(img, idxs, aug_img)
+
+    def _box_sharpen(self, img, idxs):
+        n = len(idxs)
+        if n == 0:
+            return
+        rnd = self._rnd_state
+        sizes = rnd.randint(1, 11, size=n) | 1
+        power = rnd.uniform(0.5, 5.0, size=n).astype(np.float32)[:,None,None,None]
+
+        sub = img[idxs]
+        blur = np.empty_like(sub)
+        # single box filter call per distinct kernel size
+        for size in np.unique(sizes).tolist():
+            size_sel = sizes == size
+            blur[size_sel] = _apply_stacked(sub[size_sel], lambda x: cv2.blur(x, (size,size)) )
+
+        aug_img = ne.evaluate('sub + (sub - blur)*power')
+        self._blend(img, idxs, aug_img)
+
+    def _gaussian_sharpen(self, img, idxs):
+        n = len(idxs)
+        if n == 0:
+            return
+        rnd = self._rnd_state
+        power = rnd.uniform(0.5, 5.0, size=n).astype(np.float32)[:,None,None,None]
+
+        sub = img[idxs]
+        blur = _apply_stacked(sub, lambda x: cv2.GaussianBlur(x, (0,0), 1.0) )
+        aug_img = ne.evaluate('sub + (sub - blur)*power')
+        self._blend(img, idxs, aug_img)
+
+    def _motion_blur(self, img, idxs):
+        n = len(idxs)
+        if n == 0:
+            return
+        rnd = self._rnd_state
+        sizes = rnd.randint(1, 11, size=n) | 1
+        angles = rnd.randint(360, size=n)
+
+        aug_img = img[idxs]
+        for i in range(n):
+            aug_img[i] = cv2.filter2D(aug_img[i], -1, _get_motion_blur_kernel(sizes[i], angles[i]))
+        self._blend(img, idxs, aug_img)
+
+    def _gaussian_blur(self, img, idxs):
+        n = len(idxs)
+        if n == 0:
+            return
+        rnd = self._rnd_state
+        sigmas = rnd.uniform(0.5, 3.0, size=n)
+
+        aug_img = img[idxs]
+        for i in range(n):
+            aug_img[i] = cv2.GaussianBlur(aug_img[i], (0,0), sigmas[i])
+        self._blend(img, idxs, aug_img)
+
+    def _reresize(self, img, idxs, interpolation):
+        n = len(idxs)
+        if n == 0:
+            return
+        rnd = self._rnd_state
+        powers = rnd.uniform(0.0, 0.75, size=n)
+
+        aug_img = img[idxs]
+        _,H,W,_ = aug_img.shape
+        for i in range(n):
+            W_lr = max(4, int(W*(1.0-powers[i])))
+            H_lr = max(4, int(H*(1.0-powers[i])))
+            x = cv2.resize(aug_img[i], (W_lr,H_lr), interpolation=interpolation)
+            aug_img[i] = cv2.resize(x, (W,H), interpolation=interpolation)
+        self._blend(img, idxs, aug_img)
+
+    def _jpeg_recompress(self, img, idxs):
+        n = len(idxs)
+        if n == 0:
+            return
+        rnd = self._rnd_state
+        qualities = rnd.randint(10, 75, size=n)
+
+        sub_u8 = (np.clip(img[idxs], 0, 1)*255.0).astype(np.uint8)
+        aug_img = np.empty(sub_u8.shape, np.float32)
+        for i in range(n):
+            ret, buf = cv2.imencode('.jpg', sub_u8[i], [int(cv2.IMWRITE_JPEG_QUALITY), int(qualities[i])] )
+            if not ret:
+                raise Exception('unable to compress jpeg')
+            aug_img[i] = cv2.imdecode(buf, flags=cv2.IMREAD_UNCHANGED)
+        aug_img /= 255.0
+        self._blend(img, idxs, aug_img)
+
+
+def _apply_stacked(img : np.ndarray, func) -> np.ndarray:
+    """
+    apply cv2 filter func to NHWC batch stacked as HW(N*C) image,
+    split by chunks to fit cv2 max channels limit.
+    """
+    N,H,W,C = img.shape
+    chunk_size = max(1, 512 // C)
+    out = np.empty_like(img)
+    for i in range(0, N, chunk_size):
+        x = img[i:i+chunk_size]
+        n = x.shape[0]
+        x = func( x.transpose( (1,2,0,3) ).reshape( (H,W,n*C) ) )
+        out[i:i+n] = x.reshape( (H,W,n,C) ).transpose( (2,0,1,3) )
+    return out
+
+_motion_blur_kernels = {}
+def _get_motion_blur_kernel(size : int, angle : int) -> np.ndarray:
+    key = (int(size), int(angle))
+    k = _motion_blur_kernels.get(key, None)
+    if k is None:
+        k = np.zeros((size, size), dtype=np.float32)
+        k[ (size-1)// 2 , :] = np.ones(size, dtype=np.float32)
+        k = cv2.warpAffine(k, cv2.getRotationMatrix2D( (size / 2 -0.5 , size / 2 -0.5 ) , float(angle), 1.0), (size, size) )
+        k = k * ( 1.0 / np.sum(k) )
+        _motion_blur_kernels[key] = k
+    return k
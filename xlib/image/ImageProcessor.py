@@ -2,9 +2,12 @@ from enum import IntEnum
 from typing import Tuple, Union
 
 import cv2
-import numexpr as ne
 import numpy as np
 
+from ..python import lazy_import
+
+ne = lazy_import('numexpr')
+
 class ImageProcessor:
     """
     Generic image processor for numpy images
@@ -0,0 +1,164 @@
+from typing import Any, List, Tuple, Union
+
+import cv2
+import numpy as np
+
+
+def compute_dhash(img : np.ndarray, hash_size : int = 8) -> int:
+    """
+    difference hash of the image
+
+        img         np.ndarray  HW or HWC uint8/float
+
+        hash_size(8)    hash has hash_size*hash_size bits
+
+    Compares brightness of horizontally adjacent pixels of downscaled grayscale image.
+    Robust to scale, jpeg compression and global brightness changes.
+    """
+    gray = _to_gray(img)
+    small = cv2.resize(gray, (hash_size+1, hash_size), interpolation=cv2.INTER_AREA)
+    return _bits_to_int(small[:,1:] > small[:,:-1])
+
+
+def compute_phash(img : np.ndarray, hash_size : int = 8) -> int:
+    """
+    DCT perceptual hash of the image
+
+        img         np.ndarray  HW or HWC uint8/float
+
+        hash_size(8)    hash has hash_size*hash_size bits
+
+    Compares low frequency DCT coefficients of downscaled grayscale image with their median.
+    More robust than dhash to small shifts and blur, slower to compute.
+    """
+    gray = _to_gray(img)
+    size = hash_size*4
+    small = cv2.resize(gray, (size, size), interpolation=cv2.INTER_AREA)
+    dct = cv2.dct(small)[:hash_size, :hash_size]
+    return _bits_to_int(dct > np.median(dct))
+
+
+def hamming_distance(hash1 : int, hash2 : int) -> int:
+    """number of different bits of two hashes"""
+    return bin(hash1 ^ hash2).count('1')
+
+
+class PerceptualHashIndex:
+    """
+    Index of perceptual image hashes for near-duplicate lookup.
+
+    Hashes are stored in BK-tree over hamming distance,
+    so lookup visits only a fraction of the hashes for small max_distance.
+
+    arguments
+
+        max_distance(6)     images with hash distance <= max_distance are duplicates
+
+        hash_type('dhash')  'dhash' or 'phash'
+
+        hash_size(8)        hash has hash_size*hash_size bits
+    """
+
+    def __init__(self, max_distance : int = 6, hash_type : str = 'dhash', hash_size : int = 8):
+        if hash_type == 'dhash':
+            self._hash_func = compute_dhash
+        elif hash_type == 'phash':
+            self._hash_func = compute_phash
+        else:
+            raise ValueError(f'Unknown hash_type {hash_type}')
+
+        self._max_distance = max_distance
+        self._hash_size = hash_size
+        # node is [hash_value, key, {distance : child node}]
+        self._root = None
+        self._count = 0
+
+    def get_count(self) -> int: return self._count
+    def get_max_distance(self) -> int: return self._max_distance
+
+    def compute_hash(self, img : np.ndarray) -> int:
+        """returns hash of the image using hash_type of the index"""
+        return self._hash_func(img, self._hash_size)
+
+    def add(self, hash_value : int, key : Any = None):
+        """add hash with user key"""
+        self._count += 1
+        if self._root is None:
+            self._root = [hash_value, key, {}]
+            return
+
+        node = self._root
+        while True:
+            dist = hamming_distance(hash_value, node[0])
+            child = node[2].get(dist, None)
+            if child is None:
+                node[2][dist] = [hash_value, key, {}]
+                return
+            node = child
+
+    def find(self, hash_value : int, max_distance : int = None) -> List[Tuple[Any, int]]:
+        """
+        find hashes within max_distance
+
+            max_distance(None)  None - max_distance of the index
+
+        returns list of (key, distance)
+        """
+        if max_distance is None:
+            max_distance = self._max_distance
+
+        result = []
+        if self._root is None:
+            return result
+
+        stack = [self._root]
+        while len(stack) != 0:
+            node_hash, node_key, children = stack.pop()
+            dist = hamming_distance(hash_value, node_hash)
+            if dist <= max_distance:
+                result.append( (node_key, dist) )
+
+            # triangle inequality: only children in [dist-max_distance, dist+max_distance] can match
+            for child_dist, child in children.items():
+                if dist - max_distance <= child_dist <= dist + max_distance:
+                    stack.append(child)
+        return result
+
+    def find_nearest(self, hash_value : int, max_distance : int = None) -> Union[Tuple[Any, int], None]:
+        """
+        returns (key, distance) of nearest hash within max_distance or None
+        """
+        result = self.find(hash_value, max_distance)
+        if len(result) == 0:
+            return None
+        return min(result, key=lambda x: x[1])
+
+    def add_if_unique(self, img : np.ndarray, key : Any = None) -> bool:
+        """
+        add image hash if there is no near-duplicate in the index
+
+        returns True if added, False if the image is a duplicate
+        """
+        hash_value = self.compute_hash(img)
+        if self.find_nearest(hash_value) is not None:
+            return False
+        self.add(hash_value, key)
+        return True
+
+
+def _to_gray(img : np.ndarray) -> np.ndarray:
+    if img.ndim == 3:
+        C = img.shape[2]
+        if C == 1:
+            img = img[...,0]
+        elif C == 3:
+            img = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+        elif C == 4:
+            img = cv2.cvtColor(img, cv2.COLOR_BGRA2GRAY)
+        else:
+            raise ValueError(f'Unsupported number of channels {C}')
+    return img.astype(np.float32)
+
+
+def _bits_to_int(bits : np.ndarray) -> int:
+    return int.from_bytes(np.packbits(bits.reshape(-1)).tobytes(), 'big')
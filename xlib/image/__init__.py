@@ -1,2 +1,5 @@
+from .BatchAugmentor import BatchAugmentor, RandomMaskPool
 from .ImageProcessor import ImageProcessor
-from ._misc import get_NHWC_shape
\ No newline at end of file
+from .PerceptualHashIndex import (PerceptualHashIndex, compute_dhash,
+                                  compute_phash, hamming_distance)
+from ._misc import get_NHWC_shape
@@ -1,6 +1,9 @@
 import cv2
 import numpy as np
-import numexpr as ne
+
+from ...python import lazy_import
+
+ne = lazy_import('numexpr')
 
 def rct(target : np.ndarray, source : np.ndarray, target_mask : np.ndarray = None, source_mask : np.ndarray = None, mask_cutoff=0.5) -> np.ndarray:
     """
@@ -62,6 +62,12 @@ class MPSPSCMRRingData:
     def get_write_id(self) -> int: return self._mv_ids[0]
     def get_read_id(self) -> int: return self._mv_ids[1]
 
+    def skip_unread(self, keep : int = 0):
+        """
+        mark unread data as read except last keep ones.
+        Call only while the Consumer is not running.
+        """
+        self._mv_ids[1] = max(self._mv_ids[1], self._mv_ids[0]-keep)
 
     def write(self, data : Union[bytes, bytearray]):
         """
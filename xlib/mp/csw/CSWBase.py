@@ -171,7 +171,8 @@ class Host(Base):
     """
     Base host class for CSW.
 
-
+    The worker process can be started on demand, see start_on_demand(),
+    and stopped after idle period, see set_idle_timeout().
     """
 
     class _ProcessStatus:
@@ -234,6 +235,9 @@ class Host(Base):
         self._is_busy = False
         self._process = None
         self._reset_restart = False
+        self._on_demand_pending = False
+        self._idle_timeout = 0.0
+        self._last_demand_time = 0.0
 
         self._on_state_change_evl = EventListener()
 
@@ -279,18 +283,56 @@ class Host(Base):
         """
         save current start/stop state to DB
         """
-        if self._process_status == Host._ProcessStatus.STARTED or \
+        if self._on_demand_pending:
+            # Waiting for demand is on
+            self._db.set_value(self._db_key_host_onoff, True)
+        elif self._process_status == Host._ProcessStatus.STARTED or \
            self._process_status == Host._ProcessStatus.STOPPED:
             # Save only when the process is fully started / stopped
             self._db.set_value(self._db_key_host_onoff, self._process_status == Host._ProcessStatus.STARTED )
 
-    def restore_on_off_state(self, default_state=True):
+    def restore_on_off_state(self, default_state=True, on_demand=False):
         """
         restore saved on_off state from db. Default is on.
+
+            on_demand(False)    start the worker on the first demand, see start_on_demand()
         """
         is_on = self._db.get_value(self._db_key_host_onoff, default_state)
         if is_on:
-            self.start()
+            if on_demand:
+                self.start_on_demand()
+            else:
+                self.start()
+
+    def set_idle_timeout(self, idle_timeout : float):
+        """
+        Stop the started worker after idle_timeout sec without demand,
+        and start it again on the next demand.
+        The process is stopped, thus all its models and memory are released,
+        WorkerState is kept in DB.
+
+            idle_timeout    float   0 - never stop
+        """
+        self._idle_timeout = idle_timeout
+
+    def start_on_demand(self):
+        """
+        Enable the worker, but start the process only when _has_demand() returns True.
+        """
+        if self._process_status == Host._ProcessStatus.STOPPED and not self._on_demand_pending:
+            self._on_demand_pending = True
+            # Only the demand appeared from now
+            self._has_demand()
+            self._on_state_change_evl_call()
+
+    def _has_demand(self) -> bool:
+        """
+        overridable
+
+        returns True if the worker has a work since the last call.
+        Called in process_messages() while the worker waits for demand or idle timeout is set.
+        """
+        return True
 
     def start(self):
         """
@@ -302,6 +344,7 @@ class Host(Base):
         if self._process_status != Host._ProcessStatus.STARTED:
 
             if self._process_status == Host._ProcessStatus.STOPPED:
+                self._on_demand_pending = False
                 pipe, worker_pipe = multiprocessing.Pipe()
                 self._pmpi.set_pipe(pipe)
 
@@ -344,6 +387,11 @@ class Host(Base):
         Do not kill the process, if it is using any multiprocessing syncronization primivites,
         because if process is killed while any sync is acquired, it will not be released.
         """
+        if not force and self._on_demand_pending:
+            self._on_demand_pending = False
+            if self._process_status == Host._ProcessStatus.STOPPED:
+                self._on_state_change_evl_call()
+                return True
 
         if self._process_status != Host._ProcessStatus.STOPPED:
 
@@ -377,12 +425,16 @@ class Host(Base):
     def is_stopped(self): return self._process_status == Host._ProcessStatus.STOPPED
     def is_stopping(self): return self._process_status == Host._ProcessStatus.STOPPING
     def is_busy(self): return self._is_busy
+    def is_pending(self):
+        """returns True if the worker is enabled, but waits for demand to start"""
+        return self._on_demand_pending
 
     def _save_state(self):
         self._db.set_value( self._db_key_worker_state, self._state)
 
     def _on_worker_start(self):
         self._process_status = Host._ProcessStatus.STARTED
+        self._last_demand_time = time.perf_counter()
         #print(f'{self._get_name()} is started.')
         self._on_state_change_evl_call()
 
@@ -415,6 +467,18 @@ class Host(Base):
         if self._process_status == Host._ProcessStatus.STARTED:
             if not self._process.is_alive():
                 self.stop(force=True)
+            elif self._idle_timeout != 0:
+                time_now = time.perf_counter()
+                if self._is_busy or self._has_demand():
+                    self._last_demand_time = time_now
+                elif time_now - self._last_demand_time >= self._idle_timeout:
+                    # Hibernate: stop the process and wait for the next demand
+                    self.stop()
+                    self._on_demand_pending = True
+
+        elif self._process_status == Host._ProcessStatus.STOPPED:
+            if self._on_demand_pending and self._has_demand():
+                self.start()
 
 class Worker(Base):
     """
@@ -1,34 +1,64 @@
-import io
+import hashlib
+import json
+import re
 import threading
+import time
 import urllib.request
 from pathlib import Path
-from typing import Union
+from typing import Dict, List, Union
 
 
 class ThreadFileDownloader:
     """
-    FileDownloader using sub thread
+    FileDownloader using sub threads
 
-     url            str
+    If the server supports range requests, the file is downloaded in segments
+    by multiple parallel connections into savepath.part.
+    Completed segments are recorded in savepath.part.json,
+    thus an interrupted download resumes from the partial file if the remote file is unchanged.
 
-     savepath(None) str,Path
+     url                    str
+
+     savepath(None)         str,Path
+
+     sha256(None)           str     expected hex digest,
+                                    the file is checked before it is moved to savepath
+
+     connections(4)         int     parallel connections
+
+     segment_size(8MB)      int     size of range request
 
 
     Use .get_error() to check the error
     """
+    _BUFFER_SIZE = 1024*1024
+    _RETRIES = 3
+    _RETRY_DELAY = 1.0
+    _TIMEOUT = 30.0
 
-    def __init__(self, url, savepath : Union[str, Path] = None):
+    def __init__(self, url, savepath : Union[str, Path] = None,
+                       sha256 : str = None,
+                       connections : int = 4,
+                       segment_size : int = 8*1024*1024):
         if savepath is not None:
             savepath = Path(savepath)
             self._partpath = savepath.parent / ( savepath.name + '.part' )
+            self._statepath = savepath.parent / ( savepath.name + '.part.json' )
         else:
             self._partpath = None
+            self._statepath = None
         self._savepath = savepath
 
         self._url = url
+        self._sha256 = sha256.lower() if sha256 is not None else None
+        self._connections = max(1, connections)
+        self._segment_size = segment_size
+
+        self._lock = threading.Lock()
         self._error = None
         self._file_size = None
         self._file_size_dl = None
+        self._completed = False
         self._bytes = None
 
         threading.Thread(target=self._thread, daemon=True).start()
@@ -39,10 +69,13 @@ class ThreadFileDownloader:
         return progress of downloading as [0.0...100.0] value
         where 100.0 mean download is completed
         """
-        if self._file_size is None or self._file_size_dl is None:
+        if self._completed:
+            return 100.0
+        if self._file_size is None or self._file_size_dl is None or self._file_size == 0:
             return 0.0
 
-        return (self._file_size_dl / self._file_size) * 100.0
+        # 100.0 only after the file is verified and moved to savepath
+        return min( (self._file_size_dl / self._file_size) * 100.0, 99.9 )
 
     def get_bytes(self) -> bytes:
         """
@@ -56,73 +89,231 @@ class ThreadFileDownloader:
         """
         return self._error
 
+    def _open(self, start : int = None, end : int = None):
+        """
+        open url, with range request [start, end] if start is not None
+        """
+        req = urllib.request.Request(self._url)
+        if start is not None:
+            req.add_header('Range', f'bytes={start}-{end if end is not None else ""}')
+        return urllib.request.urlopen(req, timeout=ThreadFileDownloader._TIMEOUT)
+
     def _thread(self):
-        f = None
-        url_req = None
         try:
-            url_req = urllib.request.urlopen(self._url)
-            file_size = self._file_size = int( url_req.getheader('content-length') )
+            # Probe the size and the range support with the first byte
+            with self._open(0, 0) as url_req:
+                content_range = url_req.getheader('content-range')
+                match = re.match(r'bytes\s+0-0/(\d+)', content_range) if url_req.status == 206 and content_range is not None else None
+                if match is not None:
+                    file_size = int(match.group(1))
+                else:
+                    content_length = url_req.getheader('content-length')
+                    file_size = int(content_length) if content_length is not None else None
+                validator = url_req.getheader('etag') or url_req.getheader('last-modified')
+
+            self._file_size = file_size
             self._file_size_dl = 0
-            savepath = self._savepath
-            partpath = self._partpath
-
-            if partpath is not None:
-                if partpath.exists():
-                    partpath.unlink()
-                # Use context manager for proper file handling
-                with open(partpath, 'wb') as f:
-                    while url_req is not None:
-                        buffer = url_req.read(8192)
-                        if not buffer:
-                            break
 
-                        f.write(buffer)
+            if match is not None and file_size > 0:
+                data = self._download_segments(file_size, validator)
+            else:
+                data = self._download_stream()
 
-                        new_file_size_dl = self._file_size_dl + len(buffer)
+            self._finish(data)
 
-                        if new_file_size_dl >= file_size:
+        except Exception as e:
+            # The partial file is kept to resume
+            self._error = str(e)
+
+    def _download_segments(self, file_size : int, validator) -> Union[bytearray, None]:
+        """
+        download segments by parallel connections,
+        returns bytearray if savepath is not defined
+        """
+        segment_size = self._segment_size
+        segment_count = (file_size + segment_size - 1) // segment_size
+
+        state = { 'url' : self._url, 'size' : file_size, 'validator' : validator, 'segment_size' : segment_size, 'done' : [] }
+        data = None
+        if self._partpath is not None:
+            done = self._load_done_segments(state)
+            if done is None:
+                done = []
+                with open(self._partpath, 'wb') as f:
+                    f.truncate(file_size)
+            state['done'] = done
+        else:
+            data = bytearray(file_size)
+
+        done_set = set(state['done'])
+        self._file_size_dl = sum( min(segment_size, file_size - idx*segment_size) for idx in done_set )
+        todo = [ idx for idx in range(segment_count) if idx not in done_set ]
+        errors = []
+
+        def worker_proc():
+            f = open(self._partpath, 'r+b') if self._partpath is not None else None
+            try:
+                while len(errors) == 0:
+                    with self._lock:
+                        if len(todo) == 0:
                             break
+                        idx = todo.pop(0)
+                    try:
+                        self._download_segment(idx, file_size, f, data)
+                    except Exception as e:
+                        errors.append(e)
+                        break
+                    if f is not None:
+                        f.flush()
+                        with self._lock:
+                            state['done'].append(idx)
+                            self._save_state(state)
+            finally:
+                if f is not None:
+                    f.close()
 
-                        self._file_size_dl = new_file_size_dl
-                    
-                    # Complete the download
-                    if self._file_size_dl >= file_size:
-                        if savepath.exists():
-                            savepath.unlink()
-                        partpath.rename(savepath)
-            else:
-                # Use BytesIO for in-memory download
-                with io.BytesIO() as f:
-                    while url_req is not None:
-                        buffer = url_req.read(8192)
+        threads = [ threading.Thread(target=worker_proc, daemon=True) for _ in range(min(self._connections, max(1, len(todo)))) ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        if len(errors) != 0:
+            raise errors[0]
+        return data
+
+    def _download_segment(self, idx : int, file_size : int, f, data : bytearray):
+        """
+        download segment into file f or data, retrying from the received offset
+        """
+        start = idx*self._segment_size
+        end = min(start + self._segment_size, file_size)
+        offset = start
+        for attempt in range(ThreadFileDownloader._RETRIES):
+            try:
+                with self._open(offset, end-1) as url_req:
+                    if url_req.status != 206:
+                        raise Exception('Server does not respect range request.')
+                    while offset < end:
+                        buffer = url_req.read( min(ThreadFileDownloader._BUFFER_SIZE, end-offset) )
                         if not buffer:
-                            break
+                            raise Exception('Connection closed.')
+                        if f is not None:
+                            f.seek(offset)
+                            f.write(buffer)
+                        else:
+                            data[offset:offset+len(buffer)] = buffer
+                        offset += len(buffer)
+                        with self._lock:
+                            self._file_size_dl += len(buffer)
+                return
+            except Exception:
+                if attempt == ThreadFileDownloader._RETRIES-1:
+                    raise
+                # back off, so the connections do not hammer the server that has just failed
+                time.sleep(ThreadFileDownloader._RETRY_DELAY * 2**attempt)
 
+    def _download_stream(self) -> Union[bytearray, None]:
+        """
+        download by single connection from the start,
+        returns bytearray if savepath is not defined
+        """
+        self._file_size_dl = 0
+        data = bytearray() if self._partpath is None else None
+        with self._open() as url_req:
+            f = open(self._partpath, 'wb') if self._partpath is not None else None
+            try:
+                while True:
+                    buffer = url_req.read(ThreadFileDownloader._BUFFER_SIZE)
+                    if not buffer:
+                        break
+                    if f is not None:
                         f.write(buffer)
+                    else:
+                        data += buffer
+                    self._file_size_dl += len(buffer)
+            finally:
+                if f is not None:
+                    f.close()
 
-                        new_file_size_dl = self._file_size_dl + len(buffer)
+        if self._file_size is None:
+            self._file_size = self._file_size_dl
+        elif self._file_size_dl < self._file_size:
+            raise Exception('Connection closed.')
+        return data
 
-                        if new_file_size_dl >= file_size:
+    def _finish(self, data : Union[bytearray, None]):
+        """
+        check sha256 and move the part file to savepath
+        """
+        if self._sha256 is not None:
+            sha = hashlib.sha256()
+            if data is not None:
+                sha.update(data)
+            else:
+                with open(self._partpath, 'rb') as f:
+                    while True:
+                        buffer = f.read(ThreadFileDownloader._BUFFER_SIZE)
+                        if not buffer:
                             break
+                        sha.update(buffer)
 
-                        self._file_size_dl = new_file_size_dl
-                    
-                    # Get the bytes if download completed
-                    if self._file_size_dl >= file_size:
-                        self._bytes = f.getvalue()
+            if sha.hexdigest() != self._sha256:
+                self._remove_part()
+                raise Exception(f'SHA-256 mismatch of {self._url}')
 
-        except Exception as e:
-            self._error = str(e)
-            # Clean up partial file on error
-            if partpath is not None and partpath.exists():
+        if data is not None:
+            self._bytes = bytes(data)
+        else:
+            self._partpath.replace(self._savepath)
+            if self._statepath.exists():
+                self._statepath.unlink()
+        self._completed = True
+
+    def _load_done_segments(self, state : Dict) -> Union[List[int], None]:
+        """
+        returns done segments of the partial file of the same remote file, or None
+        """
+        try:
+            if self._partpath.exists() and self._statepath.exists() and \
+               self._partpath.stat().st_size == state['size']:
+                saved_state = json.loads(self._statepath.read_text())
+                if all( saved_state.get(key, None) == state[key] for key in ['url', 'size', 'validator', 'segment_size'] ):
+                    return [ int(idx) for idx in saved_state.get('done', []) ]
+        except Exception:
+            pass
+        return None
+
+    def _save_state(self, state : Dict):
+        tmp_statepath = self._statepath.parent / (self._statepath.name + '.tmp')
+        tmp_statepath.write_text(json.dumps(state))
+        tmp_statepath.replace(self._statepath)
+
+    def _remove_part(self):
+        for path in [self._partpath, self._statepath]:
+            if path is not None and path.exists():
                 try:
-                    partpath.unlink()
+                    path.unlink()
                 except Exception:
                     pass  # Ignore cleanup errors
-        finally:
-            # Ensure URL connection is closed
-            if url_req is not None:
-                try:
-                    url_req.close()
-                except Exception:
-                    pass  # Ignore close errors
+
+
+def read_sha256_manifest(filepath : Union[str, Path]) -> Dict[str, str]:
+    """
+    read manifest of sha256sum format
+
+        <hex digest> *<file name>
+
+    returns dict of file name -> hex digest, malformed lines are skipped
+    """
+    result = {}
+    for line in Path(filepath).read_text().splitlines():
+        line = line.strip()
+        if len(line) == 0 or line.startswith('#'):
+            continue
+        fields = line.split(maxsplit=1)
+        if len(fields) != 2:
+            continue
+        digest, name = fields
+        result[name.lstrip('*')] = digest.lower()
+    return result
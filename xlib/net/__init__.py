@@ -1 +1 @@
-from .ThreadFileDownloader import ThreadFileDownloader
\ No newline at end of file
+from .ThreadFileDownloader import ThreadFileDownloader, read_sha256_manifest
@@ -1,5 +1,3 @@
-import onnx
-import onnxruntime as rt
 from io import BytesIO
 from .device import ORTDeviceInfo
 
@@ -12,6 +10,8 @@ def InferenceSession_with_device(onnx_model_or_path, device_info : ORTDeviceInfo
 
     can raise Exception
     """
+    import onnx
+    import onnxruntime as rt
 
     if isinstance(onnx_model_or_path, onnx.ModelProto):
         b = BytesIO()
@@ -3,8 +3,6 @@ import itertools
 import os
 from typing import List
 
-import onnxruntime as rt
-
 from .. import appargs as lib_appargs
 
 
@@ -105,6 +103,9 @@ def _initialize_ort_devices_info():
         os.environ['ORT_DEVICES_INITIALIZED'] = '1'
         os.environ['ORT_DEVICES_COUNT'] = '0'
 
+        # onnxruntime is heavy, imported when devices are requested
+        import onnxruntime as rt
+
         devices = []
         prs = rt.get_available_providers()
         if not lib_appargs.get_arg_bool('NO_CUDA') and 'CUDAExecutionProvider' in prs:
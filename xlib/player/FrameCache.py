@@ -0,0 +1,67 @@
+import threading
+from collections import OrderedDict
+from typing import Tuple, Union
+
+import numpy as np
+
+
+class FrameCache:
+    """
+    Thread-safe LRU cache of decoded frames bounded by total bytes of images.
+
+        max_bytes   int     budget of cached images.
+                            The most recent frame is always kept even if it is larger than the budget.
+
+    get and put are O(1).
+    """
+
+    def __init__(self, max_bytes : int):
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._frames = OrderedDict()
+        self._bytes = 0
+
+    def get_max_bytes(self) -> int: return self._max_bytes
+    def get_bytes(self) -> int: return self._bytes
+    def get_count(self) -> int: return len(self._frames)
+
+    def __contains__(self, idx : int) -> bool:
+        return idx in self._frames
+
+    def get(self, idx : int) -> Union[Tuple[np.ndarray, str], None]:
+        """
+        returns cached (image, name) and marks it as most recently used,
+        or None
+        """
+        with self._lock:
+            frame_tuple = self._frames.get(idx, None)
+            if frame_tuple is not None:
+                self._frames.move_to_end(idx)
+            return frame_tuple
+
+    def put(self, idx : int, frame_tuple : Tuple[np.ndarray, str]):
+        """
+        put (image, name) as most recently used, evicting least recently used frames over the budget
+        """
+        with self._lock:
+            frames = self._frames
+            old_frame_tuple = frames.pop(idx, None)
+            if old_frame_tuple is not None:
+                self._bytes -= _get_nbytes(old_frame_tuple)
+
+            frames[idx] = frame_tuple
+            self._bytes += _get_nbytes(frame_tuple)
+
+            while self._bytes > self._max_bytes and len(frames) > 1:
+                _, evicted_frame_tuple = frames.popitem(last=False)
+                self._bytes -= _get_nbytes(evicted_frame_tuple)
+
+    def clear(self):
+        with self._lock:
+            self._frames.clear()
+            self._bytes = 0
+
+
+def _get_nbytes(frame_tuple) -> int:
+    image = frame_tuple[0]
+    return image.nbytes if image is not None else 0
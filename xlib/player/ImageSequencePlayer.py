@@ -1,6 +1,9 @@
+import multiprocessing
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Tuple
+from typing import Dict, Tuple
 
+import cv2
 import numpy as np
 from .. import cv as lib_cv
 from .. import path as lib_path
@@ -26,6 +29,10 @@ class ImageSequencePlayer(FramePlayer):
 
         target_width(None)  int     if None : resolution will be not modified
 
+        prefetch_count(8)   int     number of next frames decoded in parallel threads
+
+        thread_count(None)  int     None - number of cpus, max 8
+
     raises
 
         Exception   path does not exists
@@ -36,7 +43,9 @@ class ImageSequencePlayer(FramePlayer):
     def __init__(self, dir_path,
                         on_error_func=None,
                         on_player_state_func=None,
-                        on_frame_update_func=None):
+                        on_frame_update_func=None,
+                        prefetch_count=8,
+                        thread_count=None):
 
         dir_path = Path(dir_path)
         if not dir_path.exists():
@@ -55,15 +64,80 @@ class ImageSequencePlayer(FramePlayer):
         self._images_paths = images_paths
         self._dir_path = dir_path
 
-
-    def _on_get_frame(self, idx) -> Tuple[np.ndarray, str]:
+        if thread_count is None:
+            thread_count = min(8, multiprocessing.cpu_count())
+        self._prefetch_count = prefetch_count
+        # cv2 releases the GIL while decoding, so threads decode in parallel
+        self._executor = ThreadPoolExecutor(max_workers=max(1, thread_count), thread_name_prefix='ImageSequencePlayer')
+        self._futures : Dict[int, Future] = {}
+        self._source_width = None
+        self._imread_flags = cv2.IMREAD_UNCHANGED
+
+    def _on_dispose(self):
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        self._futures.clear()
+        super()._on_dispose()
+
+    def _on_target_width_changed(self):
+        # frames decoded with previous reduction are not valid anymore
+        for future in self._futures.values():
+            future.cancel()
+        self._futures.clear()
+        self._frame_cache.clear()
+        self._imread_flags = self._get_imread_flags()
+
+    def _get_imread_flags(self):
+        """
+        returns flags that downscale on decode if target_width is smaller than the source,
+        so JPEG is decoded with fewer DCT coefficients and less memory is transferred
+        """
+        target_width, source_width = self._target_width, self._source_width
+        if target_width != 0 and source_width is not None:
+            for reduce, flags in [ (8, cv2.IMREAD_REDUCED_COLOR_8),
+                                   (4, cv2.IMREAD_REDUCED_COLOR_4),
+                                   (2, cv2.IMREAD_REDUCED_COLOR_2) ]:
+                if source_width // reduce >= target_width:
+                    return flags
+        return cv2.IMREAD_UNCHANGED
+
+    def _read_frame(self, idx, flags) -> Tuple[np.ndarray, str]:
         filepath = self._images_paths[idx]
-
         try:
-            img = lib_cv.imread(filepath)
+            img = lib_cv.imread(filepath, flags=flags)
+            if img is None:
+                return None, f'cv2.imread error: unable to decode {filepath.name}'
             return img, filepath.name
         except Exception as e:
             return None, 'cv2.imread error: '+str(e)
 
+    def _on_get_frame(self, idx) -> Tuple[np.ndarray, str]:
+        futures = self._futures
+        frame_count = self.get_frame_count()
+
+        # Keep decoding window [idx, idx+prefetch_count], drop requests outside of it
+        window = set( (idx + i) % frame_count for i in range(self._prefetch_count+1) )
+        for future_idx in [ x for x in futures.keys() if x not in window ]:
+            futures.pop(future_idx).cancel()
+
+        flags = self._imread_flags
+        for future_idx in sorted(window, key=lambda x: (x - idx) % frame_count):
+            if future_idx not in futures and future_idx not in self._frame_cache:
+                futures[future_idx] = self._executor.submit(self._read_frame, future_idx, flags)
+
+        # Prefetched frames are kept in futures instead of the frame cache,
+        # so every next frame comes through _on_get_frame and moves the window
+        future = futures.pop(idx, None)
+        if future is None:
+            frame_tuple = self._read_frame(idx, flags)
+        else:
+            frame_tuple = future.result()
+
+        img = frame_tuple[0]
+        if img is not None and self._source_width is None and flags == cv2.IMREAD_UNCHANGED:
+            self._source_width = img.shape[1]
+            self._imread_flags = self._get_imread_flags()
+
+        return frame_tuple
+
 
 
@@ -1,5 +1,7 @@
+import bisect
+import threading
 from pathlib import Path
-from typing import Tuple
+from typing import List, Tuple
 
 import numpy as np
 from .. import ffmpeg as lib_ffmpeg
@@ -26,6 +28,11 @@ class VideoFilePlayer(FramePlayer):
 
         target_width(None)  int     if None : resolution will be not modified
 
+        decode_ahead(16)    int     number of frames decoded by background thread
+                                    ahead of the last requested frame
+
+        cache_bytes         int     byte budget of decoded frames cache
+
     raises
 
         Exception   path does not exists
@@ -34,10 +41,9 @@ class VideoFilePlayer(FramePlayer):
     """
     SUPPORTED_VIDEO_FILE_SUFFIXES = ['.avi','.mkv','.mp4']
 
-    def __init__(self, filepath):
+    def __init__(self, filepath, decode_ahead=16, cache_bytes=512*1024*1024):
         self._ffmpeg_proc = None
 
-
         self._filepath = filepath = Path(filepath)
         if not filepath.exists():
             raise Exception(f'{filepath} does not exist.')
@@ -81,15 +87,111 @@ class VideoFilePlayer(FramePlayer):
         self._stream_width = stream_width
         self._stream_height = stream_height
         self._stream_fps = stream_fps
-        self._ffmpeg_need_restart = False
-        self._ffmpeg_frame_idx = -1
+        self._stream_start_time = float(stream_start_time)
+
+        super().__init__(default_fps=stream_fps, frame_count=stream_frame_count, cache_bytes=cache_bytes)
 
-        super().__init__(default_fps=stream_fps, frame_count=stream_frame_count)
+        # Decode thread state, guarded by _dec_cv
+        self._decode_ahead = decode_ahead
+        self._dec_cv = threading.Condition()
+        self._dec_disposed = False
+        self._dec_restart_idx = None    # frame idx to restart ffmpeg from
+        self._dec_req_idx = -1          # last requested frame idx
+        self._dec_pos = -1              # frame idx that will be read next from ffmpeg
+        self._dec_end_idx = None        # frame idx where ffmpeg stopped to output frames
+        self._dec_err = None
+        self._keyframe_idxs : List[int] = None
+
+        self._dec_thread = threading.Thread(target=self._decode_thread_proc, daemon=True)
+        self._dec_thread.start()
+
+        # ffprobe reads every packet of the file, seeking uses the heuristic until the index is ready.
+        self._keyframe_thread = threading.Thread(target=self._build_keyframe_index, daemon=True)
+        self._keyframe_thread.start()
 
     def _on_dispose(self):
+        with self._dec_cv:
+            self._dec_disposed = True
+            self._dec_cv.notify_all()
+        # kill ffmpeg to unblock pending read
         self._ffmpeg_stop()
+        self._dec_thread.join()
+        self._ffmpeg_stop()
+        self._keyframe_thread.join()
         super()._on_dispose()
 
+    def _build_keyframe_index(self):
+        try:
+            keyframe_idxs = [ round( (t - self._stream_start_time) * self._stream_fps ) for t in lib_ffmpeg.probe_keyframes(str(self._filepath), self._stream_idx) ]
+        except Exception:
+            keyframe_idxs = []
+
+        keyframe_idxs = sorted(set(keyframe_idxs))
+        if len(keyframe_idxs) != 0:
+            with self._dec_cv:
+                self._keyframe_idxs = keyframe_idxs
+
+    def _on_frame_cache_hit(self, idx):
+        # frames decoded ahead are served from the cache, keep the decode window moving
+        with self._dec_cv:
+            self._dec_req_idx = idx
+            self._dec_cv.notify_all()
+
+    def _get_keyframe_idx(self, idx) -> int:
+        """
+        returns idx of nearest keyframe at or before idx,
+        or None if keyframe index is not available
+        """
+        keyframe_idxs = self._keyframe_idxs
+        if keyframe_idxs is None:
+            return None
+        i = bisect.bisect_right(keyframe_idxs, idx)
+        return keyframe_idxs[i-1] if i != 0 else 0
+
+    def _decode_thread_proc(self):
+        cv = self._dec_cv
+        while True:
+            with cv:
+                while not self._dec_disposed and \
+                      self._dec_restart_idx is None and \
+                      (self._dec_pos < 0 or self._dec_end_idx is not None or self._dec_pos > self._dec_req_idx + self._decode_ahead):
+                    cv.wait()
+
+                if self._dec_disposed:
+                    break
+
+                restart_idx = self._dec_restart_idx
+                self._dec_restart_idx = None
+                if restart_idx is not None:
+                    self._dec_pos = restart_idx
+                    self._dec_end_idx = None
+                    self._dec_err = None
+                pos = self._dec_pos
+
+            if restart_idx is not None:
+                if not self._ffmpeg_restart(restart_idx):
+                    with cv:
+                        if self._dec_restart_idx is None:
+                            self._dec_end_idx = pos
+                            self._dec_err = 'ffmpeg error'
+                        cv.notify_all()
+                    continue
+
+            image, err = self._ffmpeg_next_frame()
+
+            with cv:
+                if self._dec_restart_idx is not None:
+                    # frame from old ffmpeg process, restart was requested meanwhile
+                    continue
+
+                if image is None:
+                    self._dec_end_idx = pos
+                    self._dec_err = f'ffmpeg error: {err}'
+                else:
+                    self._frame_cache.put(pos, (image, f'{self._filepath.name}_{pos:06}'))
+                    self._dec_pos = pos + 1
+                cv.notify_all()
+
     def _ffmpeg_stop(self):
         if self._ffmpeg_proc is not None:
             self._ffmpeg_proc.kill()
@@ -132,50 +234,94 @@ class VideoFilePlayer(FramePlayer):
             return True
         return False
 
-    def _ffmpeg_next_frame(self, frames_idx_offset=1):
-        frame_buffer = None
+    def _ffmpeg_next_frame(self):
+        ffmpeg_proc = self._ffmpeg_proc
+        if ffmpeg_proc is None:
+            return None, 'ffmpeg is stopped'
 
-        while frames_idx_offset != 0:
-            frame_buffer = self._ffmpeg_proc.stdout.read(self._ffmpeg_height*self._ffmpeg_width*3)
+        frame_size = self._ffmpeg_height*self._ffmpeg_width*3
+        frame_buffer = bytearray(frame_size)
+        frame_mv = memoryview(frame_buffer)
 
-            if len(frame_buffer) == 0:
-                # unpredicted end reached
-                err = '\r\n'.join(self._ffmpeg_proc_stderr_lines.get_lines(till_eof=True)[-5:])
-                self._ffmpeg_stop()
-                return None, err
-            frames_idx_offset -= 1
-
-        if frame_buffer is not None:
-            frame_image = np.ndarray( (self._ffmpeg_height, self._ffmpeg_width, 3), dtype=np.uint8, buffer=frame_buffer).copy()
-            return frame_image, None
-        return None, None
+        # read directly into the buffer of the new image, no extra copy
+        n_read = 0
+        while n_read < frame_size:
+            n = ffmpeg_proc.stdout.readinto(frame_mv[n_read:])
+            if n is None or n == 0:
+                break
+            n_read += n
 
-    def _on_target_width_changed(self):
-        self._ffmpeg_need_restart = True
+        if n_read != frame_size:
+            # unpredicted end reached
+            err = '\r\n'.join(self._ffmpeg_proc_stderr_lines.get_lines(till_eof=True)[-5:])
+            self._ffmpeg_stop()
+            return None, err
 
-    def _on_get_frame(self, idx) -> Tuple[np.ndarray, str]:
+        frame_image = np.ndarray( (self._ffmpeg_height, self._ffmpeg_width, 3), dtype=np.uint8, buffer=frame_buffer)
+        return frame_image, None
 
-        frame_diff = idx - self._ffmpeg_frame_idx
-        self._ffmpeg_frame_idx = idx
+    def _on_target_width_changed(self):
+        with self._dec_cv:
+            # frames of previous resolution are not valid anymore,
+            # frame being decoded is dropped by the decode thread due to restart request
+            self._frame_cache.clear()
+            self._dec_restart_idx = max(0, self._dec_req_idx)
+            self._dec_cv.notify_all()
+
+    def _is_restart_required(self, idx) -> bool:
+        """
+        decides whether idx is reached faster by restarting ffmpeg than by decoding forward
+        """
+        dec_pos = self._dec_restart_idx
+        if dec_pos is None:
+            if self._dec_end_idx is not None and idx >= self._dec_end_idx:
+                return True
+            dec_pos = self._dec_pos
+
+        if idx < dec_pos or dec_pos < 0:
+            return True
 
-        if self._ffmpeg_proc is None or \
-           frame_diff <= 0 or frame_diff >= 100:
-            self._ffmpeg_need_restart = True
+        if idx - dec_pos <= self._decode_ahead:
+            return False
 
-        if self._ffmpeg_need_restart:
-            self._ffmpeg_need_restart = False
-            if not self._ffmpeg_restart(idx):
-                return (None, 'ffmpeg error')
-            frame_diff = 1
-        else:
-            frame_diff = max(1, frame_diff)
+        keyframe_idx = self._get_keyframe_idx(idx)
+        if keyframe_idx is None:
+            return idx - dec_pos >= 100
 
-        #frame_diff += 1
-        image, err = self._ffmpeg_next_frame(frame_diff)
-        if image is None:
-            return (None, f'ffmpeg error: {err}')
+        # ffmpeg seeks to keyframe without decoding frames before it
+        return keyframe_idx > dec_pos
 
-        return (image, f'{self._filepath.name}_{idx:06}')
+    def _on_get_frame(self, idx) -> Tuple[np.ndarray, str]:
+        cv = self._dec_cv
+        with cv:
+            frame_tuple = self._frame_cache.get(idx)
+            if frame_tuple is not None:
+                self._dec_req_idx = idx
+                cv.notify_all()
+                return frame_tuple
+
+            if self._is_restart_required(idx):
+                keyframe_idx = self._get_keyframe_idx(idx)
+                if keyframe_idx is not None and idx - keyframe_idx <= self._decode_ahead:
+                    # decode from keyframe, near frames before idx will be cached for scrubbing back
+                    self._dec_restart_idx = keyframe_idx
+                else:
+                    self._dec_restart_idx = idx
+
+            self._dec_req_idx = idx
+            cv.notify_all()
+
+            while True:
+                frame_tuple = self._frame_cache.get(idx)
+                if frame_tuple is not None:
+                    return frame_tuple
+
+                if self._dec_restart_idx is None and \
+                   self._dec_end_idx is not None and idx >= self._dec_end_idx:
+                    return (None, self._dec_err)
+
+                if not cv.wait(timeout=10.0):
+                    return (None, 'ffmpeg timeout')
 
 
 
@@ -1,3 +1,4 @@
+from .FrameCache import FrameCache
 from .FramePlayer import FramePlayer
 from .ImageSequencePlayer import ImageSequencePlayer
 from .VideoFilePlayer import VideoFilePlayer
@@ -0,0 +1,149 @@
+import builtins
+import importlib.util
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List
+
+
+class ImportProfiler:
+    """
+    Measures time of module imports as a tree, like python -X importtime,
+    but can be started at runtime.
+
+    Imports of the thread which called start() are measured.
+    Only first imports are recorded, imports of already loaded modules are free.
+    Relative imports are recorded by absolute names,
+    from package import submodule  is recorded as package.submodule .
+    Modules imported via importlib.import_module() are not seen.
+    """
+
+    class Node:
+        def __init__(self, name : str):
+            self.name = name
+            self.cumulative = 0.0
+            self.children : List['ImportProfiler.Node'] = []
+
+        def get_self_time(self) -> float:
+            return self.cumulative - sum(child.cumulative for child in self.children)
+
+        def to_dict(self) -> Dict:
+            return {'name' : self.name,
+                    'cumulative' : self.cumulative,
+                    'self' : self.get_self_time(),
+                    'children' : [ child.to_dict() for child in self.children ] }
+
+    def __init__(self):
+        self._root = ImportProfiler.Node('<root>')
+        self._stack = [self._root]
+        self._thread_id = None
+        self._orig_import = None
+
+    def is_started(self) -> bool: return self._orig_import is not None
+
+    def start(self):
+        if self._orig_import is not None:
+            return
+        self._thread_id = threading.get_ident()
+        self._orig_import = orig_import = builtins.__import__
+
+        def profiled_import(name, globals=None, locals=None, fromlist=(), level=0):
+            node_name = None
+            if threading.get_ident() == self._thread_id:
+                node_name = self._get_node_name(name, globals, fromlist, level)
+            if node_name is None:
+                return orig_import(name, globals, locals, fromlist, level)
+
+            node = ImportProfiler.Node(node_name)
+            self._stack[-1].children.append(node)
+            self._stack.append(node)
+            time_start = time.perf_counter()
+            try:
+                return orig_import(name, globals, locals, fromlist, level)
+            finally:
+                node.cumulative = time.perf_counter() - time_start
+                self._stack.pop()
+
+        builtins.__import__ = profiled_import
+
+    @staticmethod
+    def _get_node_name(name, globals, fromlist, level):
+        """
+        returns absolute name of the modules loaded by the import statement, or None if all are loaded
+        """
+        if level != 0:
+            globals = globals or {}
+            package = globals.get('__package__', None)
+            if package is None:
+                package = globals.get('__name__', '').rpartition('.')[0]
+            try:
+                name = importlib.util.resolve_name('.'*level + name, package)
+            except (ImportError, ValueError):
+                # invalid relative import, the error is raised by the import itself
+                return None
+
+        module = sys.modules.get(name, None)
+        if module is None:
+            return name
+
+        # submodules of the loaded package imported by the from list,
+        # module __dict__ is checked, so module __getattr__ is not triggered
+        module_dict = getattr(module, '__dict__', {})
+        submodules = [ f'{name}.{item}' for item in (fromlist or ()) if item != '*' and item not in module_dict ]
+        if len(submodules) == 0:
+            return None
+        return ', '.join(submodules)
+
+    def stop(self):
+        if self._orig_import is not None:
+            builtins.__import__ = self._orig_import
+            self._orig_import = None
+
+    def get_tree(self) -> List[Node]:
+        """returns list of top level import nodes"""
+        return list(self._root.children)
+
+    def get_top(self, count : int = 20) -> List[Node]:
+        """returns nodes of all levels with the largest self time"""
+        nodes = []
+        stack = list(self._root.children)
+        while len(stack) != 0:
+            node = stack.pop()
+            nodes.append(node)
+            stack += node.children
+        return sorted(nodes, key=lambda node: node.get_self_time(), reverse=True)[:count]
+
+    def format_tree(self, min_time : float = 0.001) -> str:
+        """
+        returns text tree of imports with cumulative time over min_time sec
+        """
+        lines = ['  cumulative ms |   self ms | module']
+        def format_node(node, depth):
+            if node.cumulative < min_time:
+                return
+            lines.append(f'{node.cumulative*1000:15.1f} | {node.get_self_time()*1000:9.1f} | {"  "*depth}{node.name}')
+            for child in node.children:
+                format_node(child, depth+1)
+        for node in self._root.children:
+            format_node(node, 0)
+        return '\n'.join(lines)
+
+    def write_report(self, filepath : Path, phases : Dict[str, float] = None):
+        """
+        write JSON report of phase timings and import tree,
+        and the text tree to the file with .txt suffix
+        """
+        filepath = Path(filepath)
+        report = {'phases' : phases or {},
+                  'import_total' : sum(node.cumulative for node in self._root.children),
+                  'top_self' : [ {'name' : node.name, 'self' : node.get_self_time()} for node in self.get_top() ],
+                  'imports' : [ node.to_dict() for node in self._root.children ] }
+        filepath.write_text(json.dumps(report, indent=2))
+
+        text = []
+        if phases:
+            text += [ f'{name:>20} : {sec:.3f}s' for name, sec in phases.items() ] + ['']
+        text.append(self.format_tree())
+        filepath.with_suffix('.txt').write_text('\n'.join(text))
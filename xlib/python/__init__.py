@@ -5,6 +5,8 @@ class dotdict(dict):
     __delattr__ = dict.__delitem__
 
 from .EventListener import EventListener
+from .ImportProfiler import ImportProfiler
+from .lazy_import import lazy_import, preload_modules
 
 def all_is_not_None(*args): return all(x is not None for x in args)
 def all_is_None(*args): return all(x is None for x in args)
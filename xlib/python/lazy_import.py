@@ -0,0 +1,63 @@
+import importlib
+import sys
+import threading
+from typing import Iterable
+
+
+class _LazyModule:
+    """
+    Module proxy, the module is imported on the first attribute access.
+    Accessed attributes are cached in the proxy, thus later access costs as a regular attribute.
+    """
+    def __init__(self, name : str):
+        self.__dict__['_lazy_module_name'] = name
+
+    def _lazy_module_load(self):
+        return importlib.import_module(self.__dict__['_lazy_module_name'])
+
+    def __getattr__(self, name):
+        value = getattr(self._lazy_module_load(), name)
+        self.__dict__[name] = value
+        return value
+
+    def __dir__(self):
+        return dir(self._lazy_module_load())
+
+    def __repr__(self):
+        return f"<lazy module '{self.__dict__['_lazy_module_name']}'>"
+
+
+def lazy_import(name : str):
+    """
+    returns module if it is already imported,
+    otherwise proxy which imports the module on the first attribute access
+
+    Use for heavy modules which are not needed to show the UI,
+
+        ne = lib_python.lazy_import('numexpr')
+
+    ImportError is raised on the first access.
+    """
+    module = sys.modules.get(name, None)
+    if module is not None:
+        return module
+    return _LazyModule(name)
+
+
+def preload_modules(names : Iterable[str]) -> threading.Thread:
+    """
+    import modules in background thread, missing modules are ignored
+
+    Call after the UI is shown, so the first use of lazy imported module does not stall.
+    """
+    names = list(names)
+    def preload_proc():
+        for name in names:
+            try:
+                importlib.import_module(name)
+            except Exception:
+                pass
+
+    thread = threading.Thread(target=preload_proc, daemon=True)
+    thread.start()
+    return thread
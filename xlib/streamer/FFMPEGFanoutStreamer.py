@@ -0,0 +1,446 @@
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Dict, List, Union
+
+import numpy as np
+
+from .. import ffmpeg as lib_ffmpeg
+from .FFMPEGStreamer import bgr_to_pix_fmt
+
+# MPEG-TS packet size, encoded stream is distributed in chunks of whole packets
+_TS_PACKET_SIZE = 188
+_TS_CHUNK_PACKETS = 64
+
+
+class FFMPEGFanoutStreamer:
+    """
+    Encode BGR frames once and send the encoded stream to multiple outputs.
+
+    Single ffmpeg encoder process produces MPEG-TS.
+    Every output is a lightweight ffmpeg remux process (-c copy) with own writer thread,
+    so a slow or broken output does not stall the encoder or other outputs.
+
+    write_frame() does not block: frames are queued to the encoder thread,
+    the oldest frames are dropped if the encoder is behind.
+
+    Every output has a bounded queue of encoded data. On overflow the queue is dropped
+    and the output waits for the next keyframe, so the receiver gets complete GOPs only.
+
+    Restart of the encoder (frame size or encoder settings are changed) does not stop the outputs:
+    network outputs continue with the new stream from its first keyframe,
+    file outputs are rolled to the next segment file  name_001.ext, name_002.ext, ...
+    so recorded data is never overwritten.
+
+    arguments
+
+        fps(30)             float
+
+        bitrate(2500)       int     kbit/s of the encoder, shared by all outputs
+
+        preset('veryfast')  str     x264 preset
+
+        gop_sec(2.0)        float   keyframe interval
+
+        max_frame_queue(2)  int     max frames waiting for the encoder
+
+        max_output_queue_mb(8)  float   max encoded data waiting for an output
+
+    Encoder is started on the first frame, using its resolution.
+    """
+
+    def __init__(self, fps : float = 30, bitrate : int = 2500, preset : str = 'veryfast', gop_sec : float = 2.0,
+                       max_frame_queue : int = 2, max_output_queue_mb : float = 8):
+        self._fps = fps
+        self._bitrate = bitrate
+        self._preset = preset
+        self._gop_sec = gop_sec
+        self._max_output_queue_bytes = int(max_output_queue_mb*1024*1024)
+
+        self._lock = threading.Lock()
+        self._frames = deque(maxlen=max_frame_queue)
+        self._frames_cond = threading.Condition(self._lock)
+        self._outputs : Dict[str, _FanoutOutput] = {}
+
+        self._encoder_proc = None
+        self._encoder_threads = []
+        self._width = None
+        self._height = None
+
+        self._frames_written = 0
+        self._frames_dropped = 0
+
+    def get_output_names(self) -> List[str]:
+        with self._lock:
+            return list(self._outputs.keys())
+
+    def has_outputs(self) -> bool:
+        with self._lock:
+            return len(self._outputs) != 0
+
+    def is_running(self) -> bool:
+        """returns True if the encoder is running"""
+        return self._encoder_proc is not None and self._encoder_proc.poll() is None
+
+    def set_encoder_params(self, fps : float = None, bitrate : int = None):
+        """
+        change encoder settings, the encoder is restarted on the next frame,
+        file outputs continue in a new segment file
+        """
+        if (fps is not None and fps != self._fps) or (bitrate is not None and bitrate != self._bitrate):
+            if fps is not None:
+                self._fps = fps
+            if bitrate is not None:
+                self._bitrate = bitrate
+            self._stop_encoder()
+
+    def add_output(self, name : str, url : Union[str, Path], format : str = None):
+        """
+        add output
+
+            name        str         unique name of the output
+
+            url         str/Path    rtmp/udp/srt url or file path
+
+            format(None)    str     ffmpeg muxer, None - flv for rtmp, mpegts for udp/srt, by extension for files
+
+        replaces existing output with the same name
+        """
+        self.remove_output(name)
+
+        output = _FanoutOutput(name, str(url), format if format is not None else _guess_format(str(url)), self._max_output_queue_bytes)
+        with self._lock:
+            self._outputs[name] = output
+            if self._encoder_proc is not None:
+                output.start()
+
+    def remove_output(self, name : str):
+        """remove output, pending encoded data is written before the output is closed"""
+        with self._lock:
+            output = self._outputs.pop(name, None)
+        if output is not None:
+            output.stop()
+
+    def write_frame(self, img : np.ndarray) -> bool:
+        """
+        queue frame to the encoder, does not block
+
+            img     np.ndarray  HWC uint8 BGR, not copied, should not be modified after the call
+
+        returns False if there are no outputs or the encoder cannot be started
+        """
+        H,W,C = img.shape
+        if C != 3 or img.dtype != np.uint8:
+            raise ValueError('img must be HWC uint8 BGR')
+
+        if not self.has_outputs():
+            return False
+
+        # yuv420p needs even dimensions, frames are padded by bgr_to_pix_fmt
+        H, W = H + H % 2, W + W % 2
+
+        if self._encoder_proc is not None and (self._width != W or self._height != H or not self.is_running()):
+            self._stop_encoder()
+
+        if self._encoder_proc is None and not self._start_encoder(W, H):
+            return False
+
+        with self._frames_cond:
+            if len(self._frames) == self._frames.maxlen:
+                self._frames_dropped += 1
+            self._frames.append(img)
+            self._frames_cond.notify()
+        return True
+
+    def stop(self):
+        """stop the encoder and all outputs"""
+        self._stop_encoder()
+        with self._lock:
+            outputs, self._outputs = list(self._outputs.values()), {}
+        for output in outputs:
+            output.stop()
+
+    def get_stats(self) -> Dict:
+        """
+        returns dict
+
+            {'frames_written', 'frames_dropped',
+             'outputs' : { name : {'is_running', 'bytes_written', 'bytes_dropped', 'drop_count', 'path'} } }
+
+        path is the current segment file of a file output or url of a network output
+        """
+        with self._lock:
+            return {'frames_written' : self._frames_written,
+                    'frames_dropped' : self._frames_dropped,
+                    'outputs' : { name : output.get_stats() for name, output in self._outputs.items() } }
+
+    def _start_encoder(self, width, height) -> bool:
+        gop = max(1, int(self._fps*self._gop_sec))
+        args = ['-y',
+                '-f', 'rawvideo',
+                '-vcodec', 'rawvideo',
+                '-pix_fmt', 'yuv420p',
+                '-s', f'{width}x{height}',
+                '-r', str(self._fps),
+                '-i', '-',
+                '-c:v', 'libx264',
+                '-preset', self._preset,
+                '-tune', 'zerolatency',
+                '-b:v', f'{self._bitrate}k',
+                '-maxrate', f'{self._bitrate}k',
+                '-bufsize', f'{self._bitrate*2}k',
+                '-g', str(gop),
+                '-keyint_min', str(gop),
+                '-pix_fmt', 'yuv420p',
+                '-f', 'mpegts',
+                '-' ]
+
+        encoder_proc = lib_ffmpeg.run(args, pipe_stdin=True, pipe_stdout=True, quiet_stderr=True)
+        if encoder_proc is None:
+            return False
+
+        with self._lock:
+            self._encoder_proc = encoder_proc
+            self._width = width
+            self._height = height
+            self._frames.clear()
+            outputs = list(self._outputs.values())
+        for output in outputs:
+            output.restart()
+
+        self._encoder_threads = [ threading.Thread(target=self._encode_thread_proc, args=(encoder_proc,), daemon=True),
+                                  threading.Thread(target=self._distribute_thread_proc, args=(encoder_proc,), daemon=True) ]
+        for thread in self._encoder_threads:
+            thread.start()
+        return True
+
+    def _stop_encoder(self):
+        with self._frames_cond:
+            encoder_proc, self._encoder_proc = self._encoder_proc, None
+            self._frames_cond.notify_all()
+        if encoder_proc is None:
+            return
+
+        for thread in self._encoder_threads:
+            thread.join(timeout=5.0)
+        self._encoder_threads = []
+        try:
+            encoder_proc.wait(timeout=5.0)
+        except Exception:
+            encoder_proc.kill()
+
+    def _encode_thread_proc(self, encoder_proc):
+        while True:
+            with self._frames_cond:
+                while len(self._frames) == 0 and self._encoder_proc is encoder_proc:
+                    self._frames_cond.wait()
+                if len(self._frames) == 0:
+                    break
+                img = self._frames.popleft()
+            try:
+                # converted in the encoder thread, yuv420p is half size of bgr24 in the pipe
+                encoder_proc.stdin.write( bgr_to_pix_fmt(img, 'yuv420p').data )
+                encoder_proc.stdin.flush()
+            except Exception:
+                break
+            self._frames_written += 1
+
+        try:
+            encoder_proc.stdin.close()
+        except Exception:
+            pass
+
+    def _distribute_thread_proc(self, encoder_proc):
+        chunk_size = _TS_PACKET_SIZE*_TS_CHUNK_PACKETS
+        pending = b''
+        while True:
+            data = encoder_proc.stdout.read1(chunk_size)
+            if len(data) == 0:
+                break
+
+            # cut on packet boundary, so dropped chunks do not break packets of the next ones
+            data = pending + data
+            size = len(data) - len(data) % _TS_PACKET_SIZE
+            chunk, pending = data[:size], data[size:]
+            if len(chunk) == 0:
+                continue
+
+            has_keyframe = ts_chunk_has_keyframe(chunk)
+            with self._lock:
+                outputs = list(self._outputs.values())
+            for output in outputs:
+                output.put(chunk, has_keyframe)
+
+
+class _FanoutOutput:
+    """
+    remux process of the encoded stream with own writer thread and bounded queue
+    """
+    def __init__(self, name : str, url : str, format : str, max_queue_bytes : int):
+        self._name = name
+        self._url = url
+        self._format = format
+        self._max_queue_bytes = max_queue_bytes
+        self._is_file = '://' not in url
+        self._segment = 0
+        self._segment_path = url
+
+        self._cond = threading.Condition()
+        self._chunks = deque()
+        self._queue_bytes = 0
+        self._wait_keyframe = True
+        self._proc = None
+        self._thread = None
+        self._stopping = False
+        self._proc_count = 0
+
+        self._bytes_written = 0
+        self._bytes_dropped = 0
+        self._drop_count = 0
+
+    def get_name(self) -> str: return self._name
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def get_stats(self) -> Dict:
+        return {'is_running' : self.is_running(),
+                'bytes_written' : self._bytes_written,
+                'bytes_dropped' : self._bytes_dropped,
+                'drop_count' : self._drop_count,
+                'path' : self._segment_path, }
+
+    def start(self):
+        if self._thread is not None:
+            return
+        if self._is_file and self._proc_count != 0:
+            # file of the previous stream is kept, continue in the next segment
+            self._segment_path = self._get_next_segment_path()
+
+        # only the file given by the user is overwritten
+        args = ['-y' if self._segment == 0 else '-n',
+                '-f', 'mpegts',
+                '-i', '-',
+                '-c', 'copy']
+        if self._format is not None:
+            args += ['-f', self._format]
+        args += [self._segment_path]
+        self._proc_count += 1
+
+        self._proc = lib_ffmpeg.run(args, pipe_stdin=True, quiet_stderr=True)
+        if self._proc is None:
+            return
+
+        with self._cond:
+            self._chunks.clear()
+            self._queue_bytes = 0
+            # new stream starts from a keyframe
+            self._wait_keyframe = True
+            self._stopping = False
+        self._thread = threading.Thread(target=self._write_thread_proc, daemon=True)
+        self._thread.start()
+
+    def restart(self):
+        """
+        continue with the new stream of the restarted encoder
+
+        running network output is kept connected and waits for a keyframe of the new stream,
+        file output is closed and continued in the next segment file
+        """
+        if self._is_file or not self.is_running():
+            self.stop()
+            self.start()
+            return
+        with self._cond:
+            self._wait_keyframe = True
+
+    def stop(self, timeout : float = 5.0):
+        """write pending data and close the output"""
+        thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+        thread.join(timeout=timeout)
+
+        proc, self._proc = self._proc, None
+        try:
+            proc.wait(timeout=timeout)
+        except Exception:
+            proc.kill()
+
+    def _get_next_segment_path(self) -> str:
+        path = Path(self._url)
+        while True:
+            self._segment += 1
+            segment_path = path.parent / f'{path.stem}_{self._segment:03d}{path.suffix}'
+            if not segment_path.exists():
+                return str(segment_path)
+
+    def put(self, chunk : bytes, has_keyframe : bool):
+        """
+        queue encoded chunk
+
+        if the queue is full, queued data is dropped and chunks are dropped until the next keyframe
+        """
+        with self._cond:
+            if not self._wait_keyframe and self._queue_bytes + len(chunk) > self._max_queue_bytes:
+                self._drop_count += 1
+                self._bytes_dropped += self._queue_bytes
+                self._chunks.clear()
+                self._queue_bytes = 0
+                self._wait_keyframe = True
+
+            if self._wait_keyframe:
+                if not has_keyframe:
+                    self._bytes_dropped += len(chunk)
+                    return
+                self._wait_keyframe = False
+
+            self._chunks.append(chunk)
+            self._queue_bytes += len(chunk)
+            self._cond.notify()
+
+    def _write_thread_proc(self):
+        proc = self._proc
+        while True:
+            with self._cond:
+                while len(self._chunks) == 0 and not self._stopping:
+                    self._cond.wait()
+                if len(self._chunks) == 0:
+                    break
+                chunk = self._chunks.popleft()
+                self._queue_bytes -= len(chunk)
+            try:
+                proc.stdin.write(chunk)
+                proc.stdin.flush()
+            except Exception:
+                # broken output, other outputs continue
+                break
+            self._bytes_written += len(chunk)
+
+        try:
+            proc.stdin.close()
+        except Exception:
+            pass
+
+
+def ts_chunk_has_keyframe(chunk : bytes) -> bool:
+    """
+    returns True if MPEG-TS data contains a packet with random access indicator,
+    which is set by ffmpeg on packets starting a keyframe
+    """
+    packets = np.frombuffer(chunk, np.uint8, count=len(chunk) - len(chunk) % _TS_PACKET_SIZE).reshape(-1, _TS_PACKET_SIZE)
+    has_adaptation = (packets[:,3] & 0x20) != 0
+    return bool(np.any( has_adaptation & (packets[:,4] != 0) & ((packets[:,5] & 0x40) != 0) ))
+
+
+def _guess_format(url : str) -> Union[str, None]:
+    url_lower = url.lower()
+    if url_lower.startswith( ('rtmp://', 'rtmps://') ):
+        return 'flv'
+    if url_lower.startswith( ('udp://', 'srt://', 'rtp://') ):
+        return 'mpegts'
+    # file, muxer by extension
+    return None
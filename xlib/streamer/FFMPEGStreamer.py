@@ -1,33 +1,97 @@
+import threading
+import time
+from typing import Dict
+
+import cv2
 import numpy as np
 
 from .. import ffmpeg as lib_ffmpeg
 
 
 class FFMPEGStreamer:
-    def __init__(self):
+    """
+    Stream frames as mpegts over udp using subprocess ffmpeg.
+
+    push_frame() does not block: the frame is put to a single slot
+    and written to ffmpeg by a dedicated writer thread.
+    If the writer is behind, the frame waiting in the slot is replaced (dropped),
+    so the caller is never stalled by a slow encoder or network.
+
+    Frames are converted to pix_fmt before the pipe, which is half size of bgr24.
+
+    arguments
+
+        pix_fmt('yuv420p')  'yuv420p', 'nv12' or 'bgr24'
+    """
+
+    def __init__(self, pix_fmt : str = 'yuv420p'):
+        if pix_fmt not in ['yuv420p', 'nv12', 'bgr24']:
+            raise ValueError(f'Unsupported pix_fmt {pix_fmt}')
+        self._pix_fmt = pix_fmt
+
         self._ffmpeg_proc = None
         self._addr = '127.0.0.1'
         self._port = 1234
         self._width = 320
         self._height = 240
 
+        self._cond = threading.Condition()
+        self._slot = None
+        self._thread = None
+        self._stopping = False
+
+        self._frames_pushed = 0
+        self._frames_written = 0
+        self._frames_dropped = 0
+        self._encoder_lag = 0.0
+        self._max_encoder_lag = 0.0
+
     def set_addr_port(self, addr : str, port : int):
         if self._addr != addr or self._port != port:
             self._addr = addr
             self._port = port
             self.stop()
-    
+
+    def get_frames_dropped(self) -> int: return self._frames_dropped
+
+    def get_encoder_lag(self) -> float:
+        """average sec from push_frame() to the end of the write to ffmpeg"""
+        return self._encoder_lag
+
+    def get_stats(self) -> Dict:
+        """
+        returns dict of frames_pushed, frames_written, frames_dropped, encoder_lag, max_encoder_lag
+        """
+        return {'frames_pushed' : self._frames_pushed,
+                'frames_written' : self._frames_written,
+                'frames_dropped' : self._frames_dropped,
+                'encoder_lag' : self._encoder_lag,
+                'max_encoder_lag' : self._max_encoder_lag, }
+
     def stop(self):
+        """stop the writer thread and ffmpeg, the frame waiting in the slot is discarded"""
+        with self._cond:
+            thread, self._thread = self._thread, None
+            self._stopping = True
+            self._slot = None
+            self._cond.notify()
+        # killed ffmpeg unblocks the write of the thread
+        self._stop_ffmpeg()
+        if thread is not None:
+            thread.join(timeout=5.0)
+        self._stop_ffmpeg()
+
+    def _stop_ffmpeg(self):
         if self._ffmpeg_proc is not None:
             self._ffmpeg_proc.kill()
             self._ffmpeg_proc = None
-        
+
     def _restart(self):
-        self.stop()
+        self._stop_ffmpeg()
         args = ['-y', '-re',
                 '-f', 'rawvideo',
                 '-vcodec','rawvideo',
-                '-pix_fmt', 'bgr24',
+                '-pix_fmt', self._pix_fmt,
                 '-s', f'{self._width}:{self._height}',
                 '-i', '-',
                 '-f', 'mpegts',
@@ -37,16 +101,85 @@ class FFMPEGStreamer:
         self._ffmpeg_proc = lib_ffmpeg.run (args, pipe_stdin=True, quiet_stderr=True)#, pipe_stderr=True)
 
     def push_frame(self, img : np.ndarray):
-        H,W,C = img.shape
-        if self._width != W or self._height != H:
-            self._width = W
-            self._height = H
-            self.stop()
-            
-        if self._ffmpeg_proc is None:
-            self._restart()
-        
-        try:
-            self._ffmpeg_proc.stdin.write(img)
-        except:
-            self.stop()
+        """
+        queue the frame for streaming, does not block
+
+            img     np.ndarray  HWC uint8 BGR, not copied, should not be modified after the call
+        """
+        with self._cond:
+            self._frames_pushed += 1
+            if self._slot is not None:
+                # writer is behind, drop the oldest frame
+                self._frames_dropped += 1
+            self._slot = (img, time.perf_counter())
+
+            if self._thread is None:
+                self._stopping = False
+                self._thread = threading.Thread(target=self._write_thread_proc, daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def _write_thread_proc(self):
+        while True:
+            with self._cond:
+                while self._slot is None and not self._stopping:
+                    self._cond.wait()
+                if self._stopping:
+                    break
+                (img, push_time), self._slot = self._slot, None
+
+            H,W,C = img.shape
+            H, W = H + H % 2, W + W % 2
+            if self._width != W or self._height != H:
+                self._width = W
+                self._height = H
+                self._stop_ffmpeg()
+
+            if self._ffmpeg_proc is None:
+                self._restart()
+                if self._ffmpeg_proc is None:
+                    continue
+
+            try:
+                self._ffmpeg_proc.stdin.write( bgr_to_pix_fmt(img, self._pix_fmt).data )
+            except:
+                self._stop_ffmpeg()
+                continue
+
+            lag = time.perf_counter() - push_time
+            self._encoder_lag = lag if self._frames_written == 0 else self._encoder_lag*0.9 + lag*0.1
+            self._max_encoder_lag = max(self._max_encoder_lag, lag)
+            self._frames_written += 1
+
+
+def bgr_to_pix_fmt(img : np.ndarray, pix_fmt : str) -> np.ndarray:
+    """
+    convert HWC uint8 BGR image to raw planes of ffmpeg pix_fmt
+
+        pix_fmt     'yuv420p'   planar Y, U, V
+                    'nv12'      planar Y, interleaved UV
+                    'bgr24'
+
+    Odd width or height is padded by edge pixels.
+    """
+    H,W,_ = img.shape
+    if W % 2 != 0 or H % 2 != 0:
+        img = np.pad(img, ( (0, H % 2), (0, W % 2), (0,0) ), mode='edge')
+        H,W,_ = img.shape
+
+    if pix_fmt == 'bgr24':
+        return np.ascontiguousarray(img)
+
+    i420 = cv2.cvtColor(img, cv2.COLOR_BGR2YUV_I420)
+    if pix_fmt == 'yuv420p':
+        return i420
+    elif pix_fmt == 'nv12':
+        uv_size = (H//2)*(W//2)
+        chroma = i420[H:].reshape(-1)
+        nv12 = np.empty_like(i420)
+        nv12[:H] = i420[:H]
+        uv = nv12[H:].reshape(-1)
+        uv[0::2] = chroma[:uv_size]
+        uv[1::2] = chroma[uv_size:]
+        return nv12
+    raise ValueError(f'Unsupported pix_fmt {pix_fmt}')
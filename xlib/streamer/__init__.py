@@ -1 +1,2 @@
-from .FFMPEGStreamer import FFMPEGStreamer
\ No newline at end of file
+from .FFMPEGFanoutStreamer import FFMPEGFanoutStreamer
+from .FFMPEGStreamer import FFMPEGStreamer
@@ -0,0 +1,99 @@
+import math
+from typing import Dict
+
+import numpy as np
+
+
+class LatencyHistogram:
+    """
+    HDR-style histogram of latencies with fixed relative precision.
+
+    Values are counted in log-linear buckets of microseconds:
+    values below 2**sub_bucket_bits us are exact,
+    larger values have relative error below 2**-(sub_bucket_bits-1).
+    Memory and record() cost do not depend on number of values.
+
+    arguments
+
+        max_value(60.0)     sec, larger values are counted as max_value
+
+        sub_bucket_bits(7)  precision, 7 bits gives < 1.6% error
+    """
+
+    def __init__(self, max_value : float = 60.0, sub_bucket_bits : int = 7):
+        self._sub_bucket_bits = sub_bucket_bits
+        self._sub_bucket_count = 1 << sub_bucket_bits
+        self._sub_bucket_half = self._sub_bucket_count // 2
+        self._max_units = max(1, int(max_value * 1e6))
+        self._counts = np.zeros( (self._get_index(self._max_units)+1,), np.int64)
+        self.reset()
+
+    def reset(self):
+        self._counts[:] = 0
+        self._count = 0
+        self._sum = 0.0
+        self._min = math.inf
+        self._max = 0.0
+
+    def get_count(self) -> int: return self._count
+    def get_min(self) -> float: return self._min if self._count != 0 else 0.0
+    def get_max(self) -> float: return self._max
+    def get_mean(self) -> float: return self._sum / self._count if self._count != 0 else 0.0
+
+    def record(self, value : float):
+        """
+        count value in sec
+        """
+        value = max(0.0, float(value))
+        units = min(int(value * 1e6), self._max_units)
+        self._counts[self._get_index(units)] += 1
+        self._count += 1
+        self._sum += value
+        self._min = min(self._min, value)
+        self._max = max(self._max, value)
+
+    def merge(self, other : 'LatencyHistogram'):
+        """add counts of other histogram with the same settings"""
+        if other._counts.shape != self._counts.shape:
+            raise ValueError('Histograms have different settings')
+        self._counts += other._counts
+        self._count += other._count
+        self._sum += other._sum
+        self._min = min(self._min, other._min)
+        self._max = max(self._max, other._max)
+
+    def get_percentile(self, percentile : float) -> float:
+        """
+        returns value in sec below which percentile% of values are
+        """
+        if self._count == 0:
+            return 0.0
+        rank = max(1, math.ceil(percentile / 100.0 * self._count))
+        index = int(np.searchsorted(np.cumsum(self._counts), rank))
+        return min(self._get_value(index), self._max)
+
+    def get_summary(self) -> Dict[str, float]:
+        """
+        returns dict of count, mean, min, p50, p95, p99, max. Values in sec.
+        """
+        return {'count' : self._count,
+                'mean' : self.get_mean(),
+                'min' : self.get_min(),
+                'p50' : self.get_percentile(50),
+                'p95' : self.get_percentile(95),
+                'p99' : self.get_percentile(99),
+                'max' : self.get_max(), }
+
+    def _get_index(self, units : int) -> int:
+        exp = max(0, units.bit_length() - self._sub_bucket_bits)
+        if exp == 0:
+            return units
+        return (units >> exp) + exp*self._sub_bucket_half
+
+    def _get_value(self, index : int) -> float:
+        """returns upper bound of the bucket in sec"""
+        if index < self._sub_bucket_count:
+            return index * 1e-6
+        exp = (index - self._sub_bucket_count) // self._sub_bucket_half + 1
+        low = (index - exp*self._sub_bucket_half) << exp
+        return (low + (1 << exp) - 1) * 1e-6
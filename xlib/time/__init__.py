@@ -1 +1,2 @@
-from .time_ import timeit, measure, FPSCounter, AverageMeasurer
\ No newline at end of file
+from .LatencyHistogram import LatencyHistogram
+from .time_ import timeit, measure, FPSCounter, AverageMeasurer